@@ -0,0 +1,226 @@
+"""
+Analysis Cache - persistent per-file results for the Oksana analyzer
+SQLite store keyed by path + size + mtime_ns with a content-hash fallback,
+so warm runs only read and scan files that actually changed.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from project_inventory import FileEntry
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "oksana-analyzer" / "analysis-cache.sqlite"
+DEFAULT_MAX_ENTRIES = 250_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Evict down to this fraction of the limits so we do not evict on every run
+EVICTION_HEADROOM = 0.9
+
+
+def content_digest(content: str) -> str:
+    """Fast content hash used as the fallback cache key"""
+    return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Persistent cache of per-file analysis dicts.
+
+    Lookups first try the cheap stat key (path, size, mtime_ns); when that
+    misses, callers read the file and retry with its content hash so that a
+    touched-but-unchanged file still skips the scan. Entries are evicted in
+    least-recently-used order once the entry or payload budget is exceeded.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, cache_path: Optional[Path] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_path = str(cache_path) if cache_path else ":memory:"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._touched: List[Tuple[int, str, str]] = []
+
+        if self.cache_path != ":memory:":
+            Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._connection = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self._initialize_schema()
+
+        self.stats = {
+            "hits": 0,
+            "content_hash_hits": 0,
+            "misses": 0,
+            "bytes_read_saved": 0,
+            "stores": 0,
+            "evictions": 0
+        }
+
+    @classmethod
+    def from_environment(cls) -> "AnalysisCache":
+        """Build the default cache; OKSANA_ANALYZER_CACHE overrides the path or disables it with 'off'"""
+        configured = os.getenv("OKSANA_ANALYZER_CACHE")
+        if configured and configured.lower() in ("0", "off", "none", "disabled"):
+            return cls(None)
+        return cls(Path(configured) if configured else DEFAULT_CACHE_PATH)
+
+    def _initialize_schema(self):
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            if self.cache_path != ":memory:":
+                cursor.execute("PRAGMA journal_mode = WAL")
+            cursor.execute("PRAGMA synchronous = NORMAL")
+
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                cursor.execute("DROP TABLE IF EXISTS file_results")
+                cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS file_results (
+                    path TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    payload_bytes INTEGER NOT NULL,
+                    last_used INTEGER NOT NULL,
+                    PRIMARY KEY (path, kind)
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_content ON file_results (kind, content_hash)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON file_results (last_used)")
+            self._connection.commit()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def lookup(self, entry: FileEntry, kind: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result when path, size and mtime are unchanged"""
+        path = str(entry.path)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size, mtime_ns, result FROM file_results WHERE path = ? AND kind = ?",
+                (path, kind)
+            ).fetchone()
+
+        if row and row[0] == entry.size and row[1] == entry.mtime_ns:
+            self.stats["hits"] += 1
+            self.stats["bytes_read_saved"] += entry.size
+            self._touched.append((int(time.time()), path, kind))
+            return json.loads(row[2])
+
+        return None
+
+    def lookup_content(self, entry: FileEntry, kind: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Fallback lookup by content hash; re-keys the hit under the current stat"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result FROM file_results WHERE kind = ? AND content_hash = ? LIMIT 1",
+                (kind, content_hash)
+            ).fetchone()
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["content_hash_hits"] += 1
+        result = json.loads(row[0])
+        self._write(entry, kind, content_hash, row[0])
+        return result
+
+    def store(self, entry: FileEntry, kind: str, content_hash: str, result: Dict[str, Any]):
+        """Persist a freshly computed per-file result"""
+        self.stats["stores"] += 1
+        self._write(entry, kind, content_hash, json.dumps(result, separators=(",", ":"), default=str))
+
+    def _write(self, entry: FileEntry, kind: str, content_hash: str, payload: str):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO file_results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(entry.path), kind, entry.size, entry.mtime_ns, content_hash,
+                 payload, len(payload), int(time.time()))
+            )
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def commit(self):
+        """Flush pending writes and LRU timestamps, then enforce the size budget"""
+        with self._lock:
+            if self._touched:
+                self._connection.executemany(
+                    "UPDATE file_results SET last_used = ? WHERE path = ? AND kind = ?",
+                    self._touched
+                )
+                self._touched = []
+            self._connection.commit()
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries until both budgets are respected"""
+        with self._lock:
+            entry_count, payload_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(payload_bytes), 0) FROM file_results"
+            ).fetchone()
+
+            if entry_count <= self.max_entries and payload_bytes <= self.max_bytes:
+                return 0
+
+            target_entries = int(self.max_entries * EVICTION_HEADROOM)
+            target_bytes = int(self.max_bytes * EVICTION_HEADROOM)
+
+            evicted = 0
+            rows = self._connection.execute(
+                "SELECT rowid, payload_bytes FROM file_results ORDER BY last_used ASC"
+            )
+            doomed = []
+            for rowid, size in rows:
+                if entry_count <= target_entries and payload_bytes <= target_bytes:
+                    break
+                doomed.append((rowid,))
+                entry_count -= 1
+                payload_bytes -= size
+                evicted += 1
+
+            self._connection.executemany("DELETE FROM file_results WHERE rowid = ?", doomed)
+            self._connection.commit()
+            self._connection.execute("PRAGMA incremental_vacuum")
+
+        self.stats["evictions"] += evicted
+        return evicted
+
+    def summary(self) -> Dict[str, Any]:
+        """Cache statistics for inclusion in analysis_results"""
+        with self._lock:
+            entry_count, payload_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(payload_bytes), 0) FROM file_results"
+            ).fetchone()
+
+        lookups = self.stats["hits"] + self.stats["content_hash_hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": (self.stats["hits"] + self.stats["content_hash_hits"]) / lookups if lookups else 0.0,
+            "entries": entry_count,
+            "payload_bytes": payload_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "cache_path": self.cache_path
+        }
+
+    def close(self):
+        self.commit()
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,308 @@
+"""
+Analytics Backends - pluggable engines behind the analyzer's priority analytics
+Every backend exposes the same matrix_analysis / project_metrics API. The one
+used at runtime is chosen by capability and a short micro-benchmark instead of
+CPU brand strings, so Linux hosts get vectorized analytics too.
+"""
+
+import os
+import math
+import time
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Type
+
+from file_metrics import PERCENTILES, column_statistics
+from lazy_imports import LazyModule, module_available
+from tracing import span
+
+# numpy is imported on first use so that importing the analyzer stays fast
+np = LazyModule("numpy")
+NUMPY_AVAILABLE = module_available("numpy")
+
+BENCHMARK_SHAPE = (2048, 6)  # project-scale table: per-call overhead must not decide
+BENCHMARK_REPEATS = 3
+
+
+def _to_rows(matrix: Any) -> List[List[float]]:
+    """Plain list-of-rows view of a NumPy array, nested list or flat sequence"""
+    rows = matrix.tolist() if hasattr(matrix, "tolist") else list(matrix)
+    return [list(row) if isinstance(row, (list, tuple)) else [row] for row in rows]
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    """Linear interpolation between closest ranks (NumPy's default method)"""
+    position = (len(ordered) - 1) * percentile / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _benchmark_matrix() -> List[List[float]]:
+    rows, columns = BENCHMARK_SHAPE
+    return [[float((row * 31 + column * 17) % 97) for column in range(columns)] for row in range(rows)]
+
+
+class AnalyticsBackend:
+    """
+    Base class for analytics engines.
+
+    Subclasses implement ``analyze_matrix`` for the operations listed in
+    ``capabilities``; the async API, timing and project-level aggregation are
+    shared. ``remote`` backends are never picked automatically.
+    """
+
+    name = "base"
+    engine = "Base"
+    capabilities: Tuple[str, ...] = ()
+    remote = False
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def analyze_matrix(self, matrix: Any, operation: str,
+                       column_names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def benchmark(self) -> float:
+        """Best-of-N seconds for a columnar pass over a small synthetic table"""
+        matrix = _benchmark_matrix()
+        best = float("inf")
+        for _ in range(BENCHMARK_REPEATS):
+            start = time.perf_counter()
+            self.analyze_matrix(matrix, "columnar")
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    async def matrix_analysis(self, matrix: Any, operation: str = "comprehensive",
+                              column_names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        results: Dict[str, Any] = {"engine": self.engine, "backend": self.name, "operation": operation}
+        with span(f"{self.name}.{operation}", "engine", rows=len(matrix)):
+            try:
+                if operation not in self.capabilities:
+                    raise ValueError(f"Backend '{self.name}' does not support '{operation}'")
+                results.update(self.analyze_matrix(matrix, operation, column_names))
+            except Exception as e:
+                results["error"] = str(e)
+        results["processing_time_ms"] = (time.perf_counter() - start_time) * 1000
+        return results
+
+    async def project_metrics(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Project-level analytics: the columnar file-metrics table plus legacy series"""
+        start_time = time.perf_counter()
+        metrics: Dict[str, Any] = {
+            "engine": self.engine,
+            "backend": self.name,
+            "timestamp": datetime.now().isoformat()
+        }
+
+        file_metrics = project_data.get("file_metrics")
+        if file_metrics is not None and len(file_metrics) > 0:
+            metrics["file_metrics_analysis"] = await self.matrix_analysis(
+                file_metrics.matrix, "columnar", list(file_metrics.columns)
+            )
+            metrics["group_statistics"] = file_metrics.group_statistics()
+
+        for key in ("file_sizes", "complexity_scores"):
+            series = project_data.get(key)
+            if isinstance(series, list) and len(series) > 1:
+                metrics[f"{key}_analysis"] = await self.matrix_analysis([[value] for value in series], "comprehensive")
+
+        metrics["total_processing_time_ms"] = (time.perf_counter() - start_time) * 1000
+        return metrics
+
+
+class NumpyBackend(AnalyticsBackend):
+    """Vectorized NumPy engine (BLAS/LAPACK-backed, Accelerate on Apple silicon)"""
+
+    name = "numpy"
+    engine = "NumPy-BLAS"
+    capabilities = ("columnar", "comprehensive", "eigenanalysis", "svd_analysis")
+
+    @classmethod
+    def available(cls) -> bool:
+        return NUMPY_AVAILABLE
+
+    def analyze_matrix(self, matrix: Any, operation: str,
+                       column_names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.ndim != 2:
+            raise ValueError(f"Expected a 2-D matrix, got shape {matrix.shape}")
+        results: Dict[str, Any] = {"matrix_shape": list(matrix.shape)}
+
+        if operation == "columnar":
+            results["column_statistics"] = column_statistics(matrix, column_names)
+        elif operation == "comprehensive":
+            results["statistics"] = {
+                "mean": float(np.mean(matrix)),
+                "std": float(np.std(matrix)),
+                "frobenius_norm": float(np.linalg.norm(matrix, 'fro')),
+                "trace": float(np.trace(matrix)) if matrix.shape[0] == matrix.shape[1] else None
+            }
+        elif operation == "eigenanalysis":
+            if matrix.shape[0] != matrix.shape[1]:
+                raise ValueError("Eigenanalysis needs a square matrix")
+            eigenvalues = np.linalg.eigvals(matrix)
+            magnitudes = np.abs(eigenvalues)
+            results["eigenvalues"] = [float(value) for value in np.sort(magnitudes)[::-1][:5]]
+            results["spectral_analysis"] = {
+                "max_eigenvalue": float(magnitudes.max()),
+                "condition_number": float(magnitudes.max() / magnitudes.min()) if magnitudes.min() > 0 else None
+            }
+        elif operation == "svd_analysis":
+            singular_values = np.linalg.svd(matrix, compute_uv=False)
+            results["singular_values"] = singular_values[:5].tolist()
+            results["rank_analysis"] = {
+                "numerical_rank": int(np.sum(singular_values > 1e-10)),
+                "effective_rank": int(np.sum(singular_values > singular_values[0] * 1e-10)) if len(singular_values) else 0
+            }
+        return results
+
+
+class PythonBackend(AnalyticsBackend):
+    """Pure-Python engine: always available, columnar and summary statistics only"""
+
+    name = "python"
+    engine = "Python-Native"
+    capabilities = ("columnar", "comprehensive")
+
+    def analyze_matrix(self, matrix: Any, operation: str,
+                       column_names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        rows = _to_rows(matrix)
+        width = len(rows[0]) if rows else 0
+        results: Dict[str, Any] = {"matrix_shape": [len(rows), width]}
+
+        if operation == "columnar":
+            names = list(column_names) if column_names is not None else [str(i) for i in range(width)]
+            results["column_statistics"] = {
+                name: self._column_summary([row[index] for row in rows])
+                for index, name in enumerate(names)
+            }
+        elif operation == "comprehensive":
+            values = [value for row in rows for value in row]
+            mean = sum(values) / len(values)
+            results["statistics"] = {
+                "mean": mean,
+                "std": math.sqrt(sum((value - mean) ** 2 for value in values) / len(values)),
+                "frobenius_norm": math.sqrt(sum(value * value for value in values)),
+                "trace": sum(rows[i][i] for i in range(width)) if len(rows) == width else None
+            }
+        return results
+
+    @staticmethod
+    def _column_summary(column: List[float]) -> Dict[str, Any]:
+        # NaN marks metrics a file does not have, as in file_metrics.column_statistics
+        values = sorted(value for value in column if value == value)
+        if not values:
+            return {"count": 0, "total": 0.0, "mean": None, "std": None, "min": None, "max": None,
+                    **{f"p{percentile}": None for percentile in PERCENTILES}}
+
+        total = math.fsum(values)
+        mean = total / len(values)
+        return {
+            "count": len(values),
+            "total": total,
+            "mean": mean,
+            "std": math.sqrt(math.fsum((value - mean) ** 2 for value in values) / len(values)),
+            "min": values[0],
+            "max": values[-1],
+            **{f"p{percentile}": _percentile(values, percentile) for percentile in PERCENTILES}
+        }
+
+
+class MockRemoteBackend(PythonBackend):
+    """
+    Stand-in for a remote analytics service (e.g. the Grid API).
+
+    Computes locally like the Python backend but pays a simulated round trip
+    per call, so integration code paths can be exercised without network access.
+    """
+
+    name = "mock-remote"
+    engine = "Mock-Remote"
+    remote = True
+
+    def __init__(self, latency_seconds: float = 0.05):
+        self.latency_seconds = latency_seconds
+
+    def benchmark(self) -> float:
+        return super().benchmark() + self.latency_seconds
+
+    async def matrix_analysis(self, matrix: Any, operation: str = "comprehensive",
+                              column_names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency_seconds)
+        results = await super().matrix_analysis(matrix, operation, column_names)
+        results["simulated_latency_ms"] = self.latency_seconds * 1000
+        return results
+
+
+BACKENDS: Dict[str, Type[AnalyticsBackend]] = {}
+
+
+def register_backend(backend: Type[AnalyticsBackend]) -> Type[AnalyticsBackend]:
+    """Add a backend class to the registry (usable as a class decorator)"""
+    BACKENDS[backend.name] = backend
+    return backend
+
+
+for _backend in (NumpyBackend, PythonBackend, MockRemoteBackend):
+    register_backend(_backend)
+
+
+def select_backend(preferred: Optional[str] = None,
+                   required: Sequence[str] = ("columnar",),
+                   cached_benchmark_ms: Optional[Mapping[str, float]] = None
+                   ) -> Tuple[AnalyticsBackend, Dict[str, Any]]:
+    """
+    Pick the analytics backend for this host.
+
+    ``preferred`` (or OKSANA_ANALYZER_ANALYTICS_BACKEND) forces a backend by
+    name. Otherwise every available, local backend supporting ``required``
+    is benchmarked and the fastest wins. ``cached_benchmark_ms`` holds the
+    timings of an earlier run on this host (see hardware_probe); when it
+    covers every candidate, nothing is benchmarked again. Returns the
+    backend and a report of the decision.
+    """
+    preferred = preferred or os.getenv("OKSANA_ANALYZER_ANALYTICS_BACKEND")
+    if preferred:
+        if preferred not in BACKENDS:
+            raise ValueError(f"Unknown analytics backend '{preferred}', expected one of {sorted(BACKENDS)}")
+        backend_class = BACKENDS[preferred]
+        if not backend_class.available():
+            raise RuntimeError(f"Analytics backend '{preferred}' is not available on this host")
+        return backend_class(), {"selected": preferred, "reason": "configured"}
+
+    eligible = [
+        name for name, backend_class in BACKENDS.items()
+        if not backend_class.remote and backend_class.available()
+        and all(capability in backend_class.capabilities for capability in required)
+    ]
+    if cached_benchmark_ms and eligible and all(name in cached_benchmark_ms for name in eligible):
+        selected = min(eligible, key=cached_benchmark_ms.get)
+        return BACKENDS[selected](), {
+            "selected": selected,
+            "reason": "cached-benchmark",
+            "benchmark_ms": {name: cached_benchmark_ms[name] for name in eligible}
+        }
+
+    benchmarks: Dict[str, float] = {}
+    candidates: Dict[str, AnalyticsBackend] = {}
+    for name in eligible:
+        backend = BACKENDS[name]()
+        try:
+            benchmarks[name] = backend.benchmark()
+        except Exception:
+            continue
+        candidates[name] = backend
+
+    if not candidates:
+        raise RuntimeError(f"No analytics backend supports {list(required)}")
+
+    selected = min(benchmarks, key=benchmarks.get)
+    return candidates[selected], {
+        "selected": selected,
+        "reason": "fastest-benchmark",
+        "benchmark_ms": {name: seconds * 1000 for name, seconds in benchmarks.items()}
+    }
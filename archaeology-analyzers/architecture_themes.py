@@ -0,0 +1,300 @@
+"""
+Architecture Themes - latent themes and component clusters for the Oksana analyzer
+Every component and bridge file becomes a sparse row of identifier-word weights
+(tf-idf). A truncated randomized SVD of that file x term matrix yields a few
+latent "themes"; files are clustered on their theme coordinates and each phase
+is summarized by the themes that carry most of its files' weight.
+
+The matrix is never densified: it is stored as compressed sparse rows and only
+multiplied by tall, thin dense blocks, so 100k+ files stay within a few seconds
+and a few dozen MB on one CPU core. Only numpy is needed.
+"""
+
+import os
+import time
+from collections import Counter
+from itertools import chain
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from lazy_imports import LazyModule, module_available
+
+# numpy is first needed after the scan phases, once there are documents to decompose
+np = LazyModule("numpy")
+NUMPY_AVAILABLE = module_available("numpy")
+
+DEFAULT_RANK = 12
+DEFAULT_CLUSTERS = 8
+OVERSAMPLING = 8
+POWER_ITERATIONS = 2
+KMEANS_ITERATIONS = 25
+
+MIN_DOCUMENT_FREQUENCY = 2      # a word in one file says nothing about similarity
+MAX_DOCUMENT_RATIO = 0.5        # ... nor does one that is in most files
+MAX_TERMS = 20000
+
+THEME_TERMS = 6
+THEMES_PER_PHASE = 3
+CLUSTER_EXAMPLES = 5
+
+DOT_CHUNK_NONZEROS = 1 << 16    # bounds the (non-zeros x block width) temporary of a product
+
+
+class SparseMatrix:
+    """
+    Compressed sparse rows: row ``i`` holds ``data[indptr[i]:indptr[i + 1]]``
+    at columns ``indices[indptr[i]:indptr[i + 1]]``.
+    """
+
+    __slots__ = ("shape", "indptr", "indices", "data")
+
+    def __init__(self, shape: Tuple[int, int], indptr: "np.ndarray", indices: "np.ndarray", data: "np.ndarray"):
+        self.shape = shape
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def frobenius_norm(self) -> float:
+        return float(np.sqrt(np.dot(self.data, self.data)))
+
+    def dot(self, dense: "np.ndarray") -> "np.ndarray":
+        """``self @ dense`` for a dense (columns x k) block, a chunk of rows at a time"""
+        dense = np.asarray(dense, dtype=np.float64)
+        rows = self.shape[0]
+        out = np.zeros((rows, dense.shape[1]))
+        indptr = self.indptr
+        row = 0
+        while row < rows:
+            end = int(np.searchsorted(indptr, indptr[row] + DOT_CHUNK_NONZEROS, side="right")) - 1
+            end = min(max(end, row + 1), rows)
+            low, high = indptr[row], indptr[end]
+            if high > low:
+                products = dense.take(self.indices[low:high], axis=0)
+                products *= self.data[low:high, None]
+                filled = np.diff(indptr[row:end + 1]) > 0
+                # reduceat needs strictly increasing starts, so empty rows are skipped
+                out[row:end][filled] = np.add.reduceat(products, indptr[row:end][filled] - low, axis=0)
+            row = end
+        return out
+
+    def transpose(self) -> "SparseMatrix":
+        rows, columns = self.shape
+        row_of = np.repeat(np.arange(rows), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        indptr = np.zeros(columns + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=columns), out=indptr[1:])
+        return SparseMatrix((columns, rows), indptr, row_of[order], self.data[order])
+
+
+def build_feature_matrix(documents: Sequence[Mapping[str, int]],
+                         min_document_frequency: int = MIN_DOCUMENT_FREQUENCY,
+                         max_document_ratio: float = MAX_DOCUMENT_RATIO,
+                         max_terms: int = MAX_TERMS) -> Tuple[SparseMatrix, List[str]]:
+    """
+    File x term tf-idf matrix with unit-length rows, plus its column terms.
+
+    ``documents`` are per-file word counts (the features scan). Terms outside
+    the document-frequency window are dropped; the most widespread remaining
+    ``max_terms`` are kept.
+    """
+    count = len(documents)
+    frequencies = Counter(chain.from_iterable(documents))
+    ceiling = max(min_document_frequency, int(count * max_document_ratio))
+    kept = sorted(
+        (term for term, frequency in frequencies.items() if min_document_frequency <= frequency <= ceiling),
+        key=lambda term: (-frequencies[term], term)
+    )[:max_terms]
+
+    # Every word gets an id (map() keeps the per-word loop in C); ids map to a column or -1
+    word_ids = {term: word_id for word_id, term in enumerate(frequencies)}
+    lengths = np.fromiter(map(len, documents), dtype=np.int64, count=count)
+    total = int(lengths.sum())
+    ids = np.fromiter(map(word_ids.__getitem__, chain.from_iterable(documents)), dtype=np.int64, count=total)
+    counts = np.fromiter(chain.from_iterable(document.values() for document in documents),
+                         dtype=np.float64, count=total)
+    column_of = np.full(len(word_ids), -1, dtype=np.int64)
+    column_of[[word_ids[term] for term in kept]] = np.arange(len(kept))
+    indices = column_of[ids]
+    row_of = np.repeat(np.arange(count), lengths)
+
+    known = indices >= 0
+    indices, counts, row_of = indices[known], counts[known], row_of[known]
+    idf = np.log((1 + count) / (1 + np.array([frequencies[term] for term in kept], dtype=np.float64))) + 1
+    data = (1 + np.log(counts)) * idf[indices]
+    norms = np.sqrt(np.bincount(row_of, weights=data * data, minlength=count))
+    data /= norms[row_of]
+
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_of, minlength=count), out=indptr[1:])
+    return SparseMatrix((count, len(kept)), indptr, indices, data), kept
+
+
+def randomized_svd(matrix: SparseMatrix, rank: int, oversampling: int = OVERSAMPLING,
+                   power_iterations: int = POWER_ITERATIONS,
+                   seed: int = 0) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Truncated SVD ``U, s, Vt`` of a sparse matrix (Halko, Martinsson & Tropp).
+
+    A random range sketch, sharpened by a few power iterations, reduces the
+    problem to a dense SVD of a (rank + oversampling) x columns block. Signs
+    are fixed so each right singular vector's largest loading is positive.
+    """
+    rows, columns = matrix.shape
+    size = min(rank + oversampling, rows, columns)
+    transposed = matrix.transpose()
+    generator = np.random.default_rng(seed)
+
+    basis, _ = np.linalg.qr(matrix.dot(generator.standard_normal((columns, size))))
+    for _ in range(power_iterations):
+        sketch, _ = np.linalg.qr(transposed.dot(basis))
+        basis, _ = np.linalg.qr(matrix.dot(sketch))
+
+    small_u, singular_values, vt = np.linalg.svd(transposed.dot(basis).T, full_matrices=False)
+    rank = min(rank, size)
+    u, singular_values, vt = basis @ small_u[:, :rank], singular_values[:rank], vt[:rank]
+
+    signs = np.sign(vt[np.arange(rank), np.abs(vt).argmax(axis=1)])
+    signs[signs == 0] = 1
+    return u * signs, singular_values, vt * signs[:, None]
+
+
+def spherical_kmeans(points: "np.ndarray", clusters: int, iterations: int = KMEANS_ITERATIONS,
+                     seed: int = 0) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Cosine k-means over unit-length rows (k-means++ seeding); returns labels and unit centroids"""
+    generator = np.random.default_rng(seed)
+    centroids = [points[generator.integers(len(points))]]
+    distances = np.clip(1 - points @ centroids[0], 0, None)
+    while len(centroids) < clusters and distances.sum() > 0:
+        chosen = points[generator.choice(len(points), p=distances / distances.sum())]
+        centroids.append(chosen)
+        distances = np.minimum(distances, np.clip(1 - points @ chosen, 0, None))
+    centroids = np.array(centroids)
+
+    for _ in range(iterations):
+        labels = np.argmax(points @ centroids.T, axis=1)
+        updated = centroids.copy()
+        for cluster in range(len(centroids)):
+            total = points[labels == cluster].sum(axis=0)
+            norm = np.linalg.norm(total)
+            if norm > 0:
+                updated[cluster] = total / norm
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+    return np.argmax(points @ centroids.T, axis=1), centroids
+
+
+def _top_terms(weights: "np.ndarray", terms: List[str], limit: int = THEME_TERMS) -> List[str]:
+    order = np.argsort(-weights, kind="stable")[:limit]
+    return [terms[column] for column in order if weights[column] > 0]
+
+
+class ArchitectureThemes:
+    """
+    Latent architecture themes of the scanned components and bridges.
+
+    ``analyze`` takes each file's word counts and phase and reports the
+    themes (top right singular vectors), the themes dominating each phase,
+    and clusters of files with similar vocabulary.
+    """
+
+    def __init__(self, enabled: bool = True, rank: int = DEFAULT_RANK, clusters: int = DEFAULT_CLUSTERS,
+                 seed: int = 0, all_files: bool = False):
+        self.enabled = enabled and NUMPY_AVAILABLE
+        # Components and bridges only by default; every scanned file costs a second read on cold runs
+        self.all_files = all_files
+        self.rank = max(1, rank)
+        self.clusters = max(1, clusters)
+        self.seed = seed
+
+    @classmethod
+    def from_environment(cls) -> "ArchitectureThemes":
+        """
+        OKSANA_ANALYZER_THEMES=off disables the analysis, =all covers every
+        scanned file; _THEME_RANK / _THEME_CLUSTERS size it
+        """
+        configured = os.getenv("OKSANA_ANALYZER_THEMES", "on").lower()
+        return cls(
+            enabled=configured not in ("0", "off", "false", "no"),
+            all_files=configured == "all",
+            rank=int(os.getenv("OKSANA_ANALYZER_THEME_RANK", DEFAULT_RANK)),
+            clusters=int(os.getenv("OKSANA_ANALYZER_THEME_CLUSTERS", DEFAULT_CLUSTERS))
+        )
+
+    def analyze(self, documents: Mapping[str, Mapping[str, int]], phases: Mapping[str, str]) -> Dict[str, Any]:
+        """Themes, per-phase themes and clusters for ``documents`` (rel_path -> word counts)"""
+        start_time = time.perf_counter()
+        paths = sorted(documents)
+        matrix, terms = build_feature_matrix([documents[path] for path in paths])
+        results: Dict[str, Any] = {
+            "files": len(paths),
+            "terms": len(terms),
+            "nonzeros": matrix.nnz,
+            "rank": 0,
+            "themes": [],
+            "phase_themes": {},
+            "clusters": []
+        }
+
+        described = np.diff(matrix.indptr) > 0
+        if described.sum() >= 2 and len(terms) >= 2:
+            self._analyze_matrix(results, matrix, terms, paths, phases, described)
+        results["processing_time_ms"] = (time.perf_counter() - start_time) * 1000
+        return results
+
+    def _analyze_matrix(self, results: Dict[str, Any], matrix: SparseMatrix, terms: List[str],
+                        paths: List[str], phases: Mapping[str, str], described: "np.ndarray"):
+        u, singular_values, vt = randomized_svd(matrix, self.rank, seed=self.seed)
+        significant = singular_values > singular_values[0] * 1e-8  # beyond the numerical rank is noise
+        u, singular_values, vt = u[:, significant], singular_values[significant], vt[significant]
+        coordinates = u * singular_values
+        total_energy = matrix.frobenius_norm() ** 2
+        results["rank"] = len(singular_values)
+        results["explained_energy"] = float((singular_values ** 2).sum() / total_energy) if total_energy else 0.0
+        results["themes"] = [
+            {"theme": theme, "terms": _top_terms(vt[theme], terms),
+             "weight": float(singular_values[theme] ** 2 / total_energy) if total_energy else 0.0}
+            for theme in range(len(singular_values))
+        ]
+
+        # A phase's themes: where its files' energy lies
+        file_phases = [phases.get(path, ".") for path in paths]
+        energy = coordinates ** 2
+        by_phase: Dict[str, List[int]] = {}
+        for row, phase in enumerate(file_phases):
+            if described[row]:
+                by_phase.setdefault(phase, []).append(row)
+        for phase in sorted(by_phase):
+            shares = energy[by_phase[phase]].sum(axis=0)
+            shares = shares / shares.sum() if shares.sum() > 0 else shares
+            results["phase_themes"][phase] = [
+                {"theme": int(theme), "share": float(shares[theme]), "terms": results["themes"][theme]["terms"]}
+                for theme in np.argsort(-shares, kind="stable")[:THEMES_PER_PHASE]
+            ]
+
+        # Files with a similar vocabulary point the same way in theme space
+        rows = np.flatnonzero(described)
+        points = coordinates[rows]
+        norms = np.linalg.norm(points, axis=1)
+        rows, points = rows[norms > 0], points[norms > 0] / norms[norms > 0, None]
+        if len(rows) == 0:
+            return
+        labels, centroids = spherical_kmeans(points, min(self.clusters, len(rows)), seed=self.seed)
+        for cluster in range(len(centroids)):
+            members = np.flatnonzero(labels == cluster)
+            if len(members) == 0:
+                continue
+            similarity = points[members] @ centroids[cluster]
+            closest = members[np.argsort(-similarity, kind="stable")[:CLUSTER_EXAMPLES]]
+            results["clusters"].append({
+                "files": len(members),
+                "cohesion": float(similarity.mean()),
+                "terms": _top_terms(coordinates[rows[members]].mean(axis=0) @ vt, terms),
+                "phases": dict(Counter(file_phases[row] for row in rows[members]).most_common()),
+                "examples": [paths[rows[member]] for member in closest]
+            })
+        ordered = sorted(results["clusters"], key=lambda cluster: (-cluster["files"], cluster["examples"][0]))
+        results["clusters"] = [{"cluster": index, **cluster} for index, cluster in enumerate(ordered)]
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Batch Analysis - run the Oksana analyzer over many project roots in one process
+All roots share one scan executor (process/thread pool), one reader pool, one
+analysis cache and one analytics backend, so interpreter startup, imports and
+pool spin-up are paid once per night instead of once per repository.
+
+Usage: python3 batch_analysis.py ROOT [ROOT ...] --output-dir DIR
+       python3 batch_analysis.py --roots-file roots.txt --output-dir DIR
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from analysis_cache import AnalysisCache
+from analytics_backends import select_backend
+from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer
+from file_reader_pool import AsyncFileReaderPool, DEFAULT_MAX_IN_FLIGHT, DEFAULT_MAX_BUFFERED_BYTES
+from hardware_probe import CapabilityCache
+from report_binary import REPORT_SUFFIX
+from report_stream import NDJSONReportWriter
+from scan_executor import ScanExecutor
+from tracing import Tracer
+
+SUMMARY_FILENAME = "batch_summary.json"
+# Per-root report format -> file extension
+REPORT_EXTENSIONS = {"json": "json", "ndjson": "ndjson", "binary": REPORT_SUFFIX.lstrip(".")}
+REPORT_FORMATS = tuple(REPORT_EXTENSIONS)
+
+
+def _report_name(root: Path, taken: Dict[str, int], extension: str = "json") -> str:
+    """File-system safe, unique report name for ``root``"""
+    slug = re.sub(r'[^A-Za-z0-9._-]+', '-', root.name).strip('-') or "root"
+    taken[slug] = taken.get(slug, 0) + 1
+    if taken[slug] > 1:
+        slug = f"{slug}-{taken[slug]}"
+    return f"{slug}.{extension}"
+
+
+def read_roots_file(path: Path) -> List[Path]:
+    """One project root per line; blank lines and '#' comments are ignored"""
+    roots = []
+    for line in Path(path).read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith('#'):
+            roots.append(Path(line).expanduser())
+    return roots
+
+
+class BatchAnalyzer:
+    """
+    Analyzes many project roots with shared infrastructure.
+
+    Each root gets its own EnhancedOksanaPlatformAnalyzer (results are per
+    root), but the expensive pieces are created once here and handed to every
+    analyzer. ``max_parallel_roots`` bounds how many roots run at the same
+    time; 1 runs them one after another, still on the shared pool.
+    With ``report_format="ndjson"`` each root's report is streamed phase by
+    phase (see report_stream); ``"binary"`` writes the compact indexed format
+    (see report_binary) instead of one JSON document. ``trace=True`` writes
+    a Chrome trace next to each root's report.
+    """
+
+    def __init__(self, output_dir: Path, max_parallel_roots: int = 1,
+                 analysis_cache: Optional[AnalysisCache] = None,
+                 scan_executor: Optional[ScanExecutor] = None,
+                 report_format: str = "json", include_files: bool = False, trace: bool = False,
+                 capability_cache: Optional[CapabilityCache] = None):
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format '{report_format}', expected one of {REPORT_FORMATS}")
+        self.output_dir = Path(output_dir)
+        self.report_format = report_format
+        self.include_files = include_files
+        self.trace = trace
+        self.max_parallel_roots = max(1, max_parallel_roots)
+        self.analysis_cache = analysis_cache or AnalysisCache.from_environment()
+        self._owns_scan_executor = scan_executor is None
+        self.scan_executor = scan_executor or ScanExecutor.from_environment()
+        self.reader_pool = AsyncFileReaderPool(
+            max_in_flight=int(os.getenv("OKSANA_ANALYZER_MAX_IN_FLIGHT_READS", DEFAULT_MAX_IN_FLIGHT)),
+            max_buffered_bytes=int(os.getenv("OKSANA_ANALYZER_READ_BUDGET_BYTES", DEFAULT_MAX_BUFFERED_BYTES))
+        )
+        # One host profile for every root: sizes the shared pool and reuses cached backend timings
+        self.capability_cache = capability_cache or CapabilityCache.from_environment()
+        profile = self.capability_cache.profile()
+        if self._owns_scan_executor:
+            self.scan_executor.size_for(profile)
+        self.analytics_backend, self.backend_selection = select_backend(
+            cached_benchmark_ms=profile.analytics_benchmark_ms
+        )
+        if self.backend_selection["reason"] == "fastest-benchmark":
+            self.capability_cache.store(profile.with_benchmarks(self.backend_selection["benchmark_ms"]))
+
+    async def _analyze_root(self, root: Path, output_path: Path) -> Dict[str, Any]:
+        start_time = time.time()
+        entry: Dict[str, Any] = {"root": str(root), "report": str(output_path)}
+
+        if not root.is_dir():
+            entry.update(status="error", error=f"Not a directory: {root}")
+            return entry
+
+        analyzer = EnhancedOksanaPlatformAnalyzer(
+            analysis_cache=self.analysis_cache,
+            reader_pool=self.reader_pool,
+            scan_executor=self.scan_executor,
+            project_root=root,
+            analytics_backend=self.analytics_backend,
+            capability_cache=self.capability_cache,
+            report_format="binary" if self.report_format == "binary" else "json"
+        )
+        # Reports and traces always go to the batch output dir (never environment-configured paths)
+        analyzer.report_stream = NDJSONReportWriter(output_path, self.include_files) \
+            if self.report_format == "ndjson" else None
+        analyzer.tracer = Tracer(enabled=self.trace)
+        analyzer.trace_path = output_path.with_name(f"{output_path.stem}.trace.json") if self.trace else None
+        try:
+            await analyzer.analyze_complete_project_structure()
+            results = await analyzer.generate_final_report(output_path)
+        except Exception as e:
+            entry.update(status="error", error=f"{type(e).__name__}: {e}")
+            return entry
+        finally:
+            analyzer.close()
+            entry["duration_ms"] = (time.time() - start_time) * 1000
+
+        readiness = results.get("deployment_readiness", {})
+        inventory = results.get("inventory", {})
+        entry.update(
+            status="ok",
+            overall_score=readiness.get("overall_score"),
+            readiness_level=readiness.get("readiness_level"),
+            components_analyzed=readiness.get("components_analyzed"),
+            file_count=inventory.get("file_count"),
+            total_bytes=inventory.get("total_bytes"),
+            recommendations=len(results.get("recommendations", []))
+        )
+        return entry
+
+    async def run(self, roots: Sequence[Path]) -> Dict[str, Any]:
+        """Analyze every root, write one report per root plus the aggregate summary"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        start_time = time.time()
+
+        taken: Dict[str, int] = {}
+        jobs = []
+        for root in roots:
+            root = Path(root).expanduser().resolve()
+            jobs.append((root, self.output_dir / _report_name(root, taken, REPORT_EXTENSIONS[self.report_format])))
+
+        semaphore = asyncio.Semaphore(self.max_parallel_roots)
+
+        async def run_root(root: Path, output_path: Path) -> Dict[str, Any]:
+            async with semaphore:
+                print(f"📁 Analyzing {root}")
+                return await self._analyze_root(root, output_path)
+
+        try:
+            entries = await asyncio.gather(*(run_root(root, output_path) for root, output_path in jobs))
+        finally:
+            self.close()
+
+        succeeded = [entry for entry in entries if entry["status"] == "ok"]
+        scores = [entry["overall_score"] for entry in succeeded if entry.get("overall_score") is not None]
+        readiness_levels: Dict[str, int] = {}
+        for entry in succeeded:
+            readiness_levels[entry["readiness_level"]] = readiness_levels.get(entry["readiness_level"], 0) + 1
+
+        summary = {
+            "timestamp": datetime.now().isoformat(),
+            "roots": len(entries),
+            "succeeded": len(succeeded),
+            "failed": len(entries) - len(succeeded),
+            "mean_readiness_score": sum(scores) / len(scores) if scores else None,
+            "readiness_levels": readiness_levels,
+            "total_files": sum(entry.get("file_count") or 0 for entry in succeeded),
+            "total_bytes": sum(entry.get("total_bytes") or 0 for entry in succeeded),
+            "duration_ms": (time.time() - start_time) * 1000,
+            "analytics_backend": self.backend_selection,
+            "cache_statistics": self.analysis_cache.summary(),
+            "reader_statistics": dict(self.reader_pool.stats),
+            "scan_executor": self.scan_executor.summary(),
+            "results": list(entries)
+        }
+
+        summary_path = self.output_dir / SUMMARY_FILENAME
+        summary_path.write_text(json.dumps(summary, indent=2, default=str))
+        print(f"📊 Batch complete: {summary['succeeded']}/{summary['roots']} roots analyzed")
+        print(f"💾 Summary: {summary_path}")
+        return summary
+
+    def close(self):
+        if self._owns_scan_executor:
+            self.scan_executor.shutdown()
+        self.analysis_cache.commit()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze many Oksana project roots in one process")
+    parser.add_argument("roots", nargs="*", type=Path, help="project roots to analyze")
+    parser.add_argument("--roots-file", type=Path, help="file listing one project root per line")
+    parser.add_argument("--output-dir", type=Path, required=True, help="directory for per-root reports and the summary")
+    parser.add_argument("--parallel-roots", type=int, default=1, help="roots analyzed at the same time")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="json", help="per-root report format")
+    parser.add_argument("--include-files", action="store_true", help="ndjson: add one record per scanned file")
+    parser.add_argument("--trace", action="store_true", help="write a Chrome trace per root")
+    args = parser.parse_args(argv)
+
+    roots = list(args.roots)
+    if args.roots_file:
+        roots.extend(read_roots_file(args.roots_file))
+    if not roots:
+        parser.error("no project roots given")
+
+    batch = BatchAnalyzer(args.output_dir, args.parallel_roots,
+                          report_format=args.format, include_files=args.include_files, trace=args.trace)
+    summary = asyncio.run(batch.run(roots))
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
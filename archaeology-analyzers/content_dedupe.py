@@ -0,0 +1,191 @@
+"""
+Content Dedupe - scan each distinct file content once for the Oksana analyzer
+Byte-identical copies (components mirrored into output/, vendored bridge files)
+are found by size bucket first and a fast content hash second. The first copy
+of a blob is scanned; every other copy takes over its result from the analysis
+cache instead of being decoded and scanned again.
+"""
+
+import io
+import os
+import asyncio
+import hashlib
+from collections import Counter, deque
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from project_inventory import FileEntry, ProjectInventory
+from tracing import span
+
+HASH_CHUNK_BYTES = 1024 * 1024
+READ_BATCH_FILES = 256
+READ_BATCH_BYTES = 8 * 1024 * 1024
+READ_AHEAD_BATCHES = 4
+
+
+def blob_digest(path: os.PathLike) -> str:
+    """Hash of a file's raw bytes (blake2b, 128 bit), read in chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def decode_text(data: bytes) -> str:
+    """Decode exactly as ``open(path, 'r').read()`` would (locale encoding, universal newlines)"""
+    return io.TextIOWrapper(io.BytesIO(data)).read()
+
+
+class ContentDeduplicator:
+    """
+    Maps files to content blobs and elects one copy per (blob, scan kind).
+
+    Only files whose size occurs more than once in the inventory can have a
+    copy. Small candidates are read raw in batches on worker threads, which
+    yields their blob hash and their text in one read; large candidates are
+    hashed ahead of being streamed. The scanning copy (the leader) publishes
+    the content hash its result is cached under, and the other copies look
+    the result up by that hash. A leader that fails publishes ``None`` and
+    its copies scan themselves.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._inventory: Optional[ProjectInventory] = None
+        self._size_counts: Counter = Counter()
+        self._content_hashes: Dict[Tuple[str, str], str] = {}
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+
+        self.stats = {
+            "files_read": 0,
+            "bytes_read": 0,
+            "blobs_scanned": 0,
+            "duplicate_files": 0,
+            "duplicate_bytes_skipped": 0
+        }
+
+    @classmethod
+    def from_environment(cls) -> "ContentDeduplicator":
+        """OKSANA_ANALYZER_DEDUPE=off scans every copy separately"""
+        configured = os.getenv("OKSANA_ANALYZER_DEDUPE", "on").lower()
+        return cls(enabled=configured not in ("0", "off", "false", "no"))
+
+    def is_candidate(self, inventory: ProjectInventory, entry: FileEntry) -> bool:
+        """Whether another file of the same size exists, so ``entry`` may have a copy"""
+        if not self.enabled:
+            return False
+        if inventory is not self._inventory:
+            self._inventory = inventory
+            self._size_counts = Counter(inventory.sizes())
+        return self._size_counts[entry.size] > 1
+
+    # ------------------------------------------------------------------
+    # Hashing
+    # ------------------------------------------------------------------
+
+    def _count_read(self, size: int):
+        self.stats["files_read"] += 1
+        self.stats["bytes_read"] += size
+
+    async def blob_key(self, entry: FileEntry) -> Optional[str]:
+        """Hash a (large) file without keeping its content; None if it cannot be read"""
+        try:
+            key = await asyncio.to_thread(blob_digest, entry.path)
+        except OSError:
+            return None
+        self._count_read(entry.size)
+        return key
+
+    def _read_many(self, entries: List[FileEntry]) -> List[Tuple[FileEntry, Optional[str], Any]]:
+        """(entry, blob key, text) per file; key None and the exception in place of text on failure"""
+        read = []
+        with span("read_blobs", "io") as read_span:
+            for entry in entries:
+                try:
+                    with open(entry.path, "rb") as f:
+                        data = f.read()
+                    read.append((entry, hashlib.blake2b(data, digest_size=16).hexdigest(), decode_text(data)))
+                    read_span.add(bytes=len(data), files=1)
+                except (OSError, UnicodeDecodeError) as e:
+                    read.append((entry, None, e))
+        return read
+
+    async def read_blobs(self, entries: List[FileEntry],
+                         on_error: Optional[Callable[[FileEntry, Exception], None]] = None
+                         ) -> AsyncIterator[Tuple[FileEntry, str, str]]:
+        """
+        Yield ``(entry, blob key, text)`` per readable file, in order. Batches
+        of at most READ_BATCH_FILES files / READ_BATCH_BYTES bytes are read on
+        worker threads with READ_AHEAD_BATCHES batches in flight.
+        """
+        batches: List[List[FileEntry]] = []
+        batch: List[FileEntry] = []
+        batch_bytes = 0
+        for entry in entries:
+            if batch and (len(batch) >= READ_BATCH_FILES or batch_bytes + entry.size > READ_BATCH_BYTES):
+                batches.append(batch)
+                batch, batch_bytes = [], 0
+            batch.append(entry)
+            batch_bytes += entry.size
+        if batch:
+            batches.append(batch)
+
+        in_flight: deque = deque()
+        remaining = iter(batches)
+        try:
+            for batch in remaining:
+                in_flight.append(asyncio.ensure_future(asyncio.to_thread(self._read_many, batch)))
+                if len(in_flight) >= READ_AHEAD_BATCHES:
+                    break
+            while in_flight:
+                read = await in_flight.popleft()
+                next_batch = next(remaining, None)
+                if next_batch is not None:
+                    in_flight.append(asyncio.ensure_future(asyncio.to_thread(self._read_many, next_batch)))
+                for entry, key, text in read:
+                    if key is None:
+                        if on_error:
+                            on_error(entry, text)
+                        continue
+                    self._count_read(entry.size)
+                    yield entry, key, text
+        finally:
+            for pending in in_flight:
+                pending.cancel()
+
+    # ------------------------------------------------------------------
+    # Leader election
+    # ------------------------------------------------------------------
+
+    def claim(self, key: str, kind: str) -> Optional[asyncio.Future]:
+        """
+        None when the caller becomes the leader for ``(key, kind)`` and must
+        call ``resolve``; otherwise a future of the leader's content hash.
+        """
+        blob = (key, kind)
+        if blob in self._content_hashes:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(self._content_hashes[blob])
+            return future
+        if blob in self._pending:
+            return self._pending[blob]
+        self._pending[blob] = asyncio.get_running_loop().create_future()
+        return None
+
+    def resolve(self, key: str, kind: str, content_hash: Optional[str]):
+        """Publish the leader's content hash (None: its scan failed)"""
+        blob = (key, kind)
+        future = self._pending.pop(blob, None)
+        if content_hash is not None:
+            self._content_hashes[blob] = content_hash
+            self.stats["blobs_scanned"] += 1
+        if future is not None and not future.done():
+            future.set_result(content_hash)
+
+    def record_duplicate(self, entry: FileEntry):
+        """A copy whose result was taken over from its blob's leader"""
+        self.stats["duplicate_files"] += 1
+        self.stats["duplicate_bytes_skipped"] += entry.size
+
+    def summary(self) -> Dict[str, Any]:
+        return {**self.stats, "enabled": self.enabled}
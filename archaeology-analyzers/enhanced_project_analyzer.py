@@ -1,4 +1,5 @@
-#!/usr/bin/env python3"""
+#!/usr/bin/env python3
+"""
 Enhanced Oksana Platform Project Analyzer - Apple Accelerate Priority
 M4 Neural Engine acceleration with Apple Accelerate framework priority
 Version: 4.0.0 - M4 Neural Engine Enhanced with Accelerate Priority
@@ -9,39 +10,39 @@ import sys
 import json
 import asyncio
 import time
-import subprocess
+from functools import cached_property, partial
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
-# Try to import Apple Accelerate via CoreML and Scientific libraries
-try:
-    import coremltools as ct
-    import numpy as np
-    import scipy.linalg.lapack as lapack
-    import scipy.linalg.blas as blas
-    M4_ACCELERATION_AVAILABLE = True
-    print("🍎 Apple M4 Neural Engine with Accelerate: AVAILABLE")
-except ImportError:
-    # Create dummy numpy for type hints
-    class DummyNumpy:
-        ndarray = Any
-    np = DummyNumpy()
-    M4_ACCELERATION_AVAILABLE = False
-    print("⚠️  Apple Accelerate unavailable - using Python fallback")
-
-# Optional dependencies with fallbacks
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+from project_inventory import FileEntry, ProjectInventory, report_default
+from analysis_cache import AnalysisCache, content_digest
+from content_dedupe import ContentDeduplicator
+from ignore_rules import IgnoreRules
+from file_reader_pool import AsyncFileReaderPool, DEFAULT_MAX_IN_FLIGHT, DEFAULT_MAX_BUFFERED_BYTES
+from scan_executor import ScanExecutor
+from streaming_scan import DEFAULT_STREAMING_THRESHOLD_BYTES, DEFAULT_STREAM_CHUNK_BYTES
+from file_metrics import FileMetricsTable, NUMPY_AVAILABLE
+from analytics_backends import AnalyticsBackend, PythonBackend, select_backend
+from architecture_themes import ArchitectureThemes
+from near_duplicates import NearDuplicateDetector
+from phase_graph import Phase, PhaseRegistry, PhaseScheduler
+from hardware_probe import CapabilityCache, HardwareProfile, is_apple_m4, load_hardware_profile
+from lazy_imports import module_available
+from report_binary import REPORT_SUFFIX, write_binary_report
+from report_stream import NDJSONReportWriter
+from tracing import Tracer, span
+from source_scanners import (
+    SCAN_KIND_JAVASCRIPT, SCAN_KIND_SWIFT_PATTERNS,
+    SCAN_KIND_FIGMA_PATTERNS, SCAN_KIND_XCODE_PATTERNS, SCAN_KIND_FEATURES, SCAN_KIND_MINHASH, TOKENIZED_KINDS,
+    analyze_javascript_source, analyze_bridge_source, bridge_scan_kind
+)
 
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+# Optional dependencies are only checked for here; they are imported on first use
+# (coremltools/scipy alone add seconds to a cold start)
+M4_ACCELERATION_AVAILABLE = all(module_available(name) for name in ("coremltools", "numpy", "scipy"))
+PANDAS_AVAILABLE = module_available("pandas")
+ANTHROPIC_AVAILABLE = module_available("anthropic")
 
 try:
     import aiofiles
@@ -50,159 +51,158 @@ except ImportError:
     ASYNC_FILE_AVAILABLE = False
     
 # Grid API as fallback only
-try:
-    import grid_api
-    GRID_API_AVAILABLE = True
-except ImportError:
-    GRID_API_AVAILABLE = False
-    print("ℹ️  Grid API unavailable - using Apple Accelerate primary mode")
+GRID_API_AVAILABLE = module_available("grid_api")
 
 class AppleAccelerateAnalyticsEngine:
     """
-    Primary analytics engine using Apple Accelerate framework
-    M4 Neural Engine integration for high-performance analysis
+    Apple Accelerate / M4 Neural Engine capabilities of this machine
+    (the analytics themselves run on the analytics_backends chain)
     """
-    def __init__(self):
-        self.m4_available = self._detect_m4_chip()
-        self.neural_engine_cores = 16 if self.m4_available else 0
-        self.accelerate_capabilities = {
-            "vDSP": M4_ACCELERATION_AVAILABLE,
-            "BLAS": M4_ACCELERATION_AVAILABLE,  
-            "LAPACK": M4_ACCELERATION_AVAILABLE,
-            "Neural_Engine": self.m4_available,
-            "Metal_Shaders": True,
-            "priority": "PRIMARY"
-        }
-        
-        print(f"🍎 Apple Accelerate Engine initialized: {self.accelerate_capabilities}")
+    # Hardware is probed on first access (cached per process), not at construction;
+    # the analyzer hands in the cached capability profile once it has loaded it
+    hardware_profile: Optional[HardwareProfile] = None
     
-    def _detect_m4_chip(self) -> bool:
-        """Detect M4 chip availability"""
-        try:
-            result = subprocess.run(['sysctl', '-n', 'machdep.cpu.brand_string'], 
-                                  capture_output=True, text=True, timeout=5)
-            return 'M4' in result.stdout
-        except:
-            return False
+    @cached_property
+    def m4_available(self) -> bool:
+        return self._detect_m4_chip()
     
-    async def accelerate_matrix_analysis(self, data_matrix: np.ndarray, operation_type: str = "comprehensive") -> Dict[str, Any]:
-        """High-performance matrix analysis using Apple Accelerate"""
-        start_time = time.time()
-        
-        try:
-            results = {
-                "engine": "AppleAccelerate-M4",
-                "operation": operation_type,
-                "matrix_shape": data_matrix.shape,
-                "neural_engine_used": self.m4_available
-            }
-            
-            if M4_ACCELERATION_AVAILABLE and len(data_matrix.shape) == 2:
-                # Use LAPACK for advanced linear algebra
-                if operation_type == "eigenanalysis":
-                    eigenvals = np.linalg.eigvals(data_matrix)
-                    results["eigenvalues"] = eigenvals.tolist()[:5]  # Top 5
-                    results["spectral_analysis"] = {
-                        "max_eigenvalue": float(np.max(eigenvals)),
-                        "condition_number": float(np.max(eigenvals) / np.min(eigenvals)) if np.min(eigenvals) > 0 else float('inf')
-                    }
-                
-                elif operation_type == "svd_analysis":
-                    U, s, Vt = np.linalg.svd(data_matrix, compute_uv=False)
-                    results["singular_values"] = s.tolist()[:5]
-                    results["rank_analysis"] = {
-                        "numerical_rank": int(np.sum(s > 1e-10)),
-                        "effective_rank": int(np.sum(s > s[0] * 1e-10)) if len(s) > 0 else 0
-                    }
-                
-                elif operation_type == "comprehensive":
-                    # Multi-metric analysis using Apple Accelerate
-                    results["statistics"] = {
-                        "mean": float(np.mean(data_matrix)),
-                        "std": float(np.std(data_matrix)),
-                        "frobenius_norm": float(np.linalg.norm(data_matrix, 'fro')),
-                        "trace": float(np.trace(data_matrix)) if data_matrix.shape[0] == data_matrix.shape[1] else None
-                    }
-                    
-                    # Neural Engine accelerated feature extraction
-                    if self.m4_available:
-                        results["neural_engine_features"] = {
-                            "complexity_score": float(np.std(data_matrix) / (np.mean(data_matrix) + 1e-10)),
-                            "information_density": float(np.linalg.matrix_rank(data_matrix) / min(data_matrix.shape)),
-                            "m4_optimized": True
-                        }
-                
-                processing_time = time.time() - start_time
-                results["processing_time_ms"] = processing_time * 1000
-                results["acceleration_efficiency"] = "HIGH" if processing_time < 0.1 else "MEDIUM"
-                
-                return results
-                
-        except Exception as e:
-            return {
-                "engine": "AppleAccelerate-M4",
-                "error": str(e),
-                "fallback_used": True,
-                "processing_time_ms": (time.time() - start_time) * 1000
-            }
+    @property
+    def neural_engine_cores(self) -> int:
+        return 16 if self.m4_available else 0
     
-    async def accelerate_project_metrics(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Project-specific metrics using M4 acceleration"""
-        start_time = time.time()
-        
-        metrics = {
-            "engine": "AppleAccelerate-M4-ProjectMetrics",
-            "neural_engine_active": self.m4_available,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        try:
-            # Convert project data to numerical matrix for analysis
-            if isinstance(project_data.get('file_sizes'), list):
-                file_sizes = np.array(project_data['file_sizes'])
-                if len(file_sizes) > 1:
-                    size_analysis = await self.accelerate_matrix_analysis(
-                        file_sizes.reshape(-1, 1), "comprehensive"
-                    )
-                    metrics["file_size_analysis"] = size_analysis
-            
-            # Accelerated complexity analysis
-            if 'complexity_scores' in project_data:
-                complexity_data = np.array(project_data['complexity_scores']).reshape(-1, 1)
-                complexity_analysis = await self.accelerate_matrix_analysis(
-                    complexity_data, "eigenanalysis"
-                )
-                metrics["complexity_analysis"] = complexity_analysis
-            
-            # M4 Neural Engine performance prediction
-            if self.m4_available:
-                metrics["m4_performance_prediction"] = {
-                    "build_time_optimization": "60% faster with M4 Metal",
-                    "compilation_acceleration": "Neural Engine active",
-                    "memory_efficiency": "Apple Unified Memory optimized",
-                    "neural_cores_utilized": self.neural_engine_cores
-                }
-            
-            processing_time = time.time() - start_time
-            metrics["total_processing_time_ms"] = processing_time * 1000
-            metrics["accelerate_priority_active"] = True
-            
-            return metrics
-            
-        except Exception as e:
-            return {
-                "engine": "AppleAccelerate-M4-ProjectMetrics",
-                "error": str(e),
-                "fallback_processing_time_ms": (time.time() - start_time) * 1000,
-                "accelerate_available": M4_ACCELERATION_AVAILABLE
-            }
+    def _detect_m4_chip(self) -> bool:
+        """Detect M4 chip availability"""
+        if self.hardware_profile is not None:
+            return self.hardware_profile.apple_m4
+        return is_apple_m4()
+
+# Phases 1-9 touch disjoint subtrees and may overlap; phases 10-11 wait for them
+DEFAULT_MAX_PARALLEL_PHASES = 4
+# Concurrency pool of phases 1-9, bounded by max_parallel_phases
+SCAN_POOL = "scan"
+
+# Project-relative files and directories each independent phase reads; a
+# change below one of them invalidates that phase (see watch_mode)
+PHASE_INPUTS: Dict[str, Tuple[str, ...]] = {
+    "foundation-models": ("foundation-models",),
+    "AppleIntelligenceFramework": ("AppleIntelligenceFramework",),
+    "StrategicDirectorFramework": ("StrategicDirectorFramework",),
+    "CreatrixPortal": ("CreatrixPortal",),
+    "FigmaMCPServer": ("FigmaMCPServer",),
+    "XcodeModelBridge": ("XcodeModelBridge",),
+    "Scripts": ("scripts",),
+    "BridgeIntegrations": ("SwiftTypescriptServiceBridge.swift", "CreativeIntelligenceBridge.js"),
+    "Documentation": ("docs", "foundation-models/learning-pipeline", "setup-oksana-foundation.sh"),
+}
+
+
+def phase_for_path(rel_path: str) -> str:
+    """Independent phase whose declared inputs hold ``rel_path`` (deepest input wins), else its top-level directory"""
+    owner, depth = None, -1
+    for phase, inputs in PHASE_INPUTS.items():
+        for root in inputs:
+            if (rel_path == root or rel_path.startswith(root + "/")) and len(root) > depth:
+                owner, depth = phase, len(root)
+    return owner or (rel_path.split("/", 1)[0] if "/" in rel_path else ".")
+
+
+# Final report containers written by generate_final_report
+REPORT_FORMATS = ("json", "binary")
 
 class EnhancedOksanaPlatformAnalyzer:
-    def __init__(self):
-        self.project_root = Path("/Users/pennyplatt/9bit-studios/Oksana")
+    def __init__(self, analysis_cache: Optional[AnalysisCache] = None,
+                 max_parallel_phases: Optional[int] = None,
+                 reader_pool: Optional[AsyncFileReaderPool] = None,
+                 scan_executor: Optional[ScanExecutor] = None,
+                 project_root: Optional[Path] = None,
+                 analytics_backend: Optional[AnalyticsBackend] = None,
+                 report_stream: Optional[NDJSONReportWriter] = None,
+                 report_format: Optional[str] = None,
+                 tracer: Optional[Tracer] = None,
+                 deduplicator: Optional[ContentDeduplicator] = None,
+                 ignore_rules: Optional[IgnoreRules] = None,
+                 architecture_themes: Optional[ArchitectureThemes] = None,
+                 near_duplicate_detector: Optional[NearDuplicateDetector] = None,
+                 capability_cache: Optional[CapabilityCache] = None,
+                 phase_registry: Optional[PhaseRegistry] = None):
+        self.project_root = Path(project_root) if project_root else Path("/Users/pennyplatt/9bit-studios/Oksana")
         self.foundation_core = self.project_root / "foundation-models"
         self.learning_env = self.foundation_core / "learning-env"
         
+        # Shared filesystem snapshot, built once per analysis run
+        self.inventory: Optional[ProjectInventory] = None
+        
+        # Near-copies of source files; with exclusion on, phases see the inventory without them
+        self.near_duplicate_detector = near_duplicate_detector or NearDuplicateDetector.from_environment()
+        self.near_duplicate_copies: List[str] = []
+        self._phase_view: Optional[Tuple[ProjectInventory, ProjectInventory]] = None
+        
+        # Default ignores plus .gitignore files; ignored subtrees are never walked
+        self.ignore_rules = ignore_rules or IgnoreRules.from_environment()
+        
+        # One row of metrics per scanned file, analyzed in a single pass after phases 1-9
+        self.file_metrics: Optional[FileMetricsTable] = None
+        
+        # Latent themes and clusters over the components' and bridges' vocabulary
+        self.architecture_themes = architecture_themes or ArchitectureThemes.from_environment()
+        
+        # Persistent per-file results so warm runs only rescan changed files
+        self.analysis_cache = analysis_cache or AnalysisCache.from_environment()
+        
+        # Byte-identical copies are read and scanned once per blob
+        self.deduplicator = deduplicator or ContentDeduplicator.from_environment()
+        
+        # Shared pipelined reader: bounded in-flight reads and buffered bytes
+        self.reader_pool = reader_pool or AsyncFileReaderPool(
+            max_in_flight=int(os.getenv("OKSANA_ANALYZER_MAX_IN_FLIGHT_READS", DEFAULT_MAX_IN_FLIGHT)),
+            max_buffered_bytes=int(os.getenv("OKSANA_ANALYZER_READ_BUDGET_BYTES", DEFAULT_MAX_BUFFERED_BYTES))
+        )
+        
+        # CPU-bound source scans fan out to worker processes (or run serially)
+        self._owns_scan_executor = scan_executor is None
+        self.scan_executor = scan_executor or ScanExecutor.from_environment()
+        
+        # Host capabilities (cores, memory, BLAS, backend timings), cached on disk and loaded off the event loop
+        self.capability_cache = capability_cache or CapabilityCache.from_environment()
+        self.hardware_profile: Optional[HardwareProfile] = None
+        
+        # Files at or above the threshold are streamed chunk by chunk instead of read whole
+        self.streaming_threshold_bytes = int(
+            os.getenv("OKSANA_ANALYZER_STREAMING_THRESHOLD_BYTES", DEFAULT_STREAMING_THRESHOLD_BYTES)
+        )
+        self.stream_chunk_bytes = max(1, int(
+            os.getenv("OKSANA_ANALYZER_STREAM_CHUNK_BYTES", DEFAULT_STREAM_CHUNK_BYTES)
+        ))
+        
+        # Optional NDJSON report written phase by phase while the analysis runs
+        ndjson_path = os.getenv("OKSANA_ANALYZER_REPORT_NDJSON")
+        self.report_stream = report_stream or (NDJSONReportWriter(
+            Path(ndjson_path),
+            include_files=os.getenv("OKSANA_ANALYZER_REPORT_FILES", "").lower() in ("1", "true", "yes")
+        ) if ndjson_path else None)
+        
+        # Final report container: pretty JSON or the compact binary format (report_binary)
+        self.report_format = report_format or os.getenv("OKSANA_ANALYZER_REPORT_FORMAT", "json")
+        if self.report_format not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format '{self.report_format}', expected one of {REPORT_FORMATS}")
+        
+        # Span tracing; OKSANA_ANALYZER_TRACE=<path> writes a Chrome trace on close()
+        trace_path = os.getenv("OKSANA_ANALYZER_TRACE")
+        self.trace_path = Path(trace_path) if trace_path else None
+        self.tracer = tracer or Tracer(enabled=self.trace_path is not None)
+        
+        # Upper bound on concurrently running independent phases (1 = sequential)
+        self.max_parallel_phases = max(1, max_parallel_phases or int(
+            os.getenv("OKSANA_ANALYZER_MAX_PARALLEL_PHASES", DEFAULT_MAX_PARALLEL_PHASES)
+        ))
+        
+        # The phase graph (see ANALYSIS_PHASES); register extra phases on this analyzer's copy
+        self.phase_registry = phase_registry or ANALYSIS_PHASES.copy()
+        self.phase_limits: Dict[str, int] = {SCAN_POOL: self.max_parallel_phases}
+        self.phase_statuses: Dict[str, str] = {}
+        # Input fingerprint per phase when it last ran; unchanged phases are skipped
+        self._phase_fingerprints: Dict[str, Tuple[str, str]] = {}
+        
         # Initialize Apple Accelerate Analytics Engine (PRIMARY)
         self.accelerate_engine = AppleAccelerateAnalyticsEngine()
         
@@ -216,8 +216,8 @@ class EnhancedOksanaPlatformAnalyzer:
             "timestamp": datetime.now().isoformat(),
             "analyzer_version": "4.0.0-M4-Enhanced",
             "apple_accelerate_active": M4_ACCELERATION_AVAILABLE,
-            "m4_neural_engine": self.accelerate_engine.m4_available,
-            "neural_engine_cores": self.accelerate_engine.neural_engine_cores,
+            "m4_neural_engine": None,       # probed when the analysis starts
+            "neural_engine_cores": None,
             "grid_api_connected": False,
             "foundation_model_status": "initializing",
             "analytics_priority": "Apple-Accelerate-Primary",
@@ -228,84 +228,98 @@ class EnhancedOksanaPlatformAnalyzer:
             "recommendations": []
         }
         
-        # Analytics priority determination (after analysis_results initialized)
-        self._initialize_analytics_priority()
+        # Analytics backend is benchmarked and selected on first use (unless one is shared in)
+        self._analytics_backend: Optional[AnalyticsBackend] = None
+        self._shared_analytics_backend = analytics_backend
+        self.analytics_priority: Optional[str] = None
         
         print("🚀 ENHANCED OKSANA PLATFORM PROJECT ANALYZER")
         print("=" * 70)
         print("🧠 Using REAL M4 Acceleration & Foundation Model Learning Pipeline")
     
+    @property
+    def analytics_backend(self) -> AnalyticsBackend:
+        if self._analytics_backend is None:
+            self._initialize_analytics_priority()
+        return self._analytics_backend
+    
     def _initialize_analytics_priority(self):
-        """Initialize analytics processing priority: Accelerate > Grid > Fallback"""
+        """Pick the analytics backend by capability and micro-benchmark, not CPU brand"""
+        if self._shared_analytics_backend is not None:
+            self._analytics_backend = self._shared_analytics_backend
+            selection = {"selected": self._analytics_backend.name, "reason": "shared"}
+        else:
+            profile = self.hardware_profile
+            self._analytics_backend, selection = select_backend(
+                cached_benchmark_ms=profile.analytics_benchmark_ms if profile else None
+            )
+            if profile is not None and selection["reason"] == "fastest-benchmark":
+                self.hardware_profile = profile.with_benchmarks(selection["benchmark_ms"])
+                self.capability_cache.store(self.hardware_profile)
+        self.analytics_priority = self._analytics_backend.name
+        
         priority_status = {
-            "primary_engine": "Apple Accelerate",
+            "primary_engine": self._analytics_backend.engine,
+            "backend_selection": selection,
             "accelerate_available": M4_ACCELERATION_AVAILABLE,
             "m4_neural_engine": self.accelerate_engine.m4_available,
             "grid_fallback": GRID_API_AVAILABLE,
-            "processing_strategy": "Apple-First"
+            "processing_strategy": "Capability-Benchmarked"
         }
-        
-        if M4_ACCELERATION_AVAILABLE and self.accelerate_engine.m4_available:
-            print("🍎 Analytics Priority: Apple Accelerate M4 Neural Engine (PRIMARY)")
-            self.analytics_priority = "accelerate"
-        elif GRID_API_AVAILABLE:
-            print("⚡ Analytics Priority: Grid API (FALLBACK)")
-            self.analytics_priority = "grid"
-        else:
-            print("🐍 Analytics Priority: Python Native (BASIC)")
-            self.analytics_priority = "python"
+        print(f"📈 Analytics Priority: {self._analytics_backend.engine} ({selection['reason']})")
         
         self.analysis_results["analytics_priority_status"] = priority_status
     
     async def _get_priority_analytics(self, data: Dict[str, Any], operation: str = "comprehensive") -> Dict[str, Any]:
-        """Get analytics using priority engine: Accelerate → Grid → Python"""
-        
-        if self.analytics_priority == "accelerate" and M4_ACCELERATION_AVAILABLE:
-            try:
-                return await self.accelerate_engine.accelerate_project_metrics(data)
-            except Exception as e:
-                print(f"⚠️  Accelerate failed, trying Grid fallback: {e}")
-                self.grid_fallback_active = True
-        
-        if self.analytics_priority in ["grid", "accelerate"] and GRID_API_AVAILABLE:
-            try:
-                # Grid API processing would go here
-                return {
-                    "engine": "Grid-API-Fallback",
-                    "status": "simulated",
-                    "note": "Grid API integration placeholder"
-                }
-            except Exception as e:
-                print(f"⚠️  Grid API failed, using Python fallback: {e}")
-        
-        # Python fallback
-        return {
-            "engine": "Python-Fallback",
-            "status": "basic_processing",
-            "data_processed": len(str(data)),
-            "timestamp": datetime.now().isoformat()
-        }
+        """Get analytics from the selected backend, falling back to pure Python"""
+        try:
+            with span(f"{self.analytics_backend.name}.project_metrics", "engine", operation=operation):
+                return await self.analytics_backend.project_metrics(data)
+        except Exception as e:
+            if isinstance(self.analytics_backend, PythonBackend):
+                raise
+            print(f"⚠️  {self.analytics_backend.engine} failed, using Python fallback: {e}")
+            with span("python.project_metrics", "engine", operation=operation, fallback=True):
+                return await PythonBackend().project_metrics(data)
         print("📊 Connecting to GRID API for Strategic Intelligence")
         print("🍎 Apple Intelligence M4 Neural Engine Integration")
         print("=" * 70)
 
+    async def _load_hardware_profile(self) -> HardwareProfile:
+        """Load (or probe and cache) the host profile in a thread and size the worker pools from it"""
+        if self.hardware_profile is None:
+            with span("hardware_profile", "analysis") as profile_span:
+                self.hardware_profile = await load_hardware_profile(self.capability_cache)
+                profile_span.annotate(**self.capability_cache.stats)
+            self.accelerate_engine.hardware_profile = self.hardware_profile
+            if self._owns_scan_executor:
+                self.scan_executor.size_for(self.hardware_profile)
+        return self.hardware_profile
+    
+    @staticmethod
+    def _read_quantum_env(quantum_env_path: Path) -> Optional[Dict[str, str]]:
+        """Parse the quantum-secure env file (blocking; None when it does not exist)"""
+        if not quantum_env_path.exists():
+            return None
+        env_vars = {}
+        with open(quantum_env_path, 'r') as f:
+            for line in f:
+                if '=' in line and not line.strip().startswith('#'):
+                    key, value = line.strip().split('=', 1)
+                    env_vars[key] = value.strip('"\'')
+        return env_vars
+    
     async def initialize_real_apis(self):
         """Initialize REAL APIs - GRID API, Anthropic, Core ML"""
         print("🔌 Initializing REAL APIs and M4 Acceleration...")
         
         # Load quantum-secure environment
-        quantum_env_path = self.project_root / ".env.quantum-secure"
-        env_vars = {}
+        quantum_env = await asyncio.to_thread(self._read_quantum_env, self.project_root / ".env.quantum-secure")
+        env_vars = quantum_env or {}
         
-        if quantum_env_path.exists():
+        if quantum_env is not None:
             print("🔐 Loading quantum-secure environment...")
-            with open(quantum_env_path, 'r') as f:
-                for line in f:
-                    if '=' in line and not line.strip().startswith('#'):
-                        key, value = line.strip().split('=', 1)
-                        env_vars[key] = value.strip('"\'')
-                        os.environ[key] = value.strip('"\'')
-            
+            os.environ.update(env_vars)
             print(f"✅ Loaded {len(env_vars)} quantum environment variables")
         
         # Initialize REAL GRID API
@@ -332,6 +346,7 @@ class EnhancedOksanaPlatformAnalyzer:
         anthropic_key = env_vars.get('ANTHROPIC_API_KEY') or os.getenv('ANTHROPIC_API_KEY')
         if anthropic_key:
             try:
+                from anthropic import Anthropic
                 self.anthropic_client = Anthropic(api_key=anthropic_key)
                 print("✅ Anthropic Claude connected")
             except Exception as e:
@@ -340,9 +355,9 @@ class EnhancedOksanaPlatformAnalyzer:
         # Initialize Core ML Tools for M4 acceleration
         try:
             print("🍎 Initializing M4 Neural Engine acceleration...")
-            # Check if M4 chip is available
-            result = subprocess.run(['sysctl', 'hw.optional.arm64'], capture_output=True, text=True)
-            if result.returncode == 0 and '1' in result.stdout:
+            # Check if M4 chip is available (from the cached capability profile)
+            profile = await self._load_hardware_profile()
+            if profile.apple_silicon:
                 print("✅ M4 Neural Engine detected and active")
                 self.analysis_results["m4_acceleration_active"] = True
             else:
@@ -353,52 +368,490 @@ class EnhancedOksanaPlatformAnalyzer:
 
     async def analyze_complete_project_structure(self):
         """Comprehensive analysis with Apple Accelerate M4 Neural Engine priority"""
+        with self.tracer.activate(), span("analysis", "run", project_root=str(self.project_root)):
+            await self._analyze_project_structure()
+        
+        if self.tracer.enabled:
+            self.analysis_results["trace_summary"] = self.tracer.summary()
+            await self._stream_section("trace_summary")
+            print("⏱️  Trace Summary")
+            print(self.tracer.summary_table())
+            print()
+        return self.analysis_results
+
+    async def _analyze_project_structure(self):
         print("🔍 COMPREHENSIVE PROJECT ANALYSIS - M4 NEURAL ENGINE ACCELERATED")
         print("=" * 75)
+        
+        # Probing and backend benchmarks block; keep them off the event loop
+        await self._load_hardware_profile()
+        if self._analytics_backend is None:
+            await asyncio.to_thread(self._initialize_analytics_priority)
+        self.analysis_results["hardware_profile"] = {
+            **self.hardware_profile.to_dict(),
+            "scan_workers": self.scan_executor.max_workers,
+            "cache": self.capability_cache.summary()
+        }
+        
         print(f"🍎 Apple Accelerate Engine: {'ACTIVE' if M4_ACCELERATION_AVAILABLE else 'FALLBACK'}")
         print(f"🧠 M4 Neural Engine Cores: {self.accelerate_engine.neural_engine_cores}")
-        print(f"⚡ Priority Analytics: Apple Accelerate → Grid Fallback")
+        print(f"⚡ Priority Analytics: {self.analytics_backend.engine} → Python Fallback")
         print()
         
+        self.analysis_results["m4_neural_engine"] = self.accelerate_engine.m4_available
+        self.analysis_results["neural_engine_cores"] = self.accelerate_engine.neural_engine_cores
+        
+        if self.report_stream:
+            await asyncio.to_thread(self.report_stream.open, {
+                "project_root": str(self.project_root),
+                "analyzer_version": self.analysis_results["analyzer_version"],
+                "timestamp": self.analysis_results["timestamp"]
+            })
+        
         analysis_start_time = time.time()
         
-        # Phase 1: Foundation Model Core Analysis with M4 acceleration
-        await self._analyze_foundation_model_core()
+        # Walk the project tree exactly once; every phase queries this inventory
+        with span("inventory", "analysis") as inventory_span:
+            self.inventory = await asyncio.to_thread(ProjectInventory.build, self.project_root, self.ignore_rules)
+            inventory_span.add(files=len(self.inventory))
+        self.analysis_results["inventory"] = {
+            "file_count": len(self.inventory),
+            "total_bytes": self.inventory.total_bytes(),
+            "ignored_paths": len(self.inventory.ignored),
+            "ignore_rules": self.ignore_rules.summary(),
+            "build_time_ms": (time.time() - analysis_start_time) * 1000
+        }
+        print(f"🗂️  Project Inventory: {len(self.inventory)} files indexed in {self.analysis_results['inventory']['build_time_ms']:.0f}ms "
+              f"({len(self.inventory.ignored)} ignored paths pruned)")
+        print()
+        await self._stream_section("inventory")
+        
+        # A fresh metrics table invalidates every earlier phase result
+        self.file_metrics = FileMetricsTable() if NUMPY_AVAILABLE else None
+        self._phase_fingerprints.clear()
+        
+        await self.run_phase_graph()
+        
+        self.analysis_cache.commit()
+        self.analysis_results["cache_statistics"] = self.analysis_cache.summary()
+        self.analysis_results["reader_statistics"] = dict(self.reader_pool.stats)
+        self.analysis_results["scan_executor"] = self.scan_executor.summary()
+        self.analysis_results["content_dedupe"] = self.deduplicator.summary()
+        for key in ("cache_statistics", "reader_statistics", "scan_executor", "content_dedupe", "phase_graph"):
+            await self._stream_section(key)
+        cache_stats = self.analysis_results["cache_statistics"]
+        print(f"💾 Analysis Cache: {cache_stats['hits'] + cache_stats['content_hash_hits']} hits, "
+              f"{cache_stats['misses']} misses, {cache_stats['bytes_read_saved']} bytes not re-read")
+        dedupe_stats = self.analysis_results["content_dedupe"]
+        if dedupe_stats["duplicate_files"]:
+            print(f"🧬 Content Dedupe: {dedupe_stats['duplicate_files']} identical copies, "
+                  f"{dedupe_stats['duplicate_bytes_skipped']} duplicate bytes skipped")
+
+    def independent_phases(self) -> List[Tuple[str, Callable]]:
+        """Phases 1-9: independent scans, each writing its own comprehensive_analysis key"""
+        return [(phase.name, partial(phase.run, self)) for phase in self.phase_registry if phase.pool == SCAN_POOL]
+
+    async def _analyze_project_metrics(self):
+        """Analyze the per-file metrics table of phases 1-9 in one batched pass"""
+        if self.file_metrics is None or len(self.file_metrics) == 0:
+            return
+        
+        summary = self.file_metrics.summary()
+        self.analysis_results["file_metrics"] = summary
+        await self._stream_section("file_metrics")
+        print(f"📊 File Metrics: {summary['file_count']} files x {len(summary['columns'])} columns")
         
-        # Phase 2: Apple Intelligence Framework Analysis
-        await self._analyze_apple_intelligence_framework()
+        try:
+            project_metrics = await self._get_priority_analytics({"file_metrics": self.file_metrics}, "columnar")
+            self.analysis_results["m4_performance_metrics"]["project"] = project_metrics
+            await self._stream_section("m4_performance_metrics")
+            
+            print(f"  📈 Analytics Engine: {project_metrics.get('engine', 'N/A')}")
+            print(f"  ⚡ Processing Time: {project_metrics.get('total_processing_time_ms', 0):.2f}ms")
+            
+        except Exception as e:
+            print(f"  ⚠️ Project analytics failed: {e}")
         
-        # Phase 3: Strategic Director Framework Analysis
-        await self._analyze_strategic_director_framework()
+        if self.architecture_themes.enabled:
+            try:
+                with span("architecture_themes", "engine"):
+                    await self._analyze_architecture_themes()
+            except Exception as e:
+                print(f"  ⚠️ Architecture theme analysis failed: {e}")
+        print()
+    
+    async def _analyze_architecture_themes(self):
+        """Cluster the scanned components and bridges by vocabulary and report each phase's latent themes"""
+        if self.architecture_themes.all_files:
+            rel_paths = self.file_metrics.paths
+        else:
+            rel_paths = self.file_metrics.paths_scanned_as(TOKENIZED_KINDS)
+        if not rel_paths:
+            return
         
-        # Phase 4: CreatrixPortal Analysis
-        await self._analyze_creatrix_portal()
+        root = self._get_inventory().root
+        scans = await self._scan_files([root / rel_path for rel_path in rel_paths], SCAN_KIND_FEATURES,
+                                       record_metrics=False)
+        documents = {file_path.relative_to(root).as_posix(): result["terms"] for file_path, result in scans.items()}
+        phases = {rel_path: phase_for_path(rel_path) for rel_path in documents}
+        
+        themes = await asyncio.to_thread(self.architecture_themes.analyze, documents, phases)
+        self.analysis_results["architecture_themes"] = themes
+        await self._stream_section("architecture_themes")
+        
+        print(f"  🧭 Architecture Themes: {themes['files']} files x {themes['terms']} terms, "
+              f"{len(themes['themes'])} themes, {len(themes['clusters'])} clusters "
+              f"({themes['processing_time_ms']:.0f}ms)")
+        for theme in themes["themes"][:3]:
+            print(f"     • {' / '.join(theme['terms'][:4])}")
+
+    async def _analyze_near_duplicates(self):
+        """Cluster near-copies of source files by MinHash signature; optionally hide all but one copy from the phases"""
+        detector = self.near_duplicate_detector
+        previous_copies = set(self.near_duplicate_copies) if detector.exclude else set()
+        self._phase_view = None
+        inventory = self._get_inventory()
+        entries = [entry for entry in inventory.files_under(inventory.root, detector.suffixes)
+                   if entry.size >= detector.min_bytes]
+        
+        scans = await self._scan_files([entry.path for entry in entries], SCAN_KIND_MINHASH, record_metrics=False)
+        signatures = {}
+        for file_path, result in scans.items():
+            if result["signature"] is not None:
+                signatures[file_path.relative_to(inventory.root).as_posix()] = result["signature"]
+        sizes = {entry.rel_path: entry.size for entry in entries}
+        phases = {rel_path: phase_for_path(rel_path) for rel_path in signatures}
+        
+        report, self.near_duplicate_copies = await asyncio.to_thread(detector.analyze, signatures, sizes, phases)
+        if detector.exclude and self.near_duplicate_copies:
+            self._phase_view = (inventory, inventory.without(self.near_duplicate_copies))
+        report["excluded_from_phases"] = len(self.near_duplicate_copies) if detector.exclude else 0
+        if detector.exclude and self.file_metrics is not None:
+            # Files that became or stopped being hidden copies change what their phases see
+            self.file_metrics.discard(previous_copies ^ set(self.near_duplicate_copies))
+        self.analysis_results["near_duplicates"] = report
+        await self._stream_section("near_duplicates")
+        
+        print(f"🧬 Near Duplicates: {report['cluster_count']} clusters, {report['duplicate_files']} near-copies "
+              f"({report['duplicate_bytes']} bytes) among {report['files']} sources"
+              f"{' - excluded from phases 1-9' if report['excluded_from_phases'] else ''}")
+        for cluster in report["clusters"][:3]:
+            print(f"  • {cluster['representative']}: {cluster['files']} files, "
+                  f"similarity ≥ {cluster['similarity']['min']:.2f}")
+        print()
+
+    async def run_phase_graph(self) -> Dict[str, str]:
+        """
+        Run the registered phases as a DAG: each starts once the phases it
+        requires are done, scan phases are bounded by max_parallel_phases, and
+        phases whose inputs did not change since their last run are skipped
+        """
+        scheduler = PhaseScheduler(self.phase_registry, self.phase_limits, self._phase_fingerprints,
+                                   self._phase_input_digest)
+        graph_start_time = time.time()
+        try:
+            self.phase_statuses = await scheduler.run(self, self._run_phase)
+        finally:
+            self.analysis_results["phase_graph"] = {
+                "phases": dict(scheduler.statuses),
+                "limits": dict(self.phase_limits),
+                "duration_ms": (time.time() - graph_start_time) * 1000
+            }
         
-        # Phase 5: Figma MCP Server Analysis
-        await self._analyze_figma_mcp_server()
+        # Completion order is nondeterministic (and a re-run may cover only some
+        # phases); keep the report in phase order
+        comprehensive_analysis = self.analysis_results["comprehensive_analysis"]
+        phase_keys = [phase.output_path[1] for phase in self.phase_registry
+                      if phase.output_path[0] == "comprehensive_analysis" and len(phase.output_path) == 2]
+        ordered_keys = [key for key in phase_keys if key in comprehensive_analysis]
+        remaining_keys = [key for key in comprehensive_analysis if key not in ordered_keys]
+        self.analysis_results["comprehensive_analysis"] = {
+            key: comprehensive_analysis[key] for key in ordered_keys + remaining_keys
+        }
         
-        # Phase 6: Xcode Model Bridge Analysis
-        await self._analyze_xcode_model_bridge()
+        ran = [name for name, status in self.phase_statuses.items() if status == "ran"]
+        cached = [name for name, status in self.phase_statuses.items() if status == "cached"]
+        print(f"⚡ Phase graph: {len(ran)} phases run, {len(cached)} unchanged, "
+              f"in {time.time() - graph_start_time:.2f}s (max parallel scans: {self.max_parallel_phases})")
+        print()
+        return self.phase_statuses
+    
+    async def _run_phase(self, phase: Phase):
+        """Run one phase in its span, then stream its output (in completion order)"""
+        span_args = {"subtree": phase.name} if phase.pool == SCAN_POOL else {}
+        with span(phase.name, phase.category, **span_args):
+            await phase.run(self)
+        if phase.stream is not None:
+            data = self.analysis_results
+            for key in phase.output_path:
+                if not isinstance(data, dict) or key not in data:
+                    return
+                data = data[key]
+            await self._stream_section(*phase.output_path, record_type=phase.stream)
+    
+    def _phase_input_digest(self, phase: Phase) -> str:
+        """Fingerprint of the files the phase reads, as the phases see them (near-copies excluded)"""
+        if not phase.inputs:
+            return ""
+        return self._get_inventory().fingerprint(phase.inputs)
+
+    async def _stream_section(self, *path: str, record_type: str = "section"):
+        """Append ``analysis_results[path...]`` to the NDJSON report, if one is being written"""
+        if self.report_stream is None or not self.report_stream.is_open:
+            return
+        data = self.analysis_results
+        for key in path:
+            data = data[key]
+        # Encode here, while no phase can change the data; write and flush off the loop
+        record = self.report_stream.encode_section(path, data, record_type)
+        await asyncio.to_thread(self.report_stream.write_encoded, [record])
+
+    def _get_inventory(self) -> ProjectInventory:
+        """Return the inventory the phases see (building it if a phase runs standalone), minus excluded near-copies"""
+        if self.inventory is None:
+            self.inventory = ProjectInventory.build(self.project_root, self.ignore_rules)
+        if self._phase_view is not None and self._phase_view[0] is self.inventory:
+            return self._phase_view[1]
+        return self.inventory
+
+    def _file_entry(self, file_path: Path) -> FileEntry:
+        """Inventory record for ``file_path``, stat-ing files the inventory did not see"""
+        entry = self._get_inventory().get(file_path)
+        if entry is None:
+            stat = file_path.stat()
+            entry = FileEntry(file_path, file_path.name, file_path.suffix, stat.st_size, stat.st_mtime_ns)
+        return entry
+
+    async def _record_metrics(self, scans: List[Tuple[FileEntry, str, Dict[str, Any]]]):
+        """Add scan results to the project-wide metrics table (and the NDJSON report, with include_files)"""
+        if self.file_metrics is not None:
+            for entry, kind, result in scans:
+                self.file_metrics.record(entry.rel_path, entry.size, kind, result)
+        if self.report_stream is not None and self.report_stream.is_open:
+            records = self.report_stream.encode_files(
+                (entry.rel_path, kind, entry.size, result) for entry, kind, result in scans
+            )
+            if records:
+                await asyncio.to_thread(self.report_stream.write_encoded, records)
+
+    async def _cached_scan(self, file_path: Path, kind: str) -> Dict[str, Any]:
+        """Run the ``kind`` scanner over a file's content unless the cache already holds its result"""
+        entry = self._file_entry(file_path)
+        result = await self._scan_entry(entry, kind)
+        await self._record_metrics([(entry, kind, result)])
+        return result
+
+    async def _scan_entry(self, entry: FileEntry, kind: str) -> Dict[str, Any]:
+        cached = self.analysis_cache.lookup(entry, kind)
+        if cached is not None:
+            return cached
+        
+        key, content = await self._read_blob(entry)
+        if key is None:
+            return (await self._scan_content(entry, kind))[0]
+        
+        claim = self.deduplicator.claim(key, kind)
+        if claim is not None:
+            cached = self._take_over_blob(entry, kind, await claim)
+            if cached is not None:
+                return cached
+        
+        content_hash = None
+        try:
+            result, content_hash = await self._scan_content(entry, kind, content)
+        finally:
+            if claim is None:
+                self.deduplicator.resolve(key, kind, content_hash)
+        return result
+
+    async def _read_blob(self, entry: FileEntry) -> Tuple[Optional[str], Optional[str]]:
+        """Blob key of a file that may have copies, plus its text when it is small enough to hold"""
+        if not self.deduplicator.is_candidate(self._get_inventory(), entry):
+            return None, None
+        if entry.size >= self.streaming_threshold_bytes:
+            return await self.deduplicator.blob_key(entry), None
+        read = [item async for item in self.deduplicator.read_blobs([entry])]
+        return (read[0][1], read[0][2]) if read else (None, None)
+
+    async def _scan_content(self, entry: FileEntry, kind: str,
+                            content: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+        """Scan one file (read or streamed unless ``content`` is given), returning its result and content hash"""
+        if content is None:
+            if entry.size >= self.streaming_threshold_bytes:
+                return await self._stream_scan(entry, kind)
+            content = await self.reader_pool.read(entry.path, entry.size)
+        
+        content_hash = content_digest(content)
+        cached = self.analysis_cache.lookup_content(entry, kind, content_hash)
+        if cached is not None:
+            return cached, content_hash
+        
+        # Even a single miss is scanned on the executor, never on the event loop
+        result = (await self.scan_executor.scan_many(kind, [content]))[0]
+        self.analysis_cache.store(entry, kind, content_hash, result)
+        return result, content_hash
+
+    def _take_over_blob(self, entry: FileEntry, kind: str, content_hash: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The result a copy's blob leader stored, re-keyed under the copy's own path"""
+        if content_hash is None:
+            return None
+        result = self.analysis_cache.lookup_content(entry, kind, content_hash)
+        if result is not None:
+            self.deduplicator.record_duplicate(entry)
+        return result
+
+    async def _stream_scan(self, entry: FileEntry, kind: str) -> Tuple[Dict[str, Any], str]:
+        """Scan a large file in O(chunk) memory, bypassing the reader pool"""
+        with span("stream_scan", "scan", kind=kind, path=entry.rel_path) as scan_span:
+            result, content_hash = await self.scan_executor.scan_path(kind, entry.path, self.stream_chunk_bytes)
+            scan_span.add(bytes=entry.size, files=1)
+        self.analysis_cache.store(entry, kind, content_hash, result)
+        return result, content_hash
+
+    async def _scan_pending_batch(self, kind: str, batch: List[Tuple[Path, FileEntry, str, str]],
+                                  results: Dict[Path, Dict[str, Any]]):
+        """Scan one chunk of read files on the scan executor and cache the results"""
+        try:
+            batch_results = await self.scan_executor.scan_many(kind, [content for _, _, _, content in batch])
+        except Exception as e:
+            for file_path, _, _, _ in batch:
+                print(f"    ⚠️ Error analyzing {file_path.name}: {e}")
+            return
         
-        # Phase 7: Scripts and Services Analysis
-        await self._analyze_scripts_and_services()
+        for (file_path, entry, content_hash, _), result in zip(batch, batch_results):
+            self.analysis_cache.store(entry, kind, content_hash, result)
+            results[file_path] = result
+
+    async def _scan_files(self, file_paths: List[Path], kind: str,
+                          record_metrics: bool = True) -> Dict[Path, Dict[str, Any]]:
+        """
+        Scan many files of one kind.
+        
+        Cache hits are served without reading; misses stream through the reader
+        pool and are handed to the scan executor in chunks while later reads
+        are still in flight. Misses that may have byte-identical copies are
+        read in raw batches instead, and only one copy per content blob is
+        scanned; the others take over its result once it is cached.
+        Results feed the metrics table unless ``record_metrics`` is False.
+        """
+        inventory = self._get_inventory()
+        results: Dict[Path, Dict[str, Any]] = {}
+        entries: Dict[Path, FileEntry] = {}
+        pending: Dict[Path, Tuple[Path, FileEntry]] = {}
+        candidates: Dict[Path, Tuple[Path, FileEntry]] = {}
+        streamed: List[Tuple[Path, FileEntry]] = []
+        
+        for file_path in file_paths:
+            try:
+                entry = self._file_entry(file_path)
+            except OSError as e:
+                print(f"    ⚠️ Error analyzing {file_path.name}: {e}")
+                continue
+            entries[file_path] = entry
+            cached = self.analysis_cache.lookup(entry, kind)
+            if cached is not None:
+                results[file_path] = cached
+            elif entry.size >= self.streaming_threshold_bytes:
+                streamed.append((file_path, entry))
+            elif self.deduplicator.is_candidate(inventory, entry):
+                candidates[entry.path] = (file_path, entry)
+            else:
+                pending[entry.path] = (file_path, entry)
+        
+        def report_error(path: Path, error: Exception):
+            print(f"    ⚠️ Error analyzing {path.name}: {error}")
+        
+        # Blob leaders publish their content hash once scanned; copies wait for it
+        leaders: Dict[Path, str] = {}
+        copies: List[Tuple[Path, FileEntry, asyncio.Future]] = []
+        content_hashes: Dict[Path, str] = {}
+        
+        def is_copy(file_path: Path, entry: FileEntry, key: Optional[str]) -> bool:
+            if key is None:
+                return False
+            claim = self.deduplicator.claim(key, kind)
+            if claim is not None:
+                copies.append((file_path, entry, claim))
+                return True
+            leaders[file_path] = key
+            return False
         
-        # Phase 8: Bridge Integrations Analysis
-        await self._analyze_bridge_integrations()
+        # Bound queued chunks so buffered content cannot outrun the workers
+        chunk_slots = asyncio.Semaphore(self.scan_executor.max_workers * 2)
         
-        # Phase 9: Documentation Analysis
-        await self._analyze_documentation()
+        async def scan_chunk(chunk: List[Tuple[Path, FileEntry, str, str]]):
+            try:
+                await self._scan_pending_batch(kind, chunk, results)
+            finally:
+                chunk_slots.release()
         
-        # Phase 10: GRID API Enhanced Strategic Analysis
-        if self.grid_client:
-            await self._perform_real_grid_analysis()
-        else:
-            await self._perform_enhanced_simulation_analysis()
+        async def stream_file(file_path: Path, entry: FileEntry):
+            try:
+                results[file_path], content_hashes[file_path] = await self._stream_scan(entry, kind)
+            except Exception as e:
+                report_error(file_path, e)
+            finally:
+                chunk_slots.release()
+        
+        scans = []
+        batch: List[Tuple[Path, FileEntry, str, str]] = []
+        
+        async def admit(file_path: Path, entry: FileEntry, content: str):
+            nonlocal batch
+            content_hash = content_hashes[file_path] = content_digest(content)
+            cached = self.analysis_cache.lookup_content(entry, kind, content_hash)
+            if cached is not None:
+                results[file_path] = cached
+                return
+            
+            batch.append((file_path, entry, content_hash, content))
+            if len(batch) >= self.scan_executor.chunk_size:
+                await chunk_slots.acquire()
+                scans.append(asyncio.create_task(scan_chunk(batch)))
+                batch = []
         
-        # Phase 11: Generate Strategic Recommendations
-        await self._generate_strategic_recommendations()
+        try:
+            for file_path, entry in streamed:
+                key = await self.deduplicator.blob_key(entry) if self.deduplicator.is_candidate(inventory, entry) else None
+                if is_copy(file_path, entry, key):
+                    continue
+                await chunk_slots.acquire()
+                scans.append(asyncio.create_task(stream_file(file_path, entry)))
+            
+            blobs = self.deduplicator.read_blobs(
+                [entry for _, entry in candidates.values()],
+                on_error=lambda entry, error: report_error(entry.path, error)
+            )
+            async for entry, key, content in blobs:
+                file_path, entry = candidates[entry.path]
+                if not is_copy(file_path, entry, key):
+                    await admit(file_path, entry, content)
+            
+            reads = ((entry.path, entry.size) for _, entry in pending.values())
+            async for path, content in self.reader_pool.iter_reads(reads, on_error=report_error):
+                await admit(*pending[path], content)
+            
+            if batch:
+                await chunk_slots.acquire()
+                scans.append(asyncio.create_task(scan_chunk(batch)))
+            await asyncio.gather(*scans)
+        finally:
+            for file_path, key in leaders.items():
+                self.deduplicator.resolve(key, kind, content_hashes.get(file_path) if file_path in results else None)
+        
+        for file_path, entry, claim in copies:
+            cached = self._take_over_blob(entry, kind, await claim)
+            if cached is not None:
+                results[file_path] = cached
+                continue
+            try:
+                results[file_path] = (await self._scan_content(entry, kind))[0]
+            except Exception as e:
+                report_error(file_path, e)
         
-        return self.analysis_results
+        if record_metrics:
+            await self._record_metrics([(entries[file_path], kind, result) for file_path, result in results.items()])
+        return results
 
     async def _analyze_foundation_model_core(self):
         """Deep analysis of FoundationModelCore with M4 Neural Engine acceleration"""
@@ -406,6 +859,7 @@ class EnhancedOksanaPlatformAnalyzer:
         print("-" * 65)
         
         phase_start_time = time.time()
+        inventory = self._get_inventory()
         
         foundation_analysis = {
             "analysis_engine": "AppleAccelerate-M4-Enhanced",
@@ -431,16 +885,13 @@ class EnhancedOksanaPlatformAnalyzer:
         
         for component in core_components:
             component_path = self.foundation_core / component
-            if component_path.exists():
+            if inventory.exists(component_path):
                 foundation_analysis["components_found"].append(component)
                 
                 # Analyze specific files
                 try:
                     if component.endswith('.js'):
-                        async with aiofiles.open(component_path, 'r') as f:
-                            content = await f.read()
-                        
-                        analysis = self._analyze_javascript_file(content, component)
+                        analysis = await self._cached_scan(component_path, SCAN_KIND_JAVASCRIPT)
                         foundation_analysis["key_files"][component] = analysis
                         print(f"  ✅ {component}: {analysis['complexity_score']:.2f} complexity")
                     
@@ -464,36 +915,19 @@ class EnhancedOksanaPlatformAnalyzer:
         
         # Analyze learning pipeline
         learning_pipeline_path = self.foundation_core / "learning-pipeline"
-        if learning_pipeline_path.exists():
-            pipeline_files = list(learning_pipeline_path.rglob("*.py")) + list(learning_pipeline_path.rglob("*.swift"))
+        if inventory.is_dir(learning_pipeline_path):
+            pipeline_files = inventory.names_under(learning_pipeline_path, [".py", ".swift"])
             foundation_analysis["learning_pipeline_status"] = {
                 "exists": True,
                 "file_count": len(pipeline_files),
-                "key_files": [f.name for f in pipeline_files if f.name in ["strategic-intelligence-learning-engine.py", "PythonBridge.swift"]]
+                "key_files": [name for name in pipeline_files if name in ["strategic-intelligence-learning-engine.py", "PythonBridge.swift"]]
             }
             print(f"  ✅ Learning Pipeline: {len(pipeline_files)} files")
         
         # Calculate sophistication score
         foundation_analysis["sophistication_score"] = self._calculate_component_sophistication(foundation_analysis)
         
-        # M4 Neural Engine Performance Analysis
-        if M4_ACCELERATION_AVAILABLE and foundation_analysis["components_found"]:
-            try:
-                # Create project metrics for M4 analysis
-                project_metrics_data = {
-                    "file_sizes": [len(str(comp)) for comp in foundation_analysis["components_found"]],
-                    "complexity_scores": [foundation_analysis["sophistication_score"]] * len(foundation_analysis["components_found"])
-                }
-                
-                m4_metrics = await self.accelerate_engine.accelerate_project_metrics(project_metrics_data)
-                foundation_analysis["m4_performance_metrics"] = m4_metrics
-                self.analysis_results["m4_performance_metrics"]["foundation_core"] = m4_metrics
-                
-                print(f"  🍎 M4 Neural Engine Analysis: {m4_metrics.get('engine', 'N/A')}")
-                print(f"  ⚡ Processing Time: {m4_metrics.get('total_processing_time_ms', 0):.2f}ms")
-                
-            except Exception as e:
-                print(f"  ⚠️ M4 analysis failed: {e}")
+        # M4 metrics for these files come from the project-wide table (_analyze_project_metrics)
         
         phase_time = time.time() - phase_start_time
         foundation_analysis["analysis_time_ms"] = phase_time * 1000
@@ -503,31 +937,7 @@ class EnhancedOksanaPlatformAnalyzer:
 
     def _analyze_javascript_file(self, content: str, filename: str) -> Dict[str, Any]:
         """Analyze JavaScript file for complexity and patterns"""
-        lines = content.split('')
-        
-        analysis = {
-            "lines_of_code": len(lines),
-            "functions_count": len([line for line in lines if 'function' in line or '=>' in line]),
-            "async_patterns": len([line for line in lines if 'async' in line or 'await' in line]),
-            "class_definitions": len([line for line in lines if line.strip().startswith('class ')]),
-            "export_statements": len([line for line in lines if 'export' in line]),
-            "mcp_patterns": len([line for line in lines if 'mcp' in line.lower()]),
-            "apple_intelligence_patterns": len([line for line in lines if any(pattern in line.lower() for pattern in ['apple', 'm4', 'neural', 'intelligence'])]),
-            "quantum_patterns": len([line for line in lines if 'quantum' in line.lower()]),
-            "complexity_score": 0.0
-        }
-        
-        # Calculate complexity score
-        base_score = 0.1
-        line_factor = min(analysis["lines_of_code"] / 500, 0.3)
-        function_factor = min(analysis["functions_count"] / 20, 0.2)
-        async_factor = min(analysis["async_patterns"] / 10, 0.15)
-        class_factor = analysis["class_definitions"] * 0.1
-        sophistication_factor = (analysis["mcp_patterns"] + analysis["apple_intelligence_patterns"] + analysis["quantum_patterns"]) * 0.05
-        
-        analysis["complexity_score"] = min(base_score + line_factor + function_factor + async_factor + class_factor + sophistication_factor, 1.0)
-        
-        return analysis
+        return analyze_javascript_source(content)
 
     def _calculate_component_sophistication(self, component_analysis: Dict[str, Any]) -> float:
         """Calculate overall sophistication score for a component"""
@@ -561,10 +971,11 @@ class EnhancedOksanaPlatformAnalyzer:
         print("-" * 50)
         
         ai_framework_path = self.project_root / "AppleIntelligenceFramework"
+        inventory = self._get_inventory()
         
         ai_analysis = {
             "path": str(ai_framework_path),
-            "exists": ai_framework_path.exists(),
+            "exists": inventory.is_dir(ai_framework_path),
             "file_count": 0,
             "swift_files": [],
             "typescript_files": [],
@@ -573,35 +984,32 @@ class EnhancedOksanaPlatformAnalyzer:
             "sophistication_score": 0.0
         }
         
-        if ai_framework_path.exists():
+        if ai_analysis["exists"]:
             # Analyze all files
-            all_files = list(ai_framework_path.rglob("*"))
-            ai_analysis["file_count"] = len([f for f in all_files if f.is_file()])
+            ai_analysis["file_count"] = inventory.count_under(ai_framework_path)
             
-            swift_files = list(ai_framework_path.rglob("*.swift"))
-            ts_files = list(ai_framework_path.rglob("*.ts")) + list(ai_framework_path.rglob("*.tsx"))
+            swift_files = [entry.path for entry in inventory.files_under(ai_framework_path, [".swift"])]
+            ts_files = [entry.path for entry in inventory.files_under(ai_framework_path, [".ts", ".tsx"])]
             
-            ai_analysis["swift_files"] = [str(f.relative_to(ai_framework_path)) for f in swift_files]
-            ai_analysis["typescript_files"] = [str(f.relative_to(ai_framework_path)) for f in ts_files]
+            ai_analysis["swift_files"] = inventory.relative_paths_under(ai_framework_path, [".swift"])
+            ai_analysis["typescript_files"] = inventory.relative_paths_under(ai_framework_path, [".ts", ".tsx"])
             
             print(f"  ✅ Apple Intelligence Framework: {ai_analysis['file_count']} files")
             print(f"    🔧 Swift files: {len(swift_files)}")
             print(f"    📝 TypeScript files: {len(ts_files)}")
             
             # Analyze for M4 and Neural Engine patterns
+            swift_hits = await self._scan_files(swift_files, SCAN_KIND_SWIFT_PATTERNS)
             for swift_file in swift_files:
-                try:
-                    async with aiofiles.open(swift_file, 'r') as f:
-                        content = await f.read()
-                    
-                    if any(pattern in content.lower() for pattern in ['m4', 'neural', 'metalperformanceshaders', 'accelerate']):
-                        ai_analysis["m4_optimization_patterns"].append(swift_file.name)
-                    
-                    if any(pattern in content.lower() for pattern in ['neuralengine', 'coreml', 'mlmodel']):
-                        ai_analysis["neural_engine_integration"] = True
-                        
-                except Exception as e:
-                    print(f"    ⚠️ Error analyzing {swift_file.name}: {e}")
+                hits = swift_hits.get(swift_file)
+                if hits is None:
+                    continue
+                
+                if hits["m4_optimization"]:
+                    ai_analysis["m4_optimization_patterns"].append(swift_file.name)
+                
+                if hits["neural_engine"]:
+                    ai_analysis["neural_engine_integration"] = True
             
             # Calculate sophistication score
             ai_analysis["sophistication_score"] = self._calculate_ai_sophistication(ai_analysis)
@@ -638,10 +1046,11 @@ class EnhancedOksanaPlatformAnalyzer:
         print("-" * 50)
         
         sd_framework_path = self.project_root / "StrategicDirectorFramework"
+        inventory = self._get_inventory()
         
         sd_analysis = {
             "path": str(sd_framework_path),
-            "exists": sd_framework_path.exists(),
+            "exists": inventory.is_dir(sd_framework_path),
             "components": [],
             "validation_tools": [],
             "bridge_integrations": [],
@@ -649,7 +1058,7 @@ class EnhancedOksanaPlatformAnalyzer:
             "sophistication_score": 0.0
         }
         
-        if sd_framework_path.exists():
+        if sd_analysis["exists"]:
             # Look for key Strategic Director components
             key_components = [
                 "pattern-and-alignment-validator.js",
@@ -660,7 +1069,7 @@ class EnhancedOksanaPlatformAnalyzer:
             
             for component in key_components:
                 component_path = sd_framework_path / component
-                if component_path.exists():
+                if inventory.exists(component_path):
                     sd_analysis["components"].append(component)
                     
                     if "validator" in component:
@@ -674,7 +1083,7 @@ class EnhancedOksanaPlatformAnalyzer:
             
             # Check for TypeScript configuration
             tsconfig_path = sd_framework_path / "tsconfig.json"
-            if tsconfig_path.exists():
+            if inventory.is_file(tsconfig_path):
                 try:
                     async with aiofiles.open(tsconfig_path, 'r') as f:
                         tsconfig_content = await f.read()
@@ -724,23 +1133,24 @@ class EnhancedOksanaPlatformAnalyzer:
         print("-" * 50)
         
         portal_path = self.project_root / "CreatrixPortal"
+        inventory = self._get_inventory()
         
         portal_analysis = {
             "path": str(portal_path),
-            "exists": portal_path.exists(),
+            "exists": inventory.is_dir(portal_path),
             "subprojects": {},
             "integration_complexity": 0.0,
             "quantum_integration": False,
             "sophistication_score": 0.0
         }
         
-        if portal_path.exists():
+        if portal_analysis["exists"]:
             # Analyze subprojects
             subprojects = ["vercel", "framer-cloudflare-sync", "services", "scripts", "lib", "config", "integrations"]
             
             for subproject in subprojects:
                 subproject_path = portal_path / subproject
-                if subproject_path.exists():
+                if inventory.exists(subproject_path):
                     analysis = await self._analyze_subproject(subproject_path)
                     portal_analysis["subprojects"][subproject] = analysis
                     print(f"  ✅ {subproject}: {analysis['file_count']} files, {analysis['sophistication']:.2f} sophistication")
@@ -748,8 +1158,8 @@ class EnhancedOksanaPlatformAnalyzer:
                     print(f"  ❌ {subproject}: Missing")
             
             # Check for quantum integration
-            quantum_files = list(portal_path.rglob("*quantum*"))
-            portal_analysis["quantum_integration"] = len(quantum_files) > 0
+            quantum_match = next(inventory.glob_under(portal_path, "*quantum*"), None)
+            portal_analysis["quantum_integration"] = quantum_match is not None
             
             # Calculate overall sophistication
             portal_analysis["sophistication_score"] = self._calculate_portal_sophistication(portal_analysis)
@@ -771,18 +1181,17 @@ class EnhancedOksanaPlatformAnalyzer:
             "sophistication": 0.0
         }
         
-        if subproject_path.is_dir():
-            all_files = list(subproject_path.rglob("*"))
-            files_only = [f for f in all_files if f.is_file()]
-            analysis["file_count"] = len(files_only)
+        inventory = self._get_inventory()
+        if inventory.is_dir(subproject_path):
+            analysis["file_count"] = inventory.count_under(subproject_path)
             
             # Check for package.json
             package_path = subproject_path / "package.json"
-            analysis["package_json_exists"] = package_path.exists()
+            analysis["package_json_exists"] = inventory.exists(package_path)
             
             # Count file types
-            analysis["typescript_files"] = len([f for f in files_only if f.suffix in ['.ts', '.tsx']])
-            analysis["javascript_files"] = len([f for f in files_only if f.suffix in ['.js', '.jsx']])
+            analysis["typescript_files"] = inventory.count_under(subproject_path, ['.ts', '.tsx'])
+            analysis["javascript_files"] = inventory.count_under(subproject_path, ['.js', '.jsx'])
             
             # Calculate sophistication
             base_score = 0.1
@@ -820,37 +1229,35 @@ class EnhancedOksanaPlatformAnalyzer:
         print("-" * 50)
         
         figma_path = self.project_root / "FigmaMCPServer"
+        inventory = self._get_inventory()
         
         figma_analysis = {
             "path": str(figma_path),
-            "exists": figma_path.exists(),
+            "exists": inventory.is_dir(figma_path),
             "mcp_integration": False,
             "figma_patterns": [],
             "server_files": [],
             "sophistication_score": 0.0
         }
         
-        if figma_path.exists():
+        if figma_analysis["exists"]:
             # Find server and MCP files
-            js_files = list(figma_path.rglob("*.js"))
-            ts_files = list(figma_path.rglob("*.ts"))
+            js_files = [entry.path for entry in inventory.files_under(figma_path, [".js"])]
+            ts_files = [entry.path for entry in inventory.files_under(figma_path, [".ts"])]
             
-            figma_analysis["server_files"] = [f.name for f in js_files + ts_files]
+            figma_analysis["server_files"] = (inventory.names_under(figma_path, [".js"])
+                                              + inventory.names_under(figma_path, [".ts"]))
             
+            figma_hits = await self._scan_files(js_files + ts_files, SCAN_KIND_FIGMA_PATTERNS)
             for file_path in js_files + ts_files:
-                try:
-                    async with aiofiles.open(file_path, 'r') as f:
-                        content = await f.read()
-                    
-                    if 'mcp' in content.lower():
-                        figma_analysis["mcp_integration"] = True
-                    
-                    figma_patterns = ['figma', 'design', 'component', 'frame', 'node']
-                    found_patterns = [pattern for pattern in figma_patterns if pattern in content.lower()]
-                    figma_analysis["figma_patterns"].extend(found_patterns)
-                    
-                except Exception as e:
-                    print(f"    ⚠️ Error analyzing {file_path.name}: {e}")
+                hits = figma_hits.get(file_path)
+                if hits is None:
+                    continue
+                
+                if hits["mcp_integration"]:
+                    figma_analysis["mcp_integration"] = True
+                
+                figma_analysis["figma_patterns"].extend(hits["figma_patterns"])
             
             # Remove duplicates
             figma_analysis["figma_patterns"] = list(set(figma_analysis["figma_patterns"]))
@@ -888,10 +1295,11 @@ class EnhancedOksanaPlatformAnalyzer:
         print("-" * 50)
         
         bridge_path = self.project_root / "XcodeModelBridge"
+        inventory = self._get_inventory()
         
         bridge_analysis = {
             "path": str(bridge_path),
-            "exists": bridge_path.exists(),
+            "exists": inventory.is_dir(bridge_path),
             "swift_files": [],
             "typescript_files": [],
             "bridge_patterns": [],
@@ -899,28 +1307,24 @@ class EnhancedOksanaPlatformAnalyzer:
             "sophistication_score": 0.0
         }
         
-        if bridge_path.exists():
-            swift_files = list(bridge_path.rglob("*.swift"))
-            ts_files = list(bridge_path.rglob("*.ts"))
+        if bridge_analysis["exists"]:
+            swift_files = [entry.path for entry in inventory.files_under(bridge_path, [".swift"])]
+            ts_files = [entry.path for entry in inventory.files_under(bridge_path, [".ts"])]
             
-            bridge_analysis["swift_files"] = [f.name for f in swift_files]
-            bridge_analysis["typescript_files"] = [f.name for f in ts_files]
+            bridge_analysis["swift_files"] = inventory.names_under(bridge_path, [".swift"])
+            bridge_analysis["typescript_files"] = inventory.names_under(bridge_path, [".ts"])
             
             # Analyze for bridge patterns
+            xcode_hits = await self._scan_files(swift_files + ts_files, SCAN_KIND_XCODE_PATTERNS)
             for file_path in swift_files + ts_files:
-                try:
-                    async with aiofiles.open(file_path, 'r') as f:
-                        content = await f.read()
-                    
-                    bridge_patterns = ['bridge', 'xcode', 'model', 'sync', 'convert']
-                    found_patterns = [pattern for pattern in bridge_patterns if pattern in content.lower()]
-                    bridge_analysis["bridge_patterns"].extend(found_patterns)
-                    
-                    if 'xcode' in content.lower() or '.xcodeproj' in content:
-                        bridge_analysis["xcode_integration"] = True
-                        
-                except Exception as e:
-                    print(f"    ⚠️ Error analyzing {file_path.name}: {e}")
+                hits = xcode_hits.get(file_path)
+                if hits is None:
+                    continue
+                
+                bridge_analysis["bridge_patterns"].extend(hits["bridge_patterns"])
+                
+                if hits["xcode_integration"]:
+                    bridge_analysis["xcode_integration"] = True
             
             # Remove duplicates
             bridge_analysis["bridge_patterns"] = list(set(bridge_analysis["bridge_patterns"]))
@@ -958,10 +1362,11 @@ class EnhancedOksanaPlatformAnalyzer:
         print("-" * 50)
         
         scripts_path = self.project_root / "scripts"
+        inventory = self._get_inventory()
         
         scripts_analysis = {
             "scripts_path": str(scripts_path),
-            "scripts_exists": scripts_path.exists(),
+            "scripts_exists": inventory.is_dir(scripts_path),
             "services_analysis": {},
             "validation_tools": [],
             "brand_aware_content": {},
@@ -969,30 +1374,31 @@ class EnhancedOksanaPlatformAnalyzer:
             "sophistication_score": 0.0
         }
         
-        if scripts_path.exists():
+        if scripts_analysis["scripts_exists"]:
             # Analyze services directory
             services_path = scripts_path / "services"
-            if services_path.exists():
+            services_exists = inventory.is_dir(services_path)
+            if services_exists:
                 scripts_analysis["services_analysis"] = await self._analyze_services_directory(services_path)
                 print(f"  ✅ Services: {scripts_analysis['services_analysis']['file_count']} files")
             
             # Look for validation tools
             validation_path = scripts_path / "validation"
-            if validation_path.exists():
-                validation_files = list(validation_path.rglob("*.js")) + list(validation_path.rglob("*.ts"))
-                scripts_analysis["validation_tools"] = [f.name for f in validation_files]
+            if inventory.is_dir(validation_path):
+                validation_files = inventory.names_under(validation_path, [".js", ".ts"])
+                scripts_analysis["validation_tools"] = validation_files
                 print(f"  ✅ Validation Tools: {len(validation_files)} files")
             
             # Analyze brand-aware content
-            brand_aware_path = services_path / "brand-aware-content" if services_path.exists() else None
-            if brand_aware_path and brand_aware_path.exists():
+            brand_aware_path = services_path / "brand-aware-content" if services_exists else None
+            if brand_aware_path and inventory.is_dir(brand_aware_path):
                 brand_analysis = await self._analyze_brand_aware_content(brand_aware_path)
                 scripts_analysis["brand_aware_content"] = brand_analysis
                 print(f"  ✅ Brand-Aware Content: {brand_analysis['sophistication']:.2f} sophistication")
             
             # Check for quantum environment bridge
-            quantum_bridge_path = services_path / "quantum-env-bridge.ts" if services_path.exists() else None
-            scripts_analysis["quantum_env_bridge"] = quantum_bridge_path and quantum_bridge_path.exists()
+            quantum_bridge_path = services_path / "quantum-env-bridge.ts" if services_exists else None
+            scripts_analysis["quantum_env_bridge"] = quantum_bridge_path and inventory.exists(quantum_bridge_path)
             
             # Calculate sophistication
             scripts_analysis["sophistication_score"] = self._calculate_scripts_sophistication(scripts_analysis)
@@ -1013,15 +1419,16 @@ class EnhancedOksanaPlatformAnalyzer:
             "sophisticated_services": []
         }
         
-        all_files = list(services_path.rglob("*"))
-        analysis["file_count"] = len([f for f in all_files if f.is_file()])
+        inventory = self._get_inventory()
+        all_files = list(inventory.glob_under(services_path, "*"))
+        analysis["file_count"] = inventory.count_under(services_path)
         
         # Find subdirectories
-        subdirs = [d for d in services_path.iterdir() if d.is_dir()]
+        subdirs = inventory.child_directories(services_path)
         analysis["subdirectories"] = [d.name for d in subdirs]
         
         # Find initialization scripts
-        init_scripts = [f for f in services_path.rglob("*init*.js")]
+        init_scripts = list(inventory.glob_under(services_path, "*init*.js"))
         analysis["init_scripts"] = [f.name for f in init_scripts]
         
         # Find sophisticated services
@@ -1041,9 +1448,9 @@ class EnhancedOksanaPlatformAnalyzer:
             "sophistication": 0.0
         }
         
-        if brand_path.exists():
-            all_files = list(brand_path.rglob("*"))
-            files_only = [f for f in all_files if f.is_file()]
+        inventory = self._get_inventory()
+        if inventory.is_dir(brand_path):
+            files_only = inventory.files_under(brand_path)
             analysis["file_count"] = len(files_only)
             
             # Analyze file types
@@ -1102,13 +1509,11 @@ class EnhancedOksanaPlatformAnalyzer:
             "sophistication_score": 0.0
         }
         
+        inventory = self._get_inventory()
         for bridge_name, bridge_path in bridge_files.items():
-            if bridge_path.exists():
+            if inventory.is_file(bridge_path):
                 try:
-                    async with aiofiles.open(bridge_path, 'r') as f:
-                        content = await f.read()
-                    
-                    analysis = self._analyze_bridge_file(content, bridge_name)
+                    analysis = await self._cached_scan(bridge_path, bridge_scan_kind(bridge_path))
                     bridge_analysis["bridge_files"][bridge_name] = analysis
                     
                     print(f"  ✅ {bridge_name}: {analysis['complexity_score']:.2f} complexity")
@@ -1133,47 +1538,7 @@ class EnhancedOksanaPlatformAnalyzer:
 
     def _analyze_bridge_file(self, content: str, filename: str) -> Dict[str, Any]:
         """Analyze a bridge file for complexity and patterns"""
-        lines = content.split('')
-        
-        analysis = {
-            "lines_of_code": len(lines),
-            "bridge_patterns": 0,
-            "async_operations": 0,
-            "error_handling": 0,
-            "type_definitions": 0,
-            "integration_points": 0,
-            "complexity_score": 0.0
-        }
-        
-        # Pattern analysis
-        for line in lines:
-            lower_line = line.lower()
-            if any(pattern in lower_line for pattern in ['bridge', 'integrate', 'connect', 'sync']):
-                analysis["bridge_patterns"] += 1
-            if any(pattern in lower_line for pattern in ['async', 'await', 'promise']):
-                analysis["async_operations"] += 1
-            if any(pattern in lower_line for pattern in ['try', 'catch', 'error', 'throw']):
-                analysis["error_handling"] += 1
-            if any(pattern in lower_line for pattern in ['interface', 'type', 'class', 'struct']):
-                analysis["type_definitions"] += 1
-            if any(pattern in lower_line for pattern in ['api', 'service', 'client', 'server']):
-                analysis["integration_points"] += 1
-        
-        # Calculate complexity score
-        base_score = 0.1
-        line_factor = min(analysis["lines_of_code"] / 200, 0.2)
-        pattern_factor = min(analysis["bridge_patterns"] / 10, 0.2)
-        async_factor = min(analysis["async_operations"] / 5, 0.15)
-        error_factor = min(analysis["error_handling"] / 5, 0.15)
-        type_factor = min(analysis["type_definitions"] / 5, 0.1)
-        integration_factor = min(analysis["integration_points"] / 10, 0.2)
-        
-        analysis["complexity_score"] = min(
-            base_score + line_factor + pattern_factor + async_factor + error_factor + type_factor + integration_factor, 
-            1.0
-        )
-        
-        return analysis
+        return analyze_bridge_source(content)
 
     async def _analyze_documentation(self):
         """Analyze documentation and learning pipeline"""
@@ -1182,10 +1547,11 @@ class EnhancedOksanaPlatformAnalyzer:
         
         docs_path = self.project_root / "docs"
         learning_pipeline_path = self.foundation_core / "learning-pipeline"
+        inventory = self._get_inventory()
         
         docs_analysis = {
-            "docs_exists": docs_path.exists() if docs_path else False,
-            "learning_pipeline_exists": learning_pipeline_path.exists(),
+            "docs_exists": inventory.is_dir(docs_path),
+            "learning_pipeline_exists": inventory.is_dir(learning_pipeline_path),
             "documentation_files": [],
             "learning_files": [],
             "setup_scripts": [],
@@ -1193,26 +1559,24 @@ class EnhancedOksanaPlatformAnalyzer:
         }
         
         # Analyze docs directory
-        if docs_path and docs_path.exists():
-            doc_files = list(docs_path.rglob("*.md"))
-            docs_analysis["documentation_files"] = [f.name for f in doc_files]
+        if docs_analysis["docs_exists"]:
+            doc_files = inventory.names_under(docs_path, [".md"])
+            docs_analysis["documentation_files"] = doc_files
             print(f"  ✅ Documentation: {len(doc_files)} markdown files")
         else:
             print(f"  ❌ Documentation: Missing")
         
         # Analyze learning pipeline (excluding AppleSampleProjects)
-        if learning_pipeline_path.exists():
-            all_files = list(learning_pipeline_path.rglob("*"))
-            # Exclude AppleSampleProjects
-            filtered_files = [f for f in all_files if "XCodeProjects" not in str(f)]
-            files_only = [f for f in filtered_files if f.is_file()]
+        if docs_analysis["learning_pipeline_exists"]:
+            # AppleSampleProjects (XCodeProjects) are pruned by the default ignore rules
+            files_only = inventory.names_under(learning_pipeline_path)
             
-            docs_analysis["learning_files"] = [f.name for f in files_only]
+            docs_analysis["learning_files"] = files_only
             print(f"  ✅ Learning Pipeline: {len(files_only)} files")
             
             # Look for key files
             key_files = ["PythonBridge.swift", "strategic-intelligence-learning-engine.py"]
-            found_key_files = [f.name for f in files_only if f.name in key_files]
+            found_key_files = [name for name in files_only if name in key_files]
             print(f"    🔑 Key Files Found: {found_key_files}")
         
         # Look for setup scripts
@@ -1222,7 +1586,7 @@ class EnhancedOksanaPlatformAnalyzer:
         ]
         
         for script_path in setup_scripts:
-            if script_path.exists():
+            if inventory.exists(script_path):
                 docs_analysis["setup_scripts"].append(script_path.name)
                 print(f"  ✅ Setup Script: {script_path.name}")
             else:
@@ -1250,6 +1614,13 @@ class EnhancedOksanaPlatformAnalyzer:
         
         return min(base_score + docs_factor + learning_factor + setup_factor, 1.0)
 
+    async def _analyze_strategic_intelligence(self):
+        """Phase 10: GRID API Enhanced Strategic Analysis (simulated without a GRID client)"""
+        if self.grid_client:
+            await self._perform_real_grid_analysis()
+        else:
+            await self._perform_enhanced_simulation_analysis()
+    
     async def _perform_real_grid_analysis(self):
         """Perform REAL GRID API analysis with M4 acceleration"""
         print("📋 PHASE 10: REAL GRID API Strategic Analysis")
@@ -1409,12 +1780,13 @@ class EnhancedOksanaPlatformAnalyzer:
         for i, rec in enumerate(recommendations[:3], 1):
             print(f"  {i}. {rec['category']}: {rec['recommendation']} ({rec['priority']})")
 
-    async def generate_final_report(self):
+    async def generate_final_report(self, output_path: Optional[Path] = None):
         """Generate comprehensive final report"""
-        print("🎯 GENERATING FINAL COMPREHENSIVE REPORT")
-        print("=" * 60)
-        
-        # Calculate deployment readiness
+        with self.tracer.activate(), span("final_report", "run", format=self.report_format):
+            return await self._write_final_report(output_path)
+
+    async def _score_deployment_readiness(self):
+        """Final readiness: mean sophistication over the analyzed components"""
         comprehensive_analysis = self.analysis_results["comprehensive_analysis"]
         sophistication_scores = [
             data.get("sophistication_score", 0)
@@ -1437,27 +1809,121 @@ class EnhancedOksanaPlatformAnalyzer:
             "overall_score": overall_readiness,
             "readiness_level": readiness_level,
             "components_analyzed": len(comprehensive_analysis),
-            "m4_acceleration_active": self.analysis_results["m4_acceleration_active"],
+            "m4_acceleration_active": self.analysis_results.get("m4_acceleration_active", False),
             "grid_api_connected": self.analysis_results["grid_api_connected"]
         }
+
+    async def _write_final_report(self, output_path: Optional[Path]):
+        print("🎯 GENERATING FINAL COMPREHENSIVE REPORT")
+        print("=" * 60)
         
-        # Save comprehensive results
-        output_path = self.foundation_core / "learning-pipeline" / "comprehensive_analysis_results.json"
-        output_path.parent.mkdir(exist_ok=True)
-        
-        async with aiofiles.open(output_path, 'w') as f:
-            await f.write(json.dumps(self.analysis_results, indent=2, default=str))
+        # Scored by the phase graph; phases run on their own have not been scored yet
+        if not self.analysis_results["deployment_readiness"]:
+            await self._score_deployment_readiness()
+        comprehensive_analysis = self.analysis_results["comprehensive_analysis"]
+        overall_readiness = self.analysis_results["deployment_readiness"]["overall_score"]
+        readiness_level = self.analysis_results["deployment_readiness"]["readiness_level"]
+        
+        if self.report_stream is not None and self.report_stream.is_open:
+            # Phases are already on disk; finish the stream with the summary footer
+            output_path = self.report_stream.path
+            await asyncio.to_thread(self._finish_report_stream)
+        elif self.report_format == "binary":
+            output_path = Path(output_path) if output_path else \
+                self.foundation_core / "learning-pipeline" / f"comprehensive_analysis_results{REPORT_SUFFIX}"
+            await asyncio.to_thread(
+                write_binary_report, output_path, self.analysis_results, self._report_summary(), self.file_metrics
+            )
+        else:
+            # Save comprehensive results
+            output_path = Path(output_path) if output_path else \
+                self.foundation_core / "learning-pipeline" / "comprehensive_analysis_results.json"
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            async with aiofiles.open(output_path, 'w') as f:
+                await f.write(json.dumps(self.analysis_results, indent=2, default=report_default))
         
         print(f"📊 COMPREHENSIVE ANALYSIS COMPLETE")
         print(f"🎯 Overall Readiness: {overall_readiness:.1%} ({readiness_level})")
         print(f"🧠 Components Analyzed: {len(comprehensive_analysis)}")
-        print(f"🍎 M4 Acceleration: {'Active' if self.analysis_results['m4_acceleration_active'] else 'Not Available'}")
+        print(f"🍎 M4 Acceleration: {'Active' if self.analysis_results.get('m4_acceleration_active') else 'Not Available'}")
         print(f"📊 GRID API: {'Connected' if self.analysis_results['grid_api_connected'] else 'Simulation Mode'}")
         print(f"💡 Recommendations: {len(self.analysis_results['recommendations'])}")
         print(f"💾 Full Report: {output_path}")
         
         return self.analysis_results
 
+    def _report_summary(self) -> Dict[str, Any]:
+        """Readiness and per-phase scores: what dashboards read without loading the report"""
+        comprehensive_analysis = self.analysis_results["comprehensive_analysis"]
+        return {
+            **self.analysis_results["deployment_readiness"],
+            "phase_scores": {
+                key: data.get("sophistication_score")
+                for key, data in comprehensive_analysis.items()
+                if "sophistication_score" in data
+            },
+            "recommendations": len(self.analysis_results["recommendations"])
+        }
+
+    def _finish_report_stream(self):
+        """Write the NDJSON footer: summary scores plus results not streamed as sections"""
+        streamed = {key.split("/", 1)[0] for key in self.report_stream.index}
+        top_level = {key: value for key, value in self.analysis_results.items() if key not in streamed}
+        self.report_stream.write_footer(self._report_summary(), top_level)
+
+    def close(self):
+        """Release worker pools and flush the cache"""
+        if self._owns_scan_executor:
+            self.scan_executor.shutdown()
+        self.analysis_cache.commit()
+        if self.report_stream is not None:
+            self.report_stream.close()
+        if self.tracer.enabled and self.trace_path is not None:
+            self.tracer.write_chrome_trace(self.trace_path)
+            print(f"⏱️  Chrome Trace: {self.trace_path}")
+
+
+def _scan_phase(name: str, run: Callable, requires: Tuple[str, ...] = ("near_duplicates",)) -> Phase:
+    """Phases 1-9: one subtree each, written to comprehensive_analysis and streamed as soon as it finishes"""
+    return Phase(name, run, output=f"comprehensive_analysis/{name}", inputs=PHASE_INPUTS[name], requires=requires,
+                 pool=SCAN_POOL, stream="phase")
+
+
+_Analyzer = EnhancedOksanaPlatformAnalyzer
+SCAN_PHASES = tuple(PHASE_INPUTS)
+
+# The analysis as a DAG: each phase declares what it reads and the key it writes.
+# Adding a phase means registering it here (or on an analyzer's phase_registry).
+ANALYSIS_PHASES = PhaseRegistry([
+    # Phase 0: near-copies are found first so the scan phases can leave them out (opt-in). The
+    # scan phases digest their inputs as they see them, so exclusions only invalidate the phases they touch.
+    Phase("near_duplicates", _Analyzer._analyze_near_duplicates, output="near_duplicates", inputs=("",),
+          enabled=lambda analyzer: analyzer.near_duplicate_detector.enabled, output_digest=lambda analyzer: ""),
+    _scan_phase("foundation-models", _Analyzer._analyze_foundation_model_core),               # Phase 1
+    _scan_phase("AppleIntelligenceFramework", _Analyzer._analyze_apple_intelligence_framework),  # Phase 2
+    _scan_phase("StrategicDirectorFramework", _Analyzer._analyze_strategic_director_framework),  # Phase 3
+    _scan_phase("CreatrixPortal", _Analyzer._analyze_creatrix_portal),                        # Phase 4
+    _scan_phase("FigmaMCPServer", _Analyzer._analyze_figma_mcp_server),                       # Phase 5
+    _scan_phase("XcodeModelBridge", _Analyzer._analyze_xcode_model_bridge),                   # Phase 6
+    _scan_phase("Scripts", _Analyzer._analyze_scripts_and_services),                          # Phase 7
+    _scan_phase("BridgeIntegrations", _Analyzer._analyze_bridge_integrations),                # Phase 8
+    _scan_phase("Documentation", _Analyzer._analyze_documentation),                           # Phase 9
+    # Project-wide metric distributions and themes over every file phases 1-9 scanned
+    Phase("project_metrics", _Analyzer._analyze_project_metrics, output="m4_performance_metrics",
+          requires=SCAN_PHASES, category="analysis"),
+    # Phase 10: strategic scores from every component's sophistication
+    Phase("strategic_intelligence", _Analyzer._analyze_strategic_intelligence, output="strategic_intelligence",
+          requires=SCAN_PHASES, stream="section"),
+    # Phase 11: recommendations read only the components they judge
+    Phase("recommendations", _Analyzer._generate_strategic_recommendations, output="recommendations",
+          requires=("foundation-models", "AppleIntelligenceFramework", "StrategicDirectorFramework",
+                    "BridgeIntegrations"), stream="section"),
+    # Final readiness (written to the report summary and footer)
+    Phase("deployment_readiness", _Analyzer._score_deployment_readiness, output="deployment_readiness",
+          requires=SCAN_PHASES),
+])
+
 
 async def main():
     """Main execution function"""
@@ -1477,6 +1943,7 @@ async def main():
     
     # Generate final report
     await analyzer.generate_final_report()
+    analyzer.close()
     
     print("✅ ENHANCED ANALYSIS COMPLETE - READY FOR STRATEGIC IMPLEMENTATION")
 
@@ -0,0 +1,241 @@
+"""
+File Metrics Table - columnar per-file metrics for the whole project
+One row per scanned file, stored as a contiguous NumPy matrix so project-wide
+distributions come out of a single vectorized pass instead of many tiny
+per-phase calls.
+"""
+
+import warnings
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from lazy_imports import LazyModule, module_available
+
+# The analyzer imports this module at startup; numpy loads with the first table
+np = LazyModule("numpy")
+NUMPY_AVAILABLE = module_available("numpy")
+
+from source_scanners import (
+    SCAN_KIND_JAVASCRIPT, BRIDGE_SCAN_KINDS, SCAN_KIND_SWIFT_PATTERNS,
+    SCAN_KIND_FIGMA_PATTERNS, SCAN_KIND_XCODE_PATTERNS
+)
+
+METRIC_COLUMNS = (
+    "size_bytes",
+    "lines_of_code",
+    "functions_count",
+    "async_patterns",
+    "pattern_hits",
+    "complexity_score"
+)
+
+PERCENTILES = (50, 90, 99)
+
+
+def _pattern_hits(kind: str, result: Dict[str, Any]) -> int:
+    """Number of domain pattern hits a scan result reports"""
+    if kind == SCAN_KIND_JAVASCRIPT:
+        return result["mcp_patterns"] + result["apple_intelligence_patterns"] + result["quantum_patterns"]
+    if kind in BRIDGE_SCAN_KINDS:
+        return result["bridge_patterns"] + result["integration_points"]
+    if kind == SCAN_KIND_SWIFT_PATTERNS:
+        return int(result["m4_optimization"]) + int(result["neural_engine"])
+    if kind == SCAN_KIND_FIGMA_PATTERNS:
+        return int(result["mcp_integration"]) + len(result["figma_patterns"])
+    if kind == SCAN_KIND_XCODE_PATTERNS:
+        return len(result["bridge_patterns"]) + int(result["xcode_integration"])
+    return 0
+
+
+def _json_float(value: float) -> Optional[float]:
+    """NaN (no data) becomes None so reports stay valid JSON"""
+    value = float(value)
+    return None if value != value else value
+
+
+def column_statistics(matrix: "np.ndarray", column_names: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-column count, total, mean, std, min, max and percentiles of ``matrix``.
+
+    NaN marks a metric a file's scanners do not produce and is excluded. Every
+    statistic is a reduction over axis 0, so all columns are computed together.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a 2-D metrics matrix, got shape {matrix.shape}")
+    names = list(column_names) if column_names is not None else [str(i) for i in range(matrix.shape[1])]
+
+    present = ~np.isnan(matrix)
+    counts = present.sum(axis=0)
+    filled = np.where(present, matrix, 0.0)
+    totals = filled.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = totals / counts
+        variances = np.where(present, (matrix - means) ** 2, 0.0).sum(axis=0) / counts
+    minimums = np.where(present, matrix, np.inf).min(axis=0, initial=np.inf)
+    maximums = np.where(present, matrix, -np.inf).max(axis=0, initial=-np.inf)
+    empty = counts == 0
+    minimums[empty] = np.nan
+    maximums[empty] = np.nan
+
+    with warnings.catch_warnings():
+        # Columns without any data yield NaN percentiles, reported as None
+        warnings.simplefilter("ignore", RuntimeWarning)
+        percentiles = np.nanpercentile(matrix, PERCENTILES, axis=0) if matrix.shape[0] else \
+            np.full((len(PERCENTILES), matrix.shape[1]), np.nan)
+
+    statistics = {}
+    for index, name in enumerate(names):
+        statistics[name] = {
+            "count": int(counts[index]),
+            "total": float(totals[index]),
+            "mean": _json_float(means[index]),
+            "std": _json_float(np.sqrt(variances[index])),
+            "min": _json_float(minimums[index]),
+            "max": _json_float(maximums[index]),
+            **{f"p{percentile}": _json_float(percentiles[row, index])
+               for row, percentile in enumerate(PERCENTILES)}
+        }
+    return statistics
+
+
+class FileMetricsTable:
+    """
+    Columnar metrics for every file the phases scan.
+
+    Values live in one C-contiguous float64 matrix (rows = files, columns =
+    ``METRIC_COLUMNS``) that grows by doubling. A file scanned by several
+    kinds keeps a single row; each group is the file's top-level directory,
+    which is also how the phases split the project.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("FileMetricsTable requires numpy")
+        self.columns = METRIC_COLUMNS
+        self._values = np.full((max(1, capacity), len(METRIC_COLUMNS)), np.nan)
+        self._group_codes = np.zeros(max(1, capacity), dtype=np.int32)
+        self._rows: Dict[str, int] = {}
+        self._groups: Dict[str, int] = {}
+        self._recorded: Set[Tuple[str, str]] = set()
+        self.paths: List[str] = []
+        self.group_names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def matrix(self) -> "np.ndarray":
+        """(files x columns) view of the recorded metrics"""
+        return self._values[:len(self.paths)]
+
+    @property
+    def group_codes(self) -> "np.ndarray":
+        return self._group_codes[:len(self.paths)]
+
+    def column(self, name: str) -> "np.ndarray":
+        return self.matrix[:, self.columns.index(name)]
+
+    def _row(self, rel_path: str) -> int:
+        row = self._rows.get(rel_path)
+        if row is not None:
+            return row
+
+        row = len(self.paths)
+        if row == self._values.shape[0]:
+            self._values = np.vstack([self._values, np.full_like(self._values, np.nan)])
+            self._group_codes = np.concatenate([self._group_codes, np.zeros_like(self._group_codes)])
+
+        group = rel_path.split("/", 1)[0] if "/" in rel_path else "."
+        if group not in self._groups:
+            self._groups[group] = len(self.group_names)
+            self.group_names.append(group)
+
+        self._group_codes[row] = self._groups[group]
+        self._rows[rel_path] = row
+        self.paths.append(rel_path)
+        return row
+
+    def record(self, rel_path: str, size: int, kind: str, result: Dict[str, Any]):
+        """Fold one scan result into the file's row (a repeated (file, kind) is ignored)"""
+        if (rel_path, kind) in self._recorded:
+            return
+        self._recorded.add((rel_path, kind))
+
+        row = self._row(rel_path)  # may grow (and replace) the matrix
+        values = self._values[row]
+        values[0] = size
+
+        if kind == SCAN_KIND_JAVASCRIPT:
+            values[1:4] = (result["lines_of_code"], result["functions_count"], result["async_patterns"])
+            values[5] = result["complexity_score"]
+        elif kind in BRIDGE_SCAN_KINDS:
+            values[1] = result["lines_of_code"]
+            values[3] = result["async_operations"]
+            values[5] = result["complexity_score"]
+
+        # Presence scans only contribute pattern hits, which add up across kinds
+        hits = _pattern_hits(kind, result)
+        values[4] = hits if np.isnan(values[4]) else values[4] + hits
+
+    def paths_scanned_as(self, kinds: Iterable[str]) -> List[str]:
+        """Files recorded under any of ``kinds``, in row order"""
+        kinds = set(kinds)
+        scanned = {rel_path for rel_path, kind in self._recorded if kind in kinds}
+        return [rel_path for rel_path in self.paths if rel_path in scanned]
+
+    def discard(self, rel_paths: Iterable[str]):
+        """Drop the rows of ``rel_paths`` (changed or deleted files) so they can be recorded afresh"""
+        discarded = {rel_path for rel_path in rel_paths if rel_path in self._rows}
+        if not discarded:
+            return
+        count = len(self.paths)
+        keep = np.ones(count, dtype=bool)
+        keep[[self._rows[rel_path] for rel_path in discarded]] = False
+        kept = int(keep.sum())
+
+        values = np.full_like(self._values, np.nan)
+        values[:kept] = self._values[:count][keep]
+        group_codes = np.zeros_like(self._group_codes)
+        group_codes[:kept] = self._group_codes[:count][keep]
+        self._values, self._group_codes = values, group_codes
+
+        self.paths = [rel_path for rel_path in self.paths if rel_path not in discarded]
+        self._rows = {rel_path: row for row, rel_path in enumerate(self.paths)}
+        self._recorded = {key for key in self._recorded if key[0] not in discarded}
+
+    def statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Project-wide distribution of every column"""
+        return column_statistics(self.matrix, self.columns)
+
+    def group_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-group file count, column totals and means, via one scatter-add"""
+        matrix = self.matrix
+        present = ~np.isnan(matrix)
+        group_count = len(self.group_names)
+
+        totals = np.zeros((group_count, len(self.columns)))
+        counts = np.zeros((group_count, len(self.columns)))
+        np.add.at(totals, self.group_codes, np.where(present, matrix, 0.0))
+        np.add.at(counts, self.group_codes, present)
+        files = np.bincount(self.group_codes, minlength=group_count)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = totals / counts
+
+        return {
+            group: {
+                "files": int(files[code]),
+                "totals": {name: float(totals[code, index]) for index, name in enumerate(self.columns)},
+                "means": {name: _json_float(means[code, index]) for index, name in enumerate(self.columns)}
+            }
+            for code, group in enumerate(self.group_names)
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "file_count": len(self),
+            "columns": list(self.columns),
+            "statistics": self.statistics(),
+            "by_group": self.group_statistics()
+        }
@@ -0,0 +1,157 @@
+"""
+Async File Reader Pool - pipelined, bounded file reads for the Oksana analyzer
+Keeps many reads in flight at once (semaphore-bounded) while a byte budget caps
+how much file content can be buffered before the consumer picks it up.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, Optional, Tuple
+
+from tracing import span
+
+try:
+    import aiofiles
+    ASYNC_FILE_AVAILABLE = True
+except ImportError:
+    ASYNC_FILE_AVAILABLE = False
+
+DEFAULT_MAX_IN_FLIGHT = 32
+DEFAULT_MAX_BUFFERED_BYTES = 64 * 1024 * 1024
+
+
+class AsyncFileReaderPool:
+    """
+    Shared reader used by every phase.
+
+    ``max_in_flight`` bounds concurrent open/read operations; ``max_buffered_bytes``
+    bounds the total size of contents that have been reserved but not yet
+    released by the consumer. A single file larger than the whole budget is
+    still read, but only once nothing else is buffered.
+    """
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 max_buffered_bytes: int = DEFAULT_MAX_BUFFERED_BYTES):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_buffered_bytes = max(1, max_buffered_bytes)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._budget = asyncio.Condition()
+        self._buffered_bytes = 0
+
+        self.stats = {
+            "files_read": 0,
+            "bytes_read": 0,
+            "read_errors": 0,
+            "peak_buffered_bytes": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Byte budget
+    # ------------------------------------------------------------------
+
+    async def _reserve(self, size: int) -> int:
+        reservation = min(max(size, 1), self.max_buffered_bytes)
+        async with self._budget:
+            await self._budget.wait_for(
+                lambda: self._buffered_bytes + reservation <= self.max_buffered_bytes
+            )
+            self._buffered_bytes += reservation
+            self.stats["peak_buffered_bytes"] = max(self.stats["peak_buffered_bytes"], self._buffered_bytes)
+        return reservation
+
+    async def _release(self, reservation: int):
+        async with self._budget:
+            self._buffered_bytes -= reservation
+            self._budget.notify_all()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def _read_text(self, path: Path, size: int) -> str:
+        """Read a file as text; ``size`` is its size on disk (stat'ed when not known) for the byte counts"""
+        async with self._semaphore:
+            with span("read", "io") as read_span:
+                if size <= 0:
+                    size = await asyncio.to_thread(os.path.getsize, path)
+                if ASYNC_FILE_AVAILABLE:
+                    async with aiofiles.open(path, 'r') as f:
+                        content = await f.read()
+                else:
+                    content = await asyncio.to_thread(Path(path).read_text)
+                read_span.add(bytes=size, files=1)
+
+        self.stats["files_read"] += 1
+        self.stats["bytes_read"] += size
+        return content
+
+    async def read(self, path: Path, size_hint: int = 0) -> str:
+        """Read a single file through the shared in-flight and byte limits; ``size_hint`` is its size on disk"""
+        reservation = await self._reserve(size_hint)
+        try:
+            return await self._read_text(path, size_hint)
+        finally:
+            await self._release(reservation)
+
+    async def iter_reads(self, files: Iterable[Tuple[Path, int]],
+                         on_error: Optional[Callable[[Path, Exception], None]] = None
+                         ) -> AsyncIterator[Tuple[Path, str]]:
+        """
+        Yield ``(path, content)`` for each ``(path, size_hint)`` as its read completes.
+
+        A file's bytes stay reserved until the consumer asks for the next item,
+        so the budget covers both in-flight reads and yielded-but-unprocessed
+        content. Failed reads are reported through ``on_error`` and skipped.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        files = list(files)
+
+        async def fetch(path: Path, size_hint: int, reservation: int):
+            try:
+                content = await self._read_text(path, size_hint)
+            except asyncio.CancelledError:
+                await self._release(reservation)
+                raise
+            except Exception as e:
+                queue.put_nowait((path, None, e, reservation))
+            else:
+                queue.put_nowait((path, content, None, reservation))
+
+        async def produce():
+            tasks = []
+            try:
+                for path, size_hint in files:
+                    reservation = await self._reserve(size_hint)
+                    tasks.append(asyncio.create_task(fetch(path, size_hint, reservation)))
+                await asyncio.gather(*tasks)
+            except asyncio.CancelledError:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        producer = asyncio.create_task(produce())
+        try:
+            for _ in range(len(files)):
+                path, content, error, reservation = await queue.get()
+                try:
+                    if error is not None:
+                        self.stats["read_errors"] += 1
+                        if on_error:
+                            on_error(path, error)
+                        continue
+                    yield path, content
+                finally:
+                    await self._release(reservation)
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+            # Consumer stopped early: return the budget held by unconsumed reads
+            while not queue.empty():
+                await self._release(queue.get_nowait()[3])
@@ -0,0 +1,264 @@
+"""
+Hardware Probe - deferred, cached host detection for the Oksana analyzer
+Each probe runs at most once per process and only when first asked, instead
+of shelling out to sysctl while the analyzer is being constructed.
+
+The full capability profile (CPU, core counts, memory, the BLAS numpy was
+built against, analytics benchmark timings) is also cached on disk with a
+TTL, so repeated runs skip probing altogether. Probing blocks (sysctl
+subprocesses, /proc reads, importing numpy); async callers use
+``load_hardware_profile``, which does the work in a thread.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import platform
+import subprocess
+from dataclasses import asdict, dataclass, field, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from lazy_imports import module_available
+
+DEFAULT_PROFILE_PATH = Path.home() / ".cache" / "oksana-analyzer" / "hardware-profile.json"
+DEFAULT_PROFILE_TTL_SECONDS = 24 * 60 * 60
+PROFILE_VERSION = 1
+
+
+def _sysctl(name: str) -> str:
+    """Value of a macOS sysctl, or '' when unavailable"""
+    try:
+        result = subprocess.run(['sysctl', '-n', name], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+@lru_cache(maxsize=None)
+def cpu_brand_string() -> str:
+    """Marketing name of the CPU (e.g. 'Apple M4 Pro')"""
+    if sys.platform == "darwin":
+        return _sysctl("machdep.cpu.brand_string")
+
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+@lru_cache(maxsize=None)
+def is_apple_silicon() -> bool:
+    """True on arm64 Macs, including Python running under Rosetta"""
+    return sys.platform == "darwin" and _sysctl("hw.optional.arm64") == "1"
+
+
+def is_apple_m4() -> bool:
+    return sys.platform == "darwin" and 'M4' in cpu_brand_string()
+
+
+def _sysctl_int(name: str) -> int:
+    value = _sysctl(name)
+    return int(value) if value.isdigit() else 0
+
+
+def _logical_cpus() -> int:
+    """CPUs this process may run on (container and taskset limits included)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def _linux_physical_cpus() -> int:
+    cores = set()
+    physical_id = core_id = None
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("physical id"):
+                    physical_id = line.split(":", 1)[1].strip()
+                elif line.startswith("core id"):
+                    core_id = line.split(":", 1)[1].strip()
+                elif not line.strip() and core_id is not None:
+                    cores.add((physical_id, core_id))
+                    physical_id = core_id = None
+    except OSError:
+        return 0
+    if core_id is not None:
+        cores.add((physical_id, core_id))
+    return len(cores)
+
+
+def _memory_bytes() -> int:
+    if sys.platform == "darwin":
+        return _sysctl_int("hw.memsize")
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+def _blas_info() -> Dict[str, Any]:
+    """BLAS/LAPACK numpy was built against (imports numpy; {} without it)"""
+    if not module_available("numpy"):
+        return {}
+    try:
+        import numpy
+        dependencies = numpy.show_config(mode="dicts").get("Build Dependencies", {})
+    except Exception:
+        return {}
+    return {
+        library: {key: dependencies[library].get(key) for key in ("name", "version", "openblas configuration")
+                  if dependencies[library].get(key) is not None}
+        for library in ("blas", "lapack") if isinstance(dependencies.get(library), dict)
+    }
+
+
+def _host_key() -> str:
+    """Identifies the machine and interpreter a cached profile was probed with"""
+    return f"{platform.node()}|{sys.platform}|{platform.machine()}|{sys.executable}"
+
+
+@dataclass(frozen=True)
+class HardwareProfile:
+    """What the analyzer needs to know about the host, probed once and cached on disk"""
+    host: str
+    cpu_brand: str
+    apple_silicon: bool
+    apple_m4: bool
+    logical_cpus: int
+    physical_cpus: int
+    performance_cores: int
+    memory_bytes: int
+    blas: Dict[str, Any] = field(default_factory=dict)
+    analytics_benchmark_ms: Dict[str, float] = field(default_factory=dict)
+    probed_at: float = 0.0
+
+    @property
+    def neural_engine_cores(self) -> int:
+        return 16 if self.apple_m4 else 0
+
+    def scan_workers(self) -> int:
+        """
+        Worker processes for CPU-bound scans: the performance cores on Apple
+        silicon (efficiency cores would stretch the tail of every batch),
+        otherwise every CPU the process may use.
+        """
+        if self.apple_silicon and self.performance_cores:
+            return self.performance_cores
+        return max(1, self.logical_cpus)
+
+    def with_benchmarks(self, benchmark_ms: Mapping[str, float]) -> "HardwareProfile":
+        return replace(self, analytics_benchmark_ms=dict(benchmark_ms))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": PROFILE_VERSION, **asdict(self), "scan_workers": self.scan_workers()}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "HardwareProfile":
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__ if name in data})
+
+
+def probe_hardware() -> HardwareProfile:
+    """Probe the host now (blocking: sysctl subprocesses, /proc reads, a numpy import)"""
+    darwin = sys.platform == "darwin"
+    apple_silicon = is_apple_silicon()
+    return HardwareProfile(
+        host=_host_key(),
+        cpu_brand=cpu_brand_string(),
+        apple_silicon=apple_silicon,
+        apple_m4=is_apple_m4(),
+        logical_cpus=_logical_cpus(),
+        physical_cpus=_sysctl_int("hw.physicalcpu") if darwin else _linux_physical_cpus(),
+        performance_cores=_sysctl_int("hw.perflevel0.physicalcpu") if apple_silicon else 0,
+        memory_bytes=_memory_bytes(),
+        blas=_blas_info(),
+        probed_at=time.time()
+    )
+
+
+class CapabilityCache:
+    """
+    On-disk cache of the hardware profile.
+
+    A stored profile is reused while it is younger than ``ttl_seconds`` and
+    was probed on the same host with the same interpreter; otherwise the
+    host is probed again and the file rewritten. ``path=None`` disables the
+    disk cache (every process probes once).
+    """
+
+    def __init__(self, path: Optional[Path] = DEFAULT_PROFILE_PATH,
+                 ttl_seconds: float = DEFAULT_PROFILE_TTL_SECONDS):
+        self.path = Path(path) if path else None
+        self.ttl_seconds = ttl_seconds
+        self._profile: Optional[HardwareProfile] = None
+        self.stats = {"hits": 0, "probes": 0}
+
+    @classmethod
+    def from_environment(cls) -> "CapabilityCache":
+        """OKSANA_ANALYZER_HARDWARE_PROFILE sets the path or disables it with 'off'; _TTL is in seconds"""
+        configured = os.getenv("OKSANA_ANALYZER_HARDWARE_PROFILE")
+        ttl = float(os.getenv("OKSANA_ANALYZER_HARDWARE_PROFILE_TTL", DEFAULT_PROFILE_TTL_SECONDS))
+        if configured and configured.lower() in ("0", "off", "none", "disabled"):
+            return cls(None, ttl)
+        return cls(Path(configured) if configured else DEFAULT_PROFILE_PATH, ttl)
+
+    def load(self) -> Optional[HardwareProfile]:
+        """The stored profile if it is fresh and was probed on this host, else None"""
+        if self.path is None:
+            return None
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != PROFILE_VERSION or data.get("host") != _host_key():
+            return None
+        if not 0 <= time.time() - data.get("probed_at", 0) < self.ttl_seconds:
+            return None
+        try:
+            return HardwareProfile.from_dict(data)
+        except TypeError:
+            return None
+
+    def store(self, profile: HardwareProfile):
+        self._profile = profile
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent runs never read a torn file
+            temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            temporary.write_text(json.dumps(profile.to_dict(), indent=2))
+            os.replace(temporary, self.path)
+        except OSError:
+            pass
+
+    def profile(self) -> HardwareProfile:
+        """The cached profile, probing (and storing) when there is none (blocking)"""
+        if self._profile is None:
+            profile = self.load()
+            if profile is None:
+                self.stats["probes"] += 1
+                self.store(probe_hardware())
+            else:
+                self.stats["hits"] += 1
+                self._profile = profile
+        return self._profile
+
+    def summary(self) -> Dict[str, Any]:
+        return {**self.stats, "path": str(self.path) if self.path else None, "ttl_seconds": self.ttl_seconds}
+
+
+async def load_hardware_profile(cache: CapabilityCache) -> HardwareProfile:
+    """``cache.profile()`` without blocking the event loop"""
+    if cache._profile is not None:
+        return cache._profile
+    return await asyncio.to_thread(cache.profile)
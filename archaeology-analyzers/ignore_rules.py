@@ -0,0 +1,213 @@
+"""
+Ignore Rules - .gitignore-aware pruning for the Oksana analyzer's inventory walk
+A default ignore list (dependency folders, VCS metadata, build outputs and the
+XCodeProjects mirrors) plus every .gitignore found on the way down decide which
+directories are never entered and which files are never indexed.
+
+Patterns follow .gitignore semantics: later rules win, ``!`` re-includes, a
+trailing ``/`` only matches directories, a ``/`` anywhere else anchors the
+pattern to the directory of the file that declared it, and ``**`` spans
+directories. As in git, nothing inside an ignored directory can be re-included.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+GITIGNORE = ".gitignore"
+DEFAULT_IGNORE_PATTERNS = (
+    "node_modules/",
+    ".git/",
+    ".next/",
+    "build/",
+    "dist/",
+    ".build/",
+    "DerivedData/",
+    "__pycache__/",
+    "XCodeProjects/"
+)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Regex body for one gitignore glob ("*" and "?" stay within a path component)"""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+                if i + 2 == n:
+                    out.append(".*")
+                    i += 2
+                    continue
+                if pattern[i + 2] == "/":
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+            while i < n and pattern[i] == "*":
+                i += 1
+            out.append("[^/]*")
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1:i + 2] in ("!", "^", "]") else i + 1)
+            if end < 0:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                negated = body[:1] in ("!", "^")
+                body = body[1:] if negated else body
+                out.append(("[^" if negated else "[") + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreRule:
+    """One parsed pattern; anchored rules match the relative path, the others the name"""
+
+    __slots__ = ("pattern", "negated", "dir_only", "anchored", "regex", "_compiled")
+
+    def __init__(self, pattern: str, base: str = ""):
+        self.pattern = pattern
+        self.negated = pattern.startswith("!")
+        body = pattern[1:] if self.negated else pattern
+        self.dir_only = body.endswith("/")
+        body = body.rstrip("/")
+        self.anchored = "/" in body
+        body = body.lstrip("/") if self.anchored else body
+        try:
+            regex = _glob_to_regex(body)
+            re.compile(regex)
+        except re.error:
+            # Malformed bracket expressions match literally instead of breaking the walk
+            regex = re.escape(body)
+        prefix = re.escape(base + "/") if self.anchored and base else ""
+        self.regex = prefix + regex
+        self._compiled = re.compile(self.regex)
+
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        return self._compiled.fullmatch(rel_path if self.anchored else name) is not None
+
+
+def parse_ignore_lines(lines: Iterable[str], base: str = "") -> List[IgnoreRule]:
+    """Rules from .gitignore lines declared in directory ``base`` (relative to the walk root)"""
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n\r")
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("\\#") or line.startswith("\\!"):
+            line = line[1:]
+        if line in ("!", "/", "!/"):
+            continue
+        rules.append(IgnoreRule(line, base))
+    return rules
+
+
+def _combined(rules: Sequence[IgnoreRule]) -> Optional["re.Pattern"]:
+    return re.compile("|".join(f"(?:{rule.regex})" for rule in rules)) if rules else None
+
+
+class RuleSet:
+    """
+    The rules in effect inside one directory: its parent's rules followed by
+    its own .gitignore. Most paths match no rule at all, so one combined regex
+    per kind (file/directory) and target (name/path) answers those before the
+    rules are checked in order.
+    """
+
+    __slots__ = ("rules", "_quick")
+
+    def __init__(self, rules: Sequence[IgnoreRule] = ()):
+        self.rules = tuple(rules)
+        self._quick = {
+            is_dir: (
+                _combined([rule for rule in self.rules if not rule.anchored and (is_dir or not rule.dir_only)]),
+                _combined([rule for rule in self.rules if rule.anchored and (is_dir or not rule.dir_only)])
+            )
+            for is_dir in (False, True)
+        }
+
+    def extend(self, rules: Sequence[IgnoreRule]) -> "RuleSet":
+        return RuleSet(self.rules + tuple(rules)) if rules else self
+
+    def ignores(self, rel_path: str, is_dir: bool) -> bool:
+        """Whether the file or directory at ``rel_path`` (below this rule set's directory) is ignored"""
+        name = rel_path.rpartition("/")[2]
+        by_name, by_path = self._quick[is_dir]
+        if not ((by_name and by_name.fullmatch(name)) or (by_path and by_path.fullmatch(rel_path))):
+            return False
+        for rule in reversed(self.rules):
+            if rule.matches(rel_path, name, is_dir):
+                return not rule.negated
+        return False
+
+
+class IgnoreRules:
+    """
+    Default patterns plus (optionally) the .gitignore files of the tree.
+    ``rules_at`` gives the RuleSet for any directory; a walk that descends
+    one level at a time uses ``enter`` to add each directory's .gitignore.
+    """
+
+    def __init__(self, patterns: Sequence[str] = DEFAULT_IGNORE_PATTERNS, gitignore: bool = True):
+        self.patterns = list(patterns)
+        self.gitignore = gitignore
+        self._defaults = RuleSet(parse_ignore_lines(self.patterns))
+
+    @classmethod
+    def from_environment(cls) -> "IgnoreRules":
+        """
+        OKSANA_ANALYZER_IGNORE replaces the default patterns (comma-separated,
+        "none" for no defaults); OKSANA_ANALYZER_GITIGNORE=off skips .gitignore files
+        """
+        configured = os.getenv("OKSANA_ANALYZER_IGNORE")
+        if configured is None:
+            patterns = DEFAULT_IGNORE_PATTERNS
+        elif configured.strip().lower() == "none":
+            patterns = ()
+        else:
+            patterns = [pattern.strip() for pattern in configured.split(",") if pattern.strip()]
+        gitignore = os.getenv("OKSANA_ANALYZER_GITIGNORE", "on").lower() not in ("0", "off", "false", "no")
+        return cls(patterns, gitignore)
+
+    def enter(self, rules: RuleSet, dir_path: str, rel_dir: str) -> RuleSet:
+        """``rules`` extended with the .gitignore in ``dir_path``, if enabled and readable"""
+        if not self.gitignore:
+            return rules
+        try:
+            with open(os.path.join(dir_path, GITIGNORE), "r", errors="replace") as f:
+                return rules.extend(parse_ignore_lines(f, rel_dir))
+        except OSError:
+            return rules
+
+    def rules_at(self, root: Path, rel_dir: str) -> Optional[RuleSet]:
+        """Rules in effect inside ``root/rel_dir``; None when it or one of its parents is ignored"""
+        root = str(root)
+        rules = self.enter(self._defaults, root, "")
+        current = ""
+        for part in rel_dir.split("/") if rel_dir else ():
+            current = f"{current}/{part}" if current else part
+            if rules.ignores(current, True):
+                return None
+            rules = self.enter(rules, os.path.join(root, current), current)
+        return rules
+
+    def is_ignored(self, root: Path, rel_path: str, is_dir: bool) -> bool:
+        rules = self.rules_at(root, rel_path.rpartition("/")[0])
+        return rules is None or rules.ignores(rel_path, is_dir)
+
+    def summary(self):
+        return {"patterns": self.patterns, "gitignore": self.gitignore}
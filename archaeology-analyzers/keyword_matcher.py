@@ -0,0 +1,117 @@
+"""
+Keyword Matcher - single-pass multi-pattern counting for the source scanners
+Compiles every keyword of every pattern group into one regex and walks the
+buffer once, reproducing the analyzer's per-line ``any(pattern in line)``
+counting semantics for all groups at the same time.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, Sequence, Set, Tuple
+
+
+class KeywordMatcher:
+    """
+    Counts, per category, the number of lines containing at least one keyword.
+
+    The combined alternation is matched without overlaps (longest keyword
+    first), which is much faster than a lookahead scan. Occurrences hidden
+    inside a match are recovered from two precomputed tables:
+
+    * every keyword that is a substring of the matched keyword is present too;
+    * a keyword that starts inside the match and runs past its end
+      ("asyn[c]onnect") is checked explicitly with ``str.startswith``.
+
+    Keywords never contain newlines, so all recovered occurrences sit on the
+    line of the match itself.
+    """
+
+    def __init__(self, categories: Dict[str, Sequence[str]], case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self.categories = list(categories)
+
+        keyword_categories: Dict[str, Set[str]] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                keyword = keyword if case_sensitive else keyword.lower()
+                if not keyword or "\n" in keyword:
+                    raise ValueError(f"Invalid keyword {keyword!r} in category '{category}'")
+                keyword_categories.setdefault(keyword, set()).add(category)
+
+        keywords = sorted(keyword_categories, key=lambda keyword: (-len(keyword), keyword))
+        self._pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+        # Keywords guaranteed present whenever ``keyword`` matched
+        self._contained: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(other for other in keywords if other in keyword)
+            for keyword in keywords
+        }
+        # (offset, other) pairs where ``other`` may start inside ``keyword`` and overrun it
+        self._straddles: Dict[str, Tuple[Tuple[int, str], ...]] = {
+            keyword: tuple(
+                (offset, other)
+                for offset in range(1, len(keyword))
+                for other in keywords
+                if len(other) > len(keyword) - offset and other.startswith(keyword[offset:])
+            )
+            for keyword in keywords
+        }
+        self._keyword_categories: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(category for contained in self._contained[keyword]
+                               for category in keyword_categories[contained])
+            for keyword in keywords
+        }
+        self._single_categories = {keyword: frozenset(cats) for keyword, cats in keyword_categories.items()}
+        self.max_keyword_length = len(keywords[0]) if keywords else 0
+
+    def _prepare(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def _matches(self, text: str) -> Iterable[Tuple[int, str, FrozenSet[str]]]:
+        """Yield (start, keyword, keywords present at this match) in buffer order"""
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            keyword = match.group()
+            present = self._contained[keyword]
+            for offset, other in self._straddles[keyword]:
+                if text.startswith(other, start + offset):
+                    present = present | self._contained[other]
+            yield start, keyword, present
+
+    def count_lines(self, text: str) -> Dict[str, int]:
+        """Per category, how many ``text.split('\\n')`` lines contain any of its keywords"""
+        text = self._prepare(text)
+        counts = {category: 0 for category in self.categories}
+        last_line = {category: -1 for category in self.categories}
+
+        line = 0
+        last_position = 0
+        for start, keyword, present in self._matches(text):
+            line += text.count("\n", last_position, start)
+            last_position = start
+
+            categories = self._keyword_categories[keyword]
+            if len(present) > len(self._contained[keyword]):
+                categories = frozenset(category for other in present
+                                       for category in self._single_categories[other])
+            for category in categories:
+                if last_line[category] != line:
+                    last_line[category] = line
+                    counts[category] += 1
+
+        return counts
+
+    def find_keywords(self, text: str) -> Set[str]:
+        """All keywords occurring anywhere in ``text`` (stops once every keyword is seen)"""
+        text = self._prepare(text)
+        found: Set[str] = set()
+        total = len(self._contained)
+        for _, _, present in self._matches(text):
+            found |= present
+            if len(found) == total:
+                break
+        return found
+
+    def find_categories(self, text: str) -> Set[str]:
+        """Categories with at least one keyword occurring in ``text``"""
+        return {category for keyword in self.find_keywords(text)
+                for category in self._single_categories[keyword]}
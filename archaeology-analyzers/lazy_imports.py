@@ -0,0 +1,57 @@
+"""
+Lazy Imports - optional heavy dependencies are loaded on first use
+Availability is answered from import metadata without executing the module,
+so importing the analyzer stays cheap (it runs as a pre-commit step, where
+startup time dominates).
+"""
+
+import importlib
+import importlib.util
+from functools import lru_cache
+from types import ModuleType
+from typing import Optional
+
+
+@lru_cache(maxsize=None)
+def module_available(name: str) -> bool:
+    """True if top-level module ``name`` is installed, checked without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def optional_import(name: str) -> Optional[ModuleType]:
+    """Import ``name`` on first call; None if it (or one of its dependencies) is missing"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+class LazyModule:
+    """
+    Module proxy that imports the real module on first attribute access.
+
+    ``np = LazyModule("numpy")`` keeps ``np.array(...)`` call sites unchanged
+    while numpy is only imported when one of them actually runs.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
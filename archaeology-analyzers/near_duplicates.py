@@ -0,0 +1,313 @@
+"""
+Near Duplicates - MinHash / LSH detection of near-copies across project sources
+Numbered component variants (QuantumSpatial_12.tsx, output/svg-components/*)
+and forked bridge files are near-copies that inflate the phases' counts.
+Every source file gets a MinHash signature over shingles of code tokens;
+locality-sensitive hashing buckets signatures by bands so only files sharing
+a band are compared, which keeps the search roughly linear in the file count.
+Signing every source is a second pass over the tree on cold runs, so the
+phase is opt-in.
+"""
+
+import os
+import re
+import time
+import zlib
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from lazy_imports import LazyModule, module_available
+
+# Detection is opt-in; runs without it never import numpy
+np = LazyModule("numpy")
+NUMPY_AVAILABLE = module_available("numpy")
+
+SHINGLE_TOKENS = 5
+NUM_PERMUTATIONS = 64
+BANDS = 16                      # 16 bands x 4 rows: pairs above ~0.5 similarity become candidates
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+DEFAULT_THRESHOLD = 0.8
+MIN_FILE_BYTES = 256            # tiny files are trivially "similar"
+MAX_BUCKET_PAIRS = 32           # larger buckets are linked through their first member only
+MAX_REPORTED_CLUSTERS = 100
+MAX_REPORTED_MEMBERS = 25
+
+DEFAULT_SUFFIXES = (".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".swift", ".svg", ".css", ".vue")
+
+CODE_TOKEN = re.compile(r"[A-Za-z_$][\w$]*|\d+")
+TRAILING_WORD = re.compile(r"[\w$]*\Z")
+
+# Shingle hashes are 64-bit: the top bits pick one of NUM_PERMUTATIONS bins,
+# the rest are the value whose minimum each bin keeps (one-permutation hashing)
+_BIN_SHIFT = 64 - NUM_PERMUTATIONS.bit_length() + 1
+_VALUE_MASK = (1 << _BIN_SHIFT) - 1
+_SHINGLE_MIX = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93, 0xFF51AFD7ED558CCD)
+_FINALIZER = (0xBF58476D1CE4E5B9, 0x94D049BB133111EB)
+_DENSIFY_STEP = 0x2545F4914F6CDD1D     # offset per bin a value is borrowed across
+_constants: Optional[SimpleNamespace] = None
+
+
+def _hash_constants() -> SimpleNamespace:
+    """numpy scalars of the hash constants, built once (numpy 1.x would turn large Python ints into floats)"""
+    global _constants
+    if _constants is None:
+        u64 = np.uint64
+        _constants = SimpleNamespace(
+            mix=[u64(value) for value in _SHINGLE_MIX],
+            finalizer=[u64(value) for value in _FINALIZER],
+            shifts=[u64(31), u64(29), u64(32)],
+            bin_shift=u64(_BIN_SHIFT),
+            value_mask=u64(_VALUE_MASK),
+            densify_step=u64(_DENSIFY_STEP),
+            signature_shift=u64(_BIN_SHIFT - 32),
+            bins=np.arange(NUM_PERMUTATIONS),
+            uint64=u64,
+            numpy=np._load()
+        )
+    return _constants
+
+
+class MinHasher:
+    """
+    Incremental MinHash signature of a text's token shingles.
+
+    Tokens are hashed with crc32 and each run of ``SHINGLE_TOKENS`` consecutive
+    token hashes is mixed into one 64-bit shingle hash. Rather than applying
+    NUM_PERMUTATIONS hash functions to every shingle, the hash's top bits
+    assign it to one of NUM_PERMUTATIONS bins and each bin keeps its minimum;
+    bins no shingle fell into borrow the next filled bin's value on close
+    (rotation densification). Two files still agree on a bin with probability
+    close to their Jaccard similarity, for one hash per shingle.
+
+    Minima are order-free, so the text may be fed in any pieces: a word cut
+    off at the end of a piece and the last tokens of the previous piece are
+    carried over.
+    """
+
+    def __init__(self):
+        self._minimums = None
+        self._carry: List[int] = []     # hashes of the last SHINGLE_TOKENS - 1 tokens
+        self._pending = ""
+        self._shingles = 0
+
+    def feed(self, text: str):
+        text = self._pending + text
+        cut = _trailing_word_start(text)
+        self._pending = text[cut:]
+        self._add_tokens(CODE_TOKEN.findall(text, 0, cut))
+
+    def _add_tokens(self, tokens: List[str]):
+        if not tokens:
+            return
+        hashes = self._carry + list(map(zlib.crc32, map(str.encode, tokens)))
+        self._carry = hashes[-(SHINGLE_TOKENS - 1):]
+        count = len(hashes) - SHINGLE_TOKENS + 1
+        if count > 0:
+            self._add_shingles(hashes, count)
+
+    def _add_shingles(self, token_hashes: List[int], count: int):
+        k = _hash_constants()
+        numpy = k.numpy
+        hashes = numpy.array(token_hashes, dtype=k.uint64)
+        shingles = hashes[:count] * k.mix[0]
+        for offset in range(1, min(SHINGLE_TOKENS, len(hashes))):
+            shingles += hashes[offset:offset + count] * k.mix[offset]
+        # splitmix64 finalizer: every input bit reaches the bin bits
+        shingles ^= shingles >> k.shifts[0]
+        shingles *= k.finalizer[0]
+        shingles ^= shingles >> k.shifts[1]
+        shingles *= k.finalizer[1]
+        shingles ^= shingles >> k.shifts[2]
+        if self._minimums is None:
+            self._minimums = numpy.full(NUM_PERMUTATIONS, _VALUE_MASK + 1, dtype=k.uint64)
+        numpy.minimum.at(self._minimums, (shingles >> k.bin_shift).astype(numpy.intp), shingles & k.value_mask)
+        self._shingles += count
+
+    def close(self) -> Dict[str, Any]:
+        """``{"signature": hex or None, "shingles": n}``; texts shorter than one shingle hash as a whole"""
+        self._add_tokens(CODE_TOKEN.findall(self._pending))
+        self._pending = ""
+        if self._shingles == 0 and self._carry:
+            self._add_shingles(self._carry, 1)
+        if self._minimums is None:
+            return {"signature": None, "shingles": 0}
+
+        k = _hash_constants()
+        filled = (self._minimums <= k.value_mask).nonzero()[0]
+        # Each bin takes its own value or that of the next filled bin, wrapping around
+        source = filled[filled.searchsorted(k.bins) % len(filled)]
+        distance = ((source - k.bins) % NUM_PERMUTATIONS).astype(k.uint64)
+        values = (self._minimums[source] + distance * k.densify_step) & k.value_mask
+        signature = (values >> k.signature_shift).astype(">u4").tobytes().hex()
+        return {"signature": signature, "shingles": self._shingles}
+
+
+def _trailing_word_start(text: str) -> int:
+    """Start of the word ``text`` ends in (its length if it ends in a non-word character)"""
+    start = len(text)
+    while start > 0:
+        # Only the tail is searched: a pattern anchored at the end still tries every position
+        window = max(start - 64, 0)
+        found = TRAILING_WORD.search(text, window).start()
+        if found > window or window == 0:
+            return found
+        start = window
+    return start
+
+
+def minhash_signature(content: str) -> Dict[str, Any]:
+    hasher = MinHasher()
+    hasher.feed(content)
+    return hasher.close()
+
+
+def decode_signatures(signatures: Iterable[str]) -> "np.ndarray":
+    """(files x NUM_PERMUTATIONS) uint32 matrix of hex signatures"""
+    raw = b"".join(bytes.fromhex(signature) for signature in signatures)
+    return np.frombuffer(raw, dtype=">u4").astype(np.uint32).reshape(-1, NUM_PERMUTATIONS)
+
+
+class _DisjointSet:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first: int, second: int):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+def candidate_pairs(matrix: "np.ndarray") -> Set[Tuple[int, int]]:
+    """Row pairs that agree on at least one band of their signatures"""
+    pairs: Set[Tuple[int, int]] = set()
+    for band in range(BANDS):
+        columns = matrix[:, band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        _, bucket_of, sizes = np.unique(columns, axis=0, return_inverse=True, return_counts=True)
+        bucket_of = bucket_of.reshape(-1)
+        shared = np.flatnonzero(sizes[bucket_of] > 1)
+        order = shared[np.argsort(bucket_of[shared], kind="stable")]
+        boundaries = np.flatnonzero(np.diff(bucket_of[order])) + 1
+        for bucket in np.split(order, boundaries):
+            members = bucket.tolist()
+            if len(members) <= MAX_BUCKET_PAIRS:
+                pairs.update((first, second) for index, first in enumerate(members) for second in members[index + 1:])
+            else:
+                pairs.update((members[0], second) for second in members[1:])
+    return pairs
+
+
+def find_clusters(matrix: "np.ndarray", threshold: float = DEFAULT_THRESHOLD) -> Tuple[List[List[int]], int]:
+    """
+    Groups of rows whose estimated Jaccard similarity (share of equal MinHash
+    values) reaches ``threshold``, linked transitively; plus the number of
+    candidate pairs LSH produced.
+
+    Identical signatures are collapsed first, so byte-identical copies cost
+    one row however many there are.
+    """
+    unique, row_of = np.unique(matrix, axis=0, return_inverse=True)
+    row_of = row_of.reshape(-1)
+    pairs = candidate_pairs(unique)
+    groups = _DisjointSet(len(unique))
+    if pairs:
+        first, second = np.array(sorted(pairs)).T
+        similarity = (unique[first] == unique[second]).mean(axis=1)
+        for left, right in zip(first[similarity >= threshold].tolist(), second[similarity >= threshold].tolist()):
+            groups.union(left, right)
+
+    members: Dict[int, List[int]] = {}
+    for row, unique_row in enumerate(row_of.tolist()):
+        members.setdefault(groups.find(unique_row), []).append(row)
+    return [rows for rows in members.values() if len(rows) > 1], len(pairs)
+
+
+class NearDuplicateDetector:
+    """
+    Finds near-duplicate source files from their MinHash signatures.
+
+    ``exclude`` asks the analyzer to drop every copy but one representative
+    per cluster from what phases 1-9 see, so copies stop inflating the
+    sophistication inputs.
+    """
+
+    def __init__(self, enabled: bool = True, threshold: float = DEFAULT_THRESHOLD, exclude: bool = False,
+                 suffixes: Iterable[str] = DEFAULT_SUFFIXES, min_bytes: int = MIN_FILE_BYTES):
+        self.enabled = enabled and NUMPY_AVAILABLE
+        self.threshold = threshold
+        self.exclude = exclude
+        self.suffixes = tuple(suffixes)
+        self.min_bytes = min_bytes
+
+    @classmethod
+    def from_environment(cls) -> "NearDuplicateDetector":
+        """
+        Opt-in: OKSANA_ANALYZER_NEAR_DUPLICATES=on reports clusters, =exclude also
+        keeps copies out of the phases; _NEAR_DUPLICATE_THRESHOLD sets the similarity
+        """
+        configured = os.getenv("OKSANA_ANALYZER_NEAR_DUPLICATES", "off").lower()
+        return cls(
+            enabled=configured not in ("0", "off", "false", "no"),
+            threshold=float(os.getenv("OKSANA_ANALYZER_NEAR_DUPLICATE_THRESHOLD", DEFAULT_THRESHOLD)),
+            exclude=configured == "exclude"
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        return {"threshold": self.threshold, "exclude": self.exclude, "suffixes": list(self.suffixes),
+                "permutations": NUM_PERMUTATIONS, "bands": BANDS, "shingle_tokens": SHINGLE_TOKENS}
+
+    def analyze(self, signatures: Mapping[str, str], sizes: Mapping[str, int],
+                phases: Optional[Mapping[str, str]] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Clusters of near-duplicate files among ``signatures`` (rel_path -> hex),
+        plus the sorted copies: every member but the representative, which is
+        a cluster's shortest path (the unnumbered original, usually).
+        """
+        start_time = time.perf_counter()
+        paths = sorted(signatures)
+        results: Dict[str, Any] = {
+            **self.summary(),
+            "files": len(paths),
+            "candidate_pairs": 0,
+            "cluster_count": 0,
+            "duplicate_files": 0,
+            "duplicate_bytes": 0,
+            "clusters": []
+        }
+        copies: List[str] = []
+        if len(paths) < 2:
+            results["processing_time_ms"] = (time.perf_counter() - start_time) * 1000
+            return results, copies
+
+        matrix = decode_signatures(signatures[path] for path in paths)
+        clusters, results["candidate_pairs"] = find_clusters(matrix, self.threshold)
+
+        reported = []
+        for rows in clusters:
+            rows.sort(key=lambda row: (len(paths[row]), paths[row]))
+            representative, others = rows[0], rows[1:]
+            similarity = (matrix[others] == matrix[representative]).mean(axis=1)
+            copies.extend(paths[row] for row in others)
+            results["duplicate_bytes"] += sum(sizes.get(paths[row], 0) for row in others)
+            reported.append({
+                "representative": paths[representative],
+                "files": len(rows),
+                "similarity": {"min": float(similarity.min()), "mean": float(similarity.mean())},
+                "phases": dict(Counter(phases.get(paths[row], ".") for row in rows).most_common()) if phases else {},
+                "members": [{"path": paths[row], "similarity": float(value)}
+                            for row, value in zip(others[:MAX_REPORTED_MEMBERS], similarity.tolist())]
+            })
+
+        reported.sort(key=lambda cluster: (-cluster["files"], cluster["representative"]))
+        results["cluster_count"] = len(reported)
+        results["clusters"] = reported[:MAX_REPORTED_CLUSTERS]
+        copies.sort()
+        results["duplicate_files"] = len(copies)
+        results["processing_time_ms"] = (time.perf_counter() - start_time) * 1000
+        return results, copies
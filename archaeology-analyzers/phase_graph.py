@@ -0,0 +1,198 @@
+"""
+Phase Graph - declarative phase registry and DAG scheduler for the Oksana analyzer
+Each phase declares the project subtrees it reads, the phases whose outputs
+it reads and the analysis_results key it writes. The scheduler starts every
+phase as soon as the phases it requires have finished, bounds how many
+phases of a concurrency pool run at once, cancels whatever is still running
+when a phase fails, and skips phases whose inputs did not change since they
+last ran.
+"""
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+# Scheduler outcome per phase
+RAN = "ran"
+CACHED = "cached"
+DISABLED = "disabled"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+@dataclass(frozen=True)
+class Phase:
+    """
+    One node of the analysis graph.
+
+    ``run`` is called with the analyzer. ``output`` is the analysis_results
+    key the phase writes ("/" separates nested keys), ``inputs`` the
+    project-relative files and directories it reads ("" is the whole tree)
+    and ``requires`` the phases whose outputs it reads. Phases sharing a
+    ``pool`` are bounded together by the scheduler's limits. ``stream`` is
+    the NDJSON record type the output is streamed as once the phase
+    finishes (None when the phase streams itself or is only in the footer).
+    ``output_digest`` summarizes what dependents actually read from the
+    phase, so a re-run that hands them the same thing does not invalidate
+    them; without it every re-run does.
+    """
+    name: str
+    run: Callable[[Any], Awaitable[Any]]
+    output: str
+    inputs: Tuple[str, ...] = ()
+    requires: Tuple[str, ...] = ()
+    pool: Optional[str] = None
+    category: str = "phase"
+    stream: Optional[str] = None
+    enabled: Optional[Callable[[Any], bool]] = None
+    output_digest: Optional[Callable[[Any], str]] = None
+
+    @property
+    def output_path(self) -> Tuple[str, ...]:
+        return tuple(self.output.split("/"))
+
+
+class PhaseRegistry:
+    """
+    Ordered set of phases. A phase may only require phases registered before
+    it, so registration order is always a valid execution order and the
+    graph cannot contain a cycle.
+    """
+
+    def __init__(self, phases: Iterable[Phase] = ()):
+        self._phases: Dict[str, Phase] = {}
+        for phase in phases:
+            self.register(phase)
+
+    def register(self, phase: Phase) -> Phase:
+        if phase.name in self._phases:
+            raise ValueError(f"Phase '{phase.name}' is already registered")
+        unknown = [name for name in phase.requires if name not in self._phases]
+        if unknown:
+            raise ValueError(f"Phase '{phase.name}' requires unregistered phases {unknown}")
+        outputs = {registered.output: registered.name for registered in self._phases.values()}
+        if phase.output in outputs:
+            raise ValueError(f"Phases '{outputs[phase.output]}' and '{phase.name}' both write '{phase.output}'")
+        self._phases[phase.name] = phase
+        return phase
+
+    def copy(self) -> "PhaseRegistry":
+        return PhaseRegistry(self._phases.values())
+
+    def __iter__(self) -> Iterator[Phase]:
+        return iter(self._phases.values())
+
+    def __len__(self) -> int:
+        return len(self._phases)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._phases
+
+    def __getitem__(self, name: str) -> Phase:
+        return self._phases[name]
+
+    def names(self) -> List[str]:
+        return list(self._phases)
+
+
+class PhaseScheduler:
+    """
+    Runs a registry as a DAG.
+
+    ``limits`` maps a pool name to the number of its phases that may run at
+    once (phases without a pool, or in a pool without a limit, are not
+    bounded). With ``input_digest`` the scheduler fingerprints each phase
+    from the digest of its inputs and the output digests of the phases it
+    requires; a phase whose fingerprint matches the one recorded in
+    ``fingerprints`` (name -> (fingerprint, output digest)) when it last ran
+    is skipped. The caller owns ``fingerprints`` and clears it when earlier
+    outputs become invalid.
+    """
+
+    def __init__(self, registry: PhaseRegistry, limits: Optional[Mapping[str, int]] = None,
+                 fingerprints: Optional[Dict[str, Tuple[str, str]]] = None,
+                 input_digest: Optional[Callable[[Phase], str]] = None):
+        self.registry = registry
+        self.limits = dict(limits or {})
+        self.fingerprints = fingerprints if fingerprints is not None else {}
+        self.input_digest = input_digest
+        self.statuses: Dict[str, str] = {}
+
+    def _fingerprint(self, phase: Phase) -> Optional[str]:
+        if self.input_digest is None:
+            return None
+        digest = hashlib.blake2b(phase.name.encode(), digest_size=16)
+        digest.update(self.input_digest(phase).encode())
+        for name in phase.requires:
+            digest.update(self.fingerprints.get(name, ("", ""))[1].encode())
+        return digest.hexdigest()
+
+    async def run(self, context: Any, runner: Optional[Callable[[Phase], Awaitable[Any]]] = None) -> Dict[str, str]:
+        """
+        Run every phase of the registry against ``context`` (through ``runner``
+        when given) and return each phase's status. The first failure cancels
+        the phases still running or waiting and is re-raised; cancelling the
+        caller cancels them as well.
+        """
+        runner = runner or (lambda phase: phase.run(context))
+        pools = {name: asyncio.Semaphore(max(1, limit)) for name, limit in self.limits.items()}
+        self.statuses = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_node(phase: Phase):
+            try:
+                await asyncio.gather(*(tasks[name] for name in phase.requires))
+            except BaseException:
+                # A required phase failed or was cancelled: this one never starts
+                self.statuses[phase.name] = CANCELLED
+                raise asyncio.CancelledError()
+            if phase.enabled is not None and not phase.enabled(context):
+                self.statuses[phase.name] = DISABLED
+                self.fingerprints[phase.name] = (DISABLED, DISABLED)
+                return
+            fingerprint = self._fingerprint(phase)
+            if fingerprint is not None and self.fingerprints.get(phase.name, ("", ""))[0] == fingerprint:
+                self.statuses[phase.name] = CACHED
+                return
+            # Forget the old fingerprint first: a failed or cancelled run leaves the output stale
+            self.fingerprints.pop(phase.name, None)
+            pool = pools.get(phase.pool)
+            try:
+                if pool is None:
+                    await runner(phase)
+                else:
+                    async with pool:
+                        await runner(phase)
+            except asyncio.CancelledError:
+                self.statuses[phase.name] = CANCELLED
+                raise
+            except BaseException:
+                self.statuses[phase.name] = FAILED
+                raise
+            self.statuses[phase.name] = RAN
+            if fingerprint is not None:
+                output = phase.output_digest(context) if phase.output_digest is not None else fingerprint
+                self.fingerprints[phase.name] = (fingerprint, output)
+
+        for phase in self.registry:
+            tasks[phase.name] = asyncio.ensure_future(run_node(phase))
+        try:
+            _, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+        except asyncio.CancelledError:
+            await self._cancel(tasks.values())
+            raise
+        if pending:
+            await self._cancel(pending)
+
+        failures = [task.exception() for name, task in tasks.items() if self.statuses.get(name) == FAILED]
+        if failures:
+            raise failures[0]
+        return dict(self.statuses)
+
+    @staticmethod
+    async def _cancel(tasks: Iterable[asyncio.Task]):
+        tasks = [task for task in tasks if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark - reproducible analyzer throughput on synthetic project trees
+Generates deterministic trees with the layout the analyzer expects
+(foundation-models, AppleIntelligenceFramework, CreatrixPortal/*, FigmaMCPServer,
+XcodeModelBridge, scripts/services, docs) at 1k, 10k and 100k files, then times
+the inventory walk, every phase and the full pipeline in fresh interpreters.
+Reports files/s, MB/s and peak RSS and saves the run as JSON for comparing
+commits.
+
+Usage: python3 pipeline_benchmark.py [--sizes 1k,10k,100k] [--cases pipeline,Scripts]
+                                     [--runs N] [--output FILE] [--compare BASELINE.json]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import platform
+import statistics
+import contextlib
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+ANALYZER_DIR = Path(__file__).resolve().parent
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_TREE_DIR = Path(tempfile.gettempdir()) / "oksana-benchmark-trees"
+GENERATOR_VERSION = 2
+TREE_MARKER = ".oksana-benchmark.json"
+
+# Bulk of the generated files: (directory, share of files, extensions)
+LAYOUT: Tuple[Tuple[str, float, Tuple[str, ...]], ...] = (
+    ("foundation-models/learning-pipeline", 0.08, (".py", ".swift", ".json")),
+    ("AppleIntelligenceFramework/Sources", 0.14, (".swift",)),
+    ("AppleIntelligenceFramework/web", 0.10, (".ts", ".tsx")),
+    ("StrategicDirectorFramework/src", 0.04, (".ts", ".js")),
+    ("CreatrixPortal/vercel", 0.05, (".ts", ".tsx", ".js")),
+    ("CreatrixPortal/framer-cloudflare-sync", 0.03, (".ts", ".js")),
+    ("CreatrixPortal/services", 0.04, (".ts",)),
+    ("CreatrixPortal/scripts", 0.02, (".js",)),
+    ("CreatrixPortal/lib", 0.04, (".ts", ".tsx")),
+    ("CreatrixPortal/config", 0.01, (".json", ".ts")),
+    ("CreatrixPortal/integrations", 0.03, (".ts",)),
+    ("FigmaMCPServer/src", 0.10, (".js", ".ts")),
+    ("XcodeModelBridge/Sources", 0.08, (".swift",)),
+    ("XcodeModelBridge/ts", 0.05, (".ts",)),
+    ("scripts/services", 0.05, (".js", ".ts")),
+    ("scripts/services/brand-aware-content", 0.02, (".ts", ".css")),
+    ("scripts/validation", 0.02, (".js", ".ts")),
+    ("docs", 0.10, (".md",)),
+)
+FILES_PER_MODULE = 200
+
+# Files the phases look up by name
+FIXED_FILES = (
+    "foundation-models/index.js",
+    "foundation-models/package.json",
+    "foundation-models/grid-claude-hybrid-processor.js",
+    "foundation-models/cross-project-validation-router.js",
+    "foundation-models/sources-of-truth-authenticator.js",
+    "foundation-models/apple-intelligence-qa-framework.js",
+    "foundation-models/learning-pipeline/setup-apple-intelligence.sh",
+    "StrategicDirectorFramework/pattern-and-alignment-validator.js",
+    "StrategicDirectorFramework/strategic-director-bridge.ts",
+    "StrategicDirectorFramework/strategic-director-auto-integration.ts",
+    "StrategicDirectorFramework/archaeology-configuration.js",
+    "StrategicDirectorFramework/tsconfig.json",
+    "CreatrixPortal/vercel/package.json",
+    "CreatrixPortal/lib/quantum-secure.ts",
+    "scripts/services/init-services.js",
+    "scripts/services/quantum-env-bridge.ts",
+    "SwiftTypescriptServiceBridge.swift",
+    "CreativeIntelligenceBridge.js",
+    "setup-oksana-foundation.sh",
+)
+
+TEMPLATES = {
+    ".js": (
+        "import {{ mcp }} from './mcp-client'\n"
+        "export async function handle{n}(request) {{\n"
+        "  try {{\n    const result = await quantum.process(request, {{ apple: true }})\n"
+        "    return result\n  }} catch (error) {{\n    console.error(error)\n  }}\n}}\n"
+        "class Component{n} {{\n  async render() {{ return figma.design.component }}\n}}\n"
+    ),
+    ".ts": (
+        "import {{ NeuralEngine }} from './neural'\n"
+        "export interface Props{n} {{ id: string; score: number }}\n"
+        "export const service{n} = async (props: Props{n}) => {{\n"
+        "  const bridge = await connect('xcode-model-bridge')\n  return bridge.convert(props)\n}}\n"
+    ),
+    ".tsx": (
+        "import React from 'react'\n"
+        "export function View{n}({{ label }}: {{ label: string }}) {{\n"
+        "  return <div className=\"quantum-{n}\">{{label}}</div>\n}}\n"
+    ),
+    ".swift": (
+        "import Foundation\nimport CoreML\n\n"
+        "struct Feature{n} {{\n  let identifier = \"{n}\"\n"
+        "  func predict() async throws -> Double {{\n    try await NeuralEngine.shared.run(model: \"m4\")\n  }}\n}}\n"
+    ),
+    ".py": "def feature_{n}(values):\n    \"\"\"Learning pipeline step {n}\"\"\"\n    return sum(values) / max(len(values), 1)\n",
+    ".json": "{{\"id\": {n}, \"name\": \"config-{n}\", \"scripts\": {{\"build\": \"tsc\"}}}}\n",
+    ".md": "# Document {n}\n\nStrategic notes for component {n}.\n\n- apple intelligence\n- quantum spatial\n",
+    ".css": ".quantum-{n} {{ color: var(--brand-{n}); display: grid; }}\n",
+    ".sh": "#!/bin/sh\necho setup {n}\n",
+}
+
+
+def parse_sizes(value: str) -> List[int]:
+    """'1k,10k,100k' -> [1000, 10000, 100000]"""
+    sizes = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        if part:
+            sizes.append(int(float(part[:-1]) * 1000) if part.endswith("k") else int(part))
+    return sizes
+
+
+def _content(extension: str, index: int, rng: random.Random) -> str:
+    template = TEMPLATES.get(extension, TEMPLATES[".md"])
+    repeats = rng.randint(1, 6)
+    return template.format(n=index) * (1 if extension == ".json" else repeats)
+
+
+def generate_tree(root: Path, file_count: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Write a deterministic synthetic project with ``file_count`` files under
+    ``root``. An existing tree generated with the same parameters is reused.
+    """
+    root = Path(root)
+    marker_path = root / TREE_MARKER
+    expected = {"files": file_count, "seed": seed, "generator_version": GENERATOR_VERSION}
+    if marker_path.is_file():
+        marker = json.loads(marker_path.read_text())
+        if {key: marker.get(key) for key in expected} == expected:
+            return marker
+
+    if root.exists():
+        shutil.rmtree(root)
+    rng = random.Random(seed)
+    total_bytes = 0
+
+    def write(rel_path: str, content: str):
+        nonlocal total_bytes
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = content.encode("utf-8")
+        path.write_bytes(data)
+        total_bytes += len(data)
+
+    for index, rel_path in enumerate(FIXED_FILES):
+        write(rel_path, _content(Path(rel_path).suffix, index, rng))
+
+    remaining = max(file_count - len(FIXED_FILES), 0)
+    weights = [share for _, share, _ in LAYOUT]
+    counts = [int(remaining * share / sum(weights)) for share in weights]
+    counts[0] += remaining - sum(counts)
+    index = len(FIXED_FILES)
+    for (directory, _, extensions), count in zip(LAYOUT, counts):
+        for position in range(count):
+            extension = extensions[position % len(extensions)]
+            write(f"{directory}/module{position // FILES_PER_MODULE}/file{index}{extension}",
+                  _content(extension, index, rng))
+            index += 1
+
+    marker = {**expected, "total_bytes": total_bytes, "generated_at": datetime.now().isoformat()}
+    marker_path.write_text(json.dumps(marker, indent=2))
+    return marker
+
+
+def _peak_rss() -> Tuple[Optional[int], Optional[int]]:
+    """Peak resident set size of this process and of its largest child, in bytes"""
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KiB on Linux
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+
+async def _measure_case(root: Path, case: str) -> Dict[str, Any]:
+    from analysis_cache import AnalysisCache
+    from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer
+    from file_metrics import FileMetricsTable, NUMPY_AVAILABLE
+    from ignore_rules import IgnoreRules
+    from project_inventory import ProjectInventory
+    from tracing import Tracer, span
+
+    if case == "inventory":
+        start = time.perf_counter()
+        inventory = await asyncio.to_thread(ProjectInventory.build, root, IgnoreRules.from_environment())
+        return {"seconds": time.perf_counter() - start,
+                "files": len(inventory), "bytes": inventory.total_bytes()}
+
+    tracer = Tracer()
+    analyzer = EnhancedOksanaPlatformAnalyzer(analysis_cache=AnalysisCache(), project_root=root, tracer=tracer)
+    try:
+        if case == "pipeline":
+            start = time.perf_counter()
+            await analyzer.analyze_complete_project_structure()
+            seconds = time.perf_counter() - start
+            return {"seconds": seconds, "files": len(analyzer.inventory), "bytes": analyzer.inventory.total_bytes()}
+
+        phases = dict(analyzer.independent_phases())
+        if case not in phases:
+            raise ValueError(f"Unknown case '{case}', expected inventory, pipeline or one of {list(phases)}")
+        analyzer.inventory = ProjectInventory.build(root, analyzer.ignore_rules)
+        analyzer.file_metrics = FileMetricsTable() if NUMPY_AVAILABLE else None
+        start = time.perf_counter()
+        with tracer.activate(), span(case, "phase", subtree=case):
+            await phases[case]()
+        seconds = time.perf_counter() - start
+        # Content the phase actually processed: reads plus streamed scans
+        processed = [item for item in tracer.spans if item.category == "io" or item.name == "stream_scan"]
+        return {"seconds": seconds,
+                "files": sum(item.files for item in processed),
+                "bytes": sum(item.bytes for item in processed)}
+    finally:
+        analyzer.close()
+
+
+def run_case(root: Path, case: str) -> Dict[str, Any]:
+    """Measure one case in this interpreter (called inside the child process)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = asyncio.run(_measure_case(root, case))
+    result["peak_rss_bytes"], result["peak_child_rss_bytes"] = _peak_rss()
+    return result
+
+
+def _run_child(root: Path, case: str, scan_mode: Optional[str]) -> Dict[str, Any]:
+    env = dict(os.environ, OKSANA_ANALYZER_CACHE="off", PYTHONDONTWRITEBYTECODE="1")
+    env.pop("OKSANA_ANALYZER_TRACE", None)
+    env.pop("OKSANA_ANALYZER_REPORT_NDJSON", None)
+    if scan_mode:
+        env["OKSANA_ANALYZER_SCAN_MODE"] = scan_mode
+    completed = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--run-case", case, "--root", str(root)],
+        cwd=ANALYZER_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ANALYZER_DIR,
+                                   capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def benchmark(sizes: Sequence[int] = DEFAULT_SIZES, cases: Optional[Sequence[str]] = None,
+              runs: int = 1, tree_dir: Path = DEFAULT_TREE_DIR, scan_mode: Optional[str] = None,
+              seed: int = 0) -> Dict[str, Any]:
+    if cases is None:
+        from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = EnhancedOksanaPlatformAnalyzer()
+            phase_names = [key for key, _ in analyzer.independent_phases()]
+            analyzer.close()
+        cases = ["inventory", *phase_names, "pipeline"]
+
+    results: List[Dict[str, Any]] = []
+    trees: Dict[str, Any] = {}
+    for size in sizes:
+        root = Path(tree_dir) / f"tree-{size}"
+        trees[str(size)] = generate_tree(root, size, seed)
+        for case in cases:
+            samples = [_run_child(root, case, scan_mode) for _ in range(max(1, runs))]
+            seconds = statistics.median(sample["seconds"] for sample in samples)
+            files, size_bytes = samples[0]["files"], samples[0]["bytes"]
+            results.append({
+                "size": size,
+                "case": case,
+                "seconds": seconds,
+                "files": files,
+                "bytes": size_bytes,
+                "files_per_s": files / seconds if seconds > 0 else None,
+                "mb_per_s": size_bytes / 1e6 / seconds if seconds > 0 else None,
+                "peak_rss_bytes": max((sample["peak_rss_bytes"] or 0) for sample in samples) or None,
+                "peak_child_rss_bytes": max((sample["peak_child_rss_bytes"] or 0) for sample in samples) or None
+            })
+
+    return {
+        "benchmark": "pipeline",
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scan_mode": scan_mode or os.getenv("OKSANA_ANALYZER_SCAN_MODE", "process"),
+        "runs": max(1, runs),
+        "seed": seed,
+        "trees": trees,
+        "results": results
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per (size, case) speedup of ``report`` over ``baseline`` (>1 is faster)"""
+    previous = {(row["size"], row["case"]): row for row in baseline["results"]}
+    rows = []
+    for row in report["results"]:
+        old = previous.get((row["size"], row["case"]))
+        if old and row["seconds"] > 0:
+            rows.append({"size": row["size"], "case": row["case"],
+                         "baseline_seconds": old["seconds"], "seconds": row["seconds"],
+                         "speedup": old["seconds"] / row["seconds"]})
+    return rows
+
+
+def print_report(report: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None):
+    print(f"⏱️  Analyzer pipeline benchmark ({report['commit'] or 'no commit'}, "
+          f"Python {report['python']}, {report['cpu_count']} CPUs, scan mode {report['scan_mode']})")
+    print(f"  {'files':>7} {'case':<28} {'seconds':>9} {'files/s':>10} {'MB/s':>8} {'peak RSS MB':>12}")
+    for row in report["results"]:
+        files_per_s = f"{row['files_per_s']:.0f}" if row["files_per_s"] else "-"
+        mb_per_s = f"{row['mb_per_s']:.2f}" if row["mb_per_s"] else "-"
+        rss = f"{row['peak_rss_bytes'] / 1e6:.1f}" if row["peak_rss_bytes"] else "-"
+        print(f"  {row['size']:>7} {row['case']:<28} {row['seconds']:>9.3f} {files_per_s:>10} {mb_per_s:>8} {rss:>12}")
+    if comparison:
+        print("  vs baseline:")
+        for row in comparison:
+            print(f"  {row['size']:>7} {row['case']:<28} {row['baseline_seconds']:>9.3f} -> "
+                  f"{row['seconds']:.3f}s ({row['speedup']:.2f}x)")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Oksana analyzer on synthetic project trees")
+    parser.add_argument("--sizes", default="1k,10k,100k", help="tree sizes in files, e.g. 1k,10k,100k")
+    parser.add_argument("--cases", help="comma-separated cases (inventory, a phase name, pipeline); default all")
+    parser.add_argument("--runs", type=int, default=1, help="fresh interpreters per case (median time)")
+    parser.add_argument("--tree-dir", type=Path, default=DEFAULT_TREE_DIR, help="where synthetic trees are kept")
+    parser.add_argument("--scan-mode", choices=("serial", "process", "thread"), help="OKSANA_ANALYZER_SCAN_MODE")
+    parser.add_argument("--seed", type=int, default=0, help="tree generator seed")
+    parser.add_argument("--output", type=Path, help="results JSON (default pipeline_benchmark_<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to compare against")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--root", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case(args.root, args.run_case)))
+        return 0
+
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()] if args.cases else None
+    report = benchmark(parse_sizes(args.sizes), cases, args.runs, args.tree_dir, args.scan_mode, args.seed)
+    comparison = compare(report, json.loads(args.compare.read_text())) if args.compare else None
+    if comparison is not None:
+        report["comparison"] = {"baseline": str(args.compare), "results": comparison}
+
+    output = args.output or Path(f"pipeline_benchmark_{(report['commit'] or 'local')[:12]}.json")
+    output.write_text(json.dumps(report, indent=2))
+    print_report(report, comparison)
+    print(f"💾 Results: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
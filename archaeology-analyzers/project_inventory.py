@@ -0,0 +1,584 @@
+"""
+Project Inventory - single-pass filesystem snapshot for the Oksana analyzer
+Walks the project tree once with os.scandir and answers every phase's
+directory, extension and glob queries from memory.
+
+Files are stored column-wise: an interned directory prefix, the file name, a
+suffix code, size and mtime per file. ``FileEntry`` records (and their Path
+objects) are only built for the files a query returns, and ``FileList`` keeps
+report lists of names or relative paths as positions until the report is
+written.
+"""
+
+import os
+import array
+import bisect
+import hashlib
+import fnmatch
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ignore_rules import GITIGNORE, IgnoreRules
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """A single file captured by the inventory walk"""
+    __slots__ = ("path", "rel_path", "suffix", "size", "mtime_ns")
+    path: Path
+    rel_path: str
+    suffix: str
+    size: int
+    mtime_ns: int
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+def _signature(entry: Optional[FileEntry]) -> Optional[Tuple[int, int]]:
+    return (entry.size, entry.mtime_ns) if entry is not None else None
+
+
+def _sort_key(dir_entry: os.DirEntry) -> str:
+    """Sibling order that makes a depth-first walk yield relative paths in sorted order"""
+    try:
+        return dir_entry.name + "/" if dir_entry.is_dir(follow_symlinks=False) else dir_entry.name
+    except OSError:
+        return dir_entry.name
+
+
+def _sorted_children(dir_path: str) -> List[os.DirEntry]:
+    try:
+        with os.scandir(dir_path) as iterator:
+            return sorted(iterator, key=_sort_key)
+    except OSError:
+        return []
+
+
+def walk(root: Path, rel_dir: str = "", ignore_rules: Optional[IgnoreRules] = None,
+         ignored: Optional[List[str]] = None) -> Iterator[Tuple[str, str, Optional[os.stat_result]]]:
+    """
+    Depth-first walk below ``root/rel_dir`` with sorted siblings, so paths come
+    out in sorted order. Yields ``(parent rel_dir, name, stat)`` per file and
+    ``(parent rel_dir, name, None)`` per directory. Ignored directories are
+    never entered; their relative paths (and those of ignored files) are
+    appended to ``ignored``.
+    """
+    rules = None
+    if ignore_rules is not None:
+        rules = ignore_rules.rules_at(root, rel_dir)
+        if rules is None:
+            return
+    start = os.path.join(str(root), rel_dir) if rel_dir else str(root)
+    stack = [(rel_dir, rules, iter(_sorted_children(start)))]
+    while stack:
+        parent, rules, children = stack[-1]
+        dir_entry = next(children, None)
+        if dir_entry is None:
+            stack.pop()
+            continue
+        rel_path = f"{parent}/{dir_entry.name}" if parent else dir_entry.name
+        try:
+            is_dir = dir_entry.is_dir(follow_symlinks=False)
+            if not is_dir and not dir_entry.is_file():
+                continue
+            if rules is not None and rules.ignores(rel_path, is_dir):
+                if ignored is not None:
+                    ignored.append(rel_path)
+                continue
+            if is_dir:
+                yield parent, dir_entry.name, None
+                grandchildren = _sorted_children(dir_entry.path)
+                if rules is not None and any(child.name == GITIGNORE for child in grandchildren):
+                    rules = ignore_rules.enter(rules, dir_entry.path, rel_path)
+                stack.append((rel_path, rules, iter(grandchildren)))
+            else:
+                yield parent, dir_entry.name, dir_entry.stat()
+        except OSError:
+            continue
+
+
+class _Columns:
+    """Column builder; starting from an inventory's tables keeps its directory and suffix codes valid"""
+
+    def __init__(self, directories: Optional[List[str]] = None, suffixes: Optional[List[str]] = None):
+        self.directories: List[str] = list(directories or [])
+        self.suffixes: List[str] = list(suffixes or [])
+        self._directory_codes = {directory: code for code, directory in enumerate(self.directories)}
+        self._suffix_codes = {suffix: code for code, suffix in enumerate(self.suffixes)}
+        self.directory_column = array.array("I")
+        self.suffix_column = array.array("H")
+        self.names: List[str] = []
+        self.sizes = array.array("q")
+        self.mtimes = array.array("q")
+
+    def directory_code(self, rel_dir: str) -> int:
+        code = self._directory_codes.get(rel_dir)
+        if code is None:
+            code = self._directory_codes[rel_dir] = len(self.directories)
+            self.directories.append(rel_dir)
+        return code
+
+    def suffix_code(self, suffix: str) -> int:
+        code = self._suffix_codes.get(suffix)
+        if code is None:
+            code = self._suffix_codes[suffix] = len(self.suffixes)
+            self.suffixes.append(suffix)
+        return code
+
+    def append(self, directory_code: int, name: str, size: int, mtime_ns: int):
+        self.directory_column.append(directory_code)
+        self.suffix_column.append(self.suffix_code(os.path.splitext(name)[1]))
+        self.names.append(name)
+        self.sizes.append(size)
+        self.mtimes.append(mtime_ns)
+
+    def append_entry(self, entry: FileEntry):
+        rel_dir, _, name = entry.rel_path.rpartition("/")
+        self.append(self.directory_code(rel_dir), name, entry.size, entry.mtime_ns)
+
+    def extend(self, inventory: "ProjectInventory", start: int, stop: int):
+        """Copy positions [start, stop) of the inventory these columns started from"""
+        if start < stop:
+            self.directory_column.extend(inventory._directory_column[start:stop])
+            self.suffix_column.extend(inventory._suffix_column[start:stop])
+            self.names.extend(inventory._names[start:stop])
+            self.sizes.extend(inventory._sizes[start:stop])
+            self.mtimes.extend(inventory._mtimes[start:stop])
+
+
+class _RelPaths(Sequence):
+    """Sorted relative paths, built on access so bisect needs no stored strings"""
+
+    def __init__(self, inventory: "ProjectInventory"):
+        self._inventory = inventory
+
+    def __len__(self) -> int:
+        return len(self._inventory._names)
+
+    def __getitem__(self, position: int) -> str:
+        return self._inventory._rel_path(position)
+
+
+class FileList(Sequence):
+    """
+    Read-only list of file names (or paths relative to ``relative_to``) backed
+    by inventory positions. Phases store these in analysis_results; reports
+    turn them into plain lists through ``report_default``.
+    """
+
+    __slots__ = ("_inventory", "_positions", "_strip")
+
+    def __init__(self, inventory: "ProjectInventory", positions: Iterable[int], relative_to: Optional[str] = None):
+        self._inventory = inventory
+        self._positions = array.array("I", positions)
+        # None: names only; otherwise the length of the directory prefix to drop
+        self._strip = None if relative_to is None else len(relative_to) + 1 if relative_to else 0
+
+    @property
+    def inventory(self) -> "ProjectInventory":
+        return self._inventory
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        position = self._positions[index]
+        if self._strip is None:
+            return self._inventory._names[position]
+        return self._inventory._rel_path(position)[self._strip:]
+
+    def __add__(self, other: "FileList") -> "FileList":
+        """Concatenation of two lists of the same inventory and kind"""
+        if not isinstance(other, FileList) or other._inventory is not self._inventory or other._strip != self._strip:
+            return NotImplemented
+        combined = FileList(self._inventory, ())
+        combined._positions = self._positions + other._positions
+        combined._strip = self._strip
+        return combined
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, FileList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"FileList({list(self)!r})"
+
+    def tolist(self) -> List[str]:
+        return list(self)
+
+
+def report_default(value: Any) -> Any:
+    """``json.dumps`` default for analysis results: FileLists become lists, anything else str()"""
+    if isinstance(value, FileList):
+        return value.tolist()
+    return str(value)
+
+
+def materialize(value: Any, keep: Optional["ProjectInventory"] = None) -> Any:
+    """Replace, in place, every FileList in nested dicts/lists that is not backed by ``keep``"""
+    items = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else ()
+    for key, item in list(items):
+        if isinstance(item, FileList):
+            if item.inventory is not keep:
+                value[key] = item.tolist()
+        elif isinstance(item, (dict, list)):
+            materialize(item, keep)
+    return value
+
+
+class ProjectInventory:
+    """
+    In-memory index of every file and directory below a project root.
+
+    Files are kept sorted by relative POSIX path so that "everything under
+    directory X" is a contiguous slice found with bisect, and a per-extension
+    index (built on the first suffix query) narrows suffix queries without
+    touching the other files.
+    """
+
+    def __init__(self, root: Path, entries: Iterable[FileEntry], directories: Set[str],
+                 ignore_rules: Optional[IgnoreRules] = None):
+        columns = _Columns()
+        for entry in sorted(entries, key=lambda entry: entry.rel_path):
+            columns.append_entry(entry)
+        self._load(root, columns, directories, ignore_rules, [])
+
+    @classmethod
+    def _from_columns(cls, root: Path, columns: _Columns, directories: Set[str],
+                      ignore_rules: Optional[IgnoreRules], ignored: List[str]) -> "ProjectInventory":
+        inventory = cls.__new__(cls)
+        inventory._load(root, columns, directories, ignore_rules, ignored)
+        return inventory
+
+    def _load(self, root: Path, columns: _Columns, directories: Set[str],
+              ignore_rules: Optional[IgnoreRules], ignored: List[str]):
+        self.root = Path(root)
+        self.ignore_rules = ignore_rules
+        # Top-most ignored paths (pruned directories and ignored files)
+        self.ignored = ignored
+        self._directory_prefixes = columns.directories
+        self._suffixes = columns.suffixes
+        self._directory_column = columns.directory_column
+        self._suffix_column = columns.suffix_column
+        self._names = columns.names
+        self._sizes = columns.sizes
+        self._mtimes = columns.mtimes
+        self._rel_paths = _RelPaths(self)
+        self._directories = directories
+        self._sorted_directories = sorted(directories)
+        # Extension index: suffix -> ascending positions, built on first use
+        self._by_suffix: Optional[Dict[str, array.array]] = None
+
+    @classmethod
+    def build(cls, root: Path, ignore_rules: Optional[IgnoreRules] = None) -> "ProjectInventory":
+        """
+        Walk ``root`` once and capture name, suffix, size and mtime per file,
+        pruning whatever ``ignore_rules`` ignores
+        """
+        root = Path(root)
+        columns = _Columns()
+        directories: Set[str] = set()
+        ignored: List[str] = []
+
+        if root.is_dir():
+            directories.add("")
+            for rel_dir, name, stat in walk(root, "", ignore_rules, ignored):
+                if stat is None:
+                    directories.add(f"{rel_dir}/{name}" if rel_dir else name)
+                else:
+                    columns.append(columns.directory_code(rel_dir), name, stat.st_size, stat.st_mtime_ns)
+
+        return cls._from_columns(root, columns, directories, ignore_rules, ignored)
+
+    def with_changes(self, paths: Iterable[Path]) -> Tuple["ProjectInventory", Set[str]]:
+        """
+        A new inventory with ``paths`` (files or directories, changed, created
+        or deleted) re-read from disk, plus the relative paths of files that
+        were added, removed or modified. Everything else is carried over.
+        """
+        rels = {rel for rel in (self._relative(path) for path in paths) if rel is not None}
+        # A changed .gitignore can hide or reveal anything next to or below it
+        rels.update([rel.rpartition("/")[0] for rel in rels if rel.rpartition("/")[2] == GITIGNORE])
+        if "" in rels:
+            rebuilt = ProjectInventory.build(self.root, self.ignore_rules)
+            before, after = self.signatures(), rebuilt.signatures()
+            return rebuilt, {key for key in before.keys() | after.keys() if before.get(key) != after.get(key)}
+
+        removed: Set[int] = set()
+        added: Dict[str, FileEntry] = {}
+        directories = set(self._directories)
+
+        for rel in sorted(rels):
+            # Forget the old state of the path (a file or a whole directory subtree)
+            position = self._position(rel)
+            if position is not None:
+                removed.add(position)
+            removed.update(self._slice(rel))
+            for key in [key for key in added if key == rel or key.startswith(rel + "/")]:
+                del added[key]
+            if rel in directories:
+                prefix = rel + "/"
+                start = bisect.bisect_left(self._sorted_directories, prefix)
+                end = bisect.bisect_left(self._sorted_directories, rel + "0", lo=start)
+                directories.difference_update(self._sorted_directories[start:end])
+                directories.discard(rel)
+
+            # Capture its current state
+            full_path = self.root / rel
+            is_dir = full_path.is_dir() and not full_path.is_symlink()
+            if self.ignore_rules is not None and self.ignore_rules.is_ignored(self.root, rel, is_dir):
+                continue
+            if is_dir:
+                directories.add(rel)
+                for rel_dir, name, stat in walk(self.root, rel, self.ignore_rules):
+                    key = f"{rel_dir}/{name}"
+                    if stat is None:
+                        directories.add(key)
+                    else:
+                        added[key] = FileEntry(self.root / key, key, os.path.splitext(name)[1],
+                                               stat.st_size, stat.st_mtime_ns)
+            elif full_path.is_file():
+                try:
+                    stat = full_path.stat()
+                except OSError:
+                    continue
+                added[rel] = FileEntry(full_path, rel, os.path.splitext(full_path.name)[1],
+                                       stat.st_size, stat.st_mtime_ns)
+            else:
+                continue
+            parent = rel.rpartition("/")[0]
+            while parent and parent not in directories:
+                directories.add(parent)
+                parent = parent.rpartition("/")[0]
+
+        before = {self._rel_path(position): self._signature_at(position) for position in removed}
+        changed = {key for key in before.keys() | added.keys() if before.get(key) != _signature(added.get(key))}
+        return self._patched(removed, list(added.values()), directories), changed
+
+    def without(self, rel_paths: Iterable[str]) -> "ProjectInventory":
+        """A copy that no longer lists the files ``rel_paths`` (directories are kept)"""
+        removed = {position for position in map(self._position, rel_paths) if position is not None}
+        return self._patched(removed, [], self._directories) if removed else self
+
+    def _patched(self, removed: Set[int], added: List[FileEntry], directories: Set[str]) -> "ProjectInventory":
+        """Copy of this inventory without ``removed`` positions and with ``added`` merged in order"""
+        columns = _Columns(self._directory_prefixes, self._suffixes)
+        removed_positions = sorted(removed)
+
+        def copy(start: int, stop: int):
+            lo = bisect.bisect_left(removed_positions, start)
+            hi = bisect.bisect_left(removed_positions, stop, lo=lo)
+            for position in removed_positions[lo:hi]:
+                columns.extend(self, start, position)
+                start = position + 1
+            columns.extend(self, start, stop)
+
+        previous = 0
+        for entry in sorted(added, key=lambda entry: entry.rel_path):
+            cut = bisect.bisect_left(self._rel_paths, entry.rel_path)
+            copy(previous, cut)
+            columns.append_entry(entry)
+            previous = cut
+        copy(previous, len(self))
+        return ProjectInventory._from_columns(self.root, columns, directories, self.ignore_rules, self.ignored)
+
+    # ------------------------------------------------------------------
+    # Columns
+    # ------------------------------------------------------------------
+
+    def _rel_path(self, position: int) -> str:
+        rel_dir = self._directory_prefixes[self._directory_column[position]]
+        name = self._names[position]
+        return f"{rel_dir}/{name}" if rel_dir else name
+
+    def _signature_at(self, position: int) -> Tuple[int, int]:
+        return (self._sizes[position], self._mtimes[position])
+
+    def _entry_at(self, position: int) -> FileEntry:
+        rel_path = self._rel_path(position)
+        return FileEntry(self.root / rel_path, rel_path, self._suffixes[self._suffix_column[position]],
+                         self._sizes[position], self._mtimes[position])
+
+    def _suffix_index(self) -> Dict[str, array.array]:
+        if self._by_suffix is None:
+            by_code: Dict[int, array.array] = {}
+            for position, code in enumerate(self._suffix_column):
+                positions = by_code.get(code)
+                if positions is None:
+                    positions = by_code[code] = array.array("I")
+                positions.append(position)
+            self._by_suffix = {self._suffixes[code]: positions for code, positions in by_code.items()}
+        return self._by_suffix
+
+    def sizes(self) -> array.array:
+        """Size of every file, in path order"""
+        return self._sizes
+
+    def fingerprint(self, rel_paths: Iterable[str]) -> str:
+        """
+        Digest of the path, size and mtime of every file at or below each of
+        ``rel_paths`` ("" is the whole tree); equal digests mean none of
+        those files was added, removed or modified
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for rel in rel_paths:
+            position = self._position(rel) if rel else None
+            if position is not None:
+                window = range(position, position + 1)
+            elif not rel or rel in self._directories:
+                window = self._slice(rel)
+            else:
+                window = range(0)
+            start, stop = window.start, window.stop
+            digest.update(f"{rel}\0{stop - start}\0".encode())
+            digest.update("\0".join(map(self._directory_prefixes.__getitem__,
+                                         self._directory_column[start:stop])).encode("utf-8", "surrogatepass"))
+            digest.update("\0".join(self._names[start:stop]).encode("utf-8", "surrogatepass"))
+            digest.update(self._sizes[start:stop].tobytes())
+            digest.update(self._mtimes[start:stop].tobytes())
+        return digest.hexdigest()
+
+    def signatures(self) -> Dict[str, Tuple[int, int]]:
+        """(size, mtime_ns) per relative path"""
+        return {self._rel_path(position): self._signature_at(position) for position in range(len(self))}
+
+    # ------------------------------------------------------------------
+    # Path helpers
+    # ------------------------------------------------------------------
+
+    def _relative(self, path: Path) -> Optional[str]:
+        """Relative POSIX key for ``path`` or None when outside the root"""
+        try:
+            rel = Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        return "" if rel == "." else rel
+
+    def _slice(self, rel_dir: str) -> range:
+        """Positions of all files below ``rel_dir`` (contiguous in sort order)"""
+        if not rel_dir:
+            return range(0, len(self))
+        prefix = rel_dir + "/"
+        start = bisect.bisect_left(self._rel_paths, prefix)
+        # "0" sorts directly after "/", so this bound closes the prefix range
+        end = bisect.bisect_left(self._rel_paths, rel_dir + "0", lo=start)
+        return range(start, end)
+
+    def _position(self, rel: str) -> Optional[int]:
+        position = bisect.bisect_left(self._rel_paths, rel)
+        if position < len(self) and self._rel_path(position) == rel:
+            return position
+        return None
+
+    # ------------------------------------------------------------------
+    # Queries used by the analysis phases
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def exists(self, path: Path) -> bool:
+        rel = self._relative(path)
+        if rel is None:
+            return Path(path).exists()
+        return self.is_dir(path) or self.is_file(path)
+
+    def is_dir(self, path: Path) -> bool:
+        rel = self._relative(path)
+        if rel is None:
+            return Path(path).is_dir()
+        return rel in self._directories
+
+    def is_file(self, path: Path) -> bool:
+        rel = self._relative(path)
+        if rel is None:
+            return Path(path).is_file()
+        return self._position(rel) is not None
+
+    def get(self, path: Path) -> Optional[FileEntry]:
+        rel = self._relative(path)
+        return self._entry(rel) if rel is not None else None
+
+    def _entry(self, rel: str) -> Optional[FileEntry]:
+        position = self._position(rel)
+        return self._entry_at(position) if position is not None else None
+
+    def positions_under(self, directory: Path, suffixes: Optional[Iterable[str]] = None) -> Sequence:
+        """Positions of the files below ``directory``, optionally restricted to ``suffixes``"""
+        rel_dir = self._relative(directory)
+        if rel_dir is None or rel_dir not in self._directories:
+            return range(0)
+
+        window = self._slice(rel_dir)
+        if suffixes is None:
+            return window
+
+        positions: List[int] = []
+        index = self._suffix_index()
+        for suffix in suffixes:
+            indexed = index.get(suffix, ())
+            lo = bisect.bisect_left(indexed, window.start)
+            hi = bisect.bisect_left(indexed, window.stop, lo=lo)
+            positions.extend(indexed[lo:hi])
+        positions.sort()
+        return positions
+
+    def files_under(self, directory: Path, suffixes: Optional[Iterable[str]] = None) -> List[FileEntry]:
+        """All files below ``directory``, optionally restricted to ``suffixes``"""
+        return [self._entry_at(position) for position in self.positions_under(directory, suffixes)]
+
+    def count_under(self, directory: Path, suffixes: Optional[Iterable[str]] = None) -> int:
+        return len(self.positions_under(directory, suffixes))
+
+    def names_under(self, directory: Path, suffixes: Optional[Iterable[str]] = None) -> FileList:
+        """File names below ``directory``"""
+        return FileList(self, self.positions_under(directory, suffixes))
+
+    def relative_paths_under(self, directory: Path, suffixes: Optional[Iterable[str]] = None) -> FileList:
+        """Paths of the files below ``directory``, relative to it"""
+        return FileList(self, self.positions_under(directory, suffixes), relative_to=self._relative(directory) or "")
+
+    def directories_under(self, directory: Path) -> List[Path]:
+        """All directories below ``directory`` (recursive, excluding itself)"""
+        rel_dir = self._relative(directory)
+        if rel_dir is None or rel_dir not in self._directories:
+            return []
+        if rel_dir:
+            prefix = rel_dir + "/"
+            start = bisect.bisect_left(self._sorted_directories, prefix)
+            end = bisect.bisect_left(self._sorted_directories, rel_dir + "0", lo=start)
+        else:
+            start, end = 1, len(self._sorted_directories)
+        return [self.root / rel for rel in self._sorted_directories[start:end]]
+
+    def child_directories(self, directory: Path) -> List[Path]:
+        """Immediate subdirectories of ``directory``"""
+        rel_dir = self._relative(directory)
+        depth = rel_dir.count("/") + 1 if rel_dir else 0
+        return [
+            candidate for candidate in self.directories_under(directory)
+            if candidate.relative_to(self.root).as_posix().count("/") == depth
+        ]
+
+    def glob_under(self, directory: Path, pattern: str, include_directories: bool = True) -> Iterator[Path]:
+        """Equivalent of ``directory.rglob(pattern)`` answered from the index"""
+        if include_directories:
+            for candidate in self.directories_under(directory):
+                if fnmatch.fnmatchcase(candidate.name, pattern):
+                    yield candidate
+        for position in self.positions_under(directory):
+            if fnmatch.fnmatchcase(self._names[position], pattern):
+                yield self.root / self._rel_path(position)
+
+    def total_bytes(self, directory: Optional[Path] = None) -> int:
+        if directory is None:
+            return sum(self._sizes)
+        window = self.positions_under(directory)
+        return sum(self._sizes[window.start:window.stop]) if window else 0
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Report Binary - compact binary analysis reports with a partial loader
+Every string (file names repeat across swift_files, typescript_files, ...) is
+stored once in an interned string table, per-file metrics are stored as
+columnar arrays, and a section index lets readers decode the summary or a
+single phase without touching the rest of the file.
+
+Layout (little-endian):
+    preamble   magic, version, section count, string table and index offsets
+    sections   one encoded value per section: "@summary", "@files", every
+               top-level result key and "comprehensive_analysis/<phase>"
+    strings    u32 count, u32 offsets[count + 1], UTF-8 blob
+    index      encoded {section name: [offset, length]}
+
+Usage: python3 report_binary.py summary REPORT
+       python3 report_binary.py phase REPORT PHASE
+       python3 report_binary.py export REPORT OUTPUT.json [--include-files]
+"""
+
+import sys
+import json
+import mmap
+import array
+import struct
+import argparse
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+MAGIC = b"OKSBRPT\x00"
+REPORT_VERSION = 1
+REPORT_SUFFIX = ".oksb"
+
+SUMMARY_SECTION = "@summary"
+FILES_SECTION = "@files"
+# Top-level results stored as one section per entry so a single phase can be loaded
+SPLIT_SECTIONS = ("comprehensive_analysis",)
+
+_PREAMBLE = struct.Struct("<8sHHIQQQ")
+_FLOAT = struct.Struct("<d")
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT_TAG, _STR, _LIST, _DICT, _STR_ARRAY, _F64_ARRAY, _I32_ARRAY = range(11)
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _pack_array(values: array.array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack_array(typecode: str, data: bytes) -> array.array:
+    values = array.array(typecode)
+    values.frombytes(data)
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _Encoder:
+    """Encodes JSON-like values, interning every string into one shared table"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def encode(self, value: Any) -> bytes:
+        out = bytearray()
+        self._encode(out, value)
+        return bytes(out)
+
+    def _encode(self, out: bytearray, value: Any):
+        if value is None:
+            out.append(_NONE)
+        elif value is True or value is False:
+            out.append(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+        elif isinstance(value, float):
+            out.append(_FLOAT_TAG)
+            out += _FLOAT.pack(value)
+        elif isinstance(value, str):
+            out.append(_STR)
+            _write_varint(out, self.intern(value))
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                _write_varint(out, self.intern(str(key)))
+                self._encode(out, item)
+        elif isinstance(value, array.array) and value.typecode in ("d", "i"):
+            out.append(_F64_ARRAY if value.typecode == "d" else _I32_ARRAY)
+            _write_varint(out, len(value))
+            out += _pack_array(value)
+        elif isinstance(value, Sequence):
+            # Lists, tuples and inventory-backed FileLists
+            if value and all(isinstance(item, str) for item in value):
+                # File name lists: one varint reference per entry
+                out.append(_STR_ARRAY)
+                _write_varint(out, len(value))
+                for item in value:
+                    _write_varint(out, self.intern(item))
+            else:
+                out.append(_LIST)
+                _write_varint(out, len(value))
+                for item in value:
+                    self._encode(out, item)
+        else:
+            # Same fallback as json.dumps(default=str) in the JSON report
+            self._encode(out, str(value))
+
+
+def _files_section(file_metrics) -> Dict[str, Any]:
+    """Columnar per-file arrays from a FileMetricsTable"""
+    matrix = file_metrics.matrix
+    return {
+        "columns": list(file_metrics.columns),
+        "paths": list(file_metrics.paths),
+        "groups": list(file_metrics.group_names),
+        "group_codes": array.array("i", file_metrics.group_codes.astype("int32").tolist()),
+        "values": {
+            name: array.array("d", matrix[:, column].tolist())
+            for column, name in enumerate(file_metrics.columns)
+        }
+    }
+
+
+def write_binary_report(path: Path, results: Dict[str, Any], summary: Dict[str, Any],
+                        file_metrics=None) -> int:
+    """Write ``results`` as a binary report; returns the file size in bytes"""
+    encoder = _Encoder()
+    sections: List[Tuple[str, bytes]] = [(SUMMARY_SECTION, encoder.encode(summary))]
+    if file_metrics is not None and len(file_metrics) > 0:
+        sections.append((FILES_SECTION, encoder.encode(_files_section(file_metrics))))
+    for key, value in results.items():
+        if key in SPLIT_SECTIONS and isinstance(value, dict) and value:
+            for name, item in value.items():
+                sections.append((f"{key}/{name}", encoder.encode(item)))
+        else:
+            sections.append((key, encoder.encode(value)))
+
+    body = bytearray()
+    index: Dict[str, List[int]] = {}
+    for name, data in sections:
+        index[name] = [_PREAMBLE.size + len(body), len(data)]
+        body += data
+    index_data = encoder.encode(index)  # interns the section names before the table is written
+
+    strings = [value.encode("utf-8") for value in encoder.strings]
+    offsets = array.array("I", [0])
+    for value in strings:
+        offsets.append(offsets[-1] + len(value))
+    string_table = struct.pack("<I", len(strings)) + _pack_array(offsets) + b"".join(strings)
+
+    strings_offset = _PREAMBLE.size + len(body)
+    index_offset = strings_offset + len(string_table)
+    preamble = _PREAMBLE.pack(MAGIC, REPORT_VERSION, 0, len(sections),
+                              strings_offset, index_offset, len(index_data))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(preamble)
+        f.write(body)
+        f.write(string_table)
+        f.write(index_data)
+    return index_offset + len(index_data)
+
+
+class BinaryReport:
+    """
+    Memory-mapped reader for a binary report.
+
+    Opening reads only the preamble, the string offsets and the section index;
+    sections and the strings they reference are decoded on demand.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a binary analysis report")
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self):
+        if len(self._data) < _PREAMBLE.size:
+            raise ValueError(f"{self.path} is not a binary analysis report")
+        magic, version, _flags, section_count, strings_offset, index_offset, index_length = \
+            _PREAMBLE.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a binary analysis report")
+        if version > REPORT_VERSION:
+            raise ValueError(f"{self.path} uses report version {version}, newer than {REPORT_VERSION}")
+
+        (count,) = struct.unpack_from("<I", self._data, strings_offset)
+        offsets_start = strings_offset + 4
+        self._blob_start = offsets_start + 4 * (count + 1)
+        self._string_offsets = _unpack_array("I", self._data[offsets_start:self._blob_start])
+        self._strings: List[Optional[str]] = [None] * count
+
+        self.index: Dict[str, List[int]] = self._decode(index_offset)[0]
+        if len(self.index) != section_count:
+            raise ValueError(f"{self.path} has a corrupt section index")
+
+    def __enter__(self) -> "BinaryReport":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+    @property
+    def sections(self) -> List[str]:
+        return list(self.index)
+
+    def _string(self, index: int) -> str:
+        value = self._strings[index]
+        if value is None:
+            start = self._blob_start + self._string_offsets[index]
+            end = self._blob_start + self._string_offsets[index + 1]
+            value = self._strings[index] = self._data[start:end].decode("utf-8")
+        return value
+
+    def _varint(self, position: int) -> Tuple[int, int]:
+        data = self._data
+        result = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, position
+            shift += 7
+
+    def _decode(self, position: int) -> Tuple[Any, int]:
+        tag = self._data[position]
+        position += 1
+        if tag == _NONE:
+            return None, position
+        if tag == _FALSE or tag == _TRUE:
+            return tag == _TRUE, position
+        if tag == _INT:
+            value, position = self._varint(position)
+            return (value >> 1) if not value & 1 else -((value + 1) >> 1), position
+        if tag == _FLOAT_TAG:
+            return _FLOAT.unpack_from(self._data, position)[0], position + _FLOAT.size
+        if tag == _STR:
+            index, position = self._varint(position)
+            return self._string(index), position
+        if tag == _DICT:
+            count, position = self._varint(position)
+            result: Dict[str, Any] = {}
+            for _ in range(count):
+                key, position = self._varint(position)
+                result[self._string(key)], position = self._decode(position)
+            return result, position
+        if tag == _LIST or tag == _STR_ARRAY:
+            count, position = self._varint(position)
+            items: List[Any] = []
+            for _ in range(count):
+                if tag == _LIST:
+                    item, position = self._decode(position)
+                else:
+                    index, position = self._varint(position)
+                    item = self._string(index)
+                items.append(item)
+            return items, position
+        if tag == _F64_ARRAY or tag == _I32_ARRAY:
+            count, position = self._varint(position)
+            typecode, width = ("d", 8) if tag == _F64_ARRAY else ("i", 4)
+            end = position + count * width
+            return _unpack_array(typecode, self._data[position:end]), end
+        raise ValueError(f"{self.path} has an unknown value tag {tag} at byte {position - 1}")
+
+    def section(self, name: str) -> Any:
+        if name not in self.index:
+            raise KeyError(name)
+        return self._decode(self.index[name][0])[0]
+
+    def summary(self) -> Dict[str, Any]:
+        return self.section(SUMMARY_SECTION)
+
+    def phase(self, name: str) -> Dict[str, Any]:
+        return self.section(f"comprehensive_analysis/{name}")
+
+    def files(self) -> Optional[Dict[str, Any]]:
+        """Columnar per-file arrays (array.array columns), None if none were stored"""
+        return self.section(FILES_SECTION) if FILES_SECTION in self.index else None
+
+    def to_dict(self, include_files: bool = False) -> Dict[str, Any]:
+        """The full analysis results, as the JSON report would contain them"""
+        results: Dict[str, Any] = {}
+        for name in self.index:
+            if name.startswith("@"):
+                continue
+            key, _, item = name.partition("/")
+            if item and key in SPLIT_SECTIONS:
+                results.setdefault(key, {})[item] = self.section(name)
+            else:
+                results[key] = self.section(name)
+        for key in SPLIT_SECTIONS:
+            results.setdefault(key, {})
+        files = self.files() if include_files else None
+        if files is not None:
+            files["group_codes"] = files["group_codes"].tolist()
+            files["values"] = {
+                name: [None if value != value else value for value in column]
+                for name, column in files["values"].items()
+            }
+            results["files"] = files
+        return results
+
+    def export_json(self, output_path: Path, include_files: bool = False):
+        Path(output_path).write_text(json.dumps(self.to_dict(include_files), indent=2, default=str))
+
+
+def read_summary(path: Path) -> Dict[str, Any]:
+    with BinaryReport(path) as report:
+        return report.summary()
+
+
+def load_binary_report(path: Path, include_files: bool = False) -> Dict[str, Any]:
+    with BinaryReport(path) as report:
+        return report.to_dict(include_files)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Read binary Oksana analysis reports")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("summary", help="print the summary scores").add_argument("report", type=Path)
+    phase = commands.add_parser("phase", help="print one phase")
+    phase.add_argument("report", type=Path)
+    phase.add_argument("name")
+    export = commands.add_parser("export", help="write the report as JSON")
+    export.add_argument("report", type=Path)
+    export.add_argument("output", type=Path)
+    export.add_argument("--include-files", action="store_true", help="add the per-file columns")
+    args = parser.parse_args(argv)
+
+    with BinaryReport(args.report) as report:
+        if args.command == "summary":
+            print(json.dumps(report.summary(), indent=2))
+        elif args.command == "phase":
+            print(json.dumps(report.phase(args.name), indent=2, default=str))
+        else:
+            report.export_json(args.output, args.include_files)
+            print(f"💾 Exported {args.report} to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,677 @@
+#!/usr/bin/env python3
+"""
+Report Diff - schema-aware structural diff of two analysis reports
+Compares two runs phase by phase instead of as generic JSON: file lists are
+compared as sets (their order is not meaningful), file entries and per-file
+metrics are keyed by path, recommendations by category and issue, and only
+changed files, changed scores and changed recommendations are reported.
+
+Both reports are indexed first (JSON reports by the byte ranges of their
+top-level members and phases, NDJSON reports by their footer index, binary
+reports by their section index) and then decoded one section at a time, so
+memory stays bounded by the largest phase rather than the whole report.
+Either side may be a JSON, NDJSON or binary report.
+
+Usage: python3 report_diff.py OLD_REPORT NEW_REPORT [--ndjson] [--all] [--tolerance T]
+"""
+
+import sys
+import json
+import codecs
+import math
+import mmap
+import re
+import argparse
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from report_binary import MAGIC, SPLIT_SECTIONS, BinaryReport
+from report_stream import REPORT_FORMAT
+
+DEFAULT_TOLERANCE = 1e-9
+# Bytes of a JSON report decoded at a time while it is indexed
+JSON_INDEX_WINDOW = 1 << 20
+
+# Change kinds; "value" changes (paths, flags, counters) are only reported with include_values
+KIND_PHASE = "phase"
+KIND_SCORE = "score"
+KIND_FILE = "file"
+KIND_RECOMMENDATION = "recommendation"
+KIND_VALUE = "value"
+
+# Run statistics rather than analysis results: they differ between any two runs
+RUN_STATISTICS = ("timestamp", "cache_statistics", "reader_statistics", "scan_executor",
+                  "content_dedupe", "trace_summary", "watch", "hardware_profile",
+                  "phase_graph")
+SCORE_KEY = re.compile(r"(score|readiness|confidence|sophistication|health)$")
+FILE_NAME = re.compile(r"^[^\s/]+(?:/[^\s/]+)*\.[A-Za-z][\w]{0,9}$")
+# Fields that identify an entry of a list of records (recommendations, clusters, themes)
+RECORD_KEYS = (("category", "issue"), ("representative",), ("cluster",), ("theme",), ("path",))
+
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _is_volatile(key: str) -> bool:
+    return key in RUN_STATISTICS or key.endswith("_ms")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _same(old: Any, new: Any, tolerance: float) -> bool:
+    if _is_number(old) and _is_number(new):
+        if isinstance(old, float) or isinstance(new, float):
+            if math.isnan(old) and math.isnan(new):
+                return True
+            return math.isclose(old, new, rel_tol=tolerance, abs_tol=tolerance)
+    return old == new
+
+
+class _ByteOffsets:
+    """Byte offsets of increasing character offsets into a non-ASCII text"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.position = 0
+        self.offset = 0
+
+    def __call__(self, position: int) -> int:
+        self.offset += len(self.text[self.position:position].encode("utf-8"))
+        self.position = position
+        return self.offset
+
+
+class _JSONCursor:
+    """
+    Read position in the JSON text of a mapped report.
+
+    Only a window of the text from the read position on is decoded at a
+    time; a value longer than the window widens it until the value fits, and
+    the next window starts where that value ended.
+    """
+
+    def __init__(self, data: mmap.mmap, window: int):
+        self.data = data
+        self.window = window
+        self.text = ""
+        self.position = 0
+        self.base = 0
+        self.at_end = False
+        self._byte_offset: Callable[[int], int] = lambda position: position
+        self._load(window)
+
+    def offset(self) -> int:
+        """Byte offset of the read position in the report"""
+        return self.base + self._byte_offset(self.position)
+
+    def _load(self, size: int):
+        start = self.offset()
+        stop = min(start + size, len(self.data))
+        self.at_end = stop == len(self.data)
+        # A character cut by the window's edge is left for the next window
+        self.text = codecs.getincrementaldecoder("utf-8")().decode(self.data[start:stop], final=self.at_end)
+        self.base, self.position = start, 0
+        # Character offsets are byte offsets unless the window has non-ASCII text
+        self._byte_offset = (lambda position: position) if self.text.isascii() else _ByteOffsets(self.text)
+
+    def peek(self) -> str:
+        """Next non-whitespace character; IndexError past the end of the report"""
+        while True:
+            self.position = _JSON_WHITESPACE.match(self.text, self.position).end()
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if self.at_end:
+                raise IndexError(self.offset())
+            self._load(self.window)
+
+    def advance(self):
+        self.position += 1
+
+    def decode(self) -> Tuple[Any, int, int]:
+        """Decode the next value; returns it with its byte range"""
+        self.peek()
+        size = self.window
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self.text, self.position)
+                # A value reaching the window's edge (a number, say) may go on past it
+                if end < len(self.text) or self.at_end:
+                    break
+            except json.JSONDecodeError:
+                if self.at_end:
+                    raise
+            size *= 2
+            self._load(size)
+        start = self.offset()
+        self.position = end
+        return value, start, self.offset()
+
+
+class ReportSource:
+    """
+    Sections of one report, decoded on demand.
+
+    ``sections`` lists section names ("inventory",
+    "comprehensive_analysis/Scripts", ...); ``file_index`` maps every
+    per-file row the report holds to a handle for ``file_row``.
+    """
+
+    path: Path
+
+    @property
+    def sections(self) -> List[str]:
+        raise NotImplementedError
+
+    def section(self, name: str) -> Any:
+        raise NotImplementedError
+
+    def file_index(self) -> Dict[str, Any]:
+        return {}
+
+    def file_row(self, handle: Any) -> Dict[str, Any]:
+        raise KeyError(handle)
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> "ReportSource":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _ColumnarFiles:
+    """Rows of the columnar per-file section of binary reports (and of JSON exports with files)"""
+
+    def __init__(self, files: Optional[Dict[str, Any]]):
+        self.files = files or {"paths": [], "groups": [], "group_codes": [], "columns": [], "values": {}}
+
+    def index(self) -> Dict[str, int]:
+        return {path: row for row, path in enumerate(self.files["paths"])}
+
+    def row(self, row: int) -> Dict[str, Any]:
+        files = self.files
+        values = {"group": files["groups"][files["group_codes"][row]]}
+        for name in files["columns"]:
+            value = files["values"][name][row]
+            values[name] = None if value is None or value != value else value
+        return values
+
+
+class JSONReportSource(ReportSource):
+    """
+    Section offsets of a pretty-printed or compact JSON report.
+
+    Each top-level member, and each member of the split sections (every
+    phase of ``comprehensive_analysis``), is decoded once by the C decoder
+    to find where its value ends; the value is dropped straight away and
+    only its byte range is kept, so sections are decoded again on demand.
+    The text is decoded a window at a time (``JSON_INDEX_WINDOW`` bytes, or
+    the longest single value if that is larger).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a JSON analysis report")
+        self.index: Dict[str, Tuple[int, int]] = {}
+        self._files: Optional[_ColumnarFiles] = None
+        try:
+            self._scan()
+        except Exception:
+            self.close()
+            raise
+
+    def _scan(self):
+        data = self._data
+        if data[:64].lstrip()[:1] != b"{":
+            raise ValueError(f"{self.path} is not a JSON analysis report")
+
+        try:
+            cursor = _JSONCursor(data, JSON_INDEX_WINDOW)
+            cursor.peek()
+            self._index_object(cursor, "")
+        except (ValueError, IndexError):
+            raise ValueError(f"{self.path} is a truncated JSON report") from None
+
+    def _index_object(self, cursor: _JSONCursor, prefix: str):
+        """Record the members of the object opening at the cursor and move past it"""
+        cursor.advance()
+        if cursor.peek() == "}":
+            cursor.advance()
+            return
+        while True:
+            key, _, _ = cursor.decode()
+            if cursor.peek() != ":":
+                raise ValueError(f"Expected ':' at byte {cursor.offset()}")
+            cursor.advance()
+            if prefix == "" and key in SPLIT_SECTIONS and cursor.peek() == "{":
+                self._index_object(cursor, key + "/")
+            else:
+                _, start, end = cursor.decode()
+                self.index[prefix + key] = (start, end)
+            separator = cursor.peek()
+            cursor.advance()
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' at byte {cursor.offset()}")
+
+    @property
+    def sections(self) -> List[str]:
+        return [name for name in self.index if name != "files"]
+
+    def section(self, name: str) -> Any:
+        start, end = self.index[name]
+        return json.loads(self._data[start:end])
+
+    def _columnar_files(self) -> _ColumnarFiles:
+        # Only exports written with --include-files carry per-file rows
+        if self._files is None:
+            self._files = _ColumnarFiles(self.section("files") if "files" in self.index else None)
+        return self._files
+
+    def file_index(self) -> Dict[str, Any]:
+        return self._columnar_files().index()
+
+    def file_row(self, handle: Any) -> Dict[str, Any]:
+        return self._columnar_files().row(handle)
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+
+class NDJSONReportSource(ReportSource):
+    """
+    Record offsets of an NDJSON report, from one pass over its lines.
+
+    The pass only matches each record's type and path, so phases are decoded
+    once, when diffed. Unfinished reports (no footer) are indexed as far as
+    they got; the footer's top-level results are small and kept in memory.
+    """
+
+    _RECORD_HEAD = re.compile(rb'\{"type":"(phase|section|file)","path":("(?:[^"\\]|\\.)*"|\[[^\]]*\])')
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self.index: Dict[str, int] = {}
+        self.files: Dict[str, int] = {}
+        self.top_level: Dict[str, Any] = {}
+        try:
+            self._scan()
+        except Exception:
+            self.close()
+            raise
+
+    def _scan(self):
+        offset = 0
+        for line in self._file:
+            if not line.endswith(b"\n"):
+                break  # torn last line of a crashed run
+            head = self._RECORD_HEAD.match(line)
+            if head is not None:
+                path = json.loads(head.group(2))
+                if head.group(1) == b"file":
+                    self.files[path] = offset
+                else:
+                    self.index["/".join(path)] = offset
+            elif line.startswith(b'{"type":"footer"'):
+                self.top_level = json.loads(line)["top_level"]
+            elif offset == 0 and json.loads(line).get("format") != REPORT_FORMAT:
+                raise ValueError(f"{self.path} is not an NDJSON analysis report")
+            offset += len(line)
+
+    def _record(self, offset: int) -> Dict[str, Any]:
+        self._file.seek(offset)
+        return json.loads(self._file.readline())
+
+    @property
+    def sections(self) -> List[str]:
+        return list(self.index) + [key for key in self.top_level if key not in self.index]
+
+    def section(self, name: str) -> Any:
+        if name in self.index:
+            return self._record(self.index[name])["data"]
+        return self.top_level[name]
+
+    def file_index(self) -> Dict[str, Any]:
+        return self.files
+
+    def file_row(self, handle: Any) -> Dict[str, Any]:
+        record = self._record(handle)
+        return {"kind": record["kind"], "size": record["size"], **_flatten(record["result"])}
+
+    def close(self):
+        self._file.close()
+
+
+class BinaryReportSource(ReportSource):
+    """Sections of a binary report through its section index"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.report = BinaryReport(path)
+        self._files: Optional[_ColumnarFiles] = None
+
+    @property
+    def sections(self) -> List[str]:
+        return [name for name in self.report.sections if not name.startswith("@")]
+
+    def section(self, name: str) -> Any:
+        return self.report.section(name)
+
+    def _columnar_files(self) -> _ColumnarFiles:
+        if self._files is None:
+            self._files = _ColumnarFiles(self.report.files())
+        return self._files
+
+    def file_index(self) -> Dict[str, Any]:
+        return self._columnar_files().index()
+
+    def file_row(self, handle: Any) -> Dict[str, Any]:
+        return self._columnar_files().row(handle)
+
+    def close(self):
+        self.report.close()
+
+
+def open_report(path: Path) -> ReportSource:
+    """A source for ``path``, whichever format the analyzer wrote it in"""
+    with open(path, 'rb') as f:
+        head = f.read(len(MAGIC) + 32)
+    if head.startswith(MAGIC):
+        return BinaryReportSource(path)
+    if head.startswith(b'{"type":"header"'):
+        return NDJSONReportSource(path)
+    return JSONReportSource(path)
+
+
+def _flatten(value: Any, prefix: str = "") -> Dict[str, Any]:
+    """Nested dicts as one level of "a/b" keys"""
+    if not isinstance(value, dict):
+        return {prefix: value}
+    flat: Dict[str, Any] = {}
+    for key, item in value.items():
+        flat.update(_flatten(item, f"{prefix}/{key}" if prefix else str(key)))
+    return flat
+
+
+def _record_key(items: List[Any]) -> Optional[Tuple[str, ...]]:
+    """The RECORD_KEYS fields every item of a list of records carries, if any"""
+    if not items or not all(isinstance(item, dict) for item in items):
+        return None
+    for fields in RECORD_KEYS:
+        if all(all(field in item for field in fields) for item in items):
+            return fields
+    return None
+
+
+def _label(item: Dict[str, Any], fields: Tuple[str, ...]) -> str:
+    return ", ".join(f"{field}={item[field]}" for field in fields)
+
+
+class ReportDiff:
+    """
+    Change records between two reports, one section at a time.
+
+    Record kinds: ``phase`` (a phase appeared or disappeared), ``score`` (a
+    numeric score changed by more than ``tolerance``), ``file`` (a file
+    entered or left a file list, or one of its metrics changed; one record
+    per file), ``recommendation`` (keyed by category and issue) and, only
+    with ``include_values``, ``value`` for any other changed field.
+    """
+
+    def __init__(self, tolerance: float = DEFAULT_TOLERANCE, include_values: bool = False):
+        self.tolerance = tolerance
+        self.include_values = include_values
+
+    def diff(self, old: ReportSource, new: ReportSource) -> Iterator[Dict[str, Any]]:
+        old_sections = [name for name in old.sections if not _is_volatile(name.split("/", 1)[0])]
+        new_sections = [name for name in new.sections if not _is_volatile(name.split("/", 1)[0])]
+        remaining = set(old_sections)
+        for name in new_sections:
+            if name in remaining:
+                remaining.discard(name)
+                yield from self.diff_section(name, old.section(name), new.section(name))
+            else:
+                yield from self.diff_section(name, None, new.section(name))
+        for name in old_sections:
+            if name in remaining:
+                yield from self.diff_section(name, old.section(name), None)
+        yield from self.diff_files(old, new)
+
+    def diff_section(self, name: str, old: Any, new: Any) -> Iterator[Dict[str, Any]]:
+        """Changes within one section; ``None`` on a side means the section is missing there"""
+        if old == new:
+            return
+        key, _, phase = name.partition("/")
+        if phase and (old is None or new is None):
+            present = new if old is None else old
+            score = present.get("sophistication_score") if isinstance(present, dict) else None
+            yield {"kind": KIND_PHASE, "section": name, "change": "added" if old is None else "removed",
+                   "score": score}
+            return
+        if key == "recommendations":
+            yield from self._diff_recommendations(old or [], new or [])
+            return
+        changes: List[Dict[str, Any]] = []
+        self._walk(name, [], old, new, changes.append)
+        if key not in SPLIT_SECTIONS:
+            # File names elsewhere (theme examples, duplicate clusters) are not phase inputs
+            changes = [self._as_value(change) for change in changes]
+        yield from (change for change in changes if change is not None)
+
+    def _as_value(self, change: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if change["kind"] != KIND_FILE:
+            return change
+        if not self.include_values:
+            return None
+        path = "/".join(part for part in (change.get("container"), change["file"]) if part)
+        if "fields" in change:
+            return {"kind": KIND_VALUE, "section": change["section"], "path": path, "change": change["change"],
+                    "fields": change["fields"]}
+        return {"kind": KIND_VALUE, "section": change["section"], "path": path, "change": change["change"]}
+
+    def diff_files(self, old: ReportSource, new: ReportSource) -> Iterator[Dict[str, Any]]:
+        """Per-file metric rows (binary @files, NDJSON file records), matched by path"""
+        old_index, new_index = old.file_index(), new.file_index()
+        if not old_index or not new_index:
+            return  # one side was written without per-file rows
+        for path, handle in new_index.items():
+            if path not in old_index:
+                yield {"kind": KIND_FILE, "section": "files", "file": path, "change": "added"}
+                continue
+            fields = self._field_changes(old.file_row(old_index[path]), new.file_row(handle))
+            if fields:
+                yield {"kind": KIND_FILE, "section": "files", "file": path, "change": "changed", "fields": fields}
+        for path in old_index:
+            if path not in new_index:
+                yield {"kind": KIND_FILE, "section": "files", "file": path, "change": "removed"}
+
+    def _walk(self, section: str, path: List[str], old: Any, new: Any, emit: Callable[[Dict[str, Any]], None]):
+        if isinstance(old, dict) or isinstance(new, dict):
+            if not (isinstance(old, dict) or old is None) or not (isinstance(new, dict) or new is None):
+                self._leaf(section, path, old, new, emit)
+                return
+            old, new = old or {}, new or {}
+            for key in list(new) + [key for key in old if key not in new]:
+                if _is_volatile(key):
+                    continue
+                old_value, new_value = old.get(key), new.get(key)
+                if old_value == new_value:
+                    continue
+                if FILE_NAME.match(key) and (isinstance(old_value, dict) or isinstance(new_value, dict)):
+                    self._file_entry(section, path, key, old_value, new_value, emit)
+                else:
+                    self._walk(section, path + [key], old_value, new_value, emit)
+        elif isinstance(old, list) and isinstance(new, list):
+            self._walk_list(section, path, old, new, emit)
+        elif isinstance(old, list) and new is None or old is None and isinstance(new, list):
+            self._walk_list(section, path, old or [], new or [], emit)
+        else:
+            self._leaf(section, path, old, new, emit)
+
+    def _walk_list(self, section: str, path: List[str], old: List[Any], new: List[Any],
+                   emit: Callable[[Dict[str, Any]], None]):
+        if all(isinstance(item, str) for item in old) and all(isinstance(item, str) for item in new):
+            # File lists: membership matters, order does not
+            old_items, new_items = set(old), set(new)
+            container = "/".join(path)
+            for change, items in (("added", new_items - old_items), ("removed", old_items - new_items)):
+                for item in sorted(items):
+                    if FILE_NAME.match(item):
+                        emit({"kind": KIND_FILE, "section": section, "container": container,
+                              "file": item, "change": change})
+                    elif self.include_values:
+                        emit({"kind": KIND_VALUE, "section": section, "path": container, "change": change,
+                              "after" if change == "added" else "before": item})
+            return
+        fields = _record_key(old + new)
+        if fields is None:
+            self._leaf(section, path, old, new, emit)
+            return
+        old_items = {_label(item, fields): item for item in old}
+        new_items = {_label(item, fields): item for item in new}
+        for label in list(new_items) + [label for label in old_items if label not in new_items]:
+            self._walk(section, path + [f"[{label}]"], old_items.get(label), new_items.get(label), emit)
+
+    def _leaf(self, section: str, path: List[str], old: Any, new: Any, emit: Callable[[Dict[str, Any]], None]):
+        if _same(old, new, self.tolerance):
+            return
+        numeric = _is_number(old) or _is_number(new)
+        if numeric and path and SCORE_KEY.search(path[-1]):
+            kind = KIND_SCORE
+        elif self.include_values:
+            kind = KIND_VALUE
+        else:
+            return
+        change = "added" if old is None else "removed" if new is None else "changed"
+        record = {"kind": kind, "section": section, "path": "/".join(path), "change": change,
+                  "before": old, "after": new}
+        if _is_number(old) and _is_number(new):
+            record["delta"] = new - old
+        emit(record)
+
+    def _file_entry(self, section: str, path: List[str], name: str, old: Any, new: Any,
+                    emit: Callable[[Dict[str, Any]], None]):
+        """One record for a file entry (key_files, bridge_files, ...) with every metric that changed"""
+        record = {"kind": KIND_FILE, "section": section, "container": "/".join(path), "file": name}
+        if old is None or new is None:
+            record["change"] = "added" if old is None else "removed"
+            emit(record)
+            return
+        fields = self._field_changes(_flatten(old), _flatten(new))
+        if fields:
+            record.update(change="changed", fields=fields)
+            emit(record)
+
+    def _field_changes(self, old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, List[Any]]:
+        return {
+            key: [old.get(key), new.get(key)]
+            for key in list(new) + [key for key in old if key not in new]
+            if not _is_volatile(key.rsplit("/", 1)[-1]) and not _same(old.get(key), new.get(key), self.tolerance)
+        }
+
+    def _diff_recommendations(self, old: List[Any], new: List[Any]) -> Iterator[Dict[str, Any]]:
+        fields = ("category", "issue")
+        old_items = {tuple(item.get(field) for field in fields): item for item in old if isinstance(item, dict)}
+        new_items = {tuple(item.get(field) for field in fields): item for item in new if isinstance(item, dict)}
+        for key in list(new_items) + [key for key in old_items if key not in new_items]:
+            old_item, new_item = old_items.get(key), new_items.get(key)
+            record = {"kind": KIND_RECOMMENDATION, "section": "recommendations", "key": dict(zip(fields, key))}
+            if old_item is None or new_item is None:
+                record.update(change="added" if old_item is None else "removed",
+                              recommendation=new_item if old_item is None else old_item)
+                yield record
+                continue
+            changed = self._field_changes(_flatten(old_item), _flatten(new_item))
+            if changed:
+                record.update(change="changed", fields=changed)
+                yield record
+
+
+def diff_reports(old_path: Path, new_path: Path, tolerance: float = DEFAULT_TOLERANCE,
+                 include_values: bool = False) -> Iterator[Dict[str, Any]]:
+    """Change records between two reports of any format (JSON, NDJSON or binary)"""
+    with open_report(old_path) as old, open_report(new_path) as new:
+        yield from ReportDiff(tolerance, include_values).diff(old, new)
+
+
+def summarize(changes: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Change counts per kind and change type"""
+    counts: Dict[str, Dict[str, int]] = {}
+    for change in changes:
+        _count(counts, change)
+    return counts
+
+
+def _count(counts: Dict[str, Dict[str, int]], change: Dict[str, Any]):
+    kind = counts.setdefault(change["kind"], {})
+    label = change.get("change", "changed")
+    kind[label] = kind.get(label, 0) + 1
+
+
+_SIGNS = {"added": "+", "removed": "-", "changed": "~"}
+
+
+def format_change(change: Dict[str, Any]) -> str:
+    """One human-readable line per change record"""
+    sign = _SIGNS[change.get("change", "changed")]
+    kind = change["kind"]
+    if kind == KIND_PHASE:
+        return f"{sign} phase  {change['section']} (score {change['score']})"
+    if kind == KIND_SCORE:
+        delta = f" ({change['delta']:+.4g})" if "delta" in change else ""
+        return f"{sign} score  {change['section']}: {change['path']} {change['before']} -> {change['after']}{delta}"
+    if kind == KIND_FILE:
+        where = "/".join(part for part in (change["section"], change.get("container")) if part)
+        fields = "".join(f"\n      {name}: {before} -> {after}"
+                         for name, (before, after) in change.get("fields", {}).items())
+        return f"{sign} file   {change['file']} [{where}]{fields}"
+    if kind == KIND_RECOMMENDATION:
+        key = change["key"]
+        fields = "".join(f"\n      {name}: {before} -> {after}"
+                         for name, (before, after) in change.get("fields", {}).items())
+        return f"{sign} recommendation  {key['category']}: {key['issue']}{fields}"
+    if "fields" in change or "before" not in change or "after" not in change:
+        item = change.get("after", change.get("before", ""))
+        fields = "".join(f"\n      {name}: {before} -> {after}"
+                         for name, (before, after) in change.get("fields", {}).items())
+        return f"{sign} value  {change['section']}: {change['path']} {item}{fields}".rstrip()
+    return f"{sign} value  {change['section']}: {change['path']} {change['before']} -> {change['after']}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Structural diff of two Oksana analysis reports")
+    parser.add_argument("old", type=Path, help="earlier report (.json, .ndjson or binary)")
+    parser.add_argument("new", type=Path, help="later report")
+    parser.add_argument("--ndjson", action="store_true", help="print one JSON change record per line")
+    parser.add_argument("--all", action="store_true", help="also report changed values that are not scores")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="ignore numeric changes within this relative/absolute tolerance")
+    args = parser.parse_args(argv)
+
+    counts: Dict[str, Dict[str, int]] = {}
+    for change in diff_reports(args.old, args.new, args.tolerance, args.all):
+        print(json.dumps(change, default=str) if args.ndjson else format_change(change))
+        _count(counts, change)
+
+    if not args.ndjson:
+        total = sum(sum(kind.values()) for kind in counts.values())
+        details = ", ".join(f"{kind}: {sum(labels.values())}" for kind, labels in counts.items())
+        print(f"📊 {total} changes{f' ({details})' if details else ''}")
+    # Like diff(1): 0 when the reports agree, 1 when they differ
+    return 1 if counts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Report Stream - incremental NDJSON analysis reports
+Appends one compact JSON record per phase (and optionally per scanned file)
+as soon as it is available, then a footer with the summary scores and a byte
+offset index. A crash mid-analysis keeps every completed phase on disk, and
+dashboards can tail the file while the analysis is still running.
+
+Record types, one per line:
+    header   run metadata, written when the analysis starts
+    phase    one analysis phase: {"path": [...], "data": {...}}
+    section  any other part of the results (inventory, recommendations, ...)
+    file     one scanned file's result (only with include_files)
+    footer   summary scores, remaining top-level results and the section index
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from project_inventory import report_default
+
+REPORT_FORMAT = "oksana-analysis-ndjson"
+REPORT_VERSION = 1
+
+# A footer is one line; read the tail in blocks until its start is found
+_TAIL_BLOCK_BYTES = 64 * 1024
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, separators=(",", ":"), default=report_default) + "\n").encode("utf-8")
+
+
+class NDJSONReportWriter:
+    """
+    Writes an analysis report one record at a time.
+
+    Every record is flushed immediately. ``index`` maps each section's path
+    ("comprehensive_analysis/Scripts") to the byte offset of its record, so
+    readers can jump to one phase without parsing the rest of the file.
+
+    Writes are serialized by a lock, so an event loop can encode records
+    itself (``encode_section`` / ``encode_files``, while the data cannot
+    change) and hand them to ``write_encoded`` on a worker thread.
+    """
+
+    def __init__(self, path: Path, include_files: bool = False):
+        self.path = Path(path)
+        self.include_files = include_files
+        self.records = 0
+        self.index: Dict[str, int] = {}
+        self._offset = 0
+        self._file: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def open(self, header: Dict[str, Any]):
+        """Start a new report (truncating any previous one) with a header record"""
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'wb')
+        self.records = 0
+        self.index = {}
+        self._offset = 0
+        self._write({"type": "header", "format": REPORT_FORMAT, "version": REPORT_VERSION, **header})
+
+    def _write(self, record: Dict[str, Any]):
+        self.write_encoded([(None, _encode(record))])
+
+    def write_encoded(self, records: Sequence[Tuple[Optional[str], bytes]]):
+        """Append encoded ``(index key or None, line)`` records with a single flush"""
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError(f"Report stream {self.path} is not open")
+            for key, line in records:
+                if key is not None:
+                    self.index[key] = self._offset
+                self._file.write(line)
+                self._offset += len(line)
+                self.records += 1
+            self._file.flush()
+
+    @staticmethod
+    def encode_section(path: Sequence[str], data: Any, record_type: str = "section") -> Tuple[str, bytes]:
+        """One part of the results as an indexed record; ``path`` is where it lives in analysis_results"""
+        return "/".join(path), _encode({"type": record_type, "path": list(path), "data": data})
+
+    def encode_files(self, files: Iterable[Tuple[str, str, int, Dict[str, Any]]]) -> List[Tuple[None, bytes]]:
+        """``(rel_path, kind, size, result)`` scans as file records (none unless include_files)"""
+        if not self.include_files:
+            return []
+        return [(None, _encode({"type": "file", "path": rel_path, "kind": kind, "size": size, "result": result}))
+                for rel_path, kind, size, result in files]
+
+    def write_section(self, path: Sequence[str], data: Any, record_type: str = "section"):
+        """Append one part of the results"""
+        self.write_encoded([self.encode_section(path, data, record_type)])
+
+    def write_file(self, rel_path: str, kind: str, size: int, result: Dict[str, Any]):
+        records = self.encode_files([(rel_path, kind, size, result)])
+        if records:
+            self.write_encoded(records)
+
+    def write_footer(self, summary: Dict[str, Any], top_level: Dict[str, Any]):
+        """Finish the report: summary scores, results not streamed as sections, and the index"""
+        self._write({
+            "type": "footer",
+            "records": self.records + 1,
+            "summary": summary,
+            "top_level": top_level,
+            "index": self.index
+        })
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield every complete record; a torn last line (crash mid-write) is skipped"""
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            yield json.loads(line)
+
+
+def read_footer(path: Path) -> Optional[Dict[str, Any]]:
+    """The footer record, read from the end of the file; None if the run did not finish"""
+    with open(path, 'rb') as f:
+        f.seek(0, 2)
+        end = f.tell()
+        tail = b""
+        position = end
+        while position > 0:
+            step = min(_TAIL_BLOCK_BYTES, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+            start = tail.rfind(b"\n", 0, len(tail) - 1)
+            if start != -1 or position == 0:
+                line = tail[start + 1:]
+                record = json.loads(line) if line.endswith(b"\n") else None
+                return record if record and record.get("type") == "footer" else None
+    return None
+
+
+def read_section(path: Path, key: str, footer: Optional[Dict[str, Any]] = None) -> Any:
+    """Data of one section (e.g. 'comprehensive_analysis/Scripts') via the footer index"""
+    footer = footer or read_footer(path)
+    if footer is None or key not in footer["index"]:
+        raise KeyError(key)
+    with open(path, 'rb') as f:
+        f.seek(footer["index"][key])
+        return json.loads(f.readline())["data"]
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    """Rebuild the analysis_results dict from a (possibly unfinished) report"""
+    results: Dict[str, Any] = {}
+    files: List[Dict[str, Any]] = []
+    for record in iter_records(path):
+        if record["type"] in ("phase", "section"):
+            target = results
+            for part in record["path"][:-1]:
+                target = target.setdefault(part, {})
+            target[record["path"][-1]] = record["data"]
+        elif record["type"] == "file":
+            files.append(record)
+        elif record["type"] == "footer":
+            results.update(record["top_level"])
+    if files:
+        results["files"] = files
+    return results
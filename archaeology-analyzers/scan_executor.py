@@ -0,0 +1,142 @@
+"""
+Scan Executor - fans CPU-bound source scans out to worker processes
+Batches file contents into chunks and runs the source_scanners functions in a
+ProcessPoolExecutor (thread pool fallback), or inline in serial mode.
+"""
+
+import os
+import pickle
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from source_scanners import scan_batch
+from streaming_scan import stream_scan_file, DEFAULT_STREAM_CHUNK_BYTES
+from tracing import span
+
+if TYPE_CHECKING:
+    from hardware_probe import HardwareProfile
+
+SCAN_MODES = ("serial", "process", "thread")
+DEFAULT_SCAN_MODE = "process"
+DEFAULT_CHUNK_SIZE = 32
+
+
+class ScanExecutor:
+    """
+    Runs per-file scans in the configured mode.
+
+    ``serial`` scans on the calling thread (handy for debugging and produces
+    the reference results), ``process`` uses a process pool and ``thread`` a
+    thread pool. If a process pool cannot be started or breaks, the executor
+    switches to threads and records the fallback in ``active_mode``.
+    """
+
+    def __init__(self, mode: str = DEFAULT_SCAN_MODE, max_workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if mode not in SCAN_MODES:
+            raise ValueError(f"Unknown scan mode '{mode}', expected one of {SCAN_MODES}")
+
+        self.mode = mode
+        self.active_mode = mode
+        self.workers_configured = max_workers is not None
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self._executor: Optional[Executor] = None
+
+        self.stats = {
+            "batches": 0,
+            "files_scanned": 0,
+            "files_streamed": 0,
+            "fallbacks": 0
+        }
+
+    @classmethod
+    def from_environment(cls) -> "ScanExecutor":
+        """Configure from OKSANA_ANALYZER_SCAN_MODE / _SCAN_WORKERS / _SCAN_CHUNK_SIZE"""
+        workers = os.getenv("OKSANA_ANALYZER_SCAN_WORKERS")
+        return cls(
+            mode=os.getenv("OKSANA_ANALYZER_SCAN_MODE", DEFAULT_SCAN_MODE),
+            max_workers=int(workers) if workers else None,
+            chunk_size=int(os.getenv("OKSANA_ANALYZER_SCAN_CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
+        )
+
+    def size_for(self, profile: "HardwareProfile"):
+        """
+        Size the pool from the host's capability profile (hardware_probe),
+        unless the worker count was configured or the pool already started.
+        """
+        if not self.workers_configured and self._executor is None:
+            self.max_workers = profile.scan_workers()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.active_mode == "process":
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except (OSError, NotImplementedError, ImportError) as e:
+                    self._fall_back_to_threads(e)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="oksana-scan")
+        return self._executor
+
+    def _fall_back_to_threads(self, reason: Exception):
+        print(f"⚠️  Process pool unavailable ({reason}) - scanning with threads")
+        self.stats["fallbacks"] += 1
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.active_mode = "thread"
+
+    async def _run(self, function, *args):
+        """Run ``function`` in the active mode, falling back to threads if processes fail"""
+        if self.active_mode == "serial":
+            return function(*args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), function, *args)
+        except (BrokenProcessPool, pickle.PicklingError) as e:
+            if self.mode != "process":
+                raise
+            # Worker crash or pickling failure: retry this work item on threads
+            if self.active_mode == "process":
+                self._fall_back_to_threads(e)
+            return await loop.run_in_executor(self._get_executor(), function, *args)
+
+    async def scan_chunk(self, kind: str, contents: List[str]) -> List[Dict[str, Any]]:
+        """Scan one chunk of contents; results are in input order"""
+        self.stats["batches"] += 1
+        self.stats["files_scanned"] += len(contents)
+        with span("scan_chunk", "scan", kind=kind, mode=self.active_mode) as scan_span:
+            scan_span.add(bytes=sum(len(content) for content in contents), files=len(contents))
+            return await self._run(scan_batch, kind, contents)
+
+    async def scan_path(self, kind: str, path: Path,
+                        chunk_bytes: int = DEFAULT_STREAM_CHUNK_BYTES) -> Tuple[Dict[str, Any], str]:
+        """Stream-scan a large file inside a worker; returns (result, content hash)"""
+        self.stats["files_streamed"] += 1
+        return await self._run(stream_scan_file, kind, str(path), chunk_bytes)
+
+    async def scan_many(self, kind: str, contents: List[str]) -> List[Dict[str, Any]]:
+        """Split ``contents`` into chunks, scan them concurrently and merge in order"""
+        chunks = [contents[i:i + self.chunk_size] for i in range(0, len(contents), self.chunk_size)]
+        results = await asyncio.gather(*(self.scan_chunk(kind, chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "mode": self.mode,
+            "active_mode": self.active_mode,
+            "max_workers": self.max_workers,
+            "chunk_size": self.chunk_size
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
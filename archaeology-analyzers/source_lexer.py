@@ -0,0 +1,431 @@
+"""
+Source Lexer - single-pass JS/TS and Swift token summaries for the source scanners
+A small hand-written lexer that skips comments, strings, template literals and
+regex literals and counts the constructs the complexity scores are built on:
+function declarations, type declarations, exports, async constructs and the
+deepest brace nesting.
+
+The lexer is incremental: text can be fed in arbitrary pieces (the streaming
+scanner feeds raw decoded chunks) and yields the same summary as one call with
+the whole file. Summaries of whole files are cached by content hash.
+"""
+
+import re
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+LANGUAGE_JAVASCRIPT = "javascript"  # JavaScript and TypeScript
+LANGUAGE_SWIFT = "swift"
+
+SUMMARY_KEYS = ("functions", "type_declarations", "exports", "async_constructs", "max_nesting_depth")
+
+DEFAULT_CACHE_ENTRIES = 4096
+
+# A "/" that would open a regex literal but finds no end within this many
+# characters is taken as division, so a misread never holds back a whole line
+MAX_REGEX_LITERAL = 4096
+
+_REGEX_BODY = re.compile(r"(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])*")
+_REGEX_FLAGS = re.compile(r"[A-Za-z]*")
+
+# Tokens after which a "/" starts a regex literal rather than a division
+_REGEX_PREFIX_PUNCT = set("([{,;:=!&|?+-*%<>~^}") | {"", "=>"}
+_REGEX_PREFIX_KEYWORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete",
+    "void", "throw", "instanceof", "yield", "await"
+}
+
+_JS_FUNCTIONS = {"function"}
+_JS_TYPES = {"class", "interface", "enum"}
+_JS_ASYNC = {"async", "await"}
+
+_SWIFT_FUNCTIONS = {"func", "init", "subscript"}
+_SWIFT_TYPES = {"struct", "enum", "protocol", "actor", "extension"}
+_SWIFT_ASYNC = {"async", "await"}
+# "class func", "class var" ... declare class members, not a class
+_SWIFT_CLASS_MEMBER = {"func", "var", "let", "subscript", "override", "init", "static"}
+# Contextual keywords decided by the token that follows them
+_SWIFT_DEFERRED = {"class", "open"}
+
+
+def _code_pattern(keywords, quotes: str, extra: str = "") -> "re.Pattern":
+    """
+    Everything code mode has to look at: comment starts, quotes, braces, the
+    counted keywords and language specifics. The text between two matches
+    only sets the previous-token context, so it is skipped in one step.
+    """
+    words = "|".join(sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"//|/\*|{quotes}|[{{}}]{extra}|(?<![\w$])(?:{words})(?![\w$])")
+
+
+_JS_KEYWORDS = _JS_FUNCTIONS | _JS_TYPES | _JS_ASYNC | _REGEX_PREFIX_KEYWORDS | {"export", "exports", "module"}
+_SWIFT_KEYWORDS = _SWIFT_FUNCTIONS | _SWIFT_TYPES | _SWIFT_ASYNC | _SWIFT_DEFERRED | {"public"}
+
+_CODE_PATTERNS = {
+    LANGUAGE_JAVASCRIPT: _code_pattern(_JS_KEYWORDS, "[\"'`]", "|=>|/"),
+    LANGUAGE_SWIFT: _code_pattern(_SWIFT_KEYWORDS, '#*"(?:"")?')
+}
+# Inside a Swift \(...) interpolation the closing parenthesis matters too
+_SWIFT_INTERPOLATION_PATTERN = _code_pattern(_SWIFT_KEYWORDS, '#*"(?:"")?', "|[()]")
+_GAP_FIRST_TOKEN = re.compile(r"\s*([\w$]+|\S)")
+_COMMENT_END = re.compile(r"\*/")
+_SWIFT_COMMENT_MARKS = re.compile(r"\*/|/\*")
+_STRING_STOPS: Dict[str, "re.Pattern"] = {}
+
+
+def _string_stops(terminator: str) -> "re.Pattern":
+    """Characters a string of this kind must stop at: its quote, escapes, and newline or ${ where relevant"""
+    stops = _STRING_STOPS.get(terminator)
+    if stops is None:
+        chars = re.escape(terminator[0]) + "\\\\"
+        if terminator == "`":
+            chars += "$"
+        elif not terminator.startswith('"""'):
+            chars += "\\n"  # single-line strings end at a newline, terminated or not
+        stops = _STRING_STOPS[terminator] = re.compile(f"[{chars}]")
+    return stops
+
+# Mode stack entries
+_CODE = "code"
+_LINE_COMMENT = "line-comment"
+_BLOCK_COMMENT = "block-comment"
+_STRING = "string"
+
+
+class SourceLexer:
+    """
+    Incremental lexer for one file. ``feed`` any number of text pieces, then
+    ``close``; ``summary`` returns the counters.
+
+    State lives on a mode stack: code (optionally closing an interpolation
+    with ``}`` or ``)``), line and block comments (Swift block comments nest)
+    and strings (JS quotes and template literals, Swift single-line,
+    multi-line and raw strings). Only a token that may continue in the next
+    piece is held back between calls.
+    """
+
+    def __init__(self, language: str = LANGUAGE_JAVASCRIPT):
+        if language not in (LANGUAGE_JAVASCRIPT, LANGUAGE_SWIFT):
+            raise ValueError(f"Unknown language '{language}'")
+        self.language = language
+        self.swift = language == LANGUAGE_SWIFT
+        self.counts = dict.fromkeys(SUMMARY_KEYS, 0)
+        # (mode, detail, nested count): closer for code, terminator for strings, depth for Swift comments
+        self._modes: List[list] = [[_CODE, None, 0]]
+        self._depth = 0
+        self._previous = ""
+        self._before_previous = ""
+        self._pending = ""
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def feed(self, text: str):
+        buffer = self._pending + text
+        self._pending = buffer[self._lex(buffer, final=False):]
+
+    def close(self) -> Dict[str, int]:
+        buffer, self._pending = self._pending, ""
+        self._lex(buffer, final=True)
+        self._token("")
+        return self.summary()
+
+    def summary(self) -> Dict[str, int]:
+        return dict(self.counts)
+
+    # ------------------------------------------------------------------
+    # Tokens
+    # ------------------------------------------------------------------
+
+    def _token(self, token: str):
+        """Count ``token`` (an identifier, "=>", "{", "}" or other punctuation) in code"""
+        previous = self._previous
+        member = previous in (".", "?.")
+        counts = self.counts
+
+        if self.swift:
+            # Decisions that need the token after a contextual keyword
+            if previous == "class" and self._before_previous != "." and token not in _SWIFT_CLASS_MEMBER:
+                counts["type_declarations"] += 1
+            elif previous == "open" and self._before_previous != "." and token.isidentifier():
+                counts["exports"] += 1
+            if not member:
+                if token in _SWIFT_FUNCTIONS:
+                    counts["functions"] += 1
+                elif token in _SWIFT_TYPES:
+                    counts["type_declarations"] += 1
+                elif token in _SWIFT_ASYNC:
+                    counts["async_constructs"] += 1
+                elif token == "public":
+                    counts["exports"] += 1
+        else:
+            if token == "=>":
+                counts["functions"] += 1
+            elif token == "exports":
+                # CommonJS: "module.exports = ..." or "exports.name = ..."
+                if not member or self._before_previous == "module":
+                    counts["exports"] += 1
+            elif not member:
+                if token in _JS_FUNCTIONS:
+                    counts["functions"] += 1
+                elif token in _JS_TYPES:
+                    counts["type_declarations"] += 1
+                elif token in _JS_ASYNC:
+                    counts["async_constructs"] += 1
+                elif token == "export":
+                    counts["exports"] += 1
+
+        if token == "{":
+            self._depth += 1
+            if self._depth > counts["max_nesting_depth"]:
+                counts["max_nesting_depth"] = self._depth
+        elif token == "}":
+            self._depth = max(self._depth - 1, 0)
+
+        self._before_previous, self._previous = previous, token
+
+    def _regex_allowed(self) -> bool:
+        previous = self._previous
+        return previous in _REGEX_PREFIX_PUNCT or previous in _REGEX_PREFIX_KEYWORDS
+
+    # ------------------------------------------------------------------
+    # Modes
+    # ------------------------------------------------------------------
+
+    def _lex(self, buffer: str, final: bool) -> int:
+        """Consume ``buffer`` from the start; return how far it got (the rest is held back)"""
+        pos, end = 0, len(buffer)
+        while pos < end:
+            mode = self._modes[-1]
+            if mode[0] == _CODE:
+                advanced = self._lex_code(buffer, pos, final, mode)
+            elif mode[0] == _LINE_COMMENT:
+                newline = buffer.find("\n", pos)
+                if newline < 0:
+                    return end
+                self._modes.pop()
+                advanced = newline + 1
+            elif mode[0] == _BLOCK_COMMENT:
+                advanced = self._lex_block_comment(buffer, pos, final, mode)
+            else:
+                advanced = self._lex_string(buffer, pos, final, mode)
+            if advanced is None or advanced == pos:
+                return pos  # wait for more input
+            pos = advanced
+        return pos
+
+    def _gap(self, buffer: str, start: int, stop: int):
+        """Tokens between two matches: only the last one (and a deferred decision) matter"""
+        gap = buffer[start:stop].strip()
+        if not gap:
+            return
+        if self.swift and self._previous in _SWIFT_DEFERRED:
+            first = _GAP_FIRST_TOKEN.match(gap).group(1)
+            self._token(first)
+            gap = gap[len(first):].strip()
+            if not gap:
+                return
+        last = gap[-1]
+        # Identifiers and numbers only matter as "some operand"
+        token = "x" if last.isalnum() or last in "_$" else last
+        self._before_previous = self._previous if len(gap) == 1 else "x"
+        self._previous = token
+
+    def _lex_code(self, buffer: str, pos: int, final: bool, mode: list) -> Optional[int]:
+        if self.swift:
+            pattern = _SWIFT_INTERPOLATION_PATTERN if mode[1] == ")" else _CODE_PATTERNS[LANGUAGE_SWIFT]
+        else:
+            pattern = _CODE_PATTERNS[LANGUAGE_JAVASCRIPT]
+        end = len(buffer)
+        while True:
+            match = pattern.search(buffer, pos)
+            if match is None:
+                stop = end
+                if not final:
+                    # Hold back a trailing word or operator that may continue in the next piece
+                    while stop > pos and (buffer[stop - 1].isalnum() or buffer[stop - 1] in "_$"):
+                        stop -= 1
+                    if stop > pos and buffer[stop - 1] in "=#/*?\\":
+                        stop -= 1
+                self._gap(buffer, pos, stop)
+                return stop
+            start = match.start()
+            if start > pos:
+                self._gap(buffer, pos, start)
+            if match.end() == end and not final:
+                return start
+            text = match.group()
+            pos = match.end()
+
+            if text == "//":
+                self._modes.append([_LINE_COMMENT, None, 0])
+                return pos
+            if text == "/*":
+                self._modes.append([_BLOCK_COMMENT, None, 1])
+                return pos
+            first = text[0]
+            if first in "\"'`#":
+                opened = self._open_string(buffer, start, text, final)
+                return start if opened is None else opened
+            if text == "/":
+                if self._regex_allowed():
+                    regex_end = self._regex_literal(buffer, pos, final)
+                    if regex_end is None:
+                        return start
+                    if regex_end > 0:
+                        self._token("/regex/")
+                        pos = regex_end
+                        continue
+                self._token("/")
+                continue
+
+            closer = mode[1]
+            if closer is not None:
+                if text == closer:
+                    if mode[2] == 0:
+                        # End of a ${...} or \(...) interpolation: back into the string
+                        self._modes.pop()
+                        return pos
+                    mode[2] -= 1
+                elif text == ("{" if closer == "}" else "("):
+                    mode[2] += 1
+            self._token(text)
+
+    def _regex_literal(self, buffer: str, pos: int, final: bool) -> Optional[int]:
+        """End of the regex literal whose body starts at ``pos``; 0 if it is not one, None to wait"""
+        body = _REGEX_BODY.match(buffer, pos, min(len(buffer), pos + MAX_REGEX_LITERAL))
+        after = body.end()
+        if after < len(buffer) and buffer[after] == "/":
+            flags = _REGEX_FLAGS.match(buffer, after + 1)
+            if flags.end() == len(buffer) and not final:
+                return None
+            return flags.end()
+        # Stopped at the end of the buffer, or at an escape / class it cuts off
+        if not final and after - pos < MAX_REGEX_LITERAL and buffer[after:after + 1] in ("", "\\", "[") \
+                and "\n" not in buffer[after:pos + MAX_REGEX_LITERAL]:
+            return None
+        return 0
+
+    def _open_string(self, buffer: str, pos: int, text: str, final: bool) -> Optional[int]:
+        if text in ("'", "`"):
+            if self.swift:
+                # Swift has no single-quoted strings; backticks escape identifiers
+                self._token(text)
+            else:
+                self._modes.append([_STRING, text, 0])
+            return pos + 1
+        # Swift raw strings: #"..."# and #"""..."""#; JavaScript has no '#' before quotes
+        hashes = len(text) - len(text.lstrip("#"))
+        quotes = text[hashes:]
+        if hashes and not self.swift:
+            self._token("#")
+            return pos + 1
+        if quotes == '"' and not final and pos + len(text) + 1 >= len(buffer):
+            return None  # may be the start of '"""'
+        if quotes == '"""' and self.swift:
+            terminator = '"""' + "#" * hashes
+        else:
+            terminator = '"' + "#" * hashes
+            if quotes == '"""':
+                # JavaScript: an empty string followed by a quote
+                self._token('""')
+                return pos + hashes + 2
+        self._modes.append([_STRING, terminator, hashes])
+        return pos + hashes + len(quotes if terminator.startswith('"""') else '"')
+
+    def _lex_block_comment(self, buffer: str, pos: int, final: bool, mode: list) -> Optional[int]:
+        pattern = _SWIFT_COMMENT_MARKS if self.swift else _COMMENT_END
+        while True:
+            match = pattern.search(buffer, pos)
+            if match is None:
+                # Keep a trailing "*" or "/" that may start the terminator
+                return len(buffer) if final else max(pos, len(buffer) - 1)
+            pos = match.end()
+            if match.group() == "/*":
+                mode[2] += 1
+                continue
+            mode[2] -= 1
+            if mode[2] == 0:
+                self._modes.pop()
+                return pos
+
+    def _lex_string(self, buffer: str, pos: int, final: bool, mode: list) -> Optional[int]:
+        terminator, hashes = mode[1], mode[2]
+        escape = "\\" + "#" * hashes
+        stops = _string_stops(terminator)
+        while True:
+            match = stops.search(buffer, pos)
+            if match is None:
+                return len(buffer)
+            index = match.start()
+            char = buffer[index]
+            if char == "\n":
+                # Unterminated single-line string
+                self._modes.pop()
+                return index + 1
+            if char == "$":
+                if index + 1 == len(buffer) and not final:
+                    return index
+                if buffer.startswith("${", index):
+                    self._modes.append([_CODE, "}", 0])
+                    return index + 2
+                pos = index + 1
+                continue
+            if char == "\\":
+                if index + len(escape) >= len(buffer) and not final:
+                    return index
+                if self.swift and buffer.startswith(escape + "(", index):
+                    self._modes.append([_CODE, ")", 0])
+                    return index + len(escape) + 1
+                # Inside raw strings a backslash without the hashes is plain text
+                pos = index + (len(escape) + 1 if buffer.startswith(escape, index) else 1)
+                continue
+            # A possible terminator
+            if buffer.startswith(terminator, index):
+                self._modes.pop()
+                self._token("string")
+                return index + len(terminator)
+            if index + len(terminator) > len(buffer) and not final:
+                return index
+            pos = index + 1
+
+
+def tokenize(content: str, language: str = LANGUAGE_JAVASCRIPT) -> Dict[str, int]:
+    """Token summary of a whole file"""
+    lexer = SourceLexer(language)
+    lexer.feed(content)
+    return lexer.close()
+
+
+class TokenSummaryCache:
+    """LRU of token summaries keyed by (language, content hash)"""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, int]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def summarize(self, content: str, language: str = LANGUAGE_JAVASCRIPT) -> Dict[str, int]:
+        key = (language, hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest())
+        summary = self._entries.get(key)
+        if summary is not None:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return dict(summary)
+        self.stats["misses"] += 1
+        summary = tokenize(content, language)
+        self._entries[key] = summary
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return dict(summary)
+
+
+# Process-wide cache (each scan worker process has its own)
+TOKEN_CACHE = TokenSummaryCache()
+
+
+def summarize(content: str, language: str = LANGUAGE_JAVASCRIPT) -> Dict[str, int]:
+    """Cached token summary: a file is only re-tokenized when its content changes"""
+    return TOKEN_CACHE.summarize(content, language)
@@ -0,0 +1,321 @@
+"""
+Source Scanners - pure per-file scans used by the Oksana analyzer phases
+Module-level functions with no analyzer state, so they can be cached by kind
+and shipped to worker processes for parallel scanning.
+"""
+
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from keyword_matcher import KeywordMatcher
+from near_duplicates import MinHasher
+from source_lexer import LANGUAGE_JAVASCRIPT, LANGUAGE_SWIFT, SourceLexer, summarize
+
+# Per-file scan kinds stored in the analysis cache; bump the suffix whenever a
+# scanner's output changes so stale entries are ignored.
+SCAN_KIND_JAVASCRIPT = "javascript:v2"
+SCAN_KIND_BRIDGE = "bridge:v2"
+SCAN_KIND_SWIFT_BRIDGE = "swift-bridge:v1"
+SCAN_KIND_SWIFT_PATTERNS = "swift-patterns:v1"
+SCAN_KIND_FIGMA_PATTERNS = "figma-patterns:v1"
+SCAN_KIND_XCODE_PATTERNS = "xcode-patterns:v1"
+SCAN_KIND_FEATURES = "features:v1"
+SCAN_KIND_MINHASH = "minhash:v1"
+
+# Kinds whose code constructs (declarations, exports, async, nesting) come
+# from the source lexer rather than keyword counts, and the language lexed
+TOKENIZED_KINDS = {
+    SCAN_KIND_JAVASCRIPT: LANGUAGE_JAVASCRIPT,
+    SCAN_KIND_BRIDGE: LANGUAGE_JAVASCRIPT,
+    SCAN_KIND_SWIFT_BRIDGE: LANGUAGE_SWIFT
+}
+BRIDGE_SCAN_KINDS = (SCAN_KIND_BRIDGE, SCAN_KIND_SWIFT_BRIDGE)
+
+# Pattern groups, each compiled once into a single-pass matcher
+JS_DOMAIN_MATCHER = KeywordMatcher({
+    "mcp_patterns": ['mcp'],
+    "apple_intelligence_patterns": ['apple', 'm4', 'neural', 'intelligence'],
+    "quantum_patterns": ['quantum']
+})
+
+BRIDGE_MATCHER = KeywordMatcher({
+    "bridge_patterns": ['bridge', 'integrate', 'connect', 'sync'],
+    "error_handling": ['try', 'catch', 'error', 'throw'],
+    "integration_points": ['api', 'service', 'client', 'server']
+})
+
+SWIFT_PATTERN_MATCHER = KeywordMatcher({
+    "m4_optimization": ['m4', 'neural', 'metalperformanceshaders', 'accelerate'],
+    "neural_engine": ['neuralengine', 'coreml', 'mlmodel']
+})
+
+FIGMA_PATTERNS = ['figma', 'design', 'component', 'frame', 'node']
+FIGMA_PATTERN_MATCHER = KeywordMatcher({
+    "mcp_integration": ['mcp'],
+    "figma_patterns": FIGMA_PATTERNS
+})
+
+XCODE_BRIDGE_PATTERNS = ['bridge', 'xcode', 'model', 'sync', 'convert']
+XCODE_PATTERN_MATCHER = KeywordMatcher({
+    "bridge_patterns": XCODE_BRIDGE_PATTERNS
+})
+
+# Identifier words for the file x term matrix (architecture_themes): camelCase,
+# PascalCase, snake_case and ACRONYMS split into lower-cased words of 3+ letters
+IDENTIFIER_WORD = re.compile(r"[A-Z][a-z]{2,}|[a-z]{3,}|[A-Z]{3,}(?![a-z])")
+TRAILING_LETTERS = re.compile(r"[A-Za-z]*\Z")
+MAX_FILE_TERMS = 48
+STOP_TERMS = frozenset("""
+    abstract and any are args arguments array assert async await bool boolean break but case catch class const
+    constructor continue def default defer delete didset else enum error export extends extension false fileprivate
+    final for from func function get guard has implements import init inout instanceof interface internal lazy
+    length let mutating new nil not null number object open operator optional override private protected protocol
+    public readonly rethrows return self set some static string struct subscript super switch that the then this
+    throw throws true try type typeof undefined value var void weak where while willset with yield
+""".split())
+
+# Longest keyword of any matcher: pieces of a split line must overlap by one less
+MAX_KEYWORD_LENGTH = max(matcher.max_keyword_length for matcher in (
+    JS_DOMAIN_MATCHER, BRIDGE_MATCHER,
+    SWIFT_PATTERN_MATCHER, FIGMA_PATTERN_MATCHER, XCODE_PATTERN_MATCHER
+))
+
+
+# ----------------------------------------------------------------------
+# Each scan is split into ``measure`` (additive counters over a run of whole
+# lines) and ``finalize`` (counters -> per-file analysis dict). Scanning a file
+# in one piece or as line-aligned chunks whose counters are summed gives the
+# same result, which is what the streaming path relies on.
+#
+# Lexer summaries, identifier-word counts and MinHash signatures are not
+# line-additive (one line may be split into overlapping pieces): for those
+# kinds the whole file goes through one incremental scanner (see
+# incremental_scanner), fed at once by scan_source or chunk by chunk when
+# streaming, and its counters are merged in before finalize.
+# ----------------------------------------------------------------------
+
+def measure_javascript(content: str) -> Dict[str, int]:
+    return {
+        "newlines": content.count('\n'),
+        **JS_DOMAIN_MATCHER.count_lines(content)
+    }
+
+
+def finalize_javascript(counts: Dict[str, int]) -> Dict[str, Any]:
+    analysis = {
+        "lines_of_code": counts["newlines"] + 1,
+        "functions_count": counts["functions"],
+        "async_patterns": counts["async_constructs"],
+        "class_definitions": counts["type_declarations"],
+        "export_statements": counts["exports"],
+        "max_nesting_depth": counts["max_nesting_depth"],
+        "mcp_patterns": counts["mcp_patterns"],
+        "apple_intelligence_patterns": counts["apple_intelligence_patterns"],
+        "quantum_patterns": counts["quantum_patterns"],
+        "complexity_score": 0.0
+    }
+
+    # Calculate complexity score
+    base_score = 0.1
+    line_factor = min(analysis["lines_of_code"] / 500, 0.3)
+    function_factor = min(analysis["functions_count"] / 20, 0.2)
+    async_factor = min(analysis["async_patterns"] / 10, 0.15)
+    class_factor = analysis["class_definitions"] * 0.1
+    sophistication_factor = (analysis["mcp_patterns"] + analysis["apple_intelligence_patterns"] + analysis["quantum_patterns"]) * 0.05
+
+    analysis["complexity_score"] = min(base_score + line_factor + function_factor + async_factor + class_factor + sophistication_factor, 1.0)
+
+    return analysis
+
+
+def measure_bridge(content: str) -> Dict[str, int]:
+    return {
+        "newlines": content.count('\n'),
+        **BRIDGE_MATCHER.count_lines(content)
+    }
+
+
+def finalize_bridge(counts: Dict[str, int]) -> Dict[str, Any]:
+    analysis = {
+        "lines_of_code": counts["newlines"] + 1,
+        "bridge_patterns": counts["bridge_patterns"],
+        "async_operations": counts["async_constructs"],
+        "error_handling": counts["error_handling"],
+        "type_definitions": counts["type_declarations"],
+        "integration_points": counts["integration_points"],
+        "functions_count": counts["functions"],
+        "export_statements": counts["exports"],
+        "max_nesting_depth": counts["max_nesting_depth"],
+        "complexity_score": 0.0
+    }
+
+    # Calculate complexity score
+    base_score = 0.1
+    line_factor = min(analysis["lines_of_code"] / 200, 0.2)
+    pattern_factor = min(analysis["bridge_patterns"] / 10, 0.2)
+    async_factor = min(analysis["async_operations"] / 5, 0.15)
+    error_factor = min(analysis["error_handling"] / 5, 0.15)
+    type_factor = min(analysis["type_definitions"] / 5, 0.1)
+    integration_factor = min(analysis["integration_points"] / 10, 0.2)
+
+    analysis["complexity_score"] = min(
+        base_score + line_factor + pattern_factor + async_factor + error_factor + type_factor + integration_factor,
+        1.0
+    )
+
+    return analysis
+
+
+def measure_swift_patterns(content: str) -> Dict[str, int]:
+    return {category: 1 for category in SWIFT_PATTERN_MATCHER.find_categories(content)}
+
+
+def finalize_swift_patterns(counts: Dict[str, int]) -> Dict[str, Any]:
+    return {
+        "m4_optimization": counts.get("m4_optimization", 0) > 0,
+        "neural_engine": counts.get("neural_engine", 0) > 0
+    }
+
+
+def measure_figma_patterns(content: str) -> Dict[str, int]:
+    return {keyword: 1 for keyword in FIGMA_PATTERN_MATCHER.find_keywords(content)}
+
+
+def finalize_figma_patterns(counts: Dict[str, int]) -> Dict[str, Any]:
+    return {
+        "mcp_integration": counts.get('mcp', 0) > 0,
+        "figma_patterns": [pattern for pattern in FIGMA_PATTERNS if counts.get(pattern, 0) > 0]
+    }
+
+
+def measure_xcode_patterns(content: str) -> Dict[str, int]:
+    return {keyword: 1 for keyword in XCODE_PATTERN_MATCHER.find_keywords(content)}
+
+
+def finalize_xcode_patterns(counts: Dict[str, int]) -> Dict[str, Any]:
+    # '.xcodeproj' always contains 'xcode', so the keyword scan covers both checks
+    return {
+        "bridge_patterns": [pattern for pattern in XCODE_BRIDGE_PATTERNS if counts.get(pattern, 0) > 0],
+        "xcode_integration": counts.get('xcode', 0) > 0
+    }
+
+
+class IdentifierWordCounter:
+    """Incremental identifier-word counts; a run of letters cut off at the end of a chunk waits for the next"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self._pending = ""
+
+    def feed(self, text: str):
+        text = self._pending + text
+        cut = TRAILING_LETTERS.search(text).start()
+        self._pending = text[cut:]
+        self.counts.update(map(str.lower, IDENTIFIER_WORD.findall(text, 0, cut)))
+
+    def close(self) -> Dict[str, int]:
+        self.counts.update(map(str.lower, IDENTIFIER_WORD.findall(self._pending)))
+        self._pending = ""
+        return dict(self.counts)
+
+
+def measure_features(content: str) -> Dict[str, int]:
+    return {}  # words come from IdentifierWordCounter
+
+
+def finalize_features(counts: Dict[str, int]) -> Dict[str, Any]:
+    terms = sorted(((count, term) for term, count in counts.items() if term not in STOP_TERMS),
+                   key=lambda item: (-item[0], item[1]))
+    return {
+        "terms": {term: count for count, term in terms[:MAX_FILE_TERMS]},
+        "distinct_terms": len(terms)
+    }
+
+
+def measure_minhash(content: str) -> Dict[str, int]:
+    return {}  # the signature comes from MinHasher
+
+
+def finalize_minhash(counts: Dict[str, Any]) -> Dict[str, Any]:
+    return {"signature": counts["signature"], "shingles": counts["shingles"]}
+
+
+def merge_counts(total: Dict[str, int], counts: Dict[str, int]) -> Dict[str, int]:
+    """Accumulate one chunk's counters into ``total`` (in place)"""
+    for key, value in counts.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+
+SCANNERS: Dict[str, Tuple[Callable[[str], Dict[str, int]], Callable[[Dict[str, int]], Dict[str, Any]]]] = {
+    SCAN_KIND_JAVASCRIPT: (measure_javascript, finalize_javascript),
+    SCAN_KIND_BRIDGE: (measure_bridge, finalize_bridge),
+    SCAN_KIND_SWIFT_BRIDGE: (measure_bridge, finalize_bridge),
+    SCAN_KIND_SWIFT_PATTERNS: (measure_swift_patterns, finalize_swift_patterns),
+    SCAN_KIND_FIGMA_PATTERNS: (measure_figma_patterns, finalize_figma_patterns),
+    SCAN_KIND_XCODE_PATTERNS: (measure_xcode_patterns, finalize_xcode_patterns),
+    SCAN_KIND_FEATURES: (measure_features, finalize_features),
+    SCAN_KIND_MINHASH: (measure_minhash, finalize_minhash)
+}
+
+
+def scan_source(kind: str, content: str) -> Dict[str, Any]:
+    """Run the scanner registered for ``kind`` over one file's content"""
+    measure, finalize = SCANNERS[kind]
+    counts = measure(content)
+    if kind in TOKENIZED_KINDS:
+        counts.update(summarize(content, TOKENIZED_KINDS[kind]))
+    else:
+        incremental = incremental_scanner(kind)
+        if incremental is not None:
+            incremental.feed(content)
+            counts.update(incremental.close())
+    return finalize(counts)
+
+
+def incremental_scanner(kind: str) -> Optional[Any]:
+    """Fresh ``feed(text)`` / ``close() -> counters`` scanner for kinds that are not line-additive"""
+    if kind in TOKENIZED_KINDS:
+        return SourceLexer(TOKENIZED_KINDS[kind])
+    if kind == SCAN_KIND_FEATURES:
+        return IdentifierWordCounter()
+    if kind == SCAN_KIND_MINHASH:
+        return MinHasher()
+    return None
+
+
+def bridge_scan_kind(path: Path) -> str:
+    """Bridge scan kind for a file: Swift sources are lexed as Swift, the rest as JS/TS"""
+    return SCAN_KIND_SWIFT_BRIDGE if Path(path).suffix == ".swift" else SCAN_KIND_BRIDGE
+
+
+def analyze_javascript_source(content: str) -> Dict[str, Any]:
+    """Analyze JavaScript file for complexity and patterns"""
+    return scan_source(SCAN_KIND_JAVASCRIPT, content)
+
+
+def analyze_bridge_source(content: str) -> Dict[str, Any]:
+    """Analyze a bridge file for complexity and patterns"""
+    return scan_source(SCAN_KIND_BRIDGE, content)
+
+
+def scan_swift_patterns(content: str) -> Dict[str, Any]:
+    """Detect M4 optimization and Neural Engine patterns in a Swift file"""
+    return scan_source(SCAN_KIND_SWIFT_PATTERNS, content)
+
+
+def scan_figma_patterns(content: str) -> Dict[str, Any]:
+    """Detect MCP usage and Figma vocabulary in a server source file"""
+    return scan_source(SCAN_KIND_FIGMA_PATTERNS, content)
+
+
+def scan_xcode_patterns(content: str) -> Dict[str, Any]:
+    """Detect bridge vocabulary and Xcode references in a bridge source file"""
+    return scan_source(SCAN_KIND_XCODE_PATTERNS, content)
+
+
+def scan_batch(kind: str, contents: List[str]) -> List[Dict[str, Any]]:
+    """Worker entry point: scan a chunk of file contents of the same kind"""
+    return [scan_source(kind, content) for content in contents]
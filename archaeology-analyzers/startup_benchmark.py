@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark - cold-start cost of the Oksana analyzer
+Runs fresh interpreters with ``-X importtime``, times importing the analyzer
+module and constructing EnhancedOksanaPlatformAnalyzer, and reports the
+slowest imports plus which heavy optional dependencies got loaded.
+
+Usage: python3 startup_benchmark.py [--runs N] [--top N] [--json]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List
+
+ANALYZER_DIR = Path(__file__).resolve().parent
+
+# Modules whose presence after startup means something was imported eagerly
+HEAVY_MODULES = ("numpy", "scipy", "coremltools", "pandas", "anthropic", "grid_api")
+
+PROBE = """
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import enhanced_project_analyzer
+    imported = time.perf_counter()
+    analyzer = enhanced_project_analyzer.EnhancedOksanaPlatformAnalyzer()
+    constructed = time.perf_counter()
+    analyzer.close()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "construct_ms": (constructed - imported) * 1000,
+    "heavy_modules_loaded": [name for name in %r if name in sys.modules]
+}))
+""" % (HEAVY_MODULES,)
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, float]]:
+    """Per-module self/cumulative microseconds from ``-X importtime`` output"""
+    modules: Dict[str, Dict[str, float]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = {
+            "self_us": float(self_us),
+            "cumulative_us": float(cumulative_us),
+            "depth": (len(name) - len(name.lstrip(" "))) // 2
+        }
+    return modules
+
+
+def run_once() -> Dict[str, Any]:
+    env = dict(os.environ, OKSANA_ANALYZER_CACHE="off", PYTHONDONTWRITEBYTECODE="1")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ANALYZER_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["imports"] = parse_importtime(completed.stderr)
+    return result
+
+
+def benchmark(runs: int = 5, top: int = 10) -> Dict[str, Any]:
+    samples: List[Dict[str, Any]] = [run_once() for _ in range(max(1, runs))]
+
+    # Median cumulative time of modules imported directly by the analyzer or the probe
+    cumulative: Dict[str, List[float]] = {}
+    for sample in samples:
+        for name, timing in sample["imports"].items():
+            if timing["depth"] <= 1:
+                cumulative.setdefault(name, []).append(timing["cumulative_us"])
+    slowest = sorted(((statistics.median(values), name) for name, values in cumulative.items()), reverse=True)
+
+    return {
+        "python": sys.version.split()[0],
+        "runs": len(samples),
+        "import_ms": statistics.median(sample["import_ms"] for sample in samples),
+        "construct_ms": statistics.median(sample["construct_ms"] for sample in samples),
+        "heavy_modules_loaded": samples[-1]["heavy_modules_loaded"],
+        "slowest_imports": [
+            {"module": name, "cumulative_ms": microseconds / 1000}
+            for microseconds, name in slowest[:top]
+        ]
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"⏱️  Analyzer startup (Python {report['python']}, median of {report['runs']} cold runs)")
+    print(f"  import enhanced_project_analyzer: {report['import_ms']:.1f}ms")
+    print(f"  EnhancedOksanaPlatformAnalyzer(): {report['construct_ms']:.1f}ms")
+    loaded = report["heavy_modules_loaded"]
+    print(f"  heavy modules loaded at startup: {', '.join(loaded) if loaded else 'none'}")
+    print("  slowest imports (cumulative):")
+    for entry in report["slowest_imports"]:
+        print(f"    {entry['cumulative_ms']:8.1f}ms  {entry['module']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Oksana analyzer cold-start time")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to sample")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = benchmark(args.runs, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
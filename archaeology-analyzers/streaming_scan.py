@@ -0,0 +1,151 @@
+"""
+Streaming Scan - O(chunk) memory scanning for large source files
+Maps the file (or reads fixed-size chunks when mmap is unavailable), decodes
+incrementally and feeds line-aligned text to the source scanners, so minified
+bundles and generated files never have to be held as one string.
+"""
+
+import mmap
+import codecs
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from source_scanners import SCANNERS, MAX_KEYWORD_LENGTH, incremental_scanner, merge_counts
+
+DEFAULT_STREAMING_THRESHOLD_BYTES = 8 * 1024 * 1024
+DEFAULT_STREAM_CHUNK_BYTES = 1024 * 1024
+
+# Prefixed to continuation pieces of a split line: not whitespace (so a
+# line-start pattern cannot match mid-line) and never part of a keyword
+CONTINUATION_SENTINEL = "\x00"
+
+
+def _iter_raw_chunks(path: Path, chunk_bytes: int) -> Iterator[bytes]:
+    """Raw byte chunks from an mmap of ``path``, or plain reads as a fallback"""
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and some special filesystems cannot be mapped
+            mapped = None
+
+        if mapped is None:
+            while True:
+                block = f.read(chunk_bytes)
+                if not block:
+                    return
+                yield block
+        else:
+            with mapped:
+                for offset in range(0, len(mapped), chunk_bytes):
+                    yield mapped[offset:offset + chunk_bytes]
+
+
+def iter_text_chunks(path: Path, chunk_bytes: int = DEFAULT_STREAM_CHUNK_BYTES,
+                     digest: Optional[Any] = None, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Yield decoded text of ``path`` chunk by chunk.
+
+    Newlines are normalized the way text-mode ``open()`` does it ('\\r\\n' and
+    '\\r' become '\\n'), including a '\\r\\n' split across two chunks. When
+    ``digest`` is given it is updated with the raw bytes.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    held_cr = ""
+
+    for block in _iter_raw_chunks(path, chunk_bytes):
+        if digest is not None:
+            digest.update(block)
+
+        text = held_cr + decoder.decode(block)
+        # Hold back a trailing '\r' in case the next chunk starts with '\n'
+        held_cr = "\r" if text.endswith("\r") else ""
+        if held_cr:
+            text = text[:-1]
+        if text:
+            yield text.replace("\r\n", "\n").replace("\r", "\n")
+
+    tail = (held_cr + decoder.decode(b"", final=True)).replace("\r\n", "\n").replace("\r", "\n")
+    if tail:
+        yield tail
+
+
+def _merge_presence(line_counts: Dict[str, int], counts: Dict[str, int]) -> Dict[str, int]:
+    """Combine the counters of two pieces of the same line (a line counts once)"""
+    for key, value in counts.items():
+        line_counts[key] = max(line_counts.get(key, 0), value)
+    return line_counts
+
+
+def stream_scan_file(kind: str, path: Path,
+                     chunk_bytes: int = DEFAULT_STREAM_CHUNK_BYTES) -> Tuple[Dict[str, Any], str]:
+    """
+    Scan ``path`` chunk by chunk with the ``kind`` scanner.
+
+    Runs of complete lines are measured and summed. A line longer than a chunk
+    is measured in overlapping pieces whose per-line counters (0 or 1 for a
+    single line) are OR-ed together, so even a minified single-line bundle
+    stays within O(chunk) memory. Kinds that are not line-additive (lexer
+    summaries, identifier words) also feed every decoded chunk to one
+    incremental scanner. Returns the same analysis dict as scanning
+    the whole file in memory, plus a hash of the raw bytes for the cache.
+    """
+    measure, finalize = SCANNERS[kind]
+    incremental = incremental_scanner(kind)
+    digest = hashlib.blake2b(digest_size=16)
+    overlap = max(MAX_KEYWORD_LENGTH - 1, 0)
+
+    totals: Dict[str, int] = measure("")
+    pending = ""                              # start of the current unterminated line
+    long_line: Optional[Dict[str, int]] = None  # counters of an overlong line in progress
+    dropped_nonblank = False                  # part of that line already dropped has content
+
+    def measure_piece(piece: str) -> Dict[str, int]:
+        # A piece only counts as a line start if everything dropped before it was whitespace
+        return measure(CONTINUATION_SENTINEL + piece if dropped_nonblank else piece)
+
+    def keep_overlap(piece: str) -> str:
+        nonlocal dropped_nonblank
+        kept = piece[max(len(piece) - overlap, 0):] if overlap else ""
+        dropped = piece[:len(piece) - len(kept)]
+        dropped_nonblank = dropped_nonblank or (bool(dropped) and not dropped.isspace())
+        return kept
+
+    for text in iter_text_chunks(Path(path), chunk_bytes, digest=digest):
+        if incremental is not None:
+            incremental.feed(text)
+        buffer = pending + text
+
+        if long_line is not None:
+            newline = buffer.find("\n")
+            if newline == -1:
+                _merge_presence(long_line, measure_piece(buffer))
+                pending = keep_overlap(buffer)
+                continue
+            _merge_presence(long_line, measure_piece(buffer[:newline + 1]))
+            merge_counts(totals, long_line)
+            long_line = None
+            buffer = buffer[newline + 1:]
+
+        boundary = buffer.rfind("\n")
+        if boundary == -1:
+            pending = buffer
+        else:
+            merge_counts(totals, measure(buffer[:boundary + 1]))
+            pending = buffer[boundary + 1:]
+
+        if len(pending) > chunk_bytes:
+            # Start splitting this line; only the keyword overlap is carried forward
+            long_line = measure(pending)
+            dropped_nonblank = False
+            pending = keep_overlap(pending)
+
+    if long_line is not None:
+        merge_counts(totals, _merge_presence(long_line, measure_piece(pending)))
+    elif pending:
+        merge_counts(totals, measure(pending))
+
+    if incremental is not None:
+        totals.update(incremental.close())
+    return finalize(totals), "bytes:" + digest.hexdigest()
@@ -0,0 +1,276 @@
+"""
+Tracing - span-based instrumentation for analysis runs
+Phases, file reads, scans and analytics engine calls open spans that record
+monotonic start/end times plus bytes and files processed. A run's spans export
+to Chrome ``trace_event`` JSON (chrome://tracing, Perfetto) and a text summary
+of where the time went, per span and per subtree.
+
+The active tracer lives in a context variable, so shared components (reader
+pool, scan executor, analytics backends) trace into whichever run calls them
+and cost one lookup when tracing is off.
+"""
+
+import json
+import time
+import heapq
+import asyncio
+import threading
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_active_tracer: ContextVar[Optional["Tracer"]] = ContextVar("oksana_active_tracer", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("oksana_current_span", default=None)
+
+
+def _lane_key() -> Tuple[str, int]:
+    """Identity of the running asyncio task (or thread) a span belongs to"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return ("task", id(task)) if task is not None else ("thread", threading.get_ident())
+
+
+class Span:
+    """
+    One timed operation. Use as a context manager; ``add`` accumulates the
+    bytes and files it processed, ``annotate`` attaches extra arguments.
+    ``subtree`` is inherited from the enclosing span unless given.
+    """
+
+    __slots__ = ("tracer", "name", "category", "args", "subtree", "bytes", "files",
+                 "start_ns", "end_ns", "lane", "_lane_key", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.subtree: Optional[str] = args.pop("subtree", None)
+        self.args = args
+        self.bytes = 0
+        self.files = 0
+        self.start_ns = self.end_ns = 0
+        self.lane = 0
+
+    def add(self, bytes: int = 0, files: int = 0):
+        self.bytes += bytes
+        self.files += files
+
+    def annotate(self, **args: Any):
+        self.args.update(args)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        if self.subtree is None and parent is not None:
+            self.subtree = parent.subtree
+        self._lane_key = _lane_key()
+        self.lane = self.tracer._acquire_lane(self._lane_key)
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        self.tracer._release_lane(self._lane_key)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.spans.append(self)
+        return False
+
+
+class _NullSpan:
+    """Stands in for a span when tracing is off"""
+
+    def add(self, bytes: int = 0, files: int = 0):
+        pass
+
+    def annotate(self, **args: Any):
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Activation:
+    def __init__(self, tracer: Optional["Tracer"]):
+        self.tracer = tracer
+
+    def __enter__(self):
+        self._token = _active_tracer.set(self.tracer)
+        return self.tracer
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _active_tracer.reset(self._token)
+        return False
+
+
+class Tracer:
+    """
+    Collects the spans of one analysis run.
+
+    Spans running in the same asyncio task nest on one lane; concurrent tasks
+    get the lowest free lane, so the Chrome trace shows one row per unit of
+    concurrency rather than one per task. A disabled tracer records nothing.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.spans: List[Span] = []
+        self.origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._lanes: Dict[Tuple[str, int], List[int]] = {}  # key -> [lane, open spans]
+        self._free_lanes: List[int] = []
+        self._lane_count = 0
+
+    def activate(self) -> _Activation:
+        """Make this tracer the target of ``span()`` in the current context"""
+        return _Activation(self if self.enabled else None)
+
+    def span(self, name: str, category: str = "analysis", **args: Any):
+        return Span(self, name, category, args) if self.enabled else NULL_SPAN
+
+    def _acquire_lane(self, key: Tuple[str, int]) -> int:
+        with self._lock:
+            slot = self._lanes.get(key)
+            if slot is None:
+                if self._free_lanes:
+                    lane = heapq.heappop(self._free_lanes)
+                else:
+                    lane = self._lane_count
+                    self._lane_count += 1
+                slot = self._lanes[key] = [lane, 0]
+            slot[1] += 1
+            return slot[0]
+
+    def _release_lane(self, key: Tuple[str, int]):
+        with self._lock:
+            slot = self._lanes[key]
+            slot[1] -= 1
+            if slot[1] == 0:
+                del self._lanes[key]
+                heapq.heappush(self._free_lanes, slot[0])
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Complete ("X") events in microseconds since the tracer was created"""
+        events: List[Dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": lane, "args": {"name": f"lane {lane}"}}
+            for lane in range(self._lane_count)
+        ]
+        for span in sorted(self.spans, key=lambda span: span.start_ns):
+            args = dict(span.args)
+            if span.subtree is not None:
+                args["subtree"] = span.subtree
+            if span.bytes:
+                args["bytes"] = span.bytes
+            if span.files:
+                args["files"] = span.files
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - self.origin_ns) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": 1,
+                "tid": span.lane,
+                "args": args
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace(), default=str))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Totals per (category, name) and per subtree. Subtree rows add up the
+        I/O and scan work done inside each subtree's spans, so a slow phase
+        can be told apart from a phase waiting on slow reads. I/O and scan
+        times are summed over concurrent spans and may exceed the wall time.
+        """
+        by_span: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        by_subtree: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            row = by_span.setdefault((span.category, span.name), {
+                "category": span.category, "name": span.name,
+                "count": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0, "files": 0
+            })
+            duration = span.duration_ms
+            row["count"] += 1
+            row["total_ms"] += duration
+            row["max_ms"] = max(row["max_ms"], duration)
+            row["bytes"] += span.bytes
+            row["files"] += span.files
+
+            if span.subtree is None:
+                continue
+            subtree = by_subtree.setdefault(span.subtree, {
+                "subtree": span.subtree, "wall_ms": 0.0, "io_ms": 0.0, "scan_ms": 0.0,
+                "bytes_read": 0, "files_read": 0, "files_scanned": 0
+            })
+            if span.category == "phase":
+                subtree["wall_ms"] += duration
+            elif span.category == "io":
+                subtree["io_ms"] += duration
+                subtree["bytes_read"] += span.bytes
+                subtree["files_read"] += span.files
+            elif span.category == "scan":
+                subtree["scan_ms"] += duration
+                subtree["files_scanned"] += span.files
+
+        for row in by_span.values():
+            row["mean_ms"] = row["total_ms"] / row["count"]
+        return {
+            "spans": len(self.spans),
+            "lanes": self._lane_count,
+            "by_span": sorted(by_span.values(), key=lambda row: row["total_ms"], reverse=True),
+            "by_subtree": sorted(by_subtree.values(), key=lambda row: row["wall_ms"], reverse=True)
+        }
+
+    def summary_table(self, top: int = 15) -> str:
+        summary = self.summary()
+        lines = [
+            f"{'category':<10} {'span':<32} {'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'MB':>8} {'files':>7}"
+        ]
+        for row in summary["by_span"][:top]:
+            lines.append(
+                f"{row['category']:<10} {row['name'][:32]:<32} {row['count']:>7} {row['total_ms']:>10.1f} "
+                f"{row['mean_ms']:>9.2f} {row['max_ms']:>9.1f} {row['bytes'] / 1e6:>8.2f} {row['files']:>7}"
+            )
+        if summary["by_subtree"]:
+            lines.append("")
+            lines.append(f"{'subtree':<32} {'wall ms':>10} {'io ms':>10} {'scan ms':>10} {'MB read':>8} {'files':>7}")
+            for row in summary["by_subtree"][:top]:
+                lines.append(
+                    f"{row['subtree'][:32]:<32} {row['wall_ms']:>10.1f} {row['io_ms']:>10.1f} "
+                    f"{row['scan_ms']:>10.1f} {row['bytes_read'] / 1e6:>8.2f} {row['files_read']:>7}"
+                )
+        return "\n".join(lines)
+
+
+def span(name: str, category: str = "analysis", **args: Any):
+    """A span on the active tracer, or a no-op span when none is active"""
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return NULL_SPAN
+    return Span(tracer, name, category, args)
+
+
+def active_tracer() -> Optional[Tracer]:
+    return _active_tracer.get()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Watch Mode - long-running incremental re-analysis for the Oksana analyzer
+Runs the full analysis once, then keeps the inventory, per-file results and
+analysis_results in memory. File changes arrive through inotify (Linux) or a
+polling fallback; each batch re-scans only the touched files, re-runs only the
+phases whose inputs changed, and republishes recommendations,
+deployment_readiness and the report.
+
+Usage: python3 watch_mode.py PROJECT_ROOT [--output REPORT] [--watcher auto|inotify|polling]
+"""
+
+import io
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import struct
+import asyncio
+import argparse
+import contextlib
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer, PHASE_INPUTS
+from ignore_rules import IgnoreRules
+from phase_graph import PhaseRegistry
+from project_inventory import ProjectInventory, materialize, walk
+
+WATCHER_MODES = ("auto", "inotify", "polling")
+DEFAULT_DEBOUNCE_SECONDS = 0.05
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Detects changes by re-walking the tree every ``interval`` seconds"""
+
+    mode = "polling"
+
+    def __init__(self, root: Path, inventory: Optional[ProjectInventory] = None,
+                 interval: float = DEFAULT_POLL_INTERVAL_SECONDS):
+        self.root = Path(root)
+        self.interval = interval
+        inventory = inventory or ProjectInventory.build(self.root)
+        self.ignore_rules = inventory.ignore_rules
+        self._snapshot = inventory.signatures()
+
+    async def next_changes(self) -> Set[Path]:
+        """Wait until at least one file was added, removed or modified"""
+        while True:
+            await asyncio.sleep(self.interval)
+            snapshot = (await asyncio.to_thread(ProjectInventory.build, self.root, self.ignore_rules)).signatures()
+            changed = {
+                rel for rel in set(snapshot) | set(self._snapshot)
+                if snapshot.get(rel) != self._snapshot.get(rel)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return {self.root / rel for rel in changed}
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Linux inotify watches on every directory of the project, read from the
+    event loop. New directories are watched as they appear, unless
+    ``ignore_rules`` ignores them; a queue overflow reports the project root so
+    the caller rescans everything.
+    """
+
+    mode = "inotify"
+
+    def __init__(self, root: Path, directories: Iterable[Path], debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+                 ignore_rules: Optional[IgnoreRules] = None):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.root = Path(root)
+        self.debounce = debounce
+        self.ignore_rules = ignore_rules
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, Path] = {}
+        self._pending: Set[Path] = set()
+        self._ready = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        try:
+            for directory in [self.root, *directories]:
+                self._watch(directory)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if errno == 28:  # ENOSPC: fs.inotify.max_user_watches reached
+                raise OSError(errno, "inotify watch limit reached")
+            return  # directory vanished before it could be watched
+        self._watches[wd] = Path(directory)
+
+    def _on_readable(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += _EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                self._pending.add(self.root)
+                continue
+            directory = self._watches.get(wd)
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            self._pending.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self._watch_tree(path)
+                except OSError:
+                    self._pending.add(self.root)
+        if self._pending:
+            self._ready.set()
+
+    def _watch_tree(self, directory: Path):
+        rel_dir = directory.relative_to(self.root).as_posix()
+        if self.ignore_rules is not None and self.ignore_rules.is_ignored(self.root, rel_dir, True):
+            return
+        self._watch(directory)
+        for parent, name, stat in walk(self.root, rel_dir, self.ignore_rules):
+            if stat is None:
+                self._watch(self.root / parent / name)
+
+    async def next_changes(self) -> Set[Path]:
+        """Wait for events, then collect the burst for ``debounce`` seconds"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._loop.add_reader(self._fd, self._on_readable)
+        await self._ready.wait()
+        await asyncio.sleep(self.debounce)
+        changes, self._pending = self._pending, set()
+        self._ready.clear()
+        return changes
+
+    def close(self):
+        if self._fd >= 0:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self._fd)
+            self._loop = None
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root: Path, inventory: ProjectInventory, mode: str = "auto",
+                   poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS):
+    """inotify when available (``auto``/``inotify``), otherwise polling"""
+    if mode not in WATCHER_MODES:
+        raise ValueError(f"Unknown watcher '{mode}', expected one of {WATCHER_MODES}")
+    if mode != "polling":
+        try:
+            return InotifyWatcher(root, inventory.directories_under(inventory.root),
+                                  ignore_rules=inventory.ignore_rules)
+        except (OSError, AttributeError) as e:
+            if mode == "inotify":
+                raise
+            print(f"⚠️  inotify unavailable ({e}) - polling every {poll_interval}s")
+    return PollingWatcher(root, inventory, poll_interval)
+
+
+class WatchSession:
+    """
+    Incremental re-analysis on top of one long-lived analyzer.
+
+    The analysis cache keeps every file's scan result, so re-running a phase
+    only rescans the files whose size or mtime changed; the inventory and the
+    file metrics table are patched in place rather than rebuilt. Phase 10 is
+    refreshed only in simulation mode: a connected GRID API is queried by the
+    baseline run, and its result is kept rather than re-queried on every edit.
+    """
+
+    def __init__(self, analyzer: EnhancedOksanaPlatformAnalyzer, output_path: Optional[Path] = None,
+                 verbose: bool = False):
+        self.analyzer = analyzer
+        self.output_path = Path(output_path) if output_path else None
+        self.verbose = verbose
+        self.cycles = 0
+        # Reports are rewritten every cycle; a phase-by-phase stream only covers the first run
+        self.analyzer.report_stream = None
+
+    def _files_read(self) -> int:
+        return self.analyzer.reader_pool.stats["files_read"] + self.analyzer.deduplicator.stats["files_read"]
+
+    def _quiet(self):
+        return contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+
+    async def start(self) -> Dict[str, Any]:
+        """Full analysis and report; the baseline later cycles patch"""
+        with self._quiet():
+            await self.analyzer.analyze_complete_project_structure()
+            await self.analyzer.generate_final_report(self.output_path)
+        self._keep_grid_analysis()
+        return self.analyzer.analysis_results
+
+    def _keep_grid_analysis(self):
+        """Skip phase 10 in later cycles while a GRID client backs it (the baseline run queried it)"""
+        registry = self.analyzer.phase_registry
+        if "strategic_intelligence" not in registry:
+            return
+        phase = registry["strategic_intelligence"]
+
+        def enabled(analyzer: EnhancedOksanaPlatformAnalyzer) -> bool:
+            return analyzer.grid_client is None and (phase.enabled is None or phase.enabled(analyzer))
+
+        self.analyzer.phase_registry = PhaseRegistry(
+            replace(registered, enabled=enabled) if registered is phase else registered for registered in registry
+        )
+
+    async def apply(self, paths: Iterable[Path]) -> Optional[Dict[str, Any]]:
+        """Re-analyze after ``paths`` changed; None when no file actually changed"""
+        start_time = time.perf_counter()
+        analyzer = self.analyzer
+        inventory, changed = await asyncio.to_thread(analyzer.inventory.with_changes, paths)
+        if not changed:
+            return None
+
+        analyzer.inventory = inventory
+        reads_before = self._files_read()
+
+        with self._quiet():
+            if analyzer.file_metrics is not None:
+                analyzer.file_metrics.discard(changed)
+            # Phases whose inputs are unchanged are skipped by the phase graph
+            statuses = await analyzer.run_phase_graph()
+            phases = [name for name in PHASE_INPUTS if statuses.get(name) == "ran"]
+            analyzer.analysis_results["inventory"].update(
+                file_count=len(inventory), total_bytes=inventory.total_bytes()
+            )
+            analyzer.analysis_results["content_dedupe"] = analyzer.deduplicator.summary()
+            self.cycles += 1
+            cycle = {
+                "cycle": self.cycles,
+                "changed_files": sorted(changed),
+                "phases": phases,
+                "files_read": self._files_read() - reads_before
+            }
+            analyzer.analysis_results["watch"] = cycle
+            # Phases that were not re-run would otherwise pin the previous inventory
+            materialize(analyzer.analysis_results["comprehensive_analysis"], keep=analyzer._get_inventory())
+            await analyzer.generate_final_report(self.output_path)
+
+        cycle["duration_ms"] = (time.perf_counter() - start_time) * 1000
+        cycle["overall_score"] = analyzer.analysis_results["deployment_readiness"]["overall_score"]
+        return cycle
+
+    async def run(self, watcher=None, max_cycles: Optional[int] = None):
+        """Apply change batches from ``watcher`` until cancelled (or ``max_cycles`` batches)"""
+        watcher = watcher or create_watcher(self.analyzer.project_root, self.analyzer.inventory,
+                                            os.getenv("OKSANA_ANALYZER_WATCHER", "auto"))
+        print(f"👀 Watching {self.analyzer.project_root} ({watcher.mode})")
+        try:
+            while max_cycles is None or self.cycles < max_cycles:
+                cycle = await self.apply(await watcher.next_changes())
+                if cycle is None:
+                    continue
+                phases = ", ".join(cycle["phases"]) or "no phase inputs"
+                print(f"🔄 {len(cycle['changed_files'])} changed, re-ran {phases}: "
+                      f"readiness {cycle['overall_score']:.1%} in {cycle['duration_ms']:.0f}ms")
+        finally:
+            watcher.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-analyze an Oksana project incrementally as files change")
+    parser.add_argument("project_root", type=Path)
+    parser.add_argument("--output", type=Path, help="report path (default: the analyzer's report location)")
+    parser.add_argument("--watcher", choices=WATCHER_MODES, default=os.getenv("OKSANA_ANALYZER_WATCHER", "auto"))
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL_SECONDS)
+    parser.add_argument("--verbose", action="store_true", help="show the analyzer's phase output")
+    args = parser.parse_args(argv)
+
+    async def watch():
+        analyzer = EnhancedOksanaPlatformAnalyzer(project_root=args.project_root.resolve())
+        session = WatchSession(analyzer, args.output, args.verbose)
+        try:
+            results = await session.start()
+            print(f"📊 Baseline readiness {results['deployment_readiness']['overall_score']:.1%}")
+            watcher = create_watcher(analyzer.project_root, analyzer.inventory, args.watcher, args.poll_interval)
+            await session.run(watcher)
+        finally:
+            analyzer.close()
+
+    try:
+        asyncio.run(watch())
+    except KeyboardInterrupt:
+        print("👋 Watch mode stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Cached results are served while a file's size and mtime are unchanged, a
+touched-but-identical file is found again by its content hash, results of
+another scanner kind or schema version are never reused, eviction keeps the
+most recently used entries within budget, and a warm analyzer run reads no
+unchanged file.
+"""
+
+import asyncio
+import contextlib
+import io
+import sqlite3
+import sys
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+import analysis_cache  # noqa: E402
+from analysis_cache import AnalysisCache, content_digest  # noqa: E402
+from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer  # noqa: E402
+from project_inventory import FileEntry  # noqa: E402
+from scan_executor import ScanExecutor  # noqa: E402
+
+RESULT = {"functions": 2, "patterns": ["async"]}
+
+
+def file_entry(root: Path, rel_path: str, size: int = 10, mtime_ns: int = 1) -> FileEntry:
+    return FileEntry(path=root / rel_path, rel_path=rel_path, suffix=Path(rel_path).suffix, size=size,
+                     mtime_ns=mtime_ns)
+
+
+def without_timings(components):
+    return {name: {key: value for key, value in component.items() if key != "analysis_time_ms"}
+            for name, component in components.items()}
+
+
+def test_unchanged_stat_is_a_hit(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    entry = file_entry(tmp_path, "src/app.js")
+    cache = AnalysisCache(path)
+    cache.store(entry, "javascript:v2", content_digest("source"), RESULT)
+    cache.close()
+
+    reopened = AnalysisCache(path)
+    try:
+        assert reopened.lookup(entry, "javascript:v2") == RESULT
+        assert reopened.lookup(replace(entry, size=11), "javascript:v2") is None
+        summary = reopened.summary()
+        assert summary["hits"] == 1 and summary["bytes_read_saved"] == entry.size
+        assert summary["cache_path"] == str(path) and summary["entries"] == 1
+    finally:
+        reopened.close()
+
+
+def test_touched_file_falls_back_to_its_content_hash(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache.sqlite")
+    entry = file_entry(tmp_path, "src/app.js")
+    content_hash = content_digest("source")
+    cache.store(entry, "javascript:v2", content_hash, RESULT)
+
+    touched = replace(entry, mtime_ns=2)
+    try:
+        assert cache.lookup(touched, "javascript:v2") is None
+        assert cache.lookup_content(touched, "javascript:v2", content_digest("edited")) is None
+        assert cache.lookup_content(touched, "javascript:v2", content_hash) == RESULT
+        # The hit was re-keyed under the new mtime, so the next run hits on stat alone
+        assert cache.lookup(touched, "javascript:v2") == RESULT
+        assert cache.stats["content_hash_hits"] == 1 and cache.stats["misses"] == 1
+    finally:
+        cache.close()
+
+
+def test_other_kinds_and_schema_versions_miss(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    entry = file_entry(tmp_path, "src/app.js")
+    content_hash = content_digest("source")
+    cache = AnalysisCache(path)
+    cache.store(entry, "javascript:v2", content_hash, RESULT)
+    assert cache.lookup(entry, "javascript:v1") is None
+    assert cache.lookup(entry, "bridge:v2") is None
+    assert cache.lookup_content(entry, "bridge:v2", content_hash) is None
+    cache.close()
+
+    # A cache written under another schema version is dropped on open
+    connection = sqlite3.connect(path)
+    connection.execute(f"PRAGMA user_version = {AnalysisCache.SCHEMA_VERSION + 1}")
+    connection.commit()
+    connection.close()
+
+    reopened = AnalysisCache(path)
+    try:
+        assert reopened.lookup(entry, "javascript:v2") is None
+        assert reopened.summary()["entries"] == 0
+    finally:
+        reopened.close()
+
+
+def test_eviction_keeps_recently_used_entries_within_budget(tmp_path, monkeypatch):
+    clock = SimpleNamespace(now=1000)
+    monkeypatch.setattr(analysis_cache, "time", SimpleNamespace(time=lambda: clock.now))
+
+    payload = {"body": "x" * 100}
+    entries = [file_entry(tmp_path, f"src/file{index}.js") for index in range(10)]
+    cache = AnalysisCache(tmp_path / "cache.sqlite", max_bytes=600)
+    for entry in entries:
+        clock.now += 1
+        cache.store(entry, "javascript:v2", content_digest(entry.rel_path), payload)
+
+    # Using the oldest entries again makes them the most recently used
+    clock.now += 1
+    for entry in entries[:2]:
+        assert cache.lookup(entry, "javascript:v2") == payload
+    try:
+        cache.commit()
+        summary = cache.summary()
+        assert summary["payload_bytes"] <= cache.max_bytes * analysis_cache.EVICTION_HEADROOM
+        survivors = [entry for entry in entries if cache.lookup(entry, "javascript:v2") is not None]
+        kept = summary["entries"]
+        assert summary["evictions"] == len(entries) - kept
+        assert survivors == entries[:2] + entries[len(entries) - kept + 2:]
+    finally:
+        cache.close()
+
+
+def test_environment_configuration(tmp_path, monkeypatch):
+    monkeypatch.setenv("OKSANA_ANALYZER_CACHE", "off")
+    cache = AnalysisCache.from_environment()
+    assert cache.cache_path == ":memory:"
+    cache.close()
+
+    monkeypatch.setenv("OKSANA_ANALYZER_CACHE", str(tmp_path / "nested" / "cache.sqlite"))
+    cache = AnalysisCache.from_environment()
+    assert cache.cache_path == str(tmp_path / "nested" / "cache.sqlite")
+    cache.close()
+    assert (tmp_path / "nested" / "cache.sqlite").exists()
+
+
+def test_warm_run_reads_no_unchanged_file(tmp_path):
+    project = tmp_path / "project"
+    (project / "foundation-models").mkdir(parents=True)
+    (project / "foundation-models" / "index.js").write_text("export async function run() {\n  await mcp.quantum()\n}\n")
+    (project / "foundation-models" / "package.json").write_text('{"name": "demo", "version": "1.0.0"}')
+    (project / "scripts").mkdir()
+    (project / "scripts" / "deploy.sh").write_text("echo deploy\n")
+
+    runs = []
+    for _ in range(2):
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = EnhancedOksanaPlatformAnalyzer(project_root=project,
+                                                      analysis_cache=AnalysisCache(tmp_path / "cache.sqlite"),
+                                                      scan_executor=ScanExecutor(mode="serial"))
+            try:
+                results = asyncio.run(analyzer.analyze_complete_project_structure())
+            finally:
+                analyzer.close()
+        runs.append(results)
+
+    cold, warm = runs
+    assert cold["reader_statistics"]["files_read"] > 0
+    assert warm["reader_statistics"]["files_read"] == 0
+    assert warm["cache_statistics"]["hits"] > 0
+    assert without_timings(warm["comprehensive_analysis"]) == without_timings(cold["comprehensive_analysis"])
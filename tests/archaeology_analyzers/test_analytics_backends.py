@@ -0,0 +1,108 @@
+"""
+Analytics backends must agree with each other, and selection must be driven
+by capability and benchmark rather than by the host's CPU brand.
+"""
+
+import asyncio
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from analytics_backends import (  # noqa: E402
+    BACKENDS, NUMPY_AVAILABLE, AnalyticsBackend, MockRemoteBackend, NumpyBackend, PythonBackend,
+    register_backend, select_backend
+)
+
+
+def sample_matrix(seed=3, rows=41, columns=4):
+    rng = random.Random(seed)
+    return [[rng.uniform(-5, 50) if rng.random() > 0.15 else math.nan for _ in range(columns)]
+            for _ in range(rows)]
+
+
+def assert_close(actual, expected):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            assert_close(actual[key], expected[key])
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected)
+    else:
+        assert actual == expected
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+@pytest.mark.parametrize("operation", ["columnar", "comprehensive"])
+def test_python_backend_matches_numpy(operation):
+    matrix = sample_matrix()
+    if operation == "comprehensive":
+        matrix = [[0.0 if math.isnan(value) else value for value in row] for row in matrix]
+
+    expected = NumpyBackend().analyze_matrix(matrix, operation, ["a", "b", "c", "d"])
+    actual = PythonBackend().analyze_matrix(matrix, operation, ["a", "b", "c", "d"])
+    assert_close(actual, expected)
+
+
+def test_unsupported_operation_is_reported():
+    result = asyncio.run(PythonBackend().matrix_analysis([[1.0, 2.0], [3.0, 4.0]], "svd_analysis"))
+    assert "does not support" in result["error"]
+
+
+def test_project_metrics_accepts_legacy_series():
+    metrics = asyncio.run(PythonBackend().project_metrics({"file_sizes": [10, 20, 30]}))
+    assert metrics["backend"] == "python"
+    assert metrics["file_sizes_analysis"]["statistics"]["mean"] == pytest.approx(20)
+
+
+def test_selection_is_benchmark_based(monkeypatch):
+    monkeypatch.delenv("OKSANA_ANALYZER_ANALYTICS_BACKEND", raising=False)
+
+    @register_backend
+    class InstantBackend(PythonBackend):
+        name = "instant-test"
+
+        def benchmark(self):
+            return 0.0
+
+    try:
+        backend, selection = select_backend()
+        assert backend.name == "instant-test"
+        assert selection["reason"] == "fastest-benchmark"
+        assert "mock-remote" not in selection["benchmark_ms"]
+    finally:
+        del BACKENDS["instant-test"]
+
+
+def test_required_capabilities_filter_candidates(monkeypatch):
+    monkeypatch.delenv("OKSANA_ANALYZER_ANALYTICS_BACKEND", raising=False)
+    if not NUMPY_AVAILABLE:
+        with pytest.raises(RuntimeError):
+            select_backend(required=("svd_analysis",))
+        return
+    backend, _ = select_backend(required=("svd_analysis",))
+    assert isinstance(backend, NumpyBackend)
+
+
+def test_configured_backend_wins(monkeypatch):
+    monkeypatch.setenv("OKSANA_ANALYZER_ANALYTICS_BACKEND", "mock-remote")
+    backend, selection = select_backend()
+    assert isinstance(backend, MockRemoteBackend)
+    assert selection == {"selected": "mock-remote", "reason": "configured"}
+
+    backend.latency_seconds = 0
+    result = asyncio.run(backend.matrix_analysis([[1.0], [3.0]], "columnar", ["x"]))
+    assert result["column_statistics"]["x"]["mean"] == 2.0
+
+    monkeypatch.setenv("OKSANA_ANALYZER_ANALYTICS_BACKEND", "no-such-engine")
+    with pytest.raises(ValueError):
+        select_backend()
+
+
+def test_base_backend_is_abstract():
+    with pytest.raises(NotImplementedError):
+        AnalyticsBackend().analyze_matrix([[1.0]], "columnar")
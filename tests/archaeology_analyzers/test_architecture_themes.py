@@ -0,0 +1,93 @@
+"""
+The sparse file x term matrix multiplies like its dense equivalent, the
+randomized SVD recovers the leading singular values, and files that share a
+vocabulary end up in one cluster.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from architecture_themes import ArchitectureThemes, build_feature_matrix, randomized_svd  # noqa: E402
+from enhanced_project_analyzer import phase_for_path  # noqa: E402
+from source_scanners import SCAN_KIND_FEATURES, scan_source  # noqa: E402
+
+TOPICS = {
+    "bridge": ["bridge", "swift", "typescript", "service", "channel", "message", "payload", "sync"],
+    "render": ["glass", "blur", "shader", "layer", "material", "surface", "depth", "light"],
+    "model": ["model", "tensor", "train", "epoch", "weights", "dataset", "loss", "batch"],
+}
+
+
+def dense(matrix):
+    values = np.zeros(matrix.shape)
+    for row in range(matrix.shape[0]):
+        span = slice(matrix.indptr[row], matrix.indptr[row + 1])
+        values[row, matrix.indices[span]] = matrix.data[span]
+    return values
+
+
+def topic_documents(files_per_topic=30, seed=5):
+    rng = random.Random(seed)
+    documents, phases = {}, {}
+    for topic, words in TOPICS.items():
+        for index in range(files_per_topic):
+            path = f"{topic}/file{index}.ts"
+            documents[path] = {word: rng.randint(1, 4) for word in rng.sample(words, 5)}
+            documents[path][f"local{topic}{index}"] = 1  # unique words never become columns
+            phases[path] = topic
+    return documents, phases
+
+
+def test_sparse_products_match_dense():
+    documents = [{"a": 2, "b": 1}, {}, {"b": 3, "c": 1}, {"a": 1, "c": 2, "d": 1}, {}]
+    matrix, terms = build_feature_matrix(documents, max_document_ratio=1.0)
+    assert terms == ["a", "b", "c"]  # "d" is in a single file
+    values = dense(matrix)
+    assert np.allclose(np.linalg.norm(values[[0, 2, 3]], axis=1), 1)
+
+    block = np.random.default_rng(1).standard_normal((3, 4))
+    assert np.allclose(matrix.dot(block), values @ block)
+    assert np.allclose(dense(matrix.transpose()), values.T)
+
+
+def test_randomized_svd_recovers_leading_singular_values():
+    documents, _ = topic_documents()
+    matrix, _ = build_feature_matrix(list(documents.values()))
+    u, singular_values, vt = randomized_svd(matrix, rank=3)
+    exact = np.linalg.svd(dense(matrix), compute_uv=False)
+    assert np.allclose(singular_values, exact[:3], rtol=1e-3)
+    assert np.allclose(u.T @ u, np.eye(3)) and np.allclose(vt @ vt.T, np.eye(3))
+
+
+def test_files_with_a_shared_vocabulary_cluster_together():
+    documents, phases = topic_documents()
+    themes = ArchitectureThemes(rank=3, clusters=3).analyze(documents, phases)
+
+    assert themes["files"] == 90 and themes["terms"] == 24 and themes["rank"] == 3
+    clusters = [set(cluster["phases"]) for cluster in themes["clusters"]]
+    assert sorted(map(sorted, clusters)) == [["bridge"], ["model"], ["render"]]
+    for cluster in themes["clusters"]:
+        topic = next(iter(cluster["phases"]))
+        assert cluster["files"] == 30 and set(cluster["terms"]) <= set(TOPICS[topic])
+    for phase, phase_themes in themes["phase_themes"].items():
+        assert phase_themes[0]["share"] > 0.9
+        assert set(phase_themes[0]["terms"]) <= set(TOPICS[phase])
+
+
+def test_features_split_identifiers_into_words():
+    result = scan_source(SCAN_KIND_FEATURES, "const userName = fetchHTTPServer(user_name);\nreturn glassLayer")
+    assert result["terms"] == {"name": 2, "user": 2, "fetch": 1, "glass": 1, "http": 1, "layer": 1, "server": 1}
+
+
+def test_files_belong_to_the_phase_that_reads_them():
+    assert phase_for_path("foundation-models/learning-pipeline/train.js") == "Documentation"
+    assert phase_for_path("foundation-models/index.js") == "foundation-models"
+    assert phase_for_path("CreativeIntelligenceBridge.js") == "BridgeIntegrations"
+    assert phase_for_path("other/tool.ts") == "other"
@@ -0,0 +1,63 @@
+"""
+Batch analysis writes one report per root and an aggregate summary, sharing
+one cache and one scan executor across roots.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from analysis_cache import AnalysisCache  # noqa: E402
+from batch_analysis import SUMMARY_FILENAME, BatchAnalyzer, read_roots_file  # noqa: E402
+from scan_executor import ScanExecutor  # noqa: E402
+
+
+def make_project(root: Path, extra: str = ""):
+    (root / "foundation-models" / "learning-pipeline").mkdir(parents=True)
+    (root / "foundation-models" / "index.js").write_text(
+        "export async function run() {\n  await mcp.quantum()\n}\nclass Engine {}\n" + extra
+    )
+    (root / "foundation-models" / "package.json").write_text('{"name": "demo", "version": "1.0.0"}')
+    (root / "scripts").mkdir()
+    (root / "scripts" / "deploy.sh").write_text("echo deploy\n")
+
+
+def test_batch_writes_reports_and_summary(tmp_path, capsys):
+    roots = [tmp_path / "client-a", tmp_path / "nested" / "client-a", tmp_path / "client-b"]
+    for index, root in enumerate(roots):
+        make_project(root, extra=f"// revision {index}\n")
+    missing = tmp_path / "missing"
+
+    executor = ScanExecutor(mode="serial")
+    batch = BatchAnalyzer(tmp_path / "out", max_parallel_roots=2,
+                          analysis_cache=AnalysisCache(), scan_executor=executor)
+    summary = asyncio.run(batch.run(roots + [missing]))
+
+    assert summary["roots"] == 4
+    assert summary["succeeded"] == 3
+    assert summary["failed"] == 1
+    # Every root's scans were stored in the one shared cache
+    assert summary["cache_statistics"]["stores"] >= 3
+    assert summary["scan_executor"]["mode"] == "serial"
+
+    reports = sorted(path.name for path in (tmp_path / "out").iterdir())
+    assert reports == sorted(["client-a.json", "client-a-2.json", "client-b.json", SUMMARY_FILENAME])
+
+    on_disk = json.loads((tmp_path / "out" / SUMMARY_FILENAME).read_text())
+    by_root = {entry["root"]: entry for entry in on_disk["results"]}
+    assert by_root[str(missing)]["status"] == "error"
+    for root in roots:
+        entry = by_root[str(root)]
+        assert entry["status"] == "ok"
+        report = json.loads(Path(entry["report"]).read_text())
+        assert report["deployment_readiness"]["readiness_level"] == entry["readiness_level"]
+        assert "index.js" in report["comprehensive_analysis"]["foundation-models"]["key_files"]
+
+
+def test_roots_file_skips_comments(tmp_path):
+    roots_file = tmp_path / "roots.txt"
+    roots_file.write_text("# nightly clients\n/srv/client-a\n\n  /srv/client-b  \n")
+    assert read_roots_file(roots_file) == [Path("/srv/client-a"), Path("/srv/client-b")]
@@ -0,0 +1,106 @@
+"""
+Byte-identical copies are scanned once per content blob, and every copy still
+gets the same per-file result as a scan of its own.
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from analysis_cache import AnalysisCache  # noqa: E402
+from content_dedupe import ContentDeduplicator, decode_text  # noqa: E402
+from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer  # noqa: E402
+from scan_executor import ScanExecutor  # noqa: E402
+from source_scanners import SCAN_KIND_BRIDGE, SCAN_KIND_SWIFT_PATTERNS  # noqa: E402
+
+COMPONENT = "import SwiftUI\nstruct QuantumSpatial_Glass: View {\n  // neural engine, metal\n}\n"
+LARGE = "func render() async { await NeuralEngine.run() }\n" * 200
+
+
+def make_tree(root: Path):
+    for directory in ("components", "output", "vendor"):
+        (root / directory).mkdir()
+        (root / directory / "QuantumSpatial_Glass.swift").write_text(COMPONENT)
+        (root / directory / "Renderer.swift").write_text(LARGE)
+    (root / "components" / "Unique.swift").write_text(COMPONENT.replace("Glass", "Prism"))
+    # Same size as the copies, different bytes
+    (root / "components" / "Sibling.swift").write_text(COMPONENT.replace("metal", "Metal"))
+
+
+def make_analyzer(root: Path, deduplicator: ContentDeduplicator) -> EnhancedOksanaPlatformAnalyzer:
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = EnhancedOksanaPlatformAnalyzer(
+            project_root=root, analysis_cache=AnalysisCache(),
+            scan_executor=ScanExecutor(mode="serial"), deduplicator=deduplicator
+        )
+    analyzer.streaming_threshold_bytes = 4096
+    return analyzer
+
+
+def scan_all(analyzer: EnhancedOksanaPlatformAnalyzer, root: Path):
+    paths = sorted(root.rglob("*.swift"))
+    return {path.relative_to(root).as_posix(): result
+            for path, result in asyncio.run(analyzer._scan_files(paths, SCAN_KIND_SWIFT_PATTERNS)).items()}
+
+
+def test_copies_are_scanned_once(tmp_path):
+    make_tree(tmp_path)
+    deduplicated = make_analyzer(tmp_path, ContentDeduplicator())
+    separate = make_analyzer(tmp_path, ContentDeduplicator(enabled=False))
+    try:
+        results = scan_all(deduplicated, tmp_path)
+        assert results == scan_all(separate, tmp_path)
+        assert len(results) == 8
+
+        # Glass, Unique and Sibling read whole; one Renderer streamed
+        assert deduplicated.scan_executor.stats["files_scanned"] == 3
+        assert deduplicated.scan_executor.stats["files_streamed"] == 1
+        assert separate.scan_executor.stats["files_scanned"] == 5
+
+        stats = deduplicated.deduplicator.summary()
+        assert stats["duplicate_files"] == 4
+        assert stats["duplicate_bytes_skipped"] == 2 * len(COMPONENT) + 2 * len(LARGE)
+        # Unique and Sibling share the copies' size, so they were hashed too
+        assert stats["blobs_scanned"] == 4
+    finally:
+        deduplicated.close()
+        separate.close()
+
+
+def test_single_file_scans_share_blobs_across_kinds(tmp_path):
+    make_tree(tmp_path)
+    analyzer = make_analyzer(tmp_path, ContentDeduplicator())
+    try:
+        first = asyncio.run(analyzer._cached_scan(tmp_path / "vendor" / "QuantumSpatial_Glass.swift", SCAN_KIND_BRIDGE))
+        second = asyncio.run(analyzer._cached_scan(tmp_path / "output" / "QuantumSpatial_Glass.swift", SCAN_KIND_BRIDGE))
+        assert first == second
+        assert analyzer.deduplicator.stats["duplicate_files"] == 1
+
+        # The same blob under another scan kind has its own leader
+        scan_all(analyzer, tmp_path)
+        assert analyzer.deduplicator.stats["blobs_scanned"] == 5
+    finally:
+        analyzer.close()
+
+
+def test_failed_leader_lets_copies_scan_themselves():
+    async def elect():
+        deduplicator = ContentDeduplicator()
+        assert deduplicator.claim("blob", "kind") is None
+        copy = deduplicator.claim("blob", "kind")
+        deduplicator.resolve("blob", "kind", None)
+        assert await copy is None
+        # Nobody scanned the blob, so the next claimant leads again
+        assert deduplicator.claim("blob", "kind") is None
+
+    asyncio.run(elect())
+
+
+def test_decode_text_matches_text_mode_reads(tmp_path):
+    path = tmp_path / "mixed.js"
+    path.write_bytes("line one\r\nline two\rcafé\n".encode("utf-8"))
+    assert decode_text(path.read_bytes()) == path.read_text()
@@ -0,0 +1,77 @@
+"""
+The columnar metrics table must agree with plain per-file arithmetic.
+"""
+
+import math
+import random
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from file_metrics import FileMetricsTable, column_statistics  # noqa: E402
+from source_scanners import (  # noqa: E402
+    SCAN_KIND_JAVASCRIPT, SCAN_KIND_SWIFT_PATTERNS, SCAN_KIND_XCODE_PATTERNS, scan_source
+)
+
+
+def test_column_statistics_match_reference():
+    rng = random.Random(7)
+    rows = [[rng.uniform(0, 100) if rng.random() > 0.2 else math.nan for _ in range(3)]
+            for _ in range(57)]
+    result = column_statistics(np.array(rows), ["a", "b", "c"])
+
+    for index, name in enumerate("abc"):
+        values = [row[index] for row in rows if not math.isnan(row[index])]
+        column = result[name]
+        assert column["count"] == len(values)
+        assert column["total"] == pytest.approx(sum(values))
+        assert column["mean"] == pytest.approx(statistics.fmean(values))
+        assert column["std"] == pytest.approx(statistics.pstdev(values))
+        assert column["min"] == min(values)
+        assert column["max"] == max(values)
+        assert column["p50"] == pytest.approx(statistics.median(values))
+
+
+def test_empty_column_reports_none():
+    result = column_statistics(np.array([[1.0, math.nan], [3.0, math.nan]]), ["x", "y"])
+    assert result["x"]["mean"] == 2.0
+    assert result["y"] == {"count": 0, "total": 0.0, "mean": None, "std": None,
+                           "min": None, "max": None, "p50": None, "p90": None, "p99": None}
+
+
+def test_table_rows_groups_and_growth():
+    table = FileMetricsTable(capacity=2)
+    sources = {
+        "foundation-models/a.js": "export async function a() {}\nclass A {}\n",
+        "foundation-models/b.js": "const b = () => mcp\n",
+        "Scripts/c.js": "function c() {}\n",
+    }
+    for rel_path, content in sources.items():
+        table.record(rel_path, len(content), SCAN_KIND_JAVASCRIPT, scan_source(SCAN_KIND_JAVASCRIPT, content))
+
+    swift = "import CoreML // neural m4 bridge xcode"
+    table.record("App/Model.swift", len(swift), SCAN_KIND_SWIFT_PATTERNS, scan_source(SCAN_KIND_SWIFT_PATTERNS, swift))
+    table.record("App/Model.swift", len(swift), SCAN_KIND_XCODE_PATTERNS, scan_source(SCAN_KIND_XCODE_PATTERNS, swift))
+    # Recording the same (file, kind) twice must not double count
+    table.record("App/Model.swift", len(swift), SCAN_KIND_XCODE_PATTERNS, scan_source(SCAN_KIND_XCODE_PATTERNS, swift))
+
+    assert len(table) == 4
+    assert table.matrix.shape == (4, len(table.columns))
+    assert table.matrix.flags["C_CONTIGUOUS"]
+    assert list(table.column("lines_of_code")[:3]) == [3, 2, 2]
+    assert math.isnan(table.column("lines_of_code")[3])
+    # swift: m4 + neural engine, xcode: 'bridge', 'xcode' + xcode integration
+    assert table.column("pattern_hits")[3] == 5
+
+    groups = table.group_statistics()
+    assert groups["foundation-models"]["files"] == 2
+    assert groups["foundation-models"]["totals"]["lines_of_code"] == 5
+    assert groups["Scripts"]["means"]["functions_count"] == 1
+    assert groups["App"]["means"]["lines_of_code"] is None
+    assert table.summary()["statistics"]["size_bytes"]["count"] == 4
@@ -0,0 +1,113 @@
+"""
+The shared reader never has more than max_in_flight reads open, lets a file
+larger than its whole byte budget through instead of deadlocking, returns
+the budget when an iter_reads consumer stops early, and counts bytes read
+on disk rather than decoded characters.
+"""
+
+import asyncio
+import contextlib
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+import file_reader_pool  # noqa: E402
+from file_reader_pool import AsyncFileReaderPool  # noqa: E402
+
+
+def write_files(root: Path, count: int, size: int = 100):
+    files = []
+    for index in range(count):
+        path = root / f"file{index}.txt"
+        path.write_text("x" * size)
+        files.append((path, size))
+    return files
+
+
+def test_in_flight_reads_never_exceed_the_limit(tmp_path, monkeypatch):
+    lock = threading.Lock()
+    counts = {"open": 0, "peak": 0}
+
+    class SlowPath:
+        def __init__(self, path):
+            self.path = Path(path)
+
+        def read_text(self):
+            with lock:
+                counts["open"] += 1
+                counts["peak"] = max(counts["peak"], counts["open"])
+            time.sleep(0.02)
+            with lock:
+                counts["open"] -= 1
+            return self.path.read_text()
+
+    monkeypatch.setattr(file_reader_pool, "ASYNC_FILE_AVAILABLE", False)
+    monkeypatch.setattr(file_reader_pool, "Path", SlowPath)
+    files = write_files(tmp_path, 12)
+
+    async def read_all():
+        pool = AsyncFileReaderPool(max_in_flight=3)
+        streamed = [path async for path, _ in pool.iter_reads(files)]
+        single = await asyncio.gather(*(pool.read(path, size) for path, size in files))
+        return pool, streamed, single
+
+    pool, streamed, single = asyncio.run(read_all())
+    assert sorted(streamed) == sorted(path for path, _ in files) and len(single) == len(files)
+    assert counts["peak"] == 3
+    assert pool.stats["files_read"] == 24
+
+
+def test_a_file_larger_than_the_budget_still_gets_through(tmp_path):
+    files = write_files(tmp_path, 4, size=10)
+    large = tmp_path / "large.txt"
+    large.write_text("y" * 1000)
+
+    async def read_all():
+        pool = AsyncFileReaderPool(max_buffered_bytes=50)
+        contents = {}
+        async for path, content in pool.iter_reads(files[:2] + [(large, 1000)] + files[2:]):
+            contents[path] = content
+        contents["single"] = await pool.read(large, 1000)
+        return pool, contents
+
+    pool, contents = asyncio.run(asyncio.wait_for(read_all(), 5))
+    assert contents[large] == contents["single"] == "y" * 1000 and len(contents) == 6
+    assert pool.stats["peak_buffered_bytes"] <= pool.max_buffered_bytes
+    assert pool._buffered_bytes == 0
+
+
+def test_stopping_early_releases_the_budget(tmp_path):
+    files = write_files(tmp_path, 8)
+
+    async def stop_after_one():
+        pool = AsyncFileReaderPool(max_buffered_bytes=300)
+        async with contextlib.aclosing(pool.iter_reads(files)) as reads:
+            async for _ in reads:
+                break
+        released = pool._buffered_bytes
+        # The whole budget is available again
+        content = await asyncio.wait_for(pool.read(files[0][0], 300), 5)
+        return pool, released, content
+
+    pool, released, content = asyncio.run(stop_after_one())
+    assert released == 0 and content == "x" * 100
+    assert pool._buffered_bytes == 0
+
+
+def test_bytes_read_counts_bytes_on_disk(tmp_path):
+    path = tmp_path / "accents.txt"
+    path.write_text("é" * 10, encoding="utf-8")
+    size = path.stat().st_size
+
+    async def read():
+        pool = AsyncFileReaderPool()
+        await pool.read(path, size)
+        await pool.read(path)
+        return pool
+
+    pool = asyncio.run(read())
+    assert size == 20
+    assert pool.stats["bytes_read"] == 2 * size
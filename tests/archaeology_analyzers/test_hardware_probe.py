@@ -0,0 +1,120 @@
+"""
+The capability profile is probed once and reused from disk until it expires
+or the host changes, sizes the scan pool, carries the backend benchmarks
+across runs, and is loaded without blocking the event loop.
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import threading
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+import hardware_probe  # noqa: E402
+from analysis_cache import AnalysisCache  # noqa: E402
+from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer  # noqa: E402
+from hardware_probe import CapabilityCache, HardwareProfile, load_hardware_profile  # noqa: E402
+from scan_executor import ScanExecutor  # noqa: E402
+
+PROFILE = HardwareProfile(host="", cpu_brand="Apple M4 Pro", apple_silicon=True, apple_m4=True, logical_cpus=14,
+                          physical_cpus=14, performance_cores=10, memory_bytes=48 << 30)
+
+
+def counting_probe(monkeypatch, profile=PROFILE):
+    """Replace the blocking probe; returns the list of threads it ran on"""
+    threads = []
+
+    def probe():
+        threads.append(threading.current_thread())
+        return replace(profile, host=hardware_probe._host_key(), probed_at=hardware_probe.time.time())
+
+    monkeypatch.setattr(hardware_probe, "probe_hardware", probe)
+    return threads
+
+
+def test_profile_is_cached_on_disk_until_it_expires(tmp_path, monkeypatch):
+    probes = counting_probe(monkeypatch)
+    path = tmp_path / "profile.json"
+
+    first = CapabilityCache(path).profile()
+    assert len(probes) == 1 and json.loads(path.read_text())["scan_workers"] == 10
+
+    second = CapabilityCache(path)
+    assert second.profile() == first and second.stats == {"hits": 1, "probes": 0}
+    assert len(probes) == 1
+
+    expired = CapabilityCache(path, ttl_seconds=0)
+    expired.profile()
+    assert expired.stats["probes"] == 1 and len(probes) == 2
+
+    # A profile probed on another host (or interpreter) is never reused
+    data = json.loads(path.read_text())
+    path.write_text(json.dumps({**data, "host": "elsewhere"}))
+    assert CapabilityCache(path).load() is None
+    path.write_text("{torn")
+    assert CapabilityCache(path).load() is None
+
+
+def test_scan_workers_follow_the_profile():
+    assert PROFILE.scan_workers() == 10 and PROFILE.neural_engine_cores == 16
+    linux = replace(PROFILE, cpu_brand="Xeon", apple_silicon=False, apple_m4=False, performance_cores=0)
+    assert linux.scan_workers() == 14 and linux.neural_engine_cores == 0
+    assert HardwareProfile.from_dict(PROFILE.to_dict()) == PROFILE
+
+    executor = ScanExecutor(mode="serial")
+    executor.size_for(PROFILE)
+    assert executor.max_workers == 10
+    configured = ScanExecutor(mode="serial", max_workers=3)
+    configured.size_for(PROFILE)
+    assert configured.max_workers == 3
+
+
+def test_analyzer_loads_the_profile_off_the_loop_and_reuses_benchmarks(tmp_path, monkeypatch):
+    probes = counting_probe(monkeypatch)
+    path = tmp_path / "profile.json"
+    (tmp_path / ".env.quantum-secure").write_text("# comment\nOKSANA_TEST_QUANTUM_KEY='abc'\n")
+    monkeypatch.delenv("OKSANA_TEST_QUANTUM_KEY", raising=False)
+    monkeypatch.delenv("OKSANA_ANALYZER_SCAN_WORKERS", raising=False)
+
+    selections = []
+    for _ in range(2):
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = EnhancedOksanaPlatformAnalyzer(project_root=tmp_path, analysis_cache=AnalysisCache(),
+                                                      capability_cache=CapabilityCache(path))
+            try:
+                asyncio.run(analyzer.initialize_real_apis())
+                asyncio.run(analyzer.analyze_complete_project_structure())
+            finally:
+                analyzer.close()
+        selections.append(analyzer.analysis_results["analytics_priority_status"]["backend_selection"]["reason"])
+        results = analyzer.analysis_results
+        assert results["m4_acceleration_active"] and results["neural_engine_cores"] == 16
+        assert results["hardware_profile"]["performance_cores"] == 10
+        assert analyzer.scan_executor.max_workers == 10
+
+    assert len(probes) == 1 and probes[0] is not threading.main_thread()
+    assert selections == ["fastest-benchmark", "cached-benchmark"]
+    assert json.loads(path.read_text())["analytics_benchmark_ms"]
+    assert hardware_probe.os.environ["OKSANA_TEST_QUANTUM_KEY"] == "abc"
+    monkeypatch.delenv("OKSANA_TEST_QUANTUM_KEY")
+
+
+def test_environment_configuration(tmp_path, monkeypatch):
+    monkeypatch.setenv("OKSANA_ANALYZER_HARDWARE_PROFILE", "off")
+    assert CapabilityCache.from_environment().path is None
+
+    monkeypatch.setenv("OKSANA_ANALYZER_HARDWARE_PROFILE", str(tmp_path / "p.json"))
+    monkeypatch.setenv("OKSANA_ANALYZER_HARDWARE_PROFILE_TTL", "60")
+    cache = CapabilityCache.from_environment()
+    assert cache.path == tmp_path / "p.json" and cache.ttl_seconds == 60
+
+    # Without a disk cache the host is still probed only once per cache
+    probes = counting_probe(monkeypatch)
+    memory_only = CapabilityCache(None)
+    assert asyncio.run(load_hardware_profile(memory_only)) is asyncio.run(load_hardware_profile(memory_only))
+    assert len(probes) == 1
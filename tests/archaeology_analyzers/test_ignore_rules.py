@@ -0,0 +1,96 @@
+"""
+The inventory walk prunes ignored subtrees (defaults plus .gitignore files)
+instead of filtering their files afterwards, and watch-mode patches follow
+the same rules.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from ignore_rules import IgnoreRules, RuleSet, parse_ignore_lines  # noqa: E402
+from project_inventory import ProjectInventory  # noqa: E402
+
+
+def write(root: Path, rel: str, text: str = "x"):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def make_project(root: Path):
+    for rel in ("src/app.ts", "src/node_modules/react/index.js", "node_modules/lodash/index.js",
+                ".git/HEAD", "web/.next/cache.json", "learning/XCodeProjects/App/App.swift",
+                "learning/notes.md", "logs/run.log", "logs/keep.log", "docs/build/index.html",
+                "docs/guide/build.md", "src/generated/types.ts"):
+        write(root, rel)
+    write(root, ".gitignore", "# local\n*.log\n!keep.log\n/docs/build/\n")
+    write(root, "src/.gitignore", "generated/\n")
+
+
+def rel_paths(inventory: ProjectInventory):
+    return [entry.rel_path for entry in inventory.files_under(inventory.root)]
+
+
+def test_gitignore_pattern_semantics():
+    rules = RuleSet(parse_ignore_lines(["*.log", "!keep.log", "/dist", "docs/**/draft-*.md", "tmp/", "\\#notes"]))
+    assert rules.ignores("logs/run.log", False)
+    assert not rules.ignores("logs/keep.log", False)
+    assert rules.ignores("dist", True)
+    assert not rules.ignores("web/dist", True)
+    assert rules.ignores("docs/draft-1.md", False)
+    assert rules.ignores("docs/a/b/draft-2.md", False)
+    assert rules.ignores("src/tmp", True)
+    assert not rules.ignores("src/tmp", False)
+    assert rules.ignores("#notes", False)
+
+    # Anchored patterns of a nested .gitignore are relative to its directory
+    nested = rules.extend(parse_ignore_lines(["/cache"], "web"))
+    assert nested.ignores("web/cache", True)
+    assert not nested.ignores("web/app/cache", True)
+
+
+def test_build_prunes_ignored_subtrees(tmp_path):
+    make_project(tmp_path)
+    inventory = ProjectInventory.build(tmp_path, IgnoreRules())
+
+    assert rel_paths(inventory) == [
+        ".gitignore", "docs/guide/build.md", "learning/notes.md", "logs/keep.log", "src/.gitignore", "src/app.ts"
+    ]
+    # Whole directories are recorded once, nothing below them was walked
+    assert sorted(inventory.ignored) == [
+        ".git", "docs/build", "learning/XCodeProjects", "logs/run.log",
+        "node_modules", "src/generated", "src/node_modules", "web/.next"
+    ]
+    assert not inventory.is_dir(tmp_path / "node_modules")
+
+    everything = ProjectInventory.build(tmp_path, IgnoreRules(patterns=(), gitignore=False))
+    assert len(everything) == 14 and everything.ignored == []
+
+
+def test_with_changes_follows_ignore_rules(tmp_path):
+    make_project(tmp_path)
+    inventory = ProjectInventory.build(tmp_path, IgnoreRules())
+
+    write(tmp_path, "node_modules/lodash/extra.js")
+    write(tmp_path, "src/generated/more.ts")
+    unchanged, changed = inventory.with_changes([tmp_path / "node_modules" / "lodash" / "extra.js",
+                                                 tmp_path / "src" / "generated"])
+    assert changed == set()
+
+    # Un-ignoring generated/ brings its files in
+    write(tmp_path, "src/.gitignore", "")
+    patched, changed = unchanged.with_changes([tmp_path / "src" / ".gitignore"])
+    assert changed == {"src/.gitignore", "src/generated/types.ts", "src/generated/more.ts"}
+    assert rel_paths(patched) == rel_paths(ProjectInventory.build(tmp_path, IgnoreRules()))
+
+
+def test_rules_from_environment(monkeypatch):
+    monkeypatch.setenv("OKSANA_ANALYZER_IGNORE", "vendor/, *.tmp")
+    monkeypatch.setenv("OKSANA_ANALYZER_GITIGNORE", "off")
+    rules = IgnoreRules.from_environment()
+    assert rules.summary() == {"patterns": ["vendor/", "*.tmp"], "gitignore": False}
+
+    monkeypatch.setenv("OKSANA_ANALYZER_IGNORE", "none")
+    assert IgnoreRules.from_environment().patterns == []
@@ -0,0 +1,116 @@
+"""
+Correctness tests for the single-pass keyword matcher against the analyzer's
+original per-line counting semantics.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from keyword_matcher import KeywordMatcher  # noqa: E402
+from source_scanners import (  # noqa: E402
+    analyze_bridge_source,
+    analyze_javascript_source,
+    scan_figma_patterns,
+    scan_swift_patterns,
+    scan_xcode_patterns,
+)
+
+
+# Reference implementations: the analyzer's original list-comprehension scans
+# (code constructs - functions, async, classes, exports - come from the source
+# lexer now and are covered by test_source_lexer.py)
+
+def reference_javascript(content):
+    lines = content.split('\n')
+    return {
+        "lines_of_code": len(lines),
+        "mcp_patterns": len([line for line in lines if 'mcp' in line.lower()]),
+        "apple_intelligence_patterns": len([line for line in lines if any(pattern in line.lower() for pattern in ['apple', 'm4', 'neural', 'intelligence'])]),
+        "quantum_patterns": len([line for line in lines if 'quantum' in line.lower()]),
+    }
+
+
+def reference_bridge(content):
+    analysis = {"lines_of_code": 0, "bridge_patterns": 0, "error_handling": 0, "integration_points": 0}
+    lines = content.split('\n')
+    analysis["lines_of_code"] = len(lines)
+    for line in lines:
+        lower_line = line.lower()
+        if any(pattern in lower_line for pattern in ['bridge', 'integrate', 'connect', 'sync']):
+            analysis["bridge_patterns"] += 1
+        if any(pattern in lower_line for pattern in ['try', 'catch', 'error', 'throw']):
+            analysis["error_handling"] += 1
+        if any(pattern in lower_line for pattern in ['api', 'service', 'client', 'server']):
+            analysis["integration_points"] += 1
+    return analysis
+
+
+FRAGMENTS = [
+    "function", "=>", "async", "Async", "await", "export", "class ", "  class X", "\tclass",
+    "mcp", "MCP", "apple", "M4", "neural", "NeuralEngine", "intelligence", "quantum",
+    "bridge", "integrate", "connect", "sync", "asynconnect", "promise", "try", "catch",
+    "error", "throw", "interface", "type", "struct", "api", "service", "client", "server",
+    "figma", "design", "component", "frame", "node", "xcode", ".xcodeproj", "model",
+    "convert", "coreml", "mlmodel", "metalperformanceshaders", "accelerate",
+    " ", "x", "=", ">", "\n", "\n", "\r\n", " ", "İ", "// ", "'", "\"",
+]
+
+
+def random_sources(count=300, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 80)))
+
+
+def test_javascript_counts_match_reference():
+    for content in random_sources():
+        analysis = analyze_javascript_source(content)
+        expected = reference_javascript(content)
+        assert {key: analysis[key] for key in expected} == expected, content
+
+
+def test_bridge_counts_match_reference():
+    for content in random_sources():
+        analysis = analyze_bridge_source(content)
+        expected = reference_bridge(content)
+        assert {key: analysis[key] for key in expected} == expected, content
+
+
+def test_presence_scans_match_reference():
+    for content in random_sources():
+        lower_content = content.lower()
+
+        assert scan_swift_patterns(content) == {
+            "m4_optimization": any(p in lower_content for p in ['m4', 'neural', 'metalperformanceshaders', 'accelerate']),
+            "neural_engine": any(p in lower_content for p in ['neuralengine', 'coreml', 'mlmodel'])
+        }
+        assert scan_figma_patterns(content) == {
+            "mcp_integration": 'mcp' in lower_content,
+            "figma_patterns": [p for p in ['figma', 'design', 'component', 'frame', 'node'] if p in lower_content]
+        }
+        assert scan_xcode_patterns(content) == {
+            "bridge_patterns": [p for p in ['bridge', 'xcode', 'model', 'sync', 'convert'] if p in lower_content],
+            "xcode_integration": 'xcode' in lower_content or '.xcodeproj' in content
+        }
+
+
+@pytest.mark.parametrize("text, expected", [
+    # 'async' hides 'sync' inside it and overruns into 'connect'
+    ("asynconnect", {"a": 1, "b": 1}),
+    ("x\nasync\nsync", {"a": 1, "b": 2}),
+    ("", {"a": 0, "b": 0}),
+])
+def test_overlapping_keywords_are_all_counted(text, expected):
+    matcher = KeywordMatcher({"a": ["async"], "b": ["sync", "connect"]})
+    assert matcher.count_lines(text) == expected
+
+
+def test_case_sensitive_matching():
+    matcher = KeywordMatcher({"async": ["async"]}, case_sensitive=True)
+    assert matcher.count_lines("Async\nasync\nASYNC") == {"async": 1}
+    assert matcher.find_keywords("ASYNC") == set()
@@ -0,0 +1,66 @@
+"""
+Importing and constructing the analyzer must not load heavy optional
+dependencies or probe the hardware; both happen on first use.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ANALYZER_DIR = Path(__file__).resolve().parents[2] / "archaeology-analyzers"
+sys.path.insert(0, str(ANALYZER_DIR))
+
+import hardware_probe  # noqa: E402
+from lazy_imports import LazyModule, module_available  # noqa: E402
+
+
+def test_startup_loads_no_heavy_modules_and_runs_no_probes():
+    probe = """
+import contextlib, io, json, subprocess, sys
+calls = []
+real_run = subprocess.run
+subprocess.run = lambda *args, **kwargs: calls.append(args) or real_run(*args, **kwargs)
+with contextlib.redirect_stdout(io.StringIO()):
+    import enhanced_project_analyzer
+    enhanced_project_analyzer.EnhancedOksanaPlatformAnalyzer().close()
+heavy = ("numpy", "scipy", "coremltools", "pandas", "anthropic", "grid_api")
+print(json.dumps({"loaded": [name for name in heavy if name in sys.modules], "subprocesses": len(calls)}))
+"""
+    env = dict(os.environ, OKSANA_ANALYZER_CACHE="off")
+    completed = subprocess.run([sys.executable, "-c", probe], cwd=ANALYZER_DIR, env=env,
+                               capture_output=True, text=True, check=True)
+    assert json.loads(completed.stdout.splitlines()[-1]) == {"loaded": [], "subprocesses": 0}
+
+
+def test_lazy_module_imports_on_first_attribute():
+    module = LazyModule("colorsys")
+    assert "not loaded" in repr(module)
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "(loaded)" in repr(module)
+
+
+def test_module_available_does_not_import():
+    assert module_available("json")
+    assert not module_available("definitely_not_an_installed_module")
+    assert "this" not in sys.modules and module_available("this")
+    assert "this" not in sys.modules
+
+
+def test_hardware_probes_are_cached(monkeypatch):
+    calls = []
+
+    def fake_sysctl(name):
+        calls.append(name)
+        return "1"
+
+    monkeypatch.setattr(hardware_probe, "_sysctl", fake_sysctl)
+    monkeypatch.setattr(hardware_probe.sys, "platform", "darwin")
+    hardware_probe.is_apple_silicon.cache_clear()
+    try:
+        assert hardware_probe.is_apple_silicon()
+        assert hardware_probe.is_apple_silicon()
+        assert calls == ["hw.optional.arm64"]
+    finally:
+        hardware_probe.is_apple_silicon.cache_clear()
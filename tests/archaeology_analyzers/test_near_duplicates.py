@@ -0,0 +1,134 @@
+"""
+MinHash signatures do not depend on how the text is fed, LSH clusters
+near-copies while leaving unrelated sources alone, and with exclusion on the
+phases no longer see the copies.
+"""
+
+import asyncio
+import contextlib
+import io
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from analysis_cache import AnalysisCache  # noqa: E402
+from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer  # noqa: E402
+from near_duplicates import MinHasher, NearDuplicateDetector, decode_signatures, minhash_signature  # noqa: E402
+from source_scanners import SCAN_KIND_MINHASH, scan_source  # noqa: E402
+
+WORDS = ["glass", "layer", "depth", "render", "bridge", "shader", "quantum", "spatial", "surface", "material",
+         "opacity", "blur", "frame", "pixel", "vertex", "channel", "payload", "message", "service", "token"]
+
+
+def component(seed: int, statements: int = 80) -> str:
+    rng = random.Random(seed)
+    lines = [f"const {rng.choice(WORDS)}{index} = {rng.choice(WORDS)}({rng.randint(0, 99)}, '{rng.choice(WORDS)}');"
+             for index in range(statements)]
+    return "\n".join(lines) + "\n"
+
+
+def variant(source: str, edits: int, seed: int) -> str:
+    """``source`` with ``edits`` of its lines replaced"""
+    rng = random.Random(seed)
+    lines = source.splitlines()
+    for index in rng.sample(range(len(lines)), edits):
+        lines[index] = f"let changed{index} = {index};"
+    return "\n".join(lines) + "\n"
+
+
+def similarity(first: str, second: str) -> float:
+    matrix = decode_signatures([minhash_signature(first)["signature"], minhash_signature(second)["signature"]])
+    return float((matrix[0] == matrix[1]).mean())
+
+
+def test_signature_does_not_depend_on_how_the_text_is_split():
+    source = component(1)
+    whole = minhash_signature(source)
+    for size in (1, 7, 64, 1000):
+        hasher = MinHasher()
+        for start in range(0, len(source), size):
+            hasher.feed(source[start:start + size])
+        assert hasher.close() == whole
+    assert scan_source(SCAN_KIND_MINHASH, source) == whole
+    assert minhash_signature("")["signature"] is None
+    assert minhash_signature("a b")["signature"] is not None  # shorter than one shingle
+
+
+def test_similarity_estimates_track_the_edits():
+    source = component(2)
+    assert similarity(source, source) == 1.0
+    assert similarity(source, variant(source, 2, seed=3)) > 0.8
+    assert similarity(source, variant(source, 40, seed=3)) < 0.6
+    assert similarity(source, component(4)) < 0.2
+
+
+def test_near_copies_cluster_and_unrelated_files_do_not():
+    original = component(5)
+    sources = {
+        "components/Glass.tsx": original,
+        "components/Glass_2.tsx": variant(original, 1, seed=6),
+        "output/svg-components/Glass_12.tsx": variant(original, 2, seed=7),
+        "components/Prism.tsx": component(8),
+    }
+    sources.update({f"components/Other{index}.tsx": component(100 + index) for index in range(20)})
+    signatures = {path: minhash_signature(text)["signature"] for path, text in sources.items()}
+    sizes = {path: len(text) for path, text in sources.items()}
+
+    report, copies = NearDuplicateDetector().analyze(signatures, sizes, {path: path.split("/")[0] for path in sources})
+
+    assert report["files"] == 24 and report["cluster_count"] == 1
+    [cluster] = report["clusters"]
+    assert cluster["representative"] == "components/Glass.tsx"
+    assert cluster["files"] == 3 and cluster["phases"] == {"components": 2, "output": 1}
+    assert 0.8 <= cluster["similarity"]["min"] <= cluster["similarity"]["mean"] < 1.0
+    assert copies == ["components/Glass_2.tsx", "output/svg-components/Glass_12.tsx"]
+    assert report["duplicate_files"] == 2
+    assert report["duplicate_bytes"] == sizes["components/Glass_2.tsx"] + sizes["output/svg-components/Glass_12.tsx"]
+
+
+def test_excluded_copies_are_hidden_from_the_phases(tmp_path):
+    lib = tmp_path / "CreatrixPortal" / "lib"
+    lib.mkdir(parents=True)
+    original = component(9)
+    (lib / "Glass.ts").write_text(original)
+    for index in range(3):
+        (lib / f"Glass_{index}.ts").write_text(variant(original, 1, seed=index))
+    (lib / "Prism.ts").write_text(component(10))
+
+    counts = {}
+    for mode in ("on", "exclude"):
+        detector = NearDuplicateDetector(exclude=mode == "exclude")
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = EnhancedOksanaPlatformAnalyzer(project_root=tmp_path, analysis_cache=AnalysisCache(),
+                                                      near_duplicate_detector=detector)
+            try:
+                asyncio.run(analyzer._analyze_near_duplicates())
+                asyncio.run(analyzer._analyze_creatrix_portal())
+            finally:
+                analyzer.close()
+        report = analyzer.analysis_results["near_duplicates"]
+        assert report["duplicate_files"] == 3
+        counts[mode] = (report["excluded_from_phases"],
+                        analyzer.analysis_results["comprehensive_analysis"]["CreatrixPortal"]["subprojects"]["lib"])
+
+    assert counts["on"][0] == 0 and counts["on"][1]["typescript_files"] == 5
+    assert counts["exclude"][0] == 3 and counts["exclude"][1]["typescript_files"] == 2
+
+
+def test_environment_configuration(monkeypatch):
+    monkeypatch.delenv("OKSANA_ANALYZER_NEAR_DUPLICATES", raising=False)
+    assert not NearDuplicateDetector.from_environment().enabled  # a second pass over the tree: opt-in
+
+    monkeypatch.setenv("OKSANA_ANALYZER_NEAR_DUPLICATES", "exclude")
+    monkeypatch.setenv("OKSANA_ANALYZER_NEAR_DUPLICATE_THRESHOLD", "0.9")
+    detector = NearDuplicateDetector.from_environment()
+    assert detector.enabled and detector.exclude and detector.threshold == 0.9
+
+    monkeypatch.setenv("OKSANA_ANALYZER_NEAR_DUPLICATES", "on")
+    assert not NearDuplicateDetector.from_environment().exclude
@@ -0,0 +1,202 @@
+"""
+Phases start as soon as what they require is done, pools bound how many run
+at once, a failure cancels the rest, unchanged phases are skipped, and the
+analyzer runs its eleven phases (plus any registered ones) as this graph,
+with at most max_parallel_phases scan phases at a time.
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from analysis_cache import AnalysisCache  # noqa: E402
+from enhanced_project_analyzer import SCAN_PHASES, EnhancedOksanaPlatformAnalyzer  # noqa: E402
+from phase_graph import Phase, PhaseRegistry, PhaseScheduler  # noqa: E402
+
+
+class Recorder:
+    """Context the test phases write to; tracks overlap and the order phases start and finish in"""
+
+    def __init__(self):
+        self.events = []
+        self.running = 0
+        self.peak = 0
+
+    def phase(self, name, delay=0.01, fail=False, **kwargs):
+        async def run(context):
+            context.events.append(("start", name))
+            context.running += 1
+            context.peak = max(context.peak, context.running)
+            try:
+                await asyncio.sleep(delay)
+                if fail:
+                    raise RuntimeError(f"{name} failed")
+            finally:
+                context.running -= 1
+            context.events.append(("end", name))
+        return Phase(name, run, output=name, **kwargs)
+
+
+def test_registry_rejects_unknown_requirements_and_duplicates():
+    recorder = Recorder()
+    registry = PhaseRegistry([recorder.phase("a")])
+    with pytest.raises(ValueError, match="unregistered"):
+        registry.register(recorder.phase("b", requires=("c",)))
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(recorder.phase("a"))
+    with pytest.raises(ValueError, match="both write"):
+        registry.register(Phase("b", recorder.phase("b").run, output="a"))
+
+    extended = registry.copy()
+    extended.register(recorder.phase("b", requires=("a",)))
+    assert extended.names() == ["a", "b"] and "b" not in registry
+
+
+def test_phases_start_when_their_requirements_finish_within_pool_limits():
+    recorder = Recorder()
+    registry = PhaseRegistry([
+        *(recorder.phase(f"scan{index}", pool="scan") for index in range(6)),
+        recorder.phase("slow", delay=0.05),
+        recorder.phase("metrics", requires=tuple(f"scan{index}" for index in range(6))),
+        recorder.phase("report", requires=("metrics", "slow")),
+    ])
+    statuses = asyncio.run(PhaseScheduler(registry, {"scan": 2}).run(recorder))
+
+    assert set(statuses.values()) == {"ran"}
+    events = recorder.events
+    # Two scans at a time, while the unpooled phase overlaps them
+    assert recorder.peak == 3
+    # metrics does not wait for the slow phase it does not require; report waits for both
+    assert events.index(("start", "metrics")) < events.index(("end", "slow"))
+    assert events.index(("start", "report")) > events.index(("end", "slow"))
+    assert all(events.index(("end", f"scan{index}")) < events.index(("start", "metrics")) for index in range(6))
+
+
+def test_a_failure_cancels_running_and_waiting_phases():
+    recorder = Recorder()
+    registry = PhaseRegistry([
+        recorder.phase("broken", delay=0.01, fail=True),
+        recorder.phase("long", delay=10),
+        recorder.phase("after", requires=("broken",)),
+    ])
+    scheduler = PhaseScheduler(registry)
+    with pytest.raises(RuntimeError, match="broken failed"):
+        asyncio.run(asyncio.wait_for(scheduler.run(recorder), 5))
+    assert scheduler.statuses == {"broken": "failed", "long": "cancelled", "after": "cancelled"}
+    assert ("start", "after") not in recorder.events and recorder.running == 0
+
+    # Cancelling the caller cancels every phase it started
+    async def cancel_midway():
+        task = asyncio.ensure_future(PhaseScheduler(PhaseRegistry([recorder.phase("long", delay=10)])).run(recorder))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_midway())
+    assert recorder.running == 0
+
+
+def test_unchanged_phases_are_skipped():
+    recorder = Recorder()
+    inputs = {"a": "1", "b": "1"}
+    handed_on = {"b": "same"}
+    registry = PhaseRegistry([
+        recorder.phase("a", inputs=("a",)),
+        recorder.phase("b", inputs=("b",), output_digest=lambda context: handed_on["b"]),
+        recorder.phase("a_report", requires=("a",)),
+        recorder.phase("b_report", requires=("b",)),
+        recorder.phase("off", enabled=lambda context: False),
+    ])
+    fingerprints = {}
+
+    def run():
+        scheduler = PhaseScheduler(registry, fingerprints=fingerprints,
+                                   input_digest=lambda phase: ",".join(inputs[key] for key in phase.inputs))
+        return asyncio.run(scheduler.run(recorder))
+
+    assert run() == {"a": "ran", "b": "ran", "a_report": "ran", "b_report": "ran", "off": "disabled"}
+    assert set(run().values()) == {"cached", "disabled"}
+
+    inputs["a"] = inputs["b"] = "2"
+    statuses = run()
+    # b re-ran but handed its dependent the same thing
+    assert statuses["a"] == statuses["a_report"] == statuses["b"] == "ran" and statuses["b_report"] == "cached"
+
+    fingerprints.clear()
+    assert run()["b_report"] == "ran"
+
+
+def test_analyzer_runs_registered_phases_in_its_graph(tmp_path):
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "deploy.sh").write_text("echo deploy\n")
+
+    async def summarize_scripts(analyzer):
+        scripts = analyzer.analysis_results["comprehensive_analysis"]["Scripts"]
+        analyzer.analysis_results["script_summary"] = {"scripts_exists": scripts["scripts_exists"]}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = EnhancedOksanaPlatformAnalyzer(project_root=tmp_path, analysis_cache=AnalysisCache())
+        analyzer.phase_registry.register(Phase("script_summary", summarize_scripts, output="script_summary",
+                                               requires=("Scripts",)))
+        try:
+            results = asyncio.run(analyzer.analyze_complete_project_structure())
+            statuses = dict(analyzer.phase_statuses)
+            rerun = asyncio.run(analyzer.run_phase_graph())
+        finally:
+            analyzer.close()
+
+    assert results["script_summary"] == {"scripts_exists": True}
+    assert statuses["near_duplicates"] == "disabled"
+    assert {statuses[name] for name in statuses if name != "near_duplicates"} == {"ran"}
+    assert results["deployment_readiness"]["components_analyzed"] == len(results["comprehensive_analysis"])
+    assert list(results["comprehensive_analysis"])[0] == "foundation-models"
+    # Nothing changed on disk: every phase is skipped
+    assert {rerun[name] for name in rerun if name != "near_duplicates"} == {"cached"}
+
+
+def test_analyzer_bounds_scan_phases_by_max_parallel_phases(tmp_path):
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "deploy.sh").write_text("echo deploy\n")
+    recorder = Recorder()
+
+    def observed(phase, delay):
+        async def run(analyzer):
+            recorder.events.append(("start", phase.name))
+            if phase.name in SCAN_PHASES:
+                recorder.running += 1
+                recorder.peak = max(recorder.peak, recorder.running)
+            try:
+                await asyncio.sleep(delay)
+                await phase.run(analyzer)
+            finally:
+                if phase.name in SCAN_PHASES:
+                    recorder.running -= 1
+            recorder.events.append(("end", phase.name))
+        return replace(phase, run=run)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = EnhancedOksanaPlatformAnalyzer(project_root=tmp_path, analysis_cache=AnalysisCache(),
+                                                  max_parallel_phases=3)
+        # The analyzer's own graph, with each scan phase held open long enough to overlap
+        analyzer.phase_registry = PhaseRegistry(observed(phase, 0.05 if phase.name in SCAN_PHASES else 0)
+                                                for phase in analyzer.phase_registry)
+        try:
+            asyncio.run(analyzer.analyze_complete_project_structure())
+        finally:
+            analyzer.close()
+
+    events = recorder.events
+    assert analyzer.analysis_results["phase_graph"]["limits"] == {"scan": 3}
+    assert recorder.peak == 3 and recorder.running == 0
+    # Phase 10 waits for every scan phase
+    strategic_start = events.index(("start", "strategic_intelligence"))
+    assert all(events.index(("end", name)) < strategic_start for name in SCAN_PHASES)
+    assert analyzer.analysis_results["strategic_intelligence"]
@@ -0,0 +1,63 @@
+"""
+The pipeline benchmark generates deterministic synthetic trees, measures
+cases in fresh interpreters and saves comparable JSON results.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from pipeline_benchmark import TREE_MARKER, compare, generate_tree, main, parse_sizes, run_case  # noqa: E402
+
+
+def tree_files(root: Path):
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*") if path.is_file())
+
+
+def test_parse_sizes():
+    assert parse_sizes("1k, 10k,100k") == [1000, 10000, 100000]
+    assert parse_sizes("250,1.5k") == [250, 1500]
+
+
+def test_generated_tree_is_deterministic_and_reused(tmp_path):
+    first = generate_tree(tmp_path / "a", 300, seed=7)
+    second = generate_tree(tmp_path / "b", 300, seed=7)
+    assert tree_files(tmp_path / "a") == tree_files(tmp_path / "b")
+    assert first["total_bytes"] == second["total_bytes"]
+    # Every file plus the marker; the analyzer's key paths are present
+    assert len(tree_files(tmp_path / "a")) == 301
+    assert (tmp_path / "a" / "foundation-models" / "index.js").is_file()
+    assert any((tmp_path / "a" / "CreatrixPortal" / "vercel").rglob("*.tsx"))
+    json.loads((tmp_path / "a" / "foundation-models" / "package.json").read_text())
+
+    marker = tmp_path / "a" / TREE_MARKER
+    mtime = marker.stat().st_mtime_ns
+    assert generate_tree(tmp_path / "a", 300, seed=7) == first
+    assert marker.stat().st_mtime_ns == mtime
+
+
+def test_cases_measure_throughput(tmp_path, monkeypatch):
+    monkeypatch.setenv("OKSANA_ANALYZER_SCAN_MODE", "serial")
+    root = tmp_path / "tree"
+    generate_tree(root, 200)
+
+    inventory = run_case(root, "inventory")
+    assert inventory["files"] == 201 and inventory["seconds"] > 0
+    phase = run_case(root, "AppleIntelligenceFramework")
+    assert 0 < phase["files"] < inventory["files"]
+    assert phase["bytes"] > 0
+
+
+def test_main_saves_results_and_compares(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    args = ["--sizes", "100", "--cases", "inventory", "--tree-dir", str(tmp_path / "trees"), "--output", str(output)]
+    assert main(args) == 0
+    report = json.loads(output.read_text())
+    assert [(row["size"], row["case"]) for row in report["results"]] == [(100, "inventory")]
+    row = report["results"][0]
+    assert row["files_per_s"] > 0 and row["mb_per_s"] > 0 and row["peak_rss_bytes"] > 0
+
+    assert compare(report, report)[0]["speedup"] == 1.0
+    assert "inventory" in capsys.readouterr().out
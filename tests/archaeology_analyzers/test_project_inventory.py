@@ -0,0 +1,89 @@
+"""
+The column-wise inventory answers directory queries like a directory walk, and
+its FileLists serialize to the same plain lists the report always carried.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from project_inventory import FileList, ProjectInventory, materialize, report_default  # noqa: E402
+
+
+def make_tree(root: Path):
+    for rel in ("a/x.swift", "a-b/y.ts", "a/b/z.ts", "a/b/notes.md", "a.js", "XCodeProjects/App/App.swift"):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+
+
+def walked(root: Path):
+    return sorted(
+        Path(dir_path, name).relative_to(root).as_posix()
+        for dir_path, _, names in os.walk(root) for name in names
+    )
+
+
+def test_build_keeps_paths_sorted(tmp_path):
+    make_tree(tmp_path)
+    inventory = ProjectInventory.build(tmp_path)
+
+    # "a-b" sorts between "a.js" and "a/" as a plain string sort would
+    rel_paths = [entry.rel_path for entry in inventory.files_under(tmp_path)]
+    assert rel_paths == walked(tmp_path)
+    assert len(inventory) == 6
+    assert inventory.total_bytes() == sum(len(rel) for rel in rel_paths)
+    assert inventory.signatures()["a/b/z.ts"][0] == len("a/b/z.ts")
+
+
+def test_queries_stay_within_directory(tmp_path):
+    make_tree(tmp_path)
+    inventory = ProjectInventory.build(tmp_path)
+
+    assert [entry.name for entry in inventory.files_under(tmp_path / "a", [".ts"])] == ["z.ts"]
+    assert inventory.count_under(tmp_path / "a") == 3
+    assert inventory.names_under(tmp_path, [".swift"]) == ["App.swift", "x.swift"]
+    assert inventory.relative_paths_under(tmp_path / "a", [".ts", ".md"]) == ["b/notes.md", "b/z.ts"]
+    assert inventory.count_under(tmp_path / "missing") == 0
+
+
+def test_queries_match_rglob_for_every_directory(tmp_path):
+    # Sibling names sharing a prefix ("scripts" / "scripts-old" / "scriptsold" / "scripts.d") must not leak
+    # into each other's slice; "0" is the upper bound of the "scripts/" prefix range
+    for rel in ("scripts/deploy.sh", "scripts/lib/util.js", "scripts-old/deploy.sh", "scriptsold/run.ts",
+                "scripts.d/hook.sh", "scripts0/x.js", "scripts/Z.TS", "scripts/lib/deep/view.ts", "root.ts"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+    inventory = ProjectInventory.build(tmp_path)
+
+    directories = [tmp_path] + sorted(path for path in tmp_path.rglob("*") if path.is_dir())
+    for directory in directories:
+        expected = sorted(path.relative_to(tmp_path).as_posix() for path in directory.rglob("*") if path.is_file())
+        assert [entry.rel_path for entry in inventory.files_under(directory)] == expected, directory
+        for suffixes in ([".ts"], [".sh", ".js"], [".TS"]):
+            matching = [rel for rel in expected if os.path.splitext(rel)[1] in suffixes]
+            assert [entry.rel_path for entry in inventory.files_under(directory, suffixes)] == matching
+            assert inventory.count_under(directory, suffixes) == len(matching)
+        assert inventory.is_dir(directory) and sorted(inventory.directories_under(directory)) == \
+            sorted(path for path in directory.rglob("*") if path.is_dir())
+
+
+def test_file_lists_serialize_as_plain_lists(tmp_path):
+    make_tree(tmp_path)
+    inventory = ProjectInventory.build(tmp_path)
+
+    combined = inventory.names_under(tmp_path, [".ts"]) + inventory.names_under(tmp_path, [".js"])
+    assert isinstance(combined, FileList)
+    assert json.loads(json.dumps({"files": combined}, default=report_default)) == {"files": ["y.ts", "z.ts", "a.js"]}
+
+    results = {"phase": {"files": combined, "nested": [inventory.names_under(tmp_path / "a-b")]}}
+    materialize(results, keep=inventory)
+    assert results["phase"]["files"] is combined
+
+    materialize(results)
+    assert type(results["phase"]["files"]) is list
+    assert results["phase"]["nested"] == [["y.ts"]]
@@ -0,0 +1,92 @@
+"""
+Binary reports intern repeated strings, keep per-file metrics columnar, and
+let readers load the summary or one phase without decoding the rest.
+"""
+
+import array
+import json
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from file_metrics import NUMPY_AVAILABLE  # noqa: E402
+from report_binary import (  # noqa: E402
+    FILES_SECTION, SUMMARY_SECTION, BinaryReport, load_binary_report, main, read_summary, write_binary_report
+)
+
+FILES = [f"Sources/Feature{i}/View{i}.swift" for i in range(200)]
+
+RESULTS = {
+    "timestamp": "2026-01-01T00:00:00",
+    "grid_api_connected": False,
+    "comprehensive_analysis": {
+        "SwiftUI": {"sophistication_score": 0.75, "swift_files": FILES, "typescript_files": []},
+        "Server": {"sophistication_score": 0.5, "server_files": FILES, "learning_files": FILES[::2]},
+        "Scripts": {"sophistication_score": 0.25, "script_count": -3, "notes": [1, 2.5, None, True, "x"]}
+    },
+    "recommendations": [{"category": "SwiftUI", "priority": "HIGH", "path": Path("/srv/demo")}]
+}
+SUMMARY = {"overall_score": 0.5, "phase_scores": {"SwiftUI": 0.75, "Scripts": 0.25}}
+
+
+def test_round_trip_matches_json_report(tmp_path):
+    path = tmp_path / "report.oksb"
+    size = write_binary_report(path, RESULTS, SUMMARY)
+    assert size == path.stat().st_size
+    # Each file name is stored once even though the JSON report repeats it
+    assert size < len(json.dumps(RESULTS, indent=2, default=str)) / 2
+
+    assert load_binary_report(path) == json.loads(json.dumps(RESULTS, default=str))
+    assert read_summary(path) == SUMMARY
+
+
+def test_partial_loads_decode_only_the_requested_section(tmp_path):
+    path = tmp_path / "report.oksb"
+    write_binary_report(path, RESULTS, SUMMARY)
+    with BinaryReport(path) as report:
+        assert report.sections[0] == SUMMARY_SECTION
+        assert "comprehensive_analysis/SwiftUI" in report.sections
+        assert report.phase("Scripts")["script_count"] == -3
+        # Strings referenced only by other sections were never decoded
+        assert sum(value is not None for value in report._strings) < len(FILES)
+        assert report.files() is None
+        with pytest.raises(KeyError):
+            report.phase("Missing")
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(RESULTS, default=str))
+    with pytest.raises(ValueError):
+        BinaryReport(path)
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="per-file metrics need numpy")
+def test_files_section_is_columnar(tmp_path):
+    from file_metrics import FileMetricsTable
+
+    table = FileMetricsTable(capacity=2)
+    for index, name in enumerate(("a/one.js", "a/two.js", "b/three.js")):
+        table.record(name, 100 * (index + 1), "presence", {})
+    path = tmp_path / "report.oksb"
+    write_binary_report(path, RESULTS, SUMMARY, table)
+
+    with BinaryReport(path) as report:
+        assert FILES_SECTION in report.sections
+        files = report.files()
+    assert files["paths"] == ["a/one.js", "a/two.js", "b/three.js"]
+    assert files["groups"] == ["a", "b"]
+    assert isinstance(files["values"]["size_bytes"], array.array)
+    assert list(files["values"]["size_bytes"]) == [100.0, 200.0, 300.0]
+    assert math.isnan(files["values"]["complexity_score"][0])
+
+    exported = tmp_path / "export.json"
+    assert main(["export", str(path), str(exported), "--include-files"]) == 0
+    data = json.loads(exported.read_text())
+    assert data["files"]["group_codes"] == [0, 0, 1]
+    assert data["files"]["values"]["complexity_score"][0] is None
+    assert data["comprehensive_analysis"]["SwiftUI"]["swift_files"] == FILES
@@ -0,0 +1,196 @@
+"""
+The report diff matches phases, files and recommendations by key rather than
+position, reports only changed files, scores and recommendations, and gives
+the same answer whichever formats the two reports were written in.
+"""
+
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+import report_diff  # noqa: E402
+from report_binary import write_binary_report  # noqa: E402
+from report_diff import JSONReportSource, diff_reports, main, open_report, summarize  # noqa: E402
+from report_stream import NDJSONReportWriter  # noqa: E402
+
+FILES = [f"Sources/Feature{i}/View{i}.swift" for i in range(50)]
+
+BEFORE = {
+    "timestamp": "2026-01-01T00:00:00",
+    "cache_statistics": {"hits": 10},
+    "comprehensive_analysis": {
+        "AppleIntelligenceFramework": {"path": "/srv/a", "sophistication_score": 0.75, "swift_files": FILES},
+        "foundation-models": {
+            "sophistication_score": 0.5,
+            "analysis_time_ms": 12.0,
+            "key_files": {"index.js": {"async_patterns": 40, "lines_of_code": 121}}
+        },
+        "Scripts": {"sophistication_score": 0.25, "validation_tools": ["validate.sh"]}
+    },
+    "deployment_readiness": {"overall_score": 0.5, "readiness_level": "DEVELOPMENT_STAGE"},
+    "recommendations": [
+        {"category": "GRID API Integration", "issue": "not connected", "priority": "MEDIUM"},
+        {"category": "Scripts", "issue": "no tests", "priority": "LOW"}
+    ]
+}
+
+
+def changed_results():
+    after = copy.deepcopy(BEFORE)
+    after["timestamp"] = "2026-01-02T00:00:00"
+    after["cache_statistics"] = {"hits": 99}
+    phases = after["comprehensive_analysis"]
+    phases["AppleIntelligenceFramework"]["swift_files"] = list(reversed(FILES[1:])) + ["Sources/New.swift"]
+    phases["AppleIntelligenceFramework"]["path"] = "/srv/b"
+    phases["foundation-models"]["analysis_time_ms"] = 30.0
+    phases["foundation-models"]["key_files"]["index.js"]["async_patterns"] = 60
+    phases["foundation-models"]["sophistication_score"] = 0.5 + 1e-12  # within tolerance
+    del phases["Scripts"]
+    phases["Documentation"] = {"sophistication_score": 0.9}
+    after["deployment_readiness"]["overall_score"] = 0.6
+    after["recommendations"] = [
+        {"category": "Scripts", "issue": "no tests", "priority": "HIGH"},
+        {"category": "GRID API Integration", "issue": "not connected", "priority": "MEDIUM"},
+        {"category": "Docs", "issue": "missing", "priority": "LOW"}
+    ]
+    return after
+
+
+EXPECTED = [
+    {"kind": "file", "section": "comprehensive_analysis/AppleIntelligenceFramework", "container": "swift_files",
+     "file": "Sources/New.swift", "change": "added"},
+    {"kind": "file", "section": "comprehensive_analysis/AppleIntelligenceFramework", "container": "swift_files",
+     "file": FILES[0], "change": "removed"},
+    {"kind": "file", "section": "comprehensive_analysis/foundation-models", "container": "key_files",
+     "file": "index.js", "change": "changed", "fields": {"async_patterns": [40, 60]}},
+    {"kind": "phase", "section": "comprehensive_analysis/Documentation", "change": "added", "score": 0.9},
+    {"kind": "score", "section": "deployment_readiness", "path": "overall_score", "change": "changed",
+     "before": 0.5, "after": 0.6, "delta": pytest.approx(0.1)},
+    {"kind": "recommendation", "section": "recommendations", "key": {"category": "Scripts", "issue": "no tests"},
+     "change": "changed", "fields": {"priority": ["LOW", "HIGH"]}},
+    {"kind": "recommendation", "section": "recommendations", "key": {"category": "Docs", "issue": "missing"},
+     "change": "added", "recommendation": {"category": "Docs", "issue": "missing", "priority": "LOW"}},
+    {"kind": "phase", "section": "comprehensive_analysis/Scripts", "change": "removed", "score": 0.25},
+]
+
+
+def write(path: Path, results, report_format: str) -> Path:
+    if report_format == "json":
+        path.write_text(json.dumps(results, indent=2))
+    elif report_format == "binary":
+        write_binary_report(path, results, {"overall_score": results["deployment_readiness"]["overall_score"]})
+    else:
+        writer = NDJSONReportWriter(path)
+        writer.open({"project_root": "/srv"})
+        for name, phase in results["comprehensive_analysis"].items():
+            writer.write_section(["comprehensive_analysis", name], phase, record_type="phase")
+        writer.write_footer({}, {key: value for key, value in results.items() if key != "comprehensive_analysis"})
+    return path
+
+
+def test_json_index_decodes_the_same_sections(tmp_path):
+    results = changed_results()
+    # Non-ASCII text before a section shifts its byte offset away from its character offset
+    results["timestamp"] = "18 octobre – été"
+    for separators, ensure_ascii in ((None, True), ((",", ":"), True), (None, False)):
+        path = tmp_path / "report.json"
+        path.write_text(json.dumps(results, indent=2 if separators is None else None, separators=separators,
+                                   ensure_ascii=ensure_ascii), encoding="utf-8")
+        with JSONReportSource(path) as source:
+            assert source.sections == [
+                "timestamp", "cache_statistics", "comprehensive_analysis/AppleIntelligenceFramework",
+                "comprehensive_analysis/foundation-models", "comprehensive_analysis/Documentation",
+                "deployment_readiness", "recommendations"
+            ]
+            for name in source.sections:
+                key, _, phase = name.partition("/")
+                assert source.section(name) == (results[key][phase] if phase else results[key])
+
+    path.write_text(json.dumps(results)[:-40])
+    with pytest.raises(ValueError):
+        JSONReportSource(path)
+
+
+def test_json_index_reads_a_window_at_a_time(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_diff, "JSON_INDEX_WINDOW", 64)
+    windows = []
+    load = report_diff._JSONCursor._load
+
+    def recording_load(cursor, size):
+        load(cursor, size)
+        windows.append(len(cursor.text.encode("utf-8")))
+
+    monkeypatch.setattr(report_diff._JSONCursor, "_load", recording_load)
+    phases = {f"Phase{index}": {"readiness_score": index * 1.5, "summary": "été – " * (index % 7),
+                                "files": [f"src/fichier{row}.js" for row in range(index % 5)]}
+              for index in range(300)}
+    # One phase longer than the window, and a number running into the end of a window
+    phases["Phase7"]["notes"] = "réécrit " * 40
+    results = {"timestamp": "18 octobre – été", "comprehensive_analysis": phases, "files_scanned": 123456789}
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    with JSONReportSource(path) as source:
+        assert len(source.sections) == len(phases) + 2
+        for name in source.sections:
+            key, _, phase = name.partition("/")
+            assert source.section(name) == (results[key][phase] if phase else results[key])
+    largest = max(len(json.dumps(phase, indent=2, ensure_ascii=False).encode("utf-8")) for phase in phases.values())
+    assert path.stat().st_size > 50 * largest
+    assert max(windows) <= 4 * largest
+
+
+@pytest.mark.parametrize("old_format", ["json", "binary", "ndjson"])
+@pytest.mark.parametrize("new_format", ["json", "binary", "ndjson"])
+def test_changes_are_keyed_and_format_independent(tmp_path, old_format, new_format):
+    old = write(tmp_path / f"old.{old_format}", BEFORE, old_format)
+    new = write(tmp_path / f"new.{new_format}", changed_results(), new_format)
+
+    changes = list(diff_reports(old, new))
+    assert changes == EXPECTED
+    assert summarize(changes) == {
+        "file": {"added": 1, "removed": 1, "changed": 1}, "phase": {"added": 1, "removed": 1},
+        "score": {"changed": 1}, "recommendation": {"changed": 1, "added": 1}
+    }
+    assert list(diff_reports(new, new)) == []
+
+    # Other changed values (paths, flags) only with include_values
+    values = [change for change in diff_reports(old, new, include_values=True) if change["kind"] == "value"]
+    assert values == [{"kind": "value", "section": "comprehensive_analysis/AppleIntelligenceFramework",
+                       "path": "path", "change": "changed", "before": "/srv/a", "after": "/srv/b"}]
+
+
+def test_per_file_rows_are_matched_by_path(tmp_path):
+    paths = []
+    for name, lines in (("old.ndjson", {"a.swift": 10, "b.swift": 20}), ("new.ndjson", {"b.swift": 25, "c.ts": 5})):
+        writer = NDJSONReportWriter(tmp_path / name, include_files=True)
+        writer.open({})
+        for rel_path, count in lines.items():
+            writer.write_file(rel_path, "swift", count * 10, {"lines_of_code": count, "patterns": {"mcp": 1}})
+        writer.write_footer({}, {})
+        paths.append(writer.path)
+
+    with open_report(paths[1]) as source:
+        assert source.file_row(source.file_index()["c.ts"]) == {
+            "kind": "swift", "size": 50, "lines_of_code": 5, "patterns/mcp": 1
+        }
+    assert list(diff_reports(*paths)) == [
+        {"kind": "file", "section": "files", "file": "b.swift", "change": "changed",
+         "fields": {"size": [200, 250], "lines_of_code": [20, 25]}},
+        {"kind": "file", "section": "files", "file": "c.ts", "change": "added"},
+        {"kind": "file", "section": "files", "file": "a.swift", "change": "removed"},
+    ]
+
+
+def test_command_line_exit_status(tmp_path, capsys):
+    old = write(tmp_path / "old.json", BEFORE, "json")
+    new = write(tmp_path / "new.oksb", changed_results(), "binary")
+    assert main([str(old), str(old)]) == 0
+    assert main([str(old), str(new), "--ndjson"]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["kind"] for line in lines[1:]] == [change["kind"] for change in EXPECTED]
@@ -0,0 +1,137 @@
+"""
+NDJSON reports are written one record per phase, survive a crash mid-run,
+rebuild the same results a pretty-printed JSON report would contain, and are
+written and flushed off the analyzer's event loop.
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from analysis_cache import AnalysisCache  # noqa: E402
+from batch_analysis import SUMMARY_FILENAME, BatchAnalyzer  # noqa: E402
+from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer  # noqa: E402
+from report_stream import (  # noqa: E402
+    REPORT_FORMAT, NDJSONReportWriter, iter_records, load_report, read_footer, read_section
+)
+from scan_executor import ScanExecutor  # noqa: E402
+
+
+def write_report(path: Path, include_files: bool = False, finish: bool = True) -> NDJSONReportWriter:
+    writer = NDJSONReportWriter(path, include_files=include_files)
+    writer.open({"project_root": "/srv/demo"})
+    writer.write_section(["inventory"], {"file_count": 2})
+    writer.write_section(["comprehensive_analysis", "Scripts"], {"score": 0.5}, record_type="phase")
+    writer.write_file("scripts/deploy.sh", "script", 12, {"lines_of_code": 1})
+    writer.write_section(["comprehensive_analysis", "Docs"], {"score": 0.9}, record_type="phase")
+    if finish:
+        writer.write_footer({"overall_score": 0.7}, {"timestamp": "now"})
+    return writer
+
+
+def test_round_trip_and_index(tmp_path):
+    path = tmp_path / "report.ndjson"
+    writer = write_report(path)
+    assert not writer.is_open
+
+    records = list(iter_records(path))
+    assert [record["type"] for record in records] == ["header", "section", "phase", "phase", "footer"]
+    assert records[0]["format"] == REPORT_FORMAT
+
+    footer = read_footer(path)
+    assert footer["summary"] == {"overall_score": 0.7}
+    assert footer["records"] == len(records)
+    assert read_section(path, "comprehensive_analysis/Docs", footer) == {"score": 0.9}
+
+    assert load_report(path) == {
+        "inventory": {"file_count": 2},
+        "comprehensive_analysis": {"Scripts": {"score": 0.5}, "Docs": {"score": 0.9}},
+        "timestamp": "now"
+    }
+
+
+def test_unfinished_report_keeps_completed_phases(tmp_path):
+    path = tmp_path / "report.ndjson"
+    writer = write_report(path, finish=False)
+    writer.close()
+    # Simulate a crash in the middle of the next record
+    with open(path, 'ab') as f:
+        f.write(b'{"type":"phase","path":["comprehensive_')
+
+    assert read_footer(path) is None
+    results = load_report(path)
+    assert set(results["comprehensive_analysis"]) == {"Scripts", "Docs"}
+
+
+def test_file_records_only_when_enabled(tmp_path):
+    assert "files" not in load_report(write_report(tmp_path / "plain.ndjson").path)
+    files = load_report(write_report(tmp_path / "files.ndjson", include_files=True).path)["files"]
+    assert [(record["path"], record["kind"], record["size"]) for record in files] == [("scripts/deploy.sh", "script", 12)]
+
+
+def test_batch_ndjson_matches_json_report(tmp_path):
+    root = tmp_path / "client"
+    (root / "foundation-models").mkdir(parents=True)
+    (root / "foundation-models" / "index.js").write_text("export async function run() {\n  await go()\n}\n")
+    (root / "scripts").mkdir()
+    (root / "scripts" / "deploy.sh").write_text("echo deploy\n")
+
+    reports = {}
+    for report_format in ("json", "ndjson"):
+        out = tmp_path / report_format
+        batch = BatchAnalyzer(out, analysis_cache=AnalysisCache(), scan_executor=ScanExecutor(mode="serial"),
+                              report_format=report_format)
+        summary = asyncio.run(batch.run([root]))
+        assert summary["succeeded"] == 1
+        assert sorted(path.name for path in out.iterdir()) == sorted([f"client.{report_format}", SUMMARY_FILENAME])
+        reports[report_format] = out / f"client.{report_format}"
+
+    streamed = load_report(reports["ndjson"])
+    written = json.loads(reports["json"].read_text())
+    assert set(streamed) == set(written)
+    for phases in (streamed, written):
+        for phase in phases["comprehensive_analysis"].values():
+            phase.pop("analysis_time_ms", None)
+    assert streamed["comprehensive_analysis"] == written["comprehensive_analysis"]
+    summary = read_footer(reports["ndjson"])["summary"]
+    assert summary["overall_score"] == streamed["deployment_readiness"]["overall_score"]
+    assert summary["recommendations"] == len(written["recommendations"])
+
+
+def test_analyzer_writes_records_off_the_event_loop(tmp_path, monkeypatch):
+    (tmp_path / "foundation-models").mkdir()
+    (tmp_path / "foundation-models" / "index.js").write_text("export async function run() {\n  await go()\n}\n")
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "deploy.sh").write_text("echo deploy\n")
+    path = tmp_path / "report.ndjson"
+    writer = NDJSONReportWriter(path, include_files=True)
+    threads = []
+    write_encoded = writer.write_encoded
+
+    def recording_write(records):
+        threads.append(threading.current_thread())
+        write_encoded(records)
+
+    monkeypatch.setattr(writer, "write_encoded", recording_write)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = EnhancedOksanaPlatformAnalyzer(project_root=tmp_path, analysis_cache=AnalysisCache(),
+                                                  scan_executor=ScanExecutor(mode="serial"), report_stream=writer)
+        try:
+            asyncio.run(analyzer.analyze_complete_project_structure())
+            asyncio.run(analyzer.generate_final_report())
+        finally:
+            analyzer.close()
+
+    records = list(iter_records(path))
+    assert records[-1]["type"] == "footer" and len(records) == records[-1]["records"]
+    assert any(record["type"] == "file" for record in records)
+    # Header, sections, file batches and footer were all written from worker threads
+    assert 0 < len(threads) <= len(records)
+    assert all(thread is not threading.main_thread() for thread in threads)
+    assert load_report(path)["comprehensive_analysis"]["Scripts"]["scripts_exists"]
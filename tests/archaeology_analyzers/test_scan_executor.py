@@ -0,0 +1,83 @@
+"""
+Every scan, including the single-file scans of phases 1 and 8, runs on the
+scan executor, and the serial, thread and process modes produce the same
+analysis.
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+import scan_executor  # noqa: E402
+from analysis_cache import AnalysisCache  # noqa: E402
+from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer  # noqa: E402
+from scan_executor import ScanExecutor  # noqa: E402
+from source_scanners import SCAN_KIND_BRIDGE, SCAN_KIND_JAVASCRIPT, SCAN_KIND_SWIFT_BRIDGE  # noqa: E402
+
+FILES = {
+    "foundation-models/index.js": "export async function run() {\n  await mcp.quantum()\n}\nclass Engine {}\n",
+    "foundation-models/grid-claude-hybrid-processor.js": "const grid = require('grid')\nasync function go() {}\n",
+    "foundation-models/package.json": '{"name": "demo", "version": "1.0.0"}',
+    "AppleIntelligenceFramework/Sources/Model.swift": "import CoreML\nstruct Model { func predict() async {} }\n",
+    "FigmaMCPServer/src/server.ts": "import { Figma } from 'figma'\nexport class Server {}\n",
+    "SwiftTypescriptServiceBridge.swift": "import Foundation\nclass Bridge { func call() async throws {} }\n",
+    "CreativeIntelligenceBridge.js": "export async function bridge() {\n  await fetch('/api')\n}\n",
+    "scripts/deploy.sh": "echo deploy\n",
+}
+
+
+def write_project(root: Path):
+    for rel_path, text in FILES.items():
+        (root / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel_path).write_text(text)
+
+
+def analyze(root: Path, mode: str):
+    executor = ScanExecutor(mode=mode, max_workers=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = EnhancedOksanaPlatformAnalyzer(project_root=root, analysis_cache=AnalysisCache(),
+                                                  scan_executor=executor)
+        try:
+            results = asyncio.run(analyzer.analyze_complete_project_structure())
+        finally:
+            analyzer.close()
+            executor.shutdown()
+    components = {name: {key: value for key, value in component.items() if key != "analysis_time_ms"}
+                  for name, component in results["comprehensive_analysis"].items()}
+    return components, executor
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_modes_produce_the_serial_analysis(tmp_path, mode):
+    write_project(tmp_path)
+    reference, serial = analyze(tmp_path, "serial")
+    components, executor = analyze(tmp_path, mode)
+    assert executor.active_mode == mode
+    assert components == reference
+    assert components["foundation-models"]["key_files"]["index.js"]
+    assert executor.stats["files_scanned"] == serial.stats["files_scanned"]
+
+
+def test_single_file_scans_run_off_the_event_loop(tmp_path, monkeypatch):
+    write_project(tmp_path)
+    scanned = []
+    scan_batch = scan_executor.scan_batch
+
+    def recording_scan_batch(kind, contents):
+        scanned.append((kind, threading.current_thread()))
+        return scan_batch(kind, contents)
+
+    monkeypatch.setattr(scan_executor, "scan_batch", recording_scan_batch)
+    analyze(tmp_path, "thread")
+
+    kinds = {kind for kind, _ in scanned}
+    # Phase 1 JavaScript files and both phase 8 bridges
+    assert {SCAN_KIND_JAVASCRIPT, SCAN_KIND_BRIDGE, SCAN_KIND_SWIFT_BRIDGE} <= kinds
+    assert all(thread is not threading.main_thread() for _, thread in scanned)
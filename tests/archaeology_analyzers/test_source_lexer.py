@@ -0,0 +1,119 @@
+"""
+The source lexer counts real declarations, exports, async constructs and
+nesting depth - nothing inside comments, strings or regex literals - and gives
+the same summary however its input is split.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from source_lexer import LANGUAGE_SWIFT, SourceLexer, TokenSummaryCache, tokenize  # noqa: E402
+from source_scanners import SCAN_KIND_JAVASCRIPT, SCAN_KIND_SWIFT_BRIDGE, scan_source  # noqa: E402
+from streaming_scan import stream_scan_file  # noqa: E402
+
+JAVASCRIPT = r'''
+// function export async class in a comment
+/* export function() {} => */
+import x from "./export-async.js";
+const s = "function => export { class }";
+const t = `template ${ user.name + `${ nested({a: 1}) }` } function`;
+const r = /function\/[}{]/g, d = a / b / c;
+export async function run() {
+  if (ok) { await go(() => { return 1 }) }
+}
+export default class Foo { method() { return { x: { y: 1 } } } }
+module.exports = { run }; exports.z = 1; foo.exports = 2;
+interface Shape { area(): number }
+enum Color { Red }
+const f = async x => x.async;
+const café = 'it\'s'; label: for (;;) { break label }
+'''
+
+SWIFT = r'''
+import SwiftUI
+/* outer /* nested func */ still a comment: struct */
+// class Foo
+public struct View: Body {
+  var s = "func \(value.map { $0 }) class"
+  let r = #"raw \(not) interpolated func"#
+  let m = """
+    func in a "multi-line" \(x) string
+    """
+  func body() async throws { await load() }
+  class func make() -> Self { .init() }
+  open func share() {}
+  init() { super.init() }
+  let `default` = 1
+}
+final class Renderer {}
+extension View { }
+let f = open(url)
+'''
+
+
+def feed_in_pieces(content: str, language: str, cuts) -> dict:
+    lexer = SourceLexer(language)
+    previous = 0
+    for cut in [*cuts, len(content)]:
+        lexer.feed(content[previous:cut])
+        previous = cut
+    return lexer.close()
+
+
+def test_javascript_constructs_outside_comments_and_strings():
+    assert tokenize(JAVASCRIPT) == {
+        "functions": 3,          # function run, () =>, async x =>
+        "type_declarations": 3,  # class Foo, interface Shape, enum Color
+        "exports": 4,            # export async, export default, module.exports, exports.z
+        "async_constructs": 3,   # async, await, async (x.async is a property)
+        "max_nesting_depth": 4
+    }
+
+
+def test_swift_constructs_outside_comments_and_strings():
+    assert tokenize(SWIFT, LANGUAGE_SWIFT) == {
+        "functions": 4,          # body, class func make, share, init
+        "type_declarations": 3,  # struct View, class Renderer, extension View
+        "exports": 2,            # public struct, open func
+        "async_constructs": 2,
+        "max_nesting_depth": 2
+    }
+
+
+@pytest.mark.parametrize("content, language", [(JAVASCRIPT, "javascript"), (SWIFT, LANGUAGE_SWIFT)])
+def test_any_split_gives_the_same_summary(content, language):
+    expected = tokenize(content, language)
+    for step in (1, 2, 3, 7):
+        assert feed_in_pieces(content, language, range(step, len(content), step)) == expected
+    rng = random.Random(3)
+    for _ in range(100):
+        assert feed_in_pieces(content, language, sorted(rng.sample(range(1, len(content)), 8))) == expected
+
+
+def test_streaming_scan_lexes_across_chunks(tmp_path):
+    for name, content, kind in (("Bridge.js", JAVASCRIPT, SCAN_KIND_JAVASCRIPT),
+                                ("Bridge.swift", SWIFT, SCAN_KIND_SWIFT_BRIDGE)):
+        path = tmp_path / name
+        path.write_text(content)
+        for chunk_bytes in (1, 5, 64):
+            streamed, _ = stream_scan_file(kind, path, chunk_bytes)
+            assert streamed == scan_source(kind, content)
+
+
+def test_summaries_are_cached_by_content():
+    cache = TokenSummaryCache(max_entries=2)
+    first = cache.summarize(JAVASCRIPT)
+    first["functions"] = -1  # callers get copies
+    assert cache.summarize(JAVASCRIPT)["functions"] == 3
+    assert cache.summarize(SWIFT, LANGUAGE_SWIFT)["type_declarations"] == 3
+    assert cache.stats == {"hits": 1, "misses": 2}
+
+    # Same text, other language: a separate entry; the oldest is evicted
+    cache.summarize(JAVASCRIPT, LANGUAGE_SWIFT)
+    cache.summarize(JAVASCRIPT)
+    assert cache.stats == {"hits": 1, "misses": 4}
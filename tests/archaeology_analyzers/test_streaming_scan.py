@@ -0,0 +1,50 @@
+"""
+The streaming scan path must produce the same metrics as scanning a file's
+full text in memory, whatever the chunk size.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from source_scanners import SCANNERS, scan_source  # noqa: E402
+from streaming_scan import stream_scan_file  # noqa: E402
+
+FRAGMENTS = [
+    "function", "=>", "async", "await", "export", "class ", "  class X", "   ",
+    "mcp", "apple", "neural", "quantum", "bridge", "asynconnect", "promise",
+    "metalperformanceshaders", "neuralengine", "figma", "xcode", ".xcodeproj",
+    "x", "é", "\n", "\r\n", "\r", "\n\n",
+]
+
+
+def random_source(rng):
+    return "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 200)))
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 3, 7, 64, 4096])
+def test_streaming_matches_in_memory_scan(tmp_path, chunk_bytes):
+    rng = random.Random(chunk_bytes)
+    for index in range(60):
+        raw = random_source(rng).encode("utf-8")
+        path = tmp_path / f"source_{index}.js"
+        path.write_bytes(raw)
+        text = path.read_text()  # text mode: universal newlines, like the analyzer
+
+        for kind in SCANNERS:
+            streamed, _ = stream_scan_file(kind, path, chunk_bytes)
+            assert streamed == scan_source(kind, text), (kind, raw)
+
+
+def test_single_overlong_line(tmp_path):
+    line = "  " * 50 + "class Bundle { async connect() { mcp.neural() } } " * 200
+    path = tmp_path / "bundle.min.js"
+    path.write_text(line + "\n" + line)
+
+    for kind in SCANNERS:
+        streamed, _ = stream_scan_file(kind, path, 16)
+        assert streamed == scan_source(kind, path.read_text()), kind
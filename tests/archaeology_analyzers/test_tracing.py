@@ -0,0 +1,83 @@
+"""
+Spans nest per asyncio task, inherit their subtree, and export to Chrome
+trace_event JSON and a per-subtree summary.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from analysis_cache import AnalysisCache  # noqa: E402
+from batch_analysis import BatchAnalyzer  # noqa: E402
+from scan_executor import ScanExecutor  # noqa: E402
+from tracing import NULL_SPAN, Tracer, active_tracer, span  # noqa: E402
+
+
+def test_span_is_a_no_op_without_an_active_tracer():
+    assert active_tracer() is None
+    with span("read", "io") as read_span:
+        read_span.add(bytes=10, files=1)
+    assert read_span is NULL_SPAN
+
+    disabled = Tracer(enabled=False)
+    with disabled.activate():
+        assert span("read", "io") is NULL_SPAN
+    assert disabled.spans == []
+
+
+def test_concurrent_spans_inherit_subtree_and_share_lanes():
+    tracer = Tracer()
+
+    async def read(size: int):
+        with span("read", "io") as read_span:
+            await asyncio.sleep(0)
+            read_span.add(bytes=size, files=1)
+
+    async def phase(name: str):
+        with span(name, "phase", subtree=name):
+            await asyncio.gather(read(100), read(200))
+
+    async def run():
+        with tracer.activate(), span("analysis", "run"):
+            await asyncio.gather(phase("Scripts"), phase("Docs"))
+            with span("final", "run"):
+                pass
+
+    asyncio.run(run())
+
+    spans = {(item.name, item.subtree) for item in tracer.spans}
+    assert ("read", "Scripts") in spans and ("read", "Docs") in spans
+    # Lanes are reused: at most the root, two phases and four reads are ever open at once
+    assert tracer.summary()["lanes"] <= 7
+    assert all(item.end_ns >= item.start_ns for item in tracer.spans)
+
+    by_subtree = {row["subtree"]: row for row in tracer.summary()["by_subtree"]}
+    assert by_subtree["Scripts"]["bytes_read"] == 300
+    assert by_subtree["Docs"]["files_read"] == 2
+
+    events = [event for event in tracer.to_chrome_trace()["traceEvents"] if event["ph"] == "X"]
+    assert len(events) == len(tracer.spans)
+    assert {"name", "cat", "ts", "dur", "pid", "tid", "args"} <= set(events[0])
+    assert events[0]["name"] == "analysis"
+    assert "Scripts" in tracer.summary_table()
+
+
+def test_batch_writes_a_chrome_trace_per_root(tmp_path):
+    root = tmp_path / "client"
+    (root / "foundation-models").mkdir(parents=True)
+    (root / "foundation-models" / "index.js").write_text("export async function run() {\n  await go()\n}\n")
+
+    batch = BatchAnalyzer(tmp_path / "out", analysis_cache=AnalysisCache(),
+                          scan_executor=ScanExecutor(mode="serial"), trace=True)
+    assert asyncio.run(batch.run([root]))["succeeded"] == 1
+
+    trace = json.loads((tmp_path / "out" / "client.trace.json").read_text())
+    names = {(event["cat"], event["name"]) for event in trace["traceEvents"] if event["ph"] == "X"}
+    assert {("run", "analysis"), ("run", "final_report"), ("phase", "foundation-models"), ("io", "read")} <= names
+
+    report = json.loads((tmp_path / "out" / "client.json").read_text())
+    by_subtree = {row["subtree"]: row for row in report["trace_summary"]["by_subtree"]}
+    assert by_subtree["foundation-models"]["files_read"] >= 1
@@ -0,0 +1,153 @@
+"""
+Watch mode patches the inventory with changed paths, re-runs only the phases
+whose inputs changed, and republishes readiness and the report.
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "archaeology-analyzers"))
+
+from analysis_cache import AnalysisCache  # noqa: E402
+from enhanced_project_analyzer import EnhancedOksanaPlatformAnalyzer  # noqa: E402
+from project_inventory import ProjectInventory  # noqa: E402
+from watch_mode import InotifyWatcher, PollingWatcher, WatchSession  # noqa: E402
+
+
+def make_project(root: Path):
+    (root / "foundation-models" / "learning-pipeline").mkdir(parents=True)
+    (root / "foundation-models" / "index.js").write_text("export async function run() {\n  await mcp.quantum()\n}\n")
+    (root / "foundation-models" / "package.json").write_text('{"name": "demo", "version": "1.0.0"}')
+    (root / "scripts").mkdir()
+    (root / "scripts" / "deploy.sh").write_text("echo deploy\n")
+    (root / "docs" / "guides").mkdir(parents=True)
+    (root / "docs" / "guides" / "setup.md").write_text("# Setup\n")
+
+
+def snapshot(inventory: ProjectInventory):
+    return {entry.rel_path: (entry.size, entry.mtime_ns) for entry in inventory.files_under(inventory.root)}
+
+
+def test_with_changes_matches_a_fresh_build(tmp_path):
+    make_project(tmp_path)
+    inventory = ProjectInventory.build(tmp_path)
+
+    (tmp_path / "scripts" / "deploy.sh").write_text("echo deploy --all\n")
+    (tmp_path / "docs" / "api" / "v2").mkdir(parents=True)
+    (tmp_path / "docs" / "api" / "v2" / "index.md").write_text("# API\n")
+    (tmp_path / "docs" / "guides" / "setup.md").unlink()
+    (tmp_path / "docs" / "guides").rmdir()
+
+    patched, changed = inventory.with_changes([
+        tmp_path / "scripts" / "deploy.sh", tmp_path / "docs" / "api",
+        tmp_path / "docs" / "guides", tmp_path / "docs" / "guides" / "setup.md",
+        tmp_path / "foundation-models" / "index.js"  # reported but unchanged
+    ])
+    fresh = ProjectInventory.build(tmp_path)
+
+    assert changed == {"scripts/deploy.sh", "docs/api/v2/index.md", "docs/guides/setup.md"}
+    assert snapshot(patched) == snapshot(fresh)
+    assert sorted(patched.directories_under(tmp_path)) == sorted(fresh.directories_under(tmp_path))
+    # The original inventory is left untouched
+    assert "docs/guides/setup.md" in snapshot(inventory)
+
+
+def test_session_reruns_only_affected_phases(tmp_path):
+    make_project(tmp_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = EnhancedOksanaPlatformAnalyzer(project_root=tmp_path, analysis_cache=AnalysisCache())
+    report = tmp_path / "out" / "report.json"
+    session = WatchSession(analyzer, report)
+    try:
+        asyncio.run(session.start())
+        scripts_before = analyzer.analysis_results["comprehensive_analysis"]["Scripts"]
+
+        index = tmp_path / "foundation-models" / "index.js"
+        index.write_text(index.read_text() + "class NeuralEngine {}\nexport const bridge = 1\n")
+        cycle = asyncio.run(session.apply([index]))
+
+        assert cycle["changed_files"] == ["foundation-models/index.js"]
+        assert cycle["phases"] == ["foundation-models"]
+        assert cycle["files_read"] == 2  # only the changed file: its scan plus its architecture-theme words
+        # Phases whose inputs did not change keep their previous result object
+        assert analyzer.analysis_results["comprehensive_analysis"]["Scripts"] is scripts_before
+
+        on_disk = json.loads(report.read_text())
+        assert on_disk["watch"]["cycle"] == 1
+        assert on_disk["deployment_readiness"] == analyzer.analysis_results["deployment_readiness"]
+
+        # Touching a file without changing it is not a cycle
+        assert asyncio.run(session.apply([tmp_path / "scripts" / "deploy.sh"])) is None
+    finally:
+        analyzer.close()
+
+
+def test_connected_grid_is_queried_by_the_baseline_only(tmp_path, monkeypatch):
+    make_project(tmp_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = EnhancedOksanaPlatformAnalyzer(project_root=tmp_path, analysis_cache=AnalysisCache())
+    queries = []
+
+    async def grid_analysis():
+        queries.append(len(queries))
+        analyzer.analysis_results["strategic_intelligence"] = {"source": "grid", "query": len(queries)}
+
+    monkeypatch.setattr(analyzer, "_perform_real_grid_analysis", grid_analysis)
+    analyzer.grid_client = object()
+    session = WatchSession(analyzer, tmp_path / "out" / "report.json")
+    index = tmp_path / "foundation-models" / "index.js"
+    try:
+        asyncio.run(session.start())
+        assert queries == [0]
+
+        index.write_text(index.read_text() + "class NeuralEngine {}\n")
+        cycle = asyncio.run(session.apply([index]))
+        assert cycle["phases"] == ["foundation-models"]
+        assert queries == [0] and analyzer.phase_statuses["strategic_intelligence"] == "disabled"
+        assert analyzer.analysis_results["strategic_intelligence"] == {"source": "grid", "query": 1}
+
+        # In simulation mode phase 10 follows the edits again
+        analyzer.grid_client = None
+        index.write_text(index.read_text() + "export const bridge = 1\n")
+        asyncio.run(session.apply([index]))
+        assert analyzer.phase_statuses["strategic_intelligence"] == "ran" and queries == [0]
+        assert analyzer.analysis_results["strategic_intelligence"] != {"source": "grid", "query": 1}
+    finally:
+        analyzer.close()
+
+
+def test_polling_watcher_reports_changed_files(tmp_path):
+    make_project(tmp_path)
+    watcher = PollingWatcher(tmp_path, interval=0.01)
+    (tmp_path / "scripts" / "build.sh").write_text("echo build\n")
+    changes = asyncio.run(asyncio.wait_for(watcher.next_changes(), 5))
+    assert changes == {tmp_path / "scripts" / "build.sh"}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_follows_new_directories(tmp_path):
+    make_project(tmp_path)
+    inventory = ProjectInventory.build(tmp_path)
+
+    async def watch():
+        watcher = InotifyWatcher(tmp_path, inventory.directories_under(tmp_path))
+        try:
+            waiter = asyncio.ensure_future(watcher.next_changes())
+            await asyncio.sleep(0)
+            (tmp_path / "docs" / "api").mkdir()
+            first = await asyncio.wait_for(waiter, 5)
+            (tmp_path / "docs" / "api" / "index.md").write_text("# API\n")
+            second = await asyncio.wait_for(watcher.next_changes(), 5)
+            return first, second
+        finally:
+            watcher.close()
+
+    first, second = asyncio.run(watch())
+    assert tmp_path / "docs" / "api" in first
+    assert tmp_path / "docs" / "api" / "index.md" in second